@@ -0,0 +1,262 @@
+"""
+Per-camera posthoc detection cache, so re-running mocap doesn't re-detect.
+
+Re-running a posthoc pipeline after changing triangulation or filter settings
+used to re-detect every frame of every video. A VideoNode now writes its
+detections to ``output_data/detection_cache/<camera_id>/<key>/`` and a later
+run with the same key reads them back instead of running the tracker. The
+cache is off by default (``use_detection_cache`` in the mocap config).
+
+The key (``detection_cache_key``) hashes everything that determines the
+detections: the video's content, the detector config (tracker type, model
+names and thresholds) and the installed skellytracker version, which pins the
+model weights. Change any of them and the node simply finds no cache. Folders
+for old keys are never read again and nothing removes them; the whole
+``detection_cache`` folder can be deleted at any time to reclaim the space.
+
+Storage is columnar: each ``frames_<start>-<stop>.npz`` chunk holds one
+contiguous run of frames as (frames, points, 3) xyz and (frames, points)
+visibility arrays per detection stage, with point names stored once, saved
+with ``np.savez_compressed`` at full (float64) precision. Chunks are flushed every ``flush_every`` frames and written atomically (temp file +
+rename), so a run that is stopped or crashes leaves every flushed chunk usable
+and the next run resumes detection after the last flushed frame.
+
+Only keypoints are cached. Cached observations come back with their stages'
+keypoints and image size but no bounding boxes, so annotated videos drawn
+from cached frames show keypoints only. Posthoc triangulation and filtering
+don't read the boxes.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+from collections.abc import Iterator, Mapping
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+import numpy as np
+from skellycam.core.types.type_overloads import CameraIdString
+from skellytracker.core import TrackerConfig
+from skellytracker.core.data_primitives.keypoints import Keypoints
+from skellytracker.core.data_primitives.observation import Observation, StageObservation
+
+logger = logging.getLogger(__name__)
+
+DETECTION_CACHE_FOLDER_NAME = "detection_cache"
+DEFAULT_FLUSH_EVERY_FRAMES = 500
+
+_CHUNK_PATTERN = re.compile(r"^frames_(\d+)-(\d+)\.npz$")
+_HASH_BLOCK_BYTES = 1 << 20
+_HASH_SAMPLE_BLOCKS = 64
+
+
+def video_content_hash(video_path: Path) -> str:
+    """Hash of a video file's size and a fixed sample of its bytes.
+
+    Reads the first and last block plus evenly spaced blocks in between
+    (at most ``_HASH_SAMPLE_BLOCKS`` MiB), so hashing a multi-GB recording
+    stays well under a second while any re-encode or trim changes the hash.
+    """
+    size = video_path.stat().st_size
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(size.to_bytes(8, "little"))
+    n_blocks = max(1, -(-size // _HASH_BLOCK_BYTES))
+    if n_blocks <= _HASH_SAMPLE_BLOCKS:
+        offsets = range(0, size, _HASH_BLOCK_BYTES)
+    else:
+        offsets = [
+            i * (n_blocks - 1) // (_HASH_SAMPLE_BLOCKS - 1) * _HASH_BLOCK_BYTES
+            for i in range(_HASH_SAMPLE_BLOCKS)
+        ]
+    with open(video_path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            digest.update(f.read(_HASH_BLOCK_BYTES))
+    return digest.hexdigest()
+
+
+def _skellytracker_version() -> str:
+    try:
+        return version("skellytracker")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def detection_cache_key(*, video_path: Path, detector_config: TrackerConfig) -> dict[str, str]:
+    """Everything the cached detections depend on."""
+    return {
+        "video_content_hash": video_content_hash(video_path),
+        "detector_config": detector_config.model_dump_json(),
+        "skellytracker_version": _skellytracker_version(),
+    }
+
+
+def detection_cache_dir(
+    *,
+    recording_path: Path,
+    camera_id: CameraIdString,
+    video_path: Path,
+    detector_config: TrackerConfig,
+) -> Path:
+    """Cache folder for this camera's video under this detector; writes ``key.json`` on first use."""
+    key = detection_cache_key(video_path=video_path, detector_config=detector_config)
+    key_digest = hashlib.blake2b(json.dumps(key, sort_keys=True).encode(), digest_size=8).hexdigest()
+    cache_dir = recording_path / "output_data" / DETECTION_CACHE_FOLDER_NAME / str(camera_id) / key_digest
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key_path = cache_dir / "key.json"
+    if not key_path.exists():
+        key_path.write_text(json.dumps(key, indent=2))
+    return cache_dir
+
+
+class CachedDetections(Mapping[int, Observation]):
+    """Read-only ``{frame_number: Observation}`` view over a cache folder's chunks.
+
+    Observations are rebuilt from the columnar arrays on access.
+    """
+
+    def __init__(self, chunks: list[dict[str, np.ndarray]], starts: list[int]) -> None:
+        self._chunks = chunks
+        self._location: dict[int, tuple[int, int]] = {}
+        for chunk_index, (chunk, start) in enumerate(zip(chunks, starts)):
+            for row in range(len(chunk["image_size"])):
+                self._location[start + row] = (chunk_index, row)
+
+    @classmethod
+    def load(cls, cache_dir: Path) -> "CachedDetections":
+        chunk_paths: list[tuple[int, Path]] = []
+        for path in cache_dir.iterdir():
+            match = _CHUNK_PATTERN.match(path.name)
+            if match:
+                chunk_paths.append((int(match.group(1)), path))
+        chunks: list[dict[str, np.ndarray]] = []
+        starts: list[int] = []
+        for start, path in sorted(chunk_paths):
+            try:
+                with np.load(path, allow_pickle=False) as npz:
+                    chunks.append({name: npz[name] for name in npz.files})
+                starts.append(start)
+            except Exception:
+                logger.warning(f"Ignoring unreadable detection cache chunk {path}", exc_info=True)
+        return cls(chunks, starts)
+
+    def __getitem__(self, frame_number: int) -> Observation:
+        chunk_index, row = self._location[frame_number]
+        chunk = self._chunks[chunk_index]
+        stages: dict[str, StageObservation] = {}
+        for stage_index, stage_name in enumerate(chunk["stage_names"].tolist()):
+            keypoints = None
+            if chunk[f"stage{stage_index}_present"][row]:
+                keypoints = Keypoints(
+                    names=tuple(chunk[f"stage{stage_index}_point_names"].tolist()),
+                    xyz=chunk[f"stage{stage_index}_xyz"][row],
+                    visibility=chunk[f"stage{stage_index}_visibility"][row],
+                )
+            stages[stage_name] = StageObservation(name=stage_name, keypoints=keypoints)
+        height, width = chunk["image_size"][row].tolist()
+        return Observation(frame_number=frame_number, image_size=(height, width), stages=stages)
+
+    def __contains__(self, frame_number: object) -> bool:
+        return frame_number in self._location
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._location)
+
+    def __len__(self) -> int:
+        return len(self._location)
+
+    def covers(self, frame_numbers: range) -> bool:
+        return all(frame_number in self._location for frame_number in frame_numbers)
+
+
+class DetectionCacheWriter:
+    """Buffers consecutive observations and flushes them as columnar chunks.
+
+    A chunk always holds one contiguous run of frames; adding a frame that
+    doesn't follow the previous one flushes the current run first. If the
+    observations' stage/point layout changes within a run (which a columnar
+    chunk can't hold), the writer logs a warning and stops caching.
+    """
+
+    def __init__(self, *, cache_dir: Path, flush_every: int = DEFAULT_FLUSH_EVERY_FRAMES) -> None:
+        if flush_every < 1:
+            raise ValueError(f"flush_every must be >= 1, got {flush_every}")
+        self._cache_dir = cache_dir
+        self._flush_every = flush_every
+        self._observations: list[Observation] = []
+        self._start: int | None = None
+        self._disabled = False
+
+    def add(self, *, frame_number: int, observation: Observation) -> None:
+        if self._disabled:
+            return
+        if self._start is not None and frame_number != self._start + len(self._observations):
+            self.flush()
+        if self._start is None:
+            self._start = frame_number
+        self._observations.append(observation)
+        if len(self._observations) >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered run (if any) to its chunk file."""
+        if self._disabled or not self._observations:
+            return
+        start = self._start
+        observations = self._observations
+        self._observations = []
+        self._start = None
+        try:
+            arrays = _observations_to_columns(observations)
+        except ValueError as e:
+            logger.warning(f"Detection cache disabled for {self._cache_dir}: {e}")
+            self._disabled = True
+            return
+        chunk_path = self._cache_dir / f"frames_{start:08d}-{start + len(observations):08d}.npz"
+        tmp_path = chunk_path.with_name(f".{chunk_path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, chunk_path)
+
+
+def _observations_to_columns(observations: list[Observation]) -> dict[str, np.ndarray]:
+    """Columnar arrays for a run of observations sharing one stage/point layout."""
+    n_frames = len(observations)
+    stage_names = list(observations[0].stages.keys())
+    arrays: dict[str, np.ndarray] = {
+        "stage_names": np.array(stage_names, dtype=str),
+        "image_size": np.array([observation.image_size for observation in observations], dtype=np.int32),
+    }
+    for stage_index, stage_name in enumerate(stage_names):
+        point_names: tuple[str, ...] | None = None
+        for observation in observations:
+            stage = observation.stages.get(stage_name)
+            if stage is not None and stage.keypoints is not None:
+                point_names = tuple(stage.keypoints.names)
+                break
+        n_points = 0 if point_names is None else len(point_names)
+        xyz = np.full((n_frames, n_points, 3), np.nan, dtype=np.float64)
+        visibility = np.zeros((n_frames, n_points), dtype=np.float64)
+        present = np.zeros(n_frames, dtype=bool)
+        for row, observation in enumerate(observations):
+            if list(observation.stages.keys()) != stage_names:
+                raise ValueError(
+                    f"frame {observation.frame_number} has stages {list(observation.stages.keys())}, "
+                    f"expected {stage_names}"
+                )
+            keypoints = observation.stages[stage_name].keypoints
+            if keypoints is None:
+                continue
+            if tuple(keypoints.names) != point_names:
+                raise ValueError(
+                    f"frame {observation.frame_number} stage {stage_name!r} point names changed within a run"
+                )
+            xyz[row] = keypoints.xyz
+            visibility[row] = keypoints.visibility
+            present[row] = True
+        arrays[f"stage{stage_index}_point_names"] = np.array(point_names or (), dtype=str)
+        arrays[f"stage{stage_index}_xyz"] = xyz
+        arrays[f"stage{stage_index}_visibility"] = visibility
+        arrays[f"stage{stage_index}_present"] = present
+    return arrays
@@ -5,16 +5,24 @@ The frame-collection logic is written once here. The actual processing is
 delegated to a task function (e.g. run_calibration_task, run_mocap_task)
 passed in as a picklable callable.
 
-The task function signature must be:
+Keypoints are collected column-wise: each output's keypoints are written in
+place into a preallocated KeypointColumns array as it arrives, and the
+Observation is dropped. The task function signature must be:
 
     def my_task(
         *,
-        frame_observations: list[dict[CameraIdString, Observation]],
+        keypoint_columns: KeypointColumns,
         recording_info: RecordingInfo,
         video_metadata: dict[CameraIdString, VideoMetadata],
         reporter: TaskProgressReporter | None = None,
     ) -> None:
 
+With ``retain_observations=True`` the Observation objects are kept instead of
+keypoint columns, and the task receives
+``frame_observations: list[dict[CameraIdString, Observation]]`` (calibration,
+whose anipose export needs the named charuco stages and whose cameras need not
+agree on a keypoint count).
+
 Additional task-specific kwargs are pre-bound via functools.partial.
 """
 import logging
@@ -27,13 +35,16 @@ from typing import Callable
 from skellycam.core.ipc.process_management.worker_registry import WorkerRegistry
 from skellycam.core.recorders.videos.recording_info import RecordingInfo
 from skellycam.core.types.type_overloads import CameraIdString, TopicSubscriptionQueue
+from skellytracker.core.data_primitives.observation import Observation  # noqa: TC002
 
 from freemocap.core.pipeline.abcs.aggregator_node_abc import AggregatorNode
 from freemocap.core.pipeline.abcs.pipeline_ipc import PipelineIPC
 from freemocap.core.pipeline.posthoc.pipeline_phases import AggregatorPhase, PosthocPipelineType
+from freemocap.core.pipeline.posthoc.progress_coalescer import ProgressCoalescer
 from freemocap.core.pipeline.posthoc.task_progress_reporter import TaskProgressReporter
 from freemocap.core.pipeline.posthoc.video_group_helper import VideoMetadata
-from freemocap.core.types.type_overloads import PipelineIdString, FrameNumberInt, TopicPublicationQueue
+from freemocap.core.tracking.keypoint_columns import KeypointColumns
+from freemocap.core.types.type_overloads import PipelineIdString, TopicPublicationQueue
 from freemocap.pubsub.pubsub_manager import PubSubTopicManager
 from freemocap.core.pipeline.posthoc.progress_messages import AggregatorNodeProgressMessage, PipelineProgressMessage
 from freemocap.pubsub.pubsub_topics import (
@@ -48,6 +59,31 @@ logger = logging.getLogger(__name__)
 
 PosthocAggregationNodeTaskFn = Callable[..., None]
 
+_OUTPUT_POLL_TIMEOUT_S = 0.1
+
+
+def _retain_observation(
+        observations_by_camera: dict[CameraIdString, list[Observation | None]],
+        *,
+        camera_id: CameraIdString,
+        frame_number: int,
+        start_frame: int,
+        observation: Observation,
+) -> None:
+    """Store one observation in its (camera, frame) slot, with the same checks as `KeypointColumns.add`."""
+    frames = observations_by_camera.get(camera_id)
+    if frames is None:
+        raise ValueError(f"Unexpected camera ID '{camera_id}' — expected one of {list(observations_by_camera)}")
+    row = frame_number - start_frame
+    if not 0 <= row < len(frames):
+        raise ValueError(
+            f"Unexpected frame number {frame_number} — "
+            f"expected range [{start_frame}, {start_frame + len(frames)})"
+        )
+    if frames[row] is not None:
+        raise ValueError(f"Duplicate output for camera {camera_id} frame {frame_number}")
+    frames[row] = observation
+
 
 @dataclass
 class PosthocAggregationNode(AggregatorNode):
@@ -65,6 +101,7 @@ class PosthocAggregationNode(AggregatorNode):
             worker_registry: WorkerRegistry,
             ipc: PipelineIPC,
             pubsub: PubSubTopicManager,
+            retain_observations: bool = False,
     ) -> "PosthocAggregationNode":
         _progress_queue: multiprocessing.queues.Queue = multiprocessing.Queue()
         shutdown_self_flag, worker = cls._create_worker(
@@ -78,6 +115,7 @@ class PosthocAggregationNode(AggregatorNode):
                 pipeline_type=pipeline_type,
                 recording_info=recording_info,
                 video_metadata=video_metadata,
+                retain_observations=retain_observations,
                 ipc=ipc,
                 aggregator_progress_pub=_progress_queue,
                 video_node_output_subscription=pubsub.get_subscription(
@@ -99,6 +137,7 @@ class PosthocAggregationNode(AggregatorNode):
             pipeline_type: PosthocPipelineType,
             recording_info: RecordingInfo,
             video_metadata: dict[CameraIdString, VideoMetadata],
+            retain_observations: bool,
             ipc: PipelineIPC,
             shutdown_self_flag: Synchronized,
             video_node_output_subscription: TopicSubscriptionQueue,
@@ -118,11 +157,13 @@ class PosthocAggregationNode(AggregatorNode):
             )
         start_frame = start_frames.pop()
         end_frame = end_frames.pop()
-        frame_numbers = list(range(start_frame, end_frame))
+        n_frames = end_frame - start_frame
         camera_ids = list(video_metadata.keys())
-        total_expected = len(frame_numbers) * len(camera_ids)
+        total_expected = n_frames * len(camera_ids)
 
-        aggregator_progress_pub.put(AggregatorNodeProgressMessage(
+        # Task stages may report per frame or per iteration; coalesce like the video nodes do.
+        progress = ProgressCoalescer(publish=aggregator_progress_pub.put)
+        progress.put(AggregatorNodeProgressMessage(
             pipeline_id=pipeline_id,
             pipeline_type=str(pipeline_type),
             phase=AggregatorPhase.COLLECTING_CAMERA_OUTPUT,
@@ -133,15 +174,16 @@ class PosthocAggregationNode(AggregatorNode):
         ))
         logger.debug(
             f"PosthocAggregationNode [{pipeline_id}] starting — "
-            f"expecting {len(frame_numbers)} frames × {len(camera_ids)} cameras "
+            f"expecting {n_frames} frames × {len(camera_ids)} cameras "
             f"= {total_expected} outputs"
         )
 
-        video_outputs_by_frame: dict[FrameNumberInt, dict[CameraIdString, VideoNodeOutputMessage | None]] = {
-            frame_number: {cam: None for cam in camera_ids}
-            for frame_number in frame_numbers
-        }
-        got_all_by_frame: dict[FrameNumberInt, bool] = {frame_number: False for frame_number in frame_numbers}
+        keypoint_columns: KeypointColumns | None = None
+        observations_by_camera: dict[CameraIdString, list[Observation | None]] | None = None
+        if retain_observations:
+            observations_by_camera = {cam: [None] * n_frames for cam in camera_ids}
+        else:
+            keypoint_columns = KeypointColumns(camera_ids=camera_ids, start_frame=start_frame, n_frames=n_frames)
         received_count: int = 0
 
         _error_occurred = True  # pessimistic; cleared to False only on clean completion
@@ -153,30 +195,36 @@ class PosthocAggregationNode(AggregatorNode):
                 leave=True,
                 dynamic_ncols=True,
             ) as pbar:
-                while not shutdown_self_flag.value and ipc.should_continue:
+                while received_count < total_expected and not shutdown_self_flag.value and ipc.should_continue:
                     try:
-                        msg: VideoNodeOutputMessage = video_node_output_subscription.get(timeout=0.001)
+                        msg: VideoNodeOutputMessage = video_node_output_subscription.get(
+                            timeout=_OUTPUT_POLL_TIMEOUT_S
+                        )
                     except Empty:
                         continue
 
-                    if msg.camera_id not in camera_ids:
-                        raise ValueError(
-                            f"Unexpected camera ID '{msg.camera_id}' — "
-                            f"expected one of {camera_ids}"
+                    # Rejects unknown cameras/frames and duplicates (frame-range shards
+                    # of one video must not overlap).
+                    if observations_by_camera is not None:
+                        _retain_observation(
+                            observations_by_camera,
+                            camera_id=msg.camera_id,
+                            frame_number=msg.frame_number,
+                            start_frame=start_frame,
+                            observation=msg.observation,
                         )
-                    if msg.frame_number not in video_outputs_by_frame:
-                        raise ValueError(
-                            f"Unexpected frame number {msg.frame_number} — "
-                            f"expected range [{start_frame}, {end_frame})"
+                    else:
+                        keypoint_columns.add(
+                            camera_id=msg.camera_id,
+                            frame_number=msg.frame_number,
+                            observation=msg.observation,
                         )
-
-                    video_outputs_by_frame[msg.frame_number][msg.camera_id] = msg
                     received_count += 1
                     pbar.update(1)
 
                     update_interval = max(1, total_expected // 50)
                     if received_count % update_interval == 0:
-                        aggregator_progress_pub.put(AggregatorNodeProgressMessage(
+                        progress.put(AggregatorNodeProgressMessage(
                             pipeline_id=pipeline_id,
                             pipeline_type=str(pipeline_type),
                             phase=AggregatorPhase.COLLECTING_CAMERA_OUTPUT,
@@ -186,16 +234,14 @@ class PosthocAggregationNode(AggregatorNode):
                             recording_path=rec_path_str,
                         ))
 
-                    if all(
-                            isinstance(v, VideoNodeOutputMessage)
-                            for v in video_outputs_by_frame[msg.frame_number].values()
-                    ):
-                        got_all_by_frame[msg.frame_number] = True
-
-                    if all(got_all_by_frame.values()):
-                        break
-
-            missing_frames = [frame_number for frame_number, complete in got_all_by_frame.items() if not complete]
+            if observations_by_camera is not None:
+                missing_frames = [
+                    start_frame + row
+                    for row in range(n_frames)
+                    if any(observations_by_camera[cam][row] is None for cam in camera_ids)
+                ]
+            else:
+                missing_frames = keypoint_columns.missing_frame_numbers()
             if missing_frames:
                 raise RuntimeError(
                     f"Pipeline {pipeline_id} ended with {len(missing_frames)} missing frames out of {total_expected}, "
@@ -205,20 +251,18 @@ class PosthocAggregationNode(AggregatorNode):
 
             logger.info(f"PosthocAggregationNode [{pipeline_id}] — all frames collected")
 
-            observations_by_frame: list[dict[CameraIdString, object]] = []
-            for frame_number in frame_numbers:
-                frame_data = video_outputs_by_frame[frame_number]
-                observations = {}
-                for cam_id, output_msg in frame_data.items():
-                    if not isinstance(output_msg, VideoNodeOutputMessage):
-                        raise RuntimeError(
-                            f"Missing output for camera {cam_id} frame {frame_number}"
-                        )
-                    observations[cam_id] = output_msg.observation
-                observations_by_frame.append(observations)
+            if observations_by_camera is not None:
+                collected = dict(
+                    frame_observations=[
+                        {cam: observations_by_camera[cam][row] for cam in camera_ids}
+                        for row in range(n_frames)
+                    ]
+                )
+            else:
+                collected = dict(keypoint_columns=keypoint_columns)
 
             reporter = TaskProgressReporter(
-                callback=lambda stage, detail, fraction: aggregator_progress_pub.put(
+                callback=lambda stage, detail, fraction: progress.put(
                     AggregatorNodeProgressMessage(
                         pipeline_id=pipeline_id,
                         pipeline_type=str(pipeline_type),
@@ -232,7 +276,7 @@ class PosthocAggregationNode(AggregatorNode):
             )
 
             aggregation_task_fn(
-                frame_observations=observations_by_frame,
+                **collected,
                 recording_info=recording_info,
                 video_metadata=video_metadata,
                 reporter=reporter,
@@ -247,7 +291,7 @@ class PosthocAggregationNode(AggregatorNode):
                 exc_info=True,
             )
             _error_occurred = True
-            aggregator_progress_pub.put(AggregatorNodeProgressMessage(
+            progress.put(AggregatorNodeProgressMessage(
                 pipeline_id=pipeline_id,
                 pipeline_type=str(pipeline_type),
                 phase=AggregatorPhase.FAILED,
@@ -263,7 +307,7 @@ class PosthocAggregationNode(AggregatorNode):
             # display a meaningful message to the user.
         finally:
             if not _error_occurred:
-                aggregator_progress_pub.put(AggregatorNodeProgressMessage(
+                progress.put(AggregatorNodeProgressMessage(
                     pipeline_id=pipeline_id,
                     pipeline_type=str(pipeline_type),
                     phase=AggregatorPhase.COMPLETE,
@@ -6,6 +6,9 @@ The pipeline is parameterized by:
   - detector_spec: what detector to run in the video nodes
   - task_fn: what processing to do in the aggregation node after collecting all frames
 
+Each video can optionally be split into contiguous frame ranges detected by
+parallel video nodes (``frame_shards_per_video``, see video_sharding).
+
 The pipeline self-terminates when processing is complete. All processes exit
 naturally when their work is done.
 """
@@ -29,6 +32,7 @@ from freemocap.core.pipeline.posthoc.posthoc_aggregation_node import PosthocAggr
     PosthocAggregationNodeTaskFn
 from freemocap.core.pipeline.posthoc.video_group_helper import VideoGroupHelper
 from freemocap.core.pipeline.posthoc.video_node import VideoNode
+from freemocap.core.pipeline.posthoc.video_sharding import FrameRange, plan_frame_ranges
 from freemocap.core.types.type_overloads import PipelineIdString
 from freemocap.pubsub.pubsub_manager import PubSubTopicManager
 from freemocap.core.pipeline.posthoc.progress_messages import PipelineProgressMessage
@@ -47,7 +51,8 @@ class PosthocPipeline(PipelineABC):
     id: PipelineIdString
     pipeline_type: PosthocPipelineType
     recording_info: RecordingInfo
-    video_nodes: dict[CameraIdString, VideoNode]
+    # Keyed by VideoNode.node_id: the camera id, or "<camera>:<frames>" for shards.
+    video_nodes: dict[str, VideoNode]
     aggregation_node: PosthocAggregationNode
     ipc: PipelineIPC
     pubsub: PubSubTopicManager
@@ -73,7 +78,7 @@ class PosthocPipeline(PipelineABC):
 
     @property
     def camera_ids(self) -> list[CameraIdString]:
-        return list(self.video_nodes.keys())
+        return list(dict.fromkeys(node.camera_id for node in self.video_nodes.values()))
 
     @classmethod
     def create(
@@ -86,6 +91,10 @@ class PosthocPipeline(PipelineABC):
         worker_registry: WorkerRegistry,
         global_kill_flag: Synchronized,
         save_annotated_video: bool = True,
+        inference_batch_size: int = 1,
+        frame_queue_depth: int = 4,
+        frame_shards_per_video: int = 1,
+        use_detection_cache: bool = False,
     ) -> "PosthocPipeline":
         """
         Create a posthoc pipeline.
@@ -100,6 +109,16 @@ class PosthocPipeline(PipelineABC):
             save_annotated_video: Write annotated video output during detection.
                 If an annotated video already exists, new annotations are layered
                 on top of the existing one.
+            inference_batch_size: Frames per detector call in each video node.
+                1 runs ``process_image`` per frame; larger values run
+                ``process_batch`` on that many consecutive frames.
+            frame_queue_depth: Decoded frames buffered ahead of detection, and
+                annotated frames buffered ahead of the encoder, per video node.
+            frame_shards_per_video: Split each video into up to this many
+                contiguous frame ranges, each detected by its own video node.
+                Sharded videos get no annotated video output.
+            use_detection_cache: Reuse (and save) per-camera detections under
+                output_data/detection_cache, resuming interrupted runs.
         """
         recording_path = Path(recording_info.full_recording_path)
 
@@ -118,20 +137,39 @@ class PosthocPipeline(PipelineABC):
             global_kill_flag=global_kill_flag,
         )
 
-        video_nodes: dict[CameraIdString, VideoNode] = {}
+        video_nodes: dict[str, VideoNode] = {}
         for camera_id, video_helper in video_group.videos.items():
-            video_nodes[camera_id] = VideoNode.create(
-                camera_id=camera_id,
-                video_path=video_helper.video_path,
-                detector_config=detector_config,
-                worker_registry=worker_registry,
-                ipc=ipc,
-                pubsub=pubsub,
-                recording_path=recording_path,
-                save_annotated_video=save_annotated_video,
-                pipeline_id=pipeline_id,
-                pipeline_type=pipeline_type,
-            )
+            frame_ranges: list[FrameRange | None] = [None]
+            if frame_shards_per_video > 1:
+                planned = plan_frame_ranges(
+                    frame_count=video_helper.metadata.frame_count,
+                    n_shards=frame_shards_per_video,
+                )
+                if len(planned) > 1:
+                    frame_ranges = list(planned)
+                    if save_annotated_video:
+                        logger.warning(
+                            f"PosthocPipeline [{pipeline_id}]: {camera_id} is split into "
+                            f"{len(planned)} frame ranges — skipping its annotated video"
+                        )
+            for frame_range in frame_ranges:
+                node = VideoNode.create(
+                    camera_id=camera_id,
+                    video_path=video_helper.video_path,
+                    detector_config=detector_config,
+                    worker_registry=worker_registry,
+                    ipc=ipc,
+                    pubsub=pubsub,
+                    recording_path=recording_path,
+                    save_annotated_video=save_annotated_video and frame_range is None,
+                    inference_batch_size=inference_batch_size,
+                    frame_queue_depth=frame_queue_depth,
+                    frame_range=frame_range,
+                    use_detection_cache=use_detection_cache,
+                    pipeline_id=pipeline_id,
+                    pipeline_type=pipeline_type,
+                )
+                video_nodes[node.node_id] = node
 
         aggregation_node = PosthocAggregationNode.create(
             aggregation_task_fn=aggregation_task_fn,
@@ -142,6 +180,8 @@ class PosthocPipeline(PipelineABC):
             worker_registry=worker_registry,
             ipc=ipc,
             pubsub=pubsub,
+            # The anipose calibration export still reads the named charuco stages.
+            retain_observations=pipeline_type == PosthocPipelineType.CALIBRATION,
         )
 
         video_group.close()
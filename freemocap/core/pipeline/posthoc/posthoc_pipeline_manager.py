@@ -152,6 +152,10 @@ class PosthocPipelineManager(PipelineManagerABC):
             pipeline_type=PosthocPipelineType.MOCAP,
             worker_registry=self.worker_registry,
             global_kill_flag=self.global_kill_flag,
+            inference_batch_size=mocap_config.inference_batch_size,
+            frame_queue_depth=mocap_config.frame_queue_depth,
+            frame_shards_per_video=mocap_config.frame_shards_per_video,
+            use_detection_cache=mocap_config.use_detection_cache,
         )
         pipeline.queued_progress_message = PipelineProgressMessage(
             pipeline_id=pipeline.id,
@@ -0,0 +1,72 @@
+"""
+ProgressCoalescer: rate-limits posthoc progress messages at the source.
+
+A VideoNode emits a progress update per decoded frame; on a 100k-frame
+multi-camera job that is hundreds of thousands of messages through the
+progress queues and up to the websocket, where the UI only ever shows the
+latest one per node. The coalescer sits in front of a node's progress queue
+and, per ``pipeline_id``, forwards an update only when both enough wall-clock
+time (``min_interval_s``) and enough progress (``min_fraction_delta``) have
+passed since the last forwarded one.
+
+Updates the UI must never miss always go through: the first update for a
+node, any phase change (including terminal COMPLETE / FAILED), and the
+update that reaches ``progress_fraction >= 1.0``, plus any update put with
+``force=True`` (e.g. a status change within a phase). Dropped updates are
+superseded ones — every node finishes with a terminal COMPLETE / FAILED
+message, which is always forwarded.
+"""
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from freemocap.core.pipeline.posthoc.progress_messages import PipelineProgressMessage
+
+DEFAULT_MIN_INTERVAL_S = 0.25
+DEFAULT_MIN_FRACTION_DELTA = 0.005
+
+
+@dataclass
+class _NodeProgressState:
+    last_sent_time: float
+    last_sent_phase: str
+    last_sent_fraction: float
+
+
+class ProgressCoalescer:
+    """Forwards progress messages to ``publish``, coalescing bursts per ``pipeline_id``."""
+
+    def __init__(
+        self,
+        *,
+        publish: Callable[[PipelineProgressMessage], None],
+        min_interval_s: float = DEFAULT_MIN_INTERVAL_S,
+        min_fraction_delta: float = DEFAULT_MIN_FRACTION_DELTA,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._publish = publish
+        self._min_interval_s = min_interval_s
+        self._min_fraction_delta = min_fraction_delta
+        self._clock = clock
+        self._state_by_id: dict[str, _NodeProgressState] = {}
+
+    def put(self, message: PipelineProgressMessage, *, force: bool = False) -> None:
+        """Forward ``message`` unless a recent update for the same node makes it redundant."""
+        now = self._clock()
+        state = self._state_by_id.get(message.pipeline_id)
+        if (
+            force
+            or state is None
+            or message.phase != state.last_sent_phase
+            or message.progress_fraction >= 1.0
+            or (
+                now - state.last_sent_time >= self._min_interval_s
+                and abs(message.progress_fraction - state.last_sent_fraction) >= self._min_fraction_delta
+            )
+        ):
+            self._state_by_id[message.pipeline_id] = _NodeProgressState(
+                last_sent_time=now,
+                last_sent_phase=message.phase,
+                last_sent_fraction=message.progress_fraction,
+            )
+            self._publish(message)
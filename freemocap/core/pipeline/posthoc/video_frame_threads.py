@@ -0,0 +1,181 @@
+"""
+Background decode and annotated-video encode for VideoNode.
+
+OpenCV releases the GIL inside ``VideoCapture.read``, drawing and
+``VideoWriter.write``, so running decode and encode on their own threads
+overlaps them with detection: a video node is then limited by its slowest
+stage rather than by the sum of all stages.
+
+Both threads talk to the node through bounded queues (``depth`` frames), so
+memory stays bounded however far ahead decode gets or however far behind the
+encoder falls — a full queue simply blocks the faster side. An exception on
+either thread is re-raised on the node's thread at the next hand-off.
+"""
+import logging
+import queue
+import threading
+
+import cv2
+import numpy as np
+from skellytracker.core.data_primitives.observation import Observation
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL_S = 0.1
+_END = None
+
+
+class FramePrefetcher:
+    """Decodes frames from a ``cv2.VideoCapture`` into a bounded queue on a background thread.
+
+    Stops after ``max_frames`` frames when given (a frame-range shard).
+    """
+
+    def __init__(
+        self,
+        *,
+        reader: cv2.VideoCapture,
+        depth: int,
+        name: str,
+        max_frames: int | None = None,
+    ) -> None:
+        if depth < 1:
+            raise ValueError(f"Prefetch depth must be >= 1, got {depth}")
+        self._reader = reader
+        self._max_frames = max_frames
+        self._queue: queue.Queue[np.ndarray | None] = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._exhausted = False
+        self._thread = threading.Thread(target=self._run, name=f"{name}-decode", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            decoded = 0
+            while not self._stop.is_set() and (self._max_frames is None or decoded < self._max_frames):
+                success, image = self._reader.read()
+                if not success:
+                    break
+                decoded += 1
+                self._put(image)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._put(_END)
+
+    def _put(self, item: np.ndarray | None) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL_S)
+                return
+            except queue.Full:
+                continue
+
+    def read(self) -> np.ndarray | None:
+        """Next decoded frame, or None once the video is exhausted."""
+        if self._exhausted:
+            return None
+        image = self._queue.get()
+        if image is _END:
+            self._exhausted = True
+            if self._error is not None:
+                raise self._error
+        return image
+
+    def close(self) -> None:
+        """Stop decoding and join the thread. Must run before the reader is released."""
+        self._stop.set()
+        self._thread.join()
+
+
+class AnnotatedFrameWriter:
+    """Draws annotations and encodes the annotated video on a background thread.
+
+    Frames are written in submission order. When ``base_reader`` (a previous
+    annotated video) is given, annotations are layered on its frames until it
+    runs out, then on the source frames.
+    """
+
+    def __init__(
+        self,
+        *,
+        annotator,
+        video_writer: cv2.VideoWriter,
+        base_reader: cv2.VideoCapture | None,
+        depth: int,
+        name: str,
+    ) -> None:
+        if depth < 1:
+            raise ValueError(f"Writer queue depth must be >= 1, got {depth}")
+        self._annotator = annotator
+        self._video_writer = video_writer
+        self._base_reader = base_reader
+        self._name = name
+        self._queue: queue.Queue[tuple[int, np.ndarray, Observation] | None] = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name=f"{name}-encode", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    item = self._queue.get(timeout=_POLL_INTERVAL_S)
+                except queue.Empty:
+                    continue
+                if item is _END:
+                    return
+                frame_number, image, observation = item
+                self._video_writer.write(
+                    self._annotator.annotate(self._annotation_base(frame_number, image), observation)
+                )
+        except BaseException as e:
+            self._error = e
+
+    def _annotation_base(self, frame_number: int, image: np.ndarray) -> np.ndarray:
+        if self._base_reader is None:
+            return image
+        base_ok, base_frame = self._base_reader.read()
+        if not base_ok or base_frame is None:
+            logger.warning(
+                f"Previous annotated video ran out of frames at frame {frame_number} "
+                f"for {self._name} — falling back to source frames"
+            )
+            self._base_reader.release()
+            self._base_reader = None
+            return image
+        return base_frame
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, *, frame_number: int, image: np.ndarray, observation: Observation) -> None:
+        """Queue a frame for annotation; blocks while the queue is full."""
+        while True:
+            self._raise_if_failed()
+            try:
+                self._queue.put((frame_number, image, observation), timeout=_POLL_INTERVAL_S)
+                return
+            except queue.Full:
+                if not self._thread.is_alive():
+                    self._raise_if_failed()
+                    raise RuntimeError(f"Annotated video writer for {self._name} stopped unexpectedly")
+
+    def finish(self) -> None:
+        """Write every queued frame, join the thread and re-raise any writer error."""
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_END, timeout=_POLL_INTERVAL_S)
+                break
+            except queue.Full:
+                continue
+        self._thread.join()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        """Stop without flushing (error/shutdown path). Must run before the writer is released."""
+        self._stop.set()
+        self._thread.join()
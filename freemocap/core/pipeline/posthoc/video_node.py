@@ -4,15 +4,29 @@ VideoNode: reads frames from a video file, runs a tracker, publishes observation
 Generic video processing node parameterized by TrackerConfig — the same node
 handles charuco detection, RTMPose skeleton detection, or any future tracker type.
 
+Decoding and annotated-video encoding run on background threads behind
+bounded queues (see video_frame_threads), overlapping with detection.
+
+A node can be restricted to a contiguous ``FrameRange`` of its video so that
+several nodes detect one video in parallel (see video_sharding).
+
+With ``use_detection_cache`` a node saves its detections and skips detecting
+frames already saved by an earlier run with the same video and detector (see
+detection_cache). Without annotated video output, a node starts decoding at
+its first uncached frame, so a fully cached node doesn't decode its video at all.
+
 Optionally saves annotated video output. If an existing annotated video is found
 in the annotated_videos/ folder, new annotations are drawn on top of those frames
 (allowing layering of e.g. charuco + skeleton annotations). Otherwise, annotations
 are drawn on the source video frames.
 """
+import copy
 import csv
 import logging
 import multiprocessing
 import pickle
+from collections import ChainMap
+from collections.abc import Mapping
 from dataclasses import dataclass, replace
 from multiprocessing.sharedctypes import Synchronized
 from pathlib import Path
@@ -34,8 +48,13 @@ from freemocap.core.pipeline.abcs.source_node_abc import SourceNode
 from skellycam.core.types.type_overloads import CameraIdString
 from skellycam.core.recorders.videos.recording_info import RecordingInfo
 
+from freemocap.core.pipeline.posthoc.detection_cache import CachedDetections, DetectionCacheWriter, \
+    detection_cache_dir
 from freemocap.core.pipeline.posthoc.pipeline_phases import VideoNodePhase, PosthocPipelineType
+from freemocap.core.pipeline.posthoc.progress_coalescer import ProgressCoalescer
 from freemocap.core.pipeline.posthoc.progress_messages import VideoNodeProgressMessage, PipelineProgressMessage
+from freemocap.core.pipeline.posthoc.video_frame_threads import AnnotatedFrameWriter, FramePrefetcher
+from freemocap.core.pipeline.posthoc.video_sharding import FrameRange, seek_to_frame
 from freemocap.core.types.type_overloads import TopicPublicationQueue, PipelineIdString, \
     TopicSubscriptionQueue
 from freemocap.pubsub.pubsub_manager import PubSubTopicManager
@@ -77,12 +96,17 @@ def _is_mediapipe_config(tracker_config: TrackerConfig) -> bool:
     return False
 
 
-def _build_tracker(tracker_config: TrackerConfig) -> tuple[Tracker, object]:
+def _build_tracker(
+    tracker_config: TrackerConfig,
+    *,
+    inference_batch_size: int = 1,
+) -> tuple[Tracker, object]:
     """Build a (Tracker, session) pair from a TrackerConfig.
 
     For charuco configs, returns (Tracker, CpuSession).
     For mediapipe configs, returns (Tracker, MediaPipeSession).
-    For RTMPose/ONNX configs, returns (Tracker, OnnxSession).
+    For RTMPose/ONNX configs, returns (Tracker, OnnxSession) sized for
+    ``inference_batch_size`` images per call.
     """
     from freemocap.core.tracking.tracker_factory import (
         build_charuco_tracker,
@@ -111,7 +135,7 @@ def _build_tracker(tracker_config: TrackerConfig) -> tuple[Tracker, object]:
             if isinstance(kp_det, RTMPoseDetectorConfig):
                 model_name = kp_det.model_name
                 break
-    onnx_session = build_skeleton_onnx_session(batch_size=1, model_name=model_name)
+    onnx_session = build_skeleton_onnx_session(batch_size=inference_batch_size, model_name=model_name)
     tracker = Tracker.create(tracker_config, {"onnx": onnx_session})
     return tracker, onnx_session
 
@@ -160,6 +184,14 @@ class VideoNode(SourceNode):
     camera_id: CameraIdString
     video_path: Path
     progress_subscription: TopicSubscriptionQueue
+    frame_range: FrameRange | None = None
+
+    @property
+    def node_id(self) -> str:
+        """Camera id, plus the frame range for a shard of a video."""
+        if self.frame_range is None:
+            return self.camera_id
+        return f"{self.camera_id}:{self.frame_range.label}"
 
     @classmethod
     def create(
@@ -174,12 +206,22 @@ class VideoNode(SourceNode):
         recording_path: Path,
         pipeline_type: PosthocPipelineType,
         save_annotated_video: bool = True,
+        inference_batch_size: int = 1,
+        frame_queue_depth: int = 4,
+        frame_range: FrameRange | None = None,
+        use_detection_cache: bool = False,
         pipeline_id: PipelineIdString | None = None,
     ) -> "VideoNode":
+        if inference_batch_size < 1:
+            raise ValueError(f"inference_batch_size must be >= 1, got {inference_batch_size}")
+        if frame_queue_depth < 1:
+            raise ValueError(f"frame_queue_depth must be >= 1, got {frame_queue_depth}")
+        if frame_range is not None and save_annotated_video:
+            raise ValueError("Annotated video output is not supported for a frame-range shard")
         _progress_queue: multiprocessing.queues.Queue = multiprocessing.Queue()
         shutdown_self_flag, worker = cls._create_worker(
             target=cls._run,
-            name=f"VideoNode-{video_path.stem}",
+            name=f"VideoNode-{video_path.stem}" + (f"-{frame_range.label}" if frame_range is not None else ""),
             worker_registry=worker_registry,
             log_queue=ipc.ws_queue,
             kwargs=dict(
@@ -193,6 +235,10 @@ class VideoNode(SourceNode):
                 video_progress_pub=_progress_queue,
                 recording_path=recording_path,
                 save_annotated_video=save_annotated_video,
+                inference_batch_size=inference_batch_size,
+                frame_queue_depth=frame_queue_depth,
+                frame_range=frame_range,
+                use_detection_cache=use_detection_cache,
                 pipeline_id=pipeline_id,
                 pipeline_type=pipeline_type,
             ),
@@ -203,6 +249,7 @@ class VideoNode(SourceNode):
             shutdown_self_flag=shutdown_self_flag,
             worker=worker,
             progress_subscription=_progress_queue,
+            frame_range=frame_range,
         )
 
     @staticmethod
@@ -243,11 +290,19 @@ class VideoNode(SourceNode):
         shutdown_self_flag: Synchronized,
         recording_path: Path,
         save_annotated_video: bool,
+        inference_batch_size: int,
+        frame_queue_depth: int,
+        frame_range: FrameRange | None,
+        use_detection_cache: bool,
         pipeline_id: PipelineIdString,
         pipeline_type: PosthocPipelineType,
     ) -> None:
         node_pipeline_id = f"{pipeline_id}:{camera_id}"
-        video_progress_pub.put(VideoNodeProgressMessage(
+        if frame_range is not None:
+            node_pipeline_id += f":{frame_range.label}"
+        # One progress update per frame would flood the relay; send only the ones the UI can show.
+        progress = ProgressCoalescer(publish=video_progress_pub.put)
+        progress.put(VideoNodeProgressMessage(
             camera_id=camera_id,
             pipeline_id=node_pipeline_id,
             pipeline_type=str(pipeline_type),
@@ -257,10 +312,9 @@ class VideoNode(SourceNode):
             recording_name=recording_path.name,
             recording_path=str(recording_path),
         ))
-        tracker, session = _build_tracker(detector_config)
         tracker_state = TrackerState()
 
-        cache = _build_recording_frame_cache(
+        cache: Mapping[int, Observation] | None = _build_recording_frame_cache(
             recording_path=recording_path,
             camera_id=camera_id,
             detector_config=detector_config,
@@ -275,7 +329,44 @@ class VideoNode(SourceNode):
         if not video_reader.isOpened():
             raise RuntimeError(f"Failed to open video file: {video_path}")
         frame_count: int = int(video_reader.get(cv2.CAP_PROP_FRAME_COUNT))
-        video_progress_pub.put(VideoNodeProgressMessage(
+        first_frame_number: int = 0
+        if frame_range is not None:
+            first_frame_number = frame_range.start
+            frame_count = len(frame_range)
+        node_frames = range(first_frame_number, first_frame_number + frame_count)
+
+        cached_detections: CachedDetections | None = None
+        detection_cache_writer: DetectionCacheWriter | None = None
+        if use_detection_cache:
+            cache_dir = detection_cache_dir(
+                recording_path=recording_path,
+                camera_id=camera_id,
+                video_path=video_path,
+                detector_config=detector_config,
+            )
+            cached_detections = CachedDetections.load(cache_dir)
+            detection_cache_writer = DetectionCacheWriter(cache_dir=cache_dir)
+            n_cached = sum(frame_number in cached_detections for frame_number in node_frames)
+            if n_cached:
+                logger.info(
+                    f"VideoNode [{camera_id}]: {n_cached}/{frame_count} frames found in the "
+                    f"detection cache — only uncached frames will be detected"
+                )
+                cache = cached_detections if cache is None else ChainMap(cached_detections, cache)
+
+        first_uncached_frame = next(
+            (frame_number for frame_number in node_frames if cache is None or frame_number not in cache),
+            node_frames.stop,
+        )
+        tracker: Tracker | None = None
+        if first_uncached_frame < node_frames.stop:
+            tracker, session = _build_tracker(detector_config, inference_batch_size=inference_batch_size)
+        # Cached frames need no image unless they are drawn, so decoding can
+        # start at the first uncached frame (or be skipped entirely).
+        decode_start = first_frame_number if save_annotated_video else first_uncached_frame
+        skip_decode = decode_start >= node_frames.stop
+
+        progress.put(VideoNodeProgressMessage(
             camera_id=camera_id,
             pipeline_id=node_pipeline_id,
             pipeline_type=str(pipeline_type),
@@ -284,14 +375,16 @@ class VideoNode(SourceNode):
             detail=f"Preparing {frame_count} frames",
             recording_name=recording_path.name,
             recording_path=str(recording_path),
-        ))
+        ), force=True)
 
         annotator = None
         video_writer: cv2.VideoWriter | None = None
         base_reader: cv2.VideoCapture | None = None
         prev_annotated_path: Path | None = None
+        prefetcher: FramePrefetcher | None = None
+        frame_writer: AnnotatedFrameWriter | None = None
 
-        frame_number: int = 0
+        frame_number: int = first_frame_number
         _error_occurred = False
         try:
             if save_annotated_video:
@@ -329,6 +422,13 @@ class VideoNode(SourceNode):
                     raise RuntimeError(
                         f"Failed to create video writer for: {annotated_output_path}"
                     )
+                frame_writer = AnnotatedFrameWriter(
+                    annotator=annotator,
+                    video_writer=video_writer,
+                    base_reader=base_reader,
+                    depth=frame_queue_depth,
+                    name=video_path.stem,
+                )
 
             logger.info(
                 f"VideoNode started for {video_path.stem}"
@@ -341,56 +441,91 @@ class VideoNode(SourceNode):
                 leave=True,
                 dynamic_ncols=True,
             ) as pbar:
-                success, image = video_reader.read()
-                while success and not shutdown_self_flag.value and ipc.should_continue:
-                    observation, tracker_state = _get_observation(
-                        frame_number=frame_number,
-                        image=image,
+                # Decode runs ahead on its own thread and annotated frames are
+                # encoded on another, both through bounded queues, so neither
+                # waits on detection (see video_frame_threads).
+                if not skip_decode:
+                    seek_to_frame(
+                        video_reader,
+                        frame_number=decode_start,
+                        fps=video_reader.get(cv2.CAP_PROP_FPS),
+                    )
+                    prefetcher = FramePrefetcher(
+                        reader=video_reader,
+                        depth=frame_queue_depth,
+                        name=video_path.stem,
+                        max_frames=node_frames.stop - decode_start if frame_range is not None else None,
+                    )
+                image = prefetcher.read() if prefetcher is not None else None
+                while (
+                    (image is not None or frame_number < decode_start)
+                    and not shutdown_self_flag.value
+                    and ipc.should_continue
+                ):
+                    # Take up to inference_batch_size frames, detect them in one
+                    # call, then publish/annotate them one by one in frame order.
+                    # Frames before decode_start are cached and have no image.
+                    images = []
+                    if frame_number < decode_start:
+                        images = [None] * min(inference_batch_size, decode_start - frame_number)
+                    while image is not None and len(images) < inference_batch_size:
+                        images.append(image)
+                        image = prefetcher.read()
+                    if tracker is None and not all(
+                        frame_number + i in cache for i in range(len(images))
+                    ):
+                        # The video decoded past the frames the cache was planned for.
+                        tracker, session = _build_tracker(detector_config, inference_batch_size=inference_batch_size)
+                    observations, tracker_state = _get_observations(
+                        first_frame_number=frame_number,
+                        images=images,
                         tracker=tracker,
                         state=tracker_state,
                         cache=cache,
                     )
-                    video_output_pub.put(
-                        VideoNodeOutputMessage(
+                    for frame_image, observation in zip(images, observations):
+                        video_output_pub.put(
+                            VideoNodeOutputMessage(
+                                camera_id=camera_id,
+                                frame_number=frame_number,
+                                observation=observation,
+                            ),
+                        )
+                        if detection_cache_writer is not None and frame_number not in cached_detections:
+                            detection_cache_writer.add(frame_number=frame_number, observation=observation)
+
+                        if frame_writer is not None:
+                            frame_writer.submit(
+                                frame_number=frame_number,
+                                image=frame_image,
+                                observation=observation,
+                            )
+
+                        frame_number += 1
+                        progress.put(VideoNodeProgressMessage(
                             camera_id=camera_id,
-                            frame_number=frame_number,
-                            observation=observation,
-                        ),
-                    )
-
-                    if annotator is not None and video_writer is not None:
-                        if base_reader is not None:
-                            base_ok, base_frame = base_reader.read()
-                            if not base_ok or base_frame is None:
-                                logger.warning(
-                                    f"Previous annotated video ran out of frames at frame {frame_number} "
-                                    f"for {video_path.stem} — falling back to source frames"
-                                )
-                                base_reader.release()
-                                base_reader = None
-                                annotation_base = image
-                            else:
-                                annotation_base = base_frame
-                        else:
-                            annotation_base = image
-
-                        annotated_frame = annotator.annotate(annotation_base, observation)
-                        video_writer.write(annotated_frame)
-
-                    success, image = video_reader.read()
-                    frame_number += 1
-                    video_progress_pub.put(VideoNodeProgressMessage(
-                        camera_id=camera_id,
-                        pipeline_id=node_pipeline_id,
-                        pipeline_type=str(pipeline_type),
-                        phase=VideoNodePhase.PROCESSING_IMAGES,
-                        progress_fraction=frame_number / frame_count,
-                        detail=f"Camera {camera_id}: {frame_number}/{frame_count} frames",
-                        recording_name=recording_path.name,
-                        recording_path=str(recording_path),
-                    ))
-                    pbar.update(1)
-
+                            pipeline_id=node_pipeline_id,
+                            pipeline_type=str(pipeline_type),
+                            phase=VideoNodePhase.PROCESSING_IMAGES,
+                            progress_fraction=(frame_number - first_frame_number) / frame_count,
+                            detail=f"Camera {camera_id}: {frame_number - first_frame_number}/{frame_count} frames",
+                            recording_name=recording_path.name,
+                            recording_path=str(recording_path),
+                        ))
+                        pbar.update(1)
+
+            if frame_writer is not None:
+                frame_writer.finish()
+            if (
+                frame_range is not None
+                and frame_number != frame_range.stop
+                and not shutdown_self_flag.value
+                and ipc.should_continue
+            ):
+                raise RuntimeError(
+                    f"Shard {frame_range.label} of {video_path.stem} decoded only "
+                    f"{frame_number - frame_range.start} of {len(frame_range)} frames"
+                )
             logger.info(
                 f"VideoNode for {video_path.stem} finished reading "
                 f"{frame_number} frames"
@@ -401,22 +536,35 @@ class VideoNode(SourceNode):
                 f"Exception in VideoNode for {video_path.stem}: {e}"
             )
             _error_occurred = True
-            video_progress_pub.put(VideoNodeProgressMessage(
+            progress.put(VideoNodeProgressMessage(
                 camera_id=camera_id,
                 pipeline_id=node_pipeline_id,
                 pipeline_type=str(pipeline_type),
                 phase=VideoNodePhase.FAILED,
-                progress_fraction=frame_number / frame_count if frame_count > 0 else 0.0,
+                progress_fraction=(frame_number - first_frame_number) / frame_count if frame_count > 0 else 0.0,
                 detail=f"{type(e).__name__}: {e}",
                 recording_name=recording_path.name,
                 recording_path=str(recording_path),
             ))
             ipc.shutdown_pipeline()
         finally:
-            tracker.close()
+            if detection_cache_writer is not None:
+                try:
+                    detection_cache_writer.flush()
+                except Exception:
+                    logger.warning(
+                        f"VideoNode [{camera_id}]: failed to save detections to the cache",
+                        exc_info=True,
+                    )
+            if tracker is not None:
+                tracker.close()
+            if prefetcher is not None:
+                prefetcher.close()
             video_reader.release()
+            if frame_writer is not None:
+                frame_writer.close()
             if not _error_occurred:
-                video_progress_pub.put(VideoNodeProgressMessage(
+                progress.put(VideoNodeProgressMessage(
                     camera_id=camera_id,
                     pipeline_id=node_pipeline_id,
                     pipeline_type=str(pipeline_type),
@@ -619,9 +767,9 @@ def _get_observation(
     *,
     frame_number: int,
     image,
-    tracker: Tracker,
+    tracker: Tracker | None,
     state: TrackerState,
-    cache: dict[int, Observation] | None,
+    cache: Mapping[int, Observation] | None,
 ) -> tuple[Observation, TrackerState]:
     """Get observation for a frame — from cache if available, else detect."""
     if cache is not None and frame_number in cache:
@@ -629,3 +777,48 @@ def _get_observation(
         return observation, state
 
     return tracker.process_image(image, frame_number, state)
+
+
+def _get_observations(
+    *,
+    first_frame_number: int,
+    images: list,
+    tracker: Tracker | None,
+    state: TrackerState,
+    cache: Mapping[int, Observation] | None,
+) -> tuple[list[Observation], TrackerState]:
+    """Get observations for consecutive frames, detecting the uncached ones in one batch.
+
+    A single frame goes through ``_get_observation`` (``process_image``). For a
+    batch, every uncached frame starts from the tracker state left by the
+    previous batch — frames within one batch cannot see each other's state —
+    and the state of the last frame is carried into the next batch.
+    """
+    if len(images) == 1:
+        observation, state = _get_observation(
+            frame_number=first_frame_number,
+            image=images[0],
+            tracker=tracker,
+            state=state,
+            cache=cache,
+        )
+        return [observation], state
+
+    frame_numbers = range(first_frame_number, first_frame_number + len(images))
+    observations: list[Observation | None] = [
+        cache.get(frame_number) if cache is not None else None
+        for frame_number in frame_numbers
+    ]
+    uncached = [i for i, observation in enumerate(observations) if observation is None]
+    if not uncached:
+        return observations, state
+
+    keys = [str(frame_numbers[i]) for i in uncached]
+    batch_observations, batch_states = tracker.process_batch(
+        {key: images[i] for key, i in zip(keys, uncached)},
+        frame_numbers[uncached[0]],
+        {key: copy.deepcopy(state) for key in keys},
+    )
+    for key, i in zip(keys, uncached):
+        observations[i] = replace(batch_observations[key], frame_number=frame_numbers[i])
+    return observations, batch_states[keys[-1]]
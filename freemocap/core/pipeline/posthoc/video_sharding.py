@@ -0,0 +1,118 @@
+"""
+Frame-range sharding: several VideoNodes detecting disjoint parts of one video.
+
+One VideoNode per camera leaves most cores idle on a 2-camera recording. With
+sharding, each video is split into contiguous ``FrameRange``s and each range
+gets its own VideoNode. The nodes publish ordinary per-frame
+``VideoNodeOutputMessage``s with absolute frame numbers, so the aggregation
+node reassembles them by (frame number, camera) exactly as before.
+
+A shard starts mid-video, so it has to seek, and ``CAP_PROP_POS_FRAMES``
+seeking is not exact for every codec/container (FFmpeg seeks to a keyframe and
+some demuxers land a few frames off). ``seek_to_frame`` therefore seeks a
+warmup margin *before* the shard start, decodes forward and checks each
+decoded frame's presentation timestamp until the next frame is the first
+frame of the shard. When timestamps can't confirm the position it falls back
+to decoding from the start of the video and counting frames, which is always
+exact. Each shard also checks it decoded exactly as many frames as its range
+holds, so a short read fails loudly instead of leaving holes.
+"""
+import logging
+from dataclasses import dataclass
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# Shards shorter than this aren't worth a separate tracker/session.
+MIN_FRAMES_PER_SHARD = 150
+
+# Frames decoded (and discarded) ahead of a shard's first frame after a seek.
+SEEK_WARMUP_FRAMES = 30
+
+
+@dataclass(frozen=True)
+class FrameRange:
+    """Half-open range ``[start, stop)`` of video frame numbers."""
+
+    start: int
+    stop: int
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.start <= self.stop:
+            raise ValueError(f"Invalid frame range [{self.start}, {self.stop})")
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    @property
+    def label(self) -> str:
+        return f"{self.start}-{self.stop - 1}"
+
+
+def plan_frame_ranges(
+    *,
+    frame_count: int,
+    n_shards: int,
+    min_frames_per_shard: int = MIN_FRAMES_PER_SHARD,
+) -> list[FrameRange]:
+    """Split ``frame_count`` frames into at most ``n_shards`` contiguous, near-equal ranges.
+
+    Fewer ranges are returned when the video is too short to give each one
+    ``min_frames_per_shard`` frames.
+    """
+    if n_shards < 1:
+        raise ValueError(f"n_shards must be >= 1, got {n_shards}")
+    n_ranges = max(1, min(n_shards, frame_count // max(min_frames_per_shard, 1)))
+    bounds = [i * frame_count // n_ranges for i in range(n_ranges + 1)]
+    return [FrameRange(start=start, stop=stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def _decoded_frame_index(reader: cv2.VideoCapture, fps: float) -> int:
+    """Frame index of the last grabbed frame, from its presentation timestamp."""
+    return round(reader.get(cv2.CAP_PROP_POS_MSEC) * fps / 1000.0)
+
+
+def seek_to_frame(
+    reader: cv2.VideoCapture,
+    *,
+    frame_number: int,
+    fps: float,
+    warmup_frames: int = SEEK_WARMUP_FRAMES,
+) -> None:
+    """Position ``reader`` so that its next ``read()`` returns ``frame_number``.
+
+    Raises RuntimeError if the video has fewer than ``frame_number`` frames.
+    """
+    if frame_number <= 0:
+        return
+
+    if fps > 0:
+        seek_target = max(0, frame_number - warmup_frames)
+        if reader.set(cv2.CAP_PROP_POS_FRAMES, seek_target):
+            # Allow for the seek landing early by up to another warmup margin.
+            for _ in range(frame_number - seek_target + warmup_frames):
+                if not reader.grab():
+                    break
+                decoded = _decoded_frame_index(reader, fps)
+                if decoded == frame_number - 1:
+                    return
+                if decoded >= frame_number:
+                    break
+            logger.warning(
+                f"Seek to frame {frame_number} could not be verified from frame timestamps — "
+                f"decoding from the start of the video instead"
+            )
+
+    if not reader.set(cv2.CAP_PROP_POS_FRAMES, 0):
+        raise RuntimeError("Video reader cannot rewind to frame 0")
+    for skipped in range(frame_number):
+        if not reader.grab():
+            raise RuntimeError(
+                f"Video ended after {skipped} frames while skipping to frame {frame_number}"
+            )
+    if fps > 0 and _decoded_frame_index(reader, fps) != frame_number - 1:
+        logger.warning(
+            f"Frame timestamps disagree with the decoded frame count at frame {frame_number} — "
+            f"trusting the frame count"
+        )
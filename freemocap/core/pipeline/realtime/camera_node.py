@@ -19,6 +19,10 @@ from skellycam.core.types.type_overloads import CameraIdString, TopicSubscriptio
 from freemocap.core.pipeline.abcs.pipeline_ipc import PipelineIPC
 from freemocap.core.pipeline.abcs.source_node_abc import SourceNode
 from freemocap.core.pipeline.realtime.camera_node_config import CameraNodeConfig
+from freemocap.core.pipeline.realtime.keypoint_ring_buffer import (
+    KeypointRingBufferDTO,
+    KeypointSharedMemoryRingBuffer,
+)
 from freemocap.core.types.type_overloads import TopicPublicationQueue
 from freemocap.core.pipeline.pipeline_stage_timer import PipelineStageTimer
 from freemocap.core.pipeline.realtime.realtime_keypoint_filter import RealtimeKeypointFilter
@@ -100,6 +104,7 @@ class CameraNode(SourceNode):
             pubsub: PubSubTopicManager,
             skeleton_inference_centralized: bool = False,
             log_pipeline_times: bool = False,
+            keypoint_ring_dto: KeypointRingBufferDTO | None = None,
     ) -> "CameraNode":
         shutdown_self_flag, worker = cls._create_worker(
             target=cls._run,
@@ -113,6 +118,7 @@ class CameraNode(SourceNode):
                 camera_shm_dto=camera_shm_dto,
                 skeleton_inference_centralized=skeleton_inference_centralized,
                 log_pipeline_times=log_pipeline_times,
+                keypoint_ring_dto=keypoint_ring_dto,
                 process_frame_number_sub=pubsub.get_subscription(
                     ProcessFrameNumberTopic,
                 ),
@@ -147,6 +153,7 @@ class CameraNode(SourceNode):
             camera_shm_dto: SharedMemoryRingBufferDTO,
             skeleton_inference_centralized: bool = False,
             log_pipeline_times: bool = False,
+            keypoint_ring_dto: KeypointRingBufferDTO | None = None,
     ) -> None:
         import cv2
         from skellytracker.core.tracker.tracker_state import TrackerState
@@ -156,6 +163,9 @@ class CameraNode(SourceNode):
             dto=camera_shm_dto,
             read_only=False,
         )
+        keypoint_ring: KeypointSharedMemoryRingBuffer | None = None
+        if keypoint_ring_dto is not None:
+            keypoint_ring = KeypointSharedMemoryRingBuffer.recreate(dto=keypoint_ring_dto)
 
         charuco_tracker = None
         charuco_session = None
@@ -328,6 +338,18 @@ class CameraNode(SourceNode):
                     if timer is not None:
                         timer.record("charuco_detection", (time.perf_counter() - t0) * 1e3)
 
+                # Hand the skeleton keypoints over through shared memory when
+                # possible; the Observation itself only travels as a fallback.
+                skeleton_keypoints_slot: int | None = None
+                if keypoint_ring is not None and skeleton_observation is not None:
+                    skeleton_keypoints_slot = keypoint_ring.write_observation(
+                        frame_number=actual_frame_number,
+                        camera_id=actual_camera_id,
+                        observation=skeleton_observation,
+                    )
+                    if skeleton_keypoints_slot is not None:
+                        skeleton_observation = None
+
                 if timer is not None:
                     timer.record("total_camera_node", (time.perf_counter() - t_frame_start) * 1e3)
 
@@ -337,6 +359,7 @@ class CameraNode(SourceNode):
                         frame_number=actual_frame_number,
                         charuco_observation=charuco_observation,
                         skeleton_observation=skeleton_observation,
+                        skeleton_keypoints_slot=skeleton_keypoints_slot,
                     ),
                 )
                 if timer is not None:
@@ -355,4 +378,6 @@ class CameraNode(SourceNode):
                 charuco_tracker.close()
             if skeleton_tracker is not None:
                 skeleton_tracker.close()
+            if keypoint_ring is not None:
+                keypoint_ring.close()
             logger.debug(f"RealtimeCameraNode [{camera_id}] exiting")
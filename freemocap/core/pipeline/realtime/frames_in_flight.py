@@ -0,0 +1,82 @@
+"""
+FramesInFlight: bookkeeping for the realtime aggregator's outstanding frame requests.
+
+The aggregator requests a frame by publishing its number; every camera node
+answers with one CameraNodeOutputMessage for it. With more than one request
+outstanding, outputs for frame N+1 can land while frame N is still missing a
+camera, so outputs are keyed by frame number and only the oldest frame (the
+"head") is ever handed back for processing. That keeps published output in
+request order, and the in-flight cap bounds both memory and how stale a
+processed frame can be.
+"""
+from skellycam.core.types.type_overloads import CameraIdString
+
+from freemocap.pubsub.pubsub_topics import CameraNodeOutputMessage
+
+
+class FramesInFlight:
+    """Ordered map of requested frame number -> per-camera outputs collected so far."""
+
+    def __init__(self, *, camera_ids: list[CameraIdString], max_in_flight: int) -> None:
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be >= 1, got {max_in_flight}")
+        self._camera_ids = list(camera_ids)
+        self.max_in_flight = max_in_flight
+        # Insertion order == request order == frame order (requests only ever move forward).
+        self._outputs: dict[int, dict[CameraIdString, CameraNodeOutputMessage | None]] = {}
+        self.latest_requested_frame: int = -1
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+    def can_request(self, *, latest_shm_frame: int) -> bool:
+        """True if there is room for another request and a newer frame to request."""
+        return len(self._outputs) < self.max_in_flight and latest_shm_frame > self.latest_requested_frame
+
+    def mark_requested(self, frame_number: int) -> None:
+        if frame_number <= self.latest_requested_frame:
+            raise RuntimeError(
+                f"Frame requests must increase: requested {frame_number} after "
+                f"{self.latest_requested_frame}"
+            )
+        self._outputs[frame_number] = {cam_id: None for cam_id in self._camera_ids}
+        self.latest_requested_frame = frame_number
+
+    def add_output(self, output: CameraNodeOutputMessage) -> None:
+        """File one camera's output under its frame. Raises if that frame was never requested."""
+        if output.camera_id not in self._camera_ids:
+            raise ValueError(
+                f"Camera ID {output.camera_id} not in camera IDs {self._camera_ids}"
+            )
+        frame_outputs = self._outputs.get(output.frame_number)
+        if frame_outputs is None:
+            raise RuntimeError(
+                f"WRONG FRAME from camera {output.camera_id}: received frame "
+                f"{output.frame_number} but frames in flight are {list(self._outputs)}. "
+                f"Camera processed the wrong frame — same frame sent twice?"
+            )
+        frame_outputs[output.camera_id] = output
+
+    @property
+    def head_frame_number(self) -> int | None:
+        return next(iter(self._outputs), None)
+
+    @property
+    def head_outputs(self) -> dict[CameraIdString, CameraNodeOutputMessage | None] | None:
+        head = self.head_frame_number
+        return None if head is None else self._outputs[head]
+
+    @property
+    def head_complete(self) -> bool:
+        """True once every camera has delivered its output for the oldest frame in flight."""
+        head_outputs = self.head_outputs
+        return head_outputs is not None and all(
+            isinstance(v, CameraNodeOutputMessage) for v in head_outputs.values()
+        )
+
+    def pop_head(self) -> tuple[int, dict[CameraIdString, CameraNodeOutputMessage | None]]:
+        """Remove and return (frame_number, outputs) for the oldest frame in flight."""
+        head = self.head_frame_number
+        if head is None:
+            raise RuntimeError("No frames in flight")
+        return head, self._outputs.pop(head)
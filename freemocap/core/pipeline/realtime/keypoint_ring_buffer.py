@@ -0,0 +1,329 @@
+"""
+KeypointSharedMemoryRingBuffer: fixed-layout shared-memory transport for 2D skeleton keypoints.
+
+Camera nodes (or the centralized SkeletonInferenceNode) used to publish full
+skellytracker `Observation` objects, which get pickled into a
+multiprocessing.Queue, relayed, and unpickled again per subscriber - for
+wholebody trackers that is 133 keypoints x every camera x every frame. Like
+skellycam's `CameraSharedMemoryRingBuffer` for images, this buffer keeps the
+keypoints in one shared block so messages only carry the frame number and the
+slot index, and consumers copy out just the one cell they need.
+
+Layout of one shared block:
+
+    write_seq  int64   (n_cameras,)                      writes so far, per camera
+    header     int64   (n_slots, n_cameras, 4)           frame_number, layout_index, image_height, image_width
+    bboxes     float32 (n_slots, n_cameras, 5)           x1, y1, x2, y2, bbox_from_detector
+    keypoints  float32 (n_slots, n_cameras, max_points, 4)  x, y, z, visibility
+
+Slots are handed out per camera from its write sequence, not from the frame
+number: the aggregator requests the latest multiframe, so in-flight frame
+numbers are not consecutive, and two of them may be a multiple of `n_slots`
+apart. A camera's cell is therefore reused only after `n_slots` further writes
+from that camera.
+
+Each camera has exactly one writer, so no lock is needed. The writer marks the
+cell's frame number invalid, fills it, and only then stamps the frame number.
+Readers treat the stamp as a seqlock: check it, copy the cell, and check it
+again. A slot reused before or during the read reads as missing, never as
+wrong or torn data.
+
+Point names never cross the queue: the DTO carries a small tuple of known
+point layouts (one per supported tracker) and each cell records which one it
+holds. Observations whose names match no layout are not written - the caller
+falls back to publishing the Observation itself.
+"""
+import logging
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from numpy.typing import NDArray
+from skellycam.core.types.type_overloads import CameraIdString
+from skellytracker.core.data_primitives.observation import Observation
+
+from freemocap.core.pipeline.realtime.realtime_aggregator_node_config import MAX_FRAMES_IN_FLIGHT_LIMIT
+
+logger = logging.getLogger(__name__)
+
+# Writes a camera can make between publishing a frame's keypoints and the
+# websocket overlay reading them (FrontendPayload.from_aggregation_output). The
+# aggregator waits for the websocket consumer before its next pass, so this is
+# slack on top of the frames still in flight.
+OVERLAY_LAG_SLOTS: int = 8
+
+# Slots must outlive every frame still in flight plus the overlay consumer's lag.
+DEFAULT_KEYPOINT_RING_SLOTS: int = MAX_FRAMES_IN_FLIGHT_LIMIT + OVERLAY_LAG_SLOTS
+
+_HEADER_FIELDS: int = 4
+_BBOX_FIELDS: int = 5
+_KEYPOINT_FIELDS: int = 4
+_INVALID_FRAME: int = -1
+
+
+@dataclass(frozen=True)
+class KeypointRingBufferDTO:
+    """Everything a worker process needs to attach to an existing ring buffer."""
+    shm_name: str
+    camera_ids: tuple[CameraIdString, ...]
+    point_layouts: tuple[tuple[str, ...], ...]
+    n_slots: int
+
+
+@dataclass(slots=True, frozen=True)
+class KeypointFrameView:
+    """One camera's keypoints for one frame, copied out of shared memory."""
+    frame_number: int
+    camera_id: CameraIdString
+    point_names: tuple[str, ...]
+    xyz: NDArray[np.float32]           # (n_points, 3)
+    visibility: NDArray[np.float32]    # (n_points,)
+    image_size: tuple[int, int]        # (height, width)
+    bbox_xyxy: NDArray[np.float32]     # (4,), NaN when absent
+    bbox_from_detector: bool
+
+
+def _body_keypoints(observation: Observation):
+    """The "body" stage keypoints, or None if the observation keeps keypoints anywhere else.
+
+    The ring stores a single flat point set per camera, so observations with
+    keypoints split across several stages are left to the Observation path.
+    """
+    body_stage = observation.stages.get("body")
+    if body_stage is None or body_stage.keypoints is None:
+        return None
+    for stage_name, stage in observation.stages.items():
+        if stage_name != "body" and stage.keypoints is not None:
+            return None
+    return body_stage.keypoints
+
+
+class KeypointSharedMemoryRingBuffer:
+    def __init__(
+            self,
+            *,
+            shm: SharedMemory,
+            camera_ids: tuple[CameraIdString, ...],
+            point_layouts: tuple[tuple[str, ...], ...],
+            n_slots: int,
+            is_owner: bool,
+    ) -> None:
+        self._shm = shm
+        self.camera_ids = camera_ids
+        self.point_layouts = point_layouts
+        self.n_slots = n_slots
+        self._is_owner = is_owner
+        self._camera_index: dict[CameraIdString, int] = {cam_id: i for i, cam_id in enumerate(camera_ids)}
+        # Layout lookup keyed by the names tuple itself; a tracker hands back the
+        # same tuple object every frame, so the identity cache below makes the
+        # per-frame match free after the first one.
+        self._layout_index: dict[tuple[str, ...], int] = {names: i for i, names in enumerate(point_layouts)}
+        self._last_names: tuple[str, ...] | None = None
+        self._last_layout: int | None = None
+
+        n_cameras = len(camera_ids)
+        write_seq_shape, header_shape, bbox_shape, keypoint_shape = self._shapes(
+            n_slots=n_slots, n_cameras=n_cameras, max_points=self.max_points,
+        )
+        offset = 0
+        self._write_seq = np.ndarray(write_seq_shape, dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += self._write_seq.nbytes
+        self._header = np.ndarray(header_shape, dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += self._header.nbytes
+        self._bboxes = np.ndarray(bbox_shape, dtype=np.float32, buffer=shm.buf, offset=offset)
+        offset += self._bboxes.nbytes
+        self._keypoints = np.ndarray(keypoint_shape, dtype=np.float32, buffer=shm.buf, offset=offset)
+
+    @property
+    def max_points(self) -> int:
+        return max(len(names) for names in self.point_layouts)
+
+    @staticmethod
+    def _shapes(*, n_slots: int, n_cameras: int, max_points: int) -> tuple[tuple[int, ...], ...]:
+        return (
+            (n_cameras,),
+            (n_slots, n_cameras, _HEADER_FIELDS),
+            (n_slots, n_cameras, _BBOX_FIELDS),
+            (n_slots, n_cameras, max_points, _KEYPOINT_FIELDS),
+        )
+
+    @classmethod
+    def create(
+            cls,
+            *,
+            camera_ids: list[CameraIdString],
+            point_layouts: list[tuple[str, ...]],
+            n_slots: int = DEFAULT_KEYPOINT_RING_SLOTS,
+    ) -> "KeypointSharedMemoryRingBuffer":
+        if not camera_ids:
+            raise ValueError("KeypointSharedMemoryRingBuffer needs at least one camera")
+        if not point_layouts or not all(point_layouts):
+            raise ValueError("KeypointSharedMemoryRingBuffer needs at least one non-empty point layout")
+        if n_slots < 1:
+            raise ValueError(f"n_slots must be >= 1, got {n_slots}")
+        max_points = max(len(names) for names in point_layouts)
+        write_seq_shape, header_shape, bbox_shape, keypoint_shape = cls._shapes(
+            n_slots=n_slots, n_cameras=len(camera_ids), max_points=max_points,
+        )
+        size = (
+                int(np.prod(write_seq_shape)) * 8
+                + int(np.prod(header_shape)) * 8
+                + int(np.prod(bbox_shape)) * 4
+                + int(np.prod(keypoint_shape)) * 4
+        )
+        ring = cls(
+            shm=SharedMemory(create=True, size=size),
+            camera_ids=tuple(camera_ids),
+            point_layouts=tuple(tuple(names) for names in point_layouts),
+            n_slots=n_slots,
+            is_owner=True,
+        )
+        ring._write_seq[:] = 0
+        ring._header[..., 0] = _INVALID_FRAME
+        return ring
+
+    @classmethod
+    def recreate(cls, *, dto: KeypointRingBufferDTO) -> "KeypointSharedMemoryRingBuffer":
+        return cls(
+            shm=SharedMemory(name=dto.shm_name),
+            camera_ids=dto.camera_ids,
+            point_layouts=dto.point_layouts,
+            n_slots=dto.n_slots,
+            is_owner=False,
+        )
+
+    def to_dto(self) -> KeypointRingBufferDTO:
+        return KeypointRingBufferDTO(
+            shm_name=self._shm.name,
+            camera_ids=self.camera_ids,
+            point_layouts=self.point_layouts,
+            n_slots=self.n_slots,
+        )
+
+    def _layout_for(self, names: tuple[str, ...]) -> int | None:
+        if names is not self._last_names:
+            self._last_names = names
+            self._last_layout = self._layout_index.get(tuple(names))
+        return self._last_layout
+
+    def write_observation(
+            self,
+            *,
+            frame_number: int,
+            camera_id: CameraIdString,
+            observation: Observation,
+    ) -> int | None:
+        """Copy a skeleton Observation's body keypoints into this frame's slot.
+
+        Returns the slot index, or None if the observation could not be
+        represented (unknown camera, no body keypoints, or point names matching
+        no layout) - the caller should then send the Observation itself.
+        """
+        if camera_id not in self._camera_index:
+            return None
+        kpts = _body_keypoints(observation)
+        if kpts is None:
+            return None
+        layout_index = self._layout_for(kpts.names)
+        if layout_index is None:
+            return None
+
+        bbox_xyxy: tuple[float, float, float, float] | None = None
+        bbox_from_detector = False
+        body_stage = observation.stages["body"]
+        if body_stage.bounding_boxes:
+            bb = body_stage.bounding_boxes[0]
+            bbox_xyxy = (float(bb.x1), float(bb.y1), float(bb.x2), float(bb.y2))
+            bbox_from_detector = bool(body_stage.detector_ran)
+
+        return self.write_keypoints(
+            frame_number=frame_number,
+            camera_id=camera_id,
+            layout_index=layout_index,
+            xyz=kpts.xyz,
+            visibility=kpts.visibility,
+            image_size=(int(observation.image_size[0]), int(observation.image_size[1])),
+            bbox_xyxy=bbox_xyxy,
+            bbox_from_detector=bbox_from_detector,
+        )
+
+    def write_keypoints(
+            self,
+            *,
+            frame_number: int,
+            camera_id: CameraIdString,
+            layout_index: int,
+            xyz: NDArray[np.floating],
+            visibility: NDArray[np.floating],
+            image_size: tuple[int, int],
+            bbox_xyxy: tuple[float, float, float, float] | None = None,
+            bbox_from_detector: bool = False,
+    ) -> int:
+        """Write one camera's keypoints for `frame_number` and return the slot index."""
+        if frame_number < 0:
+            raise ValueError(f"frame_number must be >= 0, got {frame_number}")
+        cam_idx = self._camera_index[camera_id]
+        n_points = len(self.point_layouts[layout_index])
+        if xyz.shape != (n_points, 3) or visibility.shape != (n_points,):
+            raise ValueError(
+                f"Layout {layout_index} has {n_points} points, got xyz {xyz.shape} "
+                f"and visibility {visibility.shape}"
+            )
+        slot = int(self._write_seq[cam_idx] % self.n_slots)
+        self._write_seq[cam_idx] += 1
+        header = self._header[slot, cam_idx]
+        header[0] = _INVALID_FRAME
+        cell = self._keypoints[slot, cam_idx]
+        cell[:n_points, :3] = xyz
+        cell[:n_points, 3] = visibility
+        bbox = self._bboxes[slot, cam_idx]
+        bbox[:4] = bbox_xyxy if bbox_xyxy is not None else np.nan
+        bbox[4] = float(bbox_from_detector)
+        header[1] = layout_index
+        header[2] = image_size[0]
+        header[3] = image_size[1]
+        header[0] = frame_number
+        return slot
+
+    def read(
+            self,
+            *,
+            frame_number: int,
+            slot: int,
+            camera_id: CameraIdString,
+    ) -> KeypointFrameView | None:
+        """Copy of one camera's keypoints, or None if that camera wrote nothing
+        for `frame_number` (no detection, or the slot was reused before or
+        while it was being read)."""
+        cam_idx = self._camera_index.get(camera_id)
+        if cam_idx is None:
+            return None
+        header = self._header[slot, cam_idx]
+        if int(header[0]) != frame_number:
+            return None
+        layout_index, image_height, image_width = (int(value) for value in header[1:])
+        point_names = self.point_layouts[layout_index]
+        cell = self._keypoints[slot, cam_idx, :len(point_names)].copy()
+        bbox = self._bboxes[slot, cam_idx].copy()
+        if int(header[0]) != frame_number:
+            return None
+        return KeypointFrameView(
+            frame_number=frame_number,
+            camera_id=camera_id,
+            point_names=point_names,
+            xyz=cell[:, :3],
+            visibility=cell[:, 3],
+            image_size=(image_height, image_width),
+            bbox_xyxy=bbox[:4],
+            bbox_from_detector=bool(bbox[4]),
+        )
+
+    def close(self) -> None:
+        # Drop our views first; SharedMemory.close() refuses while buffers are exported.
+        self._write_seq = self._header = self._bboxes = self._keypoints = None
+        try:
+            self._shm.close()
+        except BufferError:
+            logger.debug("KeypointSharedMemoryRingBuffer closed with views still alive")
+        if self._is_owner:
+            self._shm.unlink()
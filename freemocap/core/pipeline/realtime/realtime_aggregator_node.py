@@ -8,6 +8,15 @@ Uses CalibrationStateTracker for graceful degradation: if triangulation fails
 repeatedly, the calibration is invalidated and we continue publishing 2D-only
 data until a new calibration file appears on disk.
 
+Frame requests are pipelined up to ``max_frames_in_flight`` deep (default 1,
+i.e. lockstep): per-camera outputs are keyed by frame number in
+``FramesInFlight`` and only the oldest requested frame is processed, so output
+order is preserved while camera nodes detect later frames.
+
+With the shared-memory keypoint ring enabled, skeleton keypoints arrive as a
+ring slot on each output rather than as an Observation and are triangulated
+from per-camera copies read out of the ring.
+
 Calibration hot-reload: the node polls the calibration file on disk once per
 second. If the file has changed (e.g. after posthoc calibration completes),
 the new calibration is loaded and the skeleton filter + velocity gate are reset.
@@ -55,13 +64,18 @@ from skellyforge.data_models.trajectory_3d import Point3d
 
 from freemocap.core.pipeline.abcs.aggregator_node_abc import AggregatorNode
 from freemocap.core.pipeline.abcs.pipeline_ipc import PipelineIPC
+from freemocap.core.pipeline.realtime.frames_in_flight import FramesInFlight
+from freemocap.core.pipeline.realtime.keypoint_ring_buffer import (
+    KeypointFrameView,
+    KeypointRingBufferDTO,
+    KeypointSharedMemoryRingBuffer,
+)
 from freemocap.core.pipeline.realtime.realtime_pipeline_config import RealtimePipelineConfig
 from freemocap.core.pipeline.pipeline_stage_timer import PipelineStageTimer
 from freemocap.core.pipeline.pipeline_timing_reporter import PipelineTimingReporter
 from freemocap.core.tasks.calibration.shared.calibration_state import CalibrationStateTracker
 from freemocap.core.tasks.triangulation.helpers.angulation_result import AngulationResult
-from freemocap.core.tasks.mocap.realtime_filtering.realtime_point_gate import RealtimePointGate, \
-    GateResult
+from freemocap.core.tasks.mocap.realtime_filtering.realtime_point_gate import RealtimePointGate
 from freemocap.core.tasks.mocap.realtime_filtering.realtime_filter_config import RealtimeFilterConfig
 from freemocap.core.pipeline.realtime.realtime_keypoint_filter import RealtimeKeypointFilter
 from freemocap.core.types.type_overloads import TopicPublicationQueue
@@ -83,6 +97,7 @@ from freemocap.pubsub.pubsub_topics import (
 # Cap on how many pending skeleton-inference results we hold while waiting for
 # camera-node charuco outputs to arrive. Prevents unbounded memory growth if
 # camera nodes lag (e.g. one camera unplugged). Older entries get dropped.
+# Raised to max_frames_in_flight + 1 when more frames than that are in flight.
 _MAX_PENDING_SKELETON_RESULTS: int = 2
 
 # Max time to wait for a specific frame's skeleton-inference result before
@@ -123,6 +138,31 @@ def _merge_angulation(
             into_errors[point_name] = angulation.errors_px[point_name]
 
 
+def _skeleton_keypoints_by_camera(
+        *,
+        frame_outputs: dict[CameraIdString, CameraNodeOutputMessage | None],
+        keypoint_ring: KeypointSharedMemoryRingBuffer,
+) -> dict[CameraIdString, KeypointFrameView]:
+    """Ring reads for the cameras whose skeleton keypoints came through shared
+    memory. Only views sharing one point layout are returned, since they get
+    stacked for triangulation; a slot reused before or while we read it is skipped."""
+    views: dict[CameraIdString, KeypointFrameView] = {}
+    for cam_id, output in frame_outputs.items():
+        if not isinstance(output, CameraNodeOutputMessage) or output.skeleton_keypoints_slot is None:
+            continue
+        view = keypoint_ring.read(
+            frame_number=output.frame_number,
+            slot=output.skeleton_keypoints_slot,
+            camera_id=cam_id,
+        )
+        if view is None:
+            continue
+        if views and view.point_names is not next(iter(views.values())).point_names:
+            continue
+        views[cam_id] = view
+    return views
+
+
 @dataclass
 class RealtimeAggregatorNode(AggregatorNode):
 
@@ -140,6 +180,7 @@ class RealtimeAggregatorNode(AggregatorNode):
             result_ready_event: multiprocessing.synchronize.Event,
             result_consumed_event: multiprocessing.synchronize.Event,
             skeleton_fitter_reset_sub: TopicSubscriptionQueue,
+            keypoint_ring_dto: KeypointRingBufferDTO | None = None,
     ) -> "RealtimeAggregatorNode":
         shutdown_self_flag, worker = cls._create_worker(
             target=cls._run,
@@ -152,6 +193,7 @@ class RealtimeAggregatorNode(AggregatorNode):
                 camera_ids=camera_ids,
                 ipc=ipc,
                 camera_group_shm_dto=camera_group_shm_dto,
+                keypoint_ring_dto=keypoint_ring_dto,
                 camera_node_sub=pubsub.get_subscription(
                     CameraNodeOutputTopic,
                 ),
@@ -202,6 +244,7 @@ class RealtimeAggregatorNode(AggregatorNode):
             result_ready_event: multiprocessing.synchronize.Event,
             result_consumed_event: multiprocessing.synchronize.Event,
             skeleton_fitter_reset_sub: TopicSubscriptionQueue,
+            keypoint_ring_dto: KeypointRingBufferDTO | None = None,
     ) -> None:
         logger.debug(f"RealtimeAggregationNode [{camera_group_id}] initializing")
         aggregator_config = pipeline_config.aggregator_config
@@ -209,9 +252,13 @@ class RealtimeAggregatorNode(AggregatorNode):
             shm_dto=camera_group_shm_dto,
             read_only=True,
         )
+        keypoint_ring: KeypointSharedMemoryRingBuffer | None = None
+        if keypoint_ring_dto is not None:
+            keypoint_ring = KeypointSharedMemoryRingBuffer.recreate(dto=keypoint_ring_dto)
         _configured_calib_path = aggregator_config.calibration_toml_path
         calibration = CalibrationStateTracker.create_and_try_load(
             calibration_toml_path=Path(_configured_calib_path) if _configured_calib_path else None,
+            undistortion_lookup_step_px=aggregator_config.triangulation_config.undistortion_lookup_step_px,
         )
         if calibration.is_valid:
             logger.info(
@@ -269,18 +316,20 @@ class RealtimeAggregatorNode(AggregatorNode):
             d_cutoff=filter_config.d_cutoff,
         )
 
-        camera_node_outputs: dict[CameraIdString, CameraNodeOutputMessage | None] = {
-            cam_id: None for cam_id in camera_ids
-        }
+        # Requested frames whose camera outputs are still being collected, oldest
+        # first. Only the oldest is processed, so output order matches request order.
+        frames_in_flight = FramesInFlight(
+            camera_ids=camera_ids,
+            max_in_flight=aggregator_config.max_frames_in_flight,
+        )
         # Pending skeleton inference results keyed by frame_number. Populated
         # by the centralized SkeletonInferenceNode (when GPU mode is on);
         # consumed when the matching camera outputs arrive for that frame.
-        pending_skeleton_results: dict[int, dict[CameraIdString, object | None]] = {}
+        pending_skeleton_results: dict[int, SkeletonInferenceResultMessage] = {}
         # Wall-clock time we started waiting on the currently-expected frame's
         # skeleton result; None when not waiting. Reset whenever the wait
         # resolves (found, or times out and is abandoned).
         skeleton_wait_started_at: float | None = None
-        latest_requested_frame: int = -1
         last_received_frame: int = -1
         last_calibration_poll: float = time.perf_counter()
         _empty_3d_logged: bool = False  # Rate-limit the "no 3D keypoints" warning
@@ -330,6 +379,8 @@ class RealtimeAggregatorNode(AggregatorNode):
                     pipeline_config = msg.pipeline_config
                     aggregator_config = pipeline_config.aggregator_config
                     filter_config = aggregator_config.realtime_filter_config
+                    # Shrinking only stops new requests; frames already in flight still finish.
+                    frames_in_flight.max_in_flight = aggregator_config.max_frames_in_flight
                     logger.info(
                         f"RealtimeAggregationNode [{camera_group_id}] received config update"
                     )
@@ -342,6 +393,9 @@ class RealtimeAggregatorNode(AggregatorNode):
                             f"RealtimeAggregationNode [{camera_group_id}] reloaded "
                             f"calibration from {calibration.calibration_path}"
                         )
+                    calibration.set_undistortion_lookup_step(
+                        aggregator_config.triangulation_config.undistortion_lookup_step_px
+                    )
 
                     # Rebuild biomechanics / skeleton rigidifier if the detector
                     # type changed (RTMPose <-> MediaPipe use different tracker
@@ -437,17 +491,18 @@ class RealtimeAggregatorNode(AggregatorNode):
                 current_multiframe_number = camera_group_shm.latest_multiframe_number
                 # First-frame bootstrap and fallback. Normally, subsequent frames are
                 # requested optimistically after camera collection completes (below).
-                # This block handles startup (latest_requested_frame == -1) and the
-                # rare case where the shm hadn't advanced at the optimistic-request point.
-                if (current_multiframe_number > latest_requested_frame
-                        and last_received_frame >= latest_requested_frame
-                        and result_consumed_event.is_set()):
+                # This block handles startup (nothing requested yet) and the rare case
+                # where the shm hadn't advanced at the optimistic-request point - both
+                # gated on the consumer having taken the last result. With more than one
+                # frame allowed in flight it also tops the pipeline up as the shm advances.
+                if (frames_in_flight.can_request(latest_shm_frame=current_multiframe_number)
+                        and (len(frames_in_flight) > 0 or result_consumed_event.is_set())):
                     process_frame_number_pub.put(
                         ProcessFrameNumberMessage(
                             frame_number=current_multiframe_number,
                         ),
                     )
-                    latest_requested_frame = current_multiframe_number
+                    frames_in_flight.mark_requested(current_multiframe_number)
                     t_frame_requested = time.perf_counter() if timer is not None else 0.0
 
                 # ---- Collect skeleton inference results (GPU mode) ----
@@ -458,23 +513,20 @@ class RealtimeAggregatorNode(AggregatorNode):
                         skel_msg: SkeletonInferenceResultMessage = skeleton_inference_sub.get_nowait()
                     except queue.Empty:
                         break
-                    pending_skeleton_results[skel_msg.frame_number] = skel_msg.per_camera_skeleton
+                    pending_skeleton_results[skel_msg.frame_number] = skel_msg
                 # Bound the pending dict so a lagging camera can't grow it forever.
-                if len(pending_skeleton_results) > _MAX_PENDING_SKELETON_RESULTS:
+                max_pending = max(_MAX_PENDING_SKELETON_RESULTS, frames_in_flight.max_in_flight + 1)
+                if len(pending_skeleton_results) > max_pending:
                     oldest = sorted(pending_skeleton_results.keys())[
-                             :len(pending_skeleton_results) - _MAX_PENDING_SKELETON_RESULTS]
+                             :len(pending_skeleton_results) - max_pending]
                     for k in oldest:
                         pending_skeleton_results.pop(k, None)
 
                 # ---- Collect camera node outputs ----
-                # If camera outputs are already complete (we looped back waiting
-                # for the skeleton inference result), skip collection — the
-                # existing entries are still valid and we just need the skeleton.
-                all_cam_ready = all(
-                    isinstance(v, CameraNodeOutputMessage)
-                    for v in camera_node_outputs.values()
-                )
-                if not all_cam_ready:
+                # If the oldest in-flight frame is already complete (we looped back
+                # waiting for its skeleton inference result), skip collection — its
+                # entries are still valid and we just need the skeleton.
+                if not frames_in_flight.head_complete:
                     # Block up to 5ms for the next camera output instead of
                     # busy-polling with empty() + 1ms sleep — cuts CPU waste
                     # and removes polling overhead from the critical path.
@@ -482,33 +534,24 @@ class RealtimeAggregatorNode(AggregatorNode):
                         cam_output: CameraNodeOutputMessage = camera_node_sub.get(timeout=0.005)
                     except queue.Empty:
                         continue
-                    if cam_output.camera_id not in camera_ids:
-                        raise ValueError(
-                            f"Camera ID {cam_output.camera_id} not in "
-                            f"camera IDs {list(camera_ids)}"
-                        )
-                    if cam_output.frame_number != latest_requested_frame:
-                        raise RuntimeError(
-                            f"WRONG FRAME from camera {cam_output.camera_id}: "
-                            f"received frame {cam_output.frame_number} but expected "
-                            f"{latest_requested_frame} (last_received={last_received_frame}). "
-                            f"Camera processed the wrong frame — same frame sent twice?"
-                        )
-                    camera_node_outputs[cam_output.camera_id] = cam_output
-
-                    if not all(
-                            isinstance(v, CameraNodeOutputMessage)
-                            for v in camera_node_outputs.values()
-                    ):
+                    # Outputs for later in-flight frames are filed and wait their turn.
+                    frames_in_flight.add_output(cam_output)
+                    if not frames_in_flight.head_complete:
                         continue
 
                 # ---- In GPU mode, also wait for the skeleton inference result ----
                 if (pipeline_config.use_centralized_inference
                         and pipeline_config.camera_node_config.skeleton_tracking_enabled):
-                    expected_frame = next(iter(camera_node_outputs.values())).frame_number
+                    expected_frame = frames_in_flight.head_frame_number
                     if expected_frame not in pending_skeleton_results:
                         now = time.perf_counter()
-                        if skeleton_wait_started_at is None:
+                        if any(frame > expected_frame for frame in pending_skeleton_results):
+                            # Results arrive in frame order, and the inference node
+                            # drains requests to the newest one - so with several
+                            # frames in flight, a newer result means this frame's
+                            # request was dropped. Don't wait out the timeout.
+                            skeleton_wait_started_at = None
+                        elif skeleton_wait_started_at is None:
                             skeleton_wait_started_at = now
                             continue
                         elif now - skeleton_wait_started_at > _SKELETON_RESULT_WAIT_TIMEOUT_SECONDS:
@@ -527,7 +570,7 @@ class RealtimeAggregatorNode(AggregatorNode):
                             skeleton_wait_started_at = None
                         else:
                             # Camera outputs are ready but skeleton inference hasn't
-                            # caught up yet. Loop again — `camera_node_outputs` stays
+                            # caught up yet. Loop again — the head frame's outputs stay
                             # populated, and the skeleton result will land in the
                             # `skeleton_inference_sub` drain at the top of the next
                             # iteration.
@@ -535,46 +578,36 @@ class RealtimeAggregatorNode(AggregatorNode):
                     else:
                         # Splice the per-camera skeletons into each CameraNodeOutputMessage
                         # so downstream triangulation code (which reads
-                        # `output.skeleton_observation`) needs no changes.
-                        skeleton_per_camera = pending_skeleton_results.pop(expected_frame)
-                        for cam_id, output_msg in camera_node_outputs.items():
+                        # `output.skeleton_observation` / `skeleton_keypoints_slot`)
+                        # needs no changes.
+                        skeleton_result = pending_skeleton_results.pop(expected_frame)
+                        for cam_id, output_msg in frames_in_flight.head_outputs.items():
                             if output_msg is not None:
-                                output_msg.skeleton_observation = skeleton_per_camera.get(cam_id)
+                                output_msg.skeleton_observation = skeleton_result.per_camera_skeleton.get(cam_id)
+                                if cam_id not in skeleton_result.per_camera_skeleton:
+                                    output_msg.skeleton_keypoints_slot = skeleton_result.keypoints_slot
                         skeleton_wait_started_at = None
 
-                frame_numbers = [
-                    msg.frame_number
-                    for msg in camera_node_outputs.values()
-                    if isinstance(msg, CameraNodeOutputMessage)
-                ]
-                if len(set(frame_numbers)) > 1:
-                    logger.warning(
-                        f"Frame number mismatch across cameras: {frame_numbers} "
-                        f"(expected {latest_requested_frame})"
-                    )
-
-                last_received_frame = latest_requested_frame
+                last_received_frame, frame_n_outputs = frames_in_flight.pop_head()
                 t_frame_start = time.perf_counter() if timer is not None else 0.0
                 if timer is not None and recorded_first_frame:
                     timer.record("frame_collection_wait", (t_frame_start - t_frame_requested) * 1e3)
 
                 # ---- Optimistically request next frame before aggregating ----
-                # result_consumed_event is guaranteed set at this point: we checked it
-                # before requesting this frame and haven't published a result yet.
+                # Not gated on result_consumed_event: the bootstrap request was, and
+                # the in-flight cap bounds how far ahead of the consumer we can get.
                 # Camera nodes start detecting frame N+1 while we triangulate/filter N.
-                frame_n_outputs = camera_node_outputs
-                camera_node_outputs = {cam_id: None for cam_id in camera_ids}
                 latest_shm_frame = camera_group_shm.latest_multiframe_number
-                if latest_shm_frame > latest_requested_frame:
+                if frames_in_flight.can_request(latest_shm_frame=latest_shm_frame):
                     process_frame_number_pub.put(
                         ProcessFrameNumberMessage(frame_number=latest_shm_frame)
                     )
-                    latest_requested_frame = latest_shm_frame
+                    frames_in_flight.mark_requested(latest_shm_frame)
                     t_frame_requested = time.perf_counter() if timer is not None else 0.0
-                elif latest_shm_frame < latest_requested_frame:
+                elif latest_shm_frame < frames_in_flight.latest_requested_frame:
                     raise RuntimeError(
                         f"SHM frame counter went backwards: latest_shm_frame={latest_shm_frame} "
-                        f"< latest_requested_frame={latest_requested_frame}. "
+                        f"< latest_requested_frame={frames_in_flight.latest_requested_frame}. "
                         f"Ring buffer should be monotonically increasing."
                     )
 
@@ -592,14 +625,45 @@ class RealtimeAggregatorNode(AggregatorNode):
                 body_kinematics = None
                 rigid_result: RigidifyResult | None = None
                 if (calibration.is_valid or len(camera_ids) == 1) and aggregator_config.triangulation_enabled:
-                    # Triangulate mediapipe observations
+                    # Triangulate skeleton keypoints: straight from the shared-memory
+                    # ring when they came that way, else from the Observations.
+                    skeleton_keypoints_by_camera: dict[CameraIdString, KeypointFrameView] = (
+                        _skeleton_keypoints_by_camera(
+                            frame_outputs=frame_n_outputs,
+                            keypoint_ring=keypoint_ring,
+                        )
+                        if keypoint_ring is not None
+                        else {}
+                    )
                     skeleton_observations_by_camera = {
                         cam_id: output.skeleton_observation
                         for cam_id, output in frame_n_outputs.items()
                         if isinstance(output, CameraNodeOutputMessage)
                            and output.skeleton_observation is not None
                     }
-                    if skeleton_observations_by_camera:
+                    if skeleton_keypoints_by_camera:
+                        t0 = time.perf_counter() if timer is not None else 0.0
+                        _merge_angulation(
+                            angulation=calibration.try_angulate_keypoints(
+                                frame_number=last_received_frame,
+                                keypoints_2d_by_camera={
+                                    cam_id: view.xyz[:, :2]
+                                    for cam_id, view in skeleton_keypoints_by_camera.items()
+                                },
+                                point_names=next(iter(skeleton_keypoints_by_camera.values())).point_names,
+                                image_size_by_camera={
+                                    cam_id: view.image_size
+                                    for cam_id, view in skeleton_keypoints_by_camera.items()
+                                },
+                                max_reprojection_error_px=filter_config.max_reprojection_error_px,
+                                triangulation_config=aggregator_config.triangulation_config,
+                            ),
+                            into_points=raw_keypoints,
+                            into_errors=raw_errors_px,
+                        )
+                        if timer is not None:
+                            timer.record("skeleton_triangulation", (time.perf_counter() - t0) * 1e3)
+                    elif skeleton_observations_by_camera:
                         t0 = time.perf_counter() if timer is not None else 0.0
                         _merge_angulation(
                             angulation=calibration.try_angulate(
@@ -636,11 +700,12 @@ class RealtimeAggregatorNode(AggregatorNode):
                         if timer is not None:
                             timer.record("charuco_triangulation", (time.perf_counter() - t0) * 1e3)
 
-                    if not raw_keypoints and skeleton_observations_by_camera and not _empty_3d_logged:
+                    n_skeleton_cameras = len(skeleton_keypoints_by_camera) or len(skeleton_observations_by_camera)
+                    if not raw_keypoints and n_skeleton_cameras and not _empty_3d_logged:
                         _empty_3d_logged = True
                         logger.warning(
                             f"RealtimeAggregationNode [{camera_group_id}]: "
-                            f"skeleton observations received from {len(skeleton_observations_by_camera)} camera(s) "
+                            f"skeleton observations received from {n_skeleton_cameras} camera(s) "
                             f"but triangulation produced zero 3D keypoints. "
                             f"Check backend logs for 'no keypoints visible in ≥2 cameras' or reprojection error warnings. "
                             f"Calibration path: {calibration.calibration_path}"
@@ -668,13 +733,16 @@ class RealtimeAggregatorNode(AggregatorNode):
                     if aggregator_config.filter_enabled:
                         if raw_keypoints:
                             t0 = time.perf_counter() if timer is not None else 0.0
-                            gate_result: GateResult = point_gate.gate(
+                            gate_positions, gate_present = point_gate.pack(raw_keypoints)
+                            gate_result = point_gate.gate_array(
                                 t=frame_time,
-                                points=raw_keypoints,
+                                positions=gate_positions,
+                                present=gate_present,
                             )
-                            for point_name, coords in gate_result.positions.items():
-                                if not np.any(np.isnan(coords)):
-                                    filtered_keypoints[point_name] = coords
+                            gated_rows = np.flatnonzero(np.isfinite(gate_result.positions).all(axis=1))
+                            point_names = point_gate.point_names
+                            for row in gated_rows.tolist():
+                                filtered_keypoints[point_names[row]] = gate_result.positions[row]
                             if timer is not None:
                                 timer.record("velocity_gate", (time.perf_counter() - t0) * 1e3)
 
@@ -834,4 +902,6 @@ class RealtimeAggregatorNode(AggregatorNode):
                 timing_reporter_stop.set()
             if timing_reporter is not None:
                 timing_reporter.join(timeout=2.0)
+            if keypoint_ring is not None:
+                keypoint_ring.close()
             logger.debug(f"RealtimeAggregationNode [{camera_group_id}] exiting")
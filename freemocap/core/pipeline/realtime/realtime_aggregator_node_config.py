@@ -4,6 +4,11 @@ from freemocap.core.tasks.mocap.realtime_filtering.realtime_filter_config import
 from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
 
 
+# Upper bound on `max_frames_in_flight`. The shared-memory keypoint ring is sized
+# from it, since the setting can be raised by a config update after the ring exists.
+MAX_FRAMES_IN_FLIGHT_LIMIT: int = 8
+
+
 class RealtimeAggregatorNodeConfig(BaseModel):
     calibration_toml_path: str | None = Field(
         default=None,
@@ -17,6 +22,11 @@ class RealtimeAggregatorNodeConfig(BaseModel):
     # from the raw triangulated keypoints over a rolling window and logs a WARNING
     # when the reconstruction drifts from human anthropometric proportions.
     body_proportion_diagnostics_enabled: bool = True
+    # Frame requests the aggregator keeps outstanding. 1 = lockstep: frame N+1 is
+    # requested once N's camera outputs are in, so only detection of N+1 overlaps
+    # aggregation of N. >1 lets camera nodes run further ahead; output order is
+    # preserved and a published frame is at most this many requests stale.
+    max_frames_in_flight: int = Field(default=1, ge=1, le=MAX_FRAMES_IN_FLIGHT_LIMIT)
 
     realtime_filter_config: RealtimeFilterConfig = Field(default_factory=RealtimeFilterConfig)
     triangulation_config: TriangulationConfig = Field(default_factory=TriangulationConfig)
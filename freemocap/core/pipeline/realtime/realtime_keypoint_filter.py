@@ -11,14 +11,22 @@ call reports which keypoints were predicted this frame so downstream consumers
 
 Works on ``dict[str, ndarray(dims,)]`` — set ``dims=2`` for pixel-space
 (camera node) or ``dims=3`` for world-space (aggregator).
+
+Two interchangeable backends give the same output:
+  - "vectorized" (default): one ``OneEuroFilterBank`` row per keypoint, so a
+    frame is a few numpy ops regardless of skeleton size.
+  - "scalar": a tuple of ``OneEuroFilter1D`` per keypoint, stepped from
+    Python (~400 method calls per frame for a wholebody skeleton).
 """
 
 import logging
 from dataclasses import dataclass, field
+from typing import Literal
 
 import numpy as np
 
 from freemocap.core.tasks.mocap.realtime_filtering.one_euro_filter import OneEuroFilter1D
+from freemocap.core.tasks.mocap.realtime_filtering.one_euro_filter_bank import OneEuroFilterBank
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +52,8 @@ class RealtimeKeypointFilter:
     """One Euro filter applied per-keypoint with velocity-decay gap filling.
 
     Works with 2D (pixel) or 3D (world) keypoints via the ``dims`` parameter.
-    Each dimension gets an independent ``OneEuroFilter1D`` instance.
+    Each dimension is filtered independently, either as a column of a
+    ``OneEuroFilterBank`` or as its own ``OneEuroFilter1D`` (see ``backend``).
     """
 
     # Number of spatial dimensions (2 = pixel, 3 = world).
@@ -60,12 +69,30 @@ class RealtimeKeypointFilter:
     max_prediction_frames: int = 3
     prediction_velocity_decay: float = 0.5
 
-    # Per-keypoint state: each value is a tuple of ``dims`` OneEuroFilter1D
+    backend: Literal["vectorized", "scalar"] = "vectorized"
+
+    # "scalar" state: each value is a tuple of ``dims`` OneEuroFilter1D
     # instances, one per spatial axis.
     _filters: dict[str, tuple[OneEuroFilter1D, ...]] = field(default_factory=dict, init=False, repr=False)
     _prediction_counts: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    # "vectorized" state: keypoint name -> bank row, rows in first-seen order.
+    _bank: OneEuroFilterBank = field(init=False, repr=False)
+    _rows: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _row_names: list[str] = field(default_factory=list, init=False, repr=False)
+    _row_prediction_counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64), init=False, repr=False)
     _last_t: float | None = field(default=None, init=False, repr=False)
 
+    def __post_init__(self) -> None:
+        if self.backend not in ("vectorized", "scalar"):
+            raise ValueError(f"Unknown RealtimeKeypointFilter backend: {self.backend!r}")
+        self._bank = OneEuroFilterBank(
+            n_points=0,
+            dims=self.dims,
+            min_cutoff=self.min_cutoff,
+            beta=self.beta,
+            d_cutoff=self.d_cutoff,
+        )
+
     # ------------------------------------------------------------------
     def filter(
         self, *, t: float, raw_keypoints: dict[str, np.ndarray],
@@ -91,6 +118,13 @@ class RealtimeKeypointFilter:
             return FilteredKeypoints(positions=raw_keypoints, predicted_names=frozenset())
         self._last_t = t
 
+        if self.backend == "vectorized":
+            return self._filter_vectorized(t=t, raw_keypoints=raw_keypoints)
+        return self._filter_scalar(t=t, raw_keypoints=raw_keypoints)
+
+    def _filter_scalar(
+        self, *, t: float, raw_keypoints: dict[str, np.ndarray],
+    ) -> FilteredKeypoints:
         result: dict[str, np.ndarray] = {}
 
         # Process keypoints present this frame.
@@ -131,8 +165,52 @@ class RealtimeKeypointFilter:
 
         return FilteredKeypoints(positions=result, predicted_names=frozenset(predicted))
 
+    def _filter_vectorized(
+        self, *, t: float, raw_keypoints: dict[str, np.ndarray],
+    ) -> FilteredKeypoints:
+        new_names = [name for name in raw_keypoints if name not in self._rows]
+        if new_names:
+            first_row = self._bank.add_points(len(new_names))
+            for offset, name in enumerate(new_names):
+                self._rows[name] = first_row + offset
+                self._row_names.append(name)
+            self._row_prediction_counts = np.concatenate(
+                [self._row_prediction_counts, np.zeros(len(new_names), dtype=np.int64)]
+            )
+
+        n_rows = self._bank.n_points
+        observed_rows = np.fromiter(
+            (self._rows[name] for name in raw_keypoints), dtype=np.intp, count=len(raw_keypoints),
+        )
+        observed = np.zeros(n_rows, dtype=bool)
+        observed[observed_rows] = True
+        x = np.full((n_rows, self.dims), np.nan)
+        if raw_keypoints:
+            x[observed_rows] = np.stack(list(raw_keypoints.values()))
+
+        filtered = self._bank(t=t, x=x, observed=observed)
+        self._row_prediction_counts[observed] = 0
+
+        # Predict keypoints absent this frame (gap filling).
+        gap = self._bank.initialized & ~observed & (self._row_prediction_counts < self.max_prediction_frames)
+        predicted_xyz = self._bank.predict(t=t, mask=gap, velocity_decay=self.prediction_velocity_decay)
+        self._row_prediction_counts[gap] += 1
+
+        result: dict[str, np.ndarray] = {
+            name: filtered[row] for name, row in zip(raw_keypoints, observed_rows.tolist())
+        }
+        predicted: set[str] = set()
+        for row in np.flatnonzero(gap).tolist():
+            name = self._row_names[row]
+            result[name] = predicted_xyz[row]
+            predicted.add(name)
+
+        return FilteredKeypoints(positions=result, predicted_names=frozenset(predicted))
+
     def reset(self) -> None:
         """Clear all filter state (call on calibration / coordinate change)."""
         self._filters.clear()
         self._prediction_counts.clear()
+        self._bank.reset()
+        self._row_prediction_counts[:] = 0
         self._last_t = None
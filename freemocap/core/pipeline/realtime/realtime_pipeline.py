@@ -26,6 +26,7 @@ from skellycam.core.types.type_overloads import CameraIdString, CameraGroupIdStr
 
 from freemocap.core.pipeline.abcs.pipeline_ipc import PipelineIPC
 from freemocap.core.pipeline.realtime.camera_node import CameraNode
+from freemocap.core.pipeline.realtime.keypoint_ring_buffer import KeypointSharedMemoryRingBuffer
 from freemocap.core.pipeline.realtime.realtime_aggregator_node import RealtimeAggregatorNode
 from freemocap.core.pipeline.realtime.realtime_pipeline_config import RealtimePipelineConfig
 from freemocap.core.pipeline.realtime.charuco_recorder_node import CharucoRecorderNode
@@ -71,6 +72,9 @@ class RealtimePipeline:
     ipc: PipelineIPC
     pubsub: PubSubTopicManager
     worker_registry: WorkerRegistry
+    # Shared-memory transport for skeleton keypoints (None when disabled). Owned
+    # here; nodes attach by DTO, and overlays are read back from it on this side.
+    keypoint_ring: KeypointSharedMemoryRingBuffer | None = None
     started: bool = False
     # Config stashed while a calibration recording temporarily forces Charuco-only
     # mode (skeleton inference paused). None whenever not in that mode.
@@ -137,6 +141,19 @@ class RealtimePipeline:
             else list(camera_group.configs.keys())
         )
 
+        keypoint_ring: KeypointSharedMemoryRingBuffer | None = None
+        if pipeline_config.shared_memory_keypoints:
+            # Every camera in the group, not just the realtime subset: a restarted
+            # SkeletonInferenceNode serves the whole group.
+            keypoint_ring = KeypointSharedMemoryRingBuffer.create(
+                camera_ids=list(camera_group.configs.keys()),
+                point_layouts=[
+                    RTMPOSE_WHOLEBODY_DEFINITION.tracked_points,
+                    MEDIAPIPE_WHOLEBODY_DEFINITION.tracked_points,
+                ],
+            )
+        keypoint_ring_dto = keypoint_ring.to_dto() if keypoint_ring is not None else None
+
         camera_nodes = {
             camera_id: CameraNode.create(
                 camera_id=camera_id,
@@ -149,6 +166,7 @@ class RealtimePipeline:
                     pipeline_config.use_centralized_inference
                 ),
                 log_pipeline_times=pipeline_config.log_pipeline_times,
+                keypoint_ring_dto=keypoint_ring_dto,
             )
             for camera_id in pipeline_camera_ids
         }
@@ -164,6 +182,7 @@ class RealtimePipeline:
                 config=pipeline_config,
                 ipc=ipc,
                 pubsub=pubsub,
+                keypoint_ring_dto=keypoint_ring_dto,
             )
 
         # Create CharucoRecorderNode if charuco tracking is enabled.
@@ -205,6 +224,7 @@ class RealtimePipeline:
             result_ready_event=result_ready_event,
             result_consumed_event=result_consumed_event,
             skeleton_fitter_reset_sub=skeleton_fitter_reset_sub,
+            keypoint_ring_dto=keypoint_ring_dto,
         )
 
         aggregation_output_subscription = pubsub.get_subscription(
@@ -225,6 +245,7 @@ class RealtimePipeline:
             ipc=ipc,
             pubsub=pubsub,
             worker_registry=worker_registry,
+            keypoint_ring=keypoint_ring,
         )
 
     def start(self) -> None:
@@ -293,6 +314,9 @@ class RealtimePipeline:
             self.aggregation_node.shutdown()
 
         self.pubsub.close()
+        if self.keypoint_ring is not None:
+            self.keypoint_ring.close()
+            self.keypoint_ring = None
         logger.debug(f"RealtimePipeline [{self.id}] shut down")
 
     def update_config(self, new_config: RealtimePipelineConfig) -> None:
@@ -337,6 +361,7 @@ class RealtimePipeline:
                 config=new_config,
                 ipc=self.ipc,
                 pubsub=self.pubsub,
+                keypoint_ring_dto=self.keypoint_ring.to_dto() if self.keypoint_ring is not None else None,
             )
             self.skeleton_inference_node.start()
 
@@ -364,6 +389,7 @@ class RealtimePipeline:
                 config=new_config,
                 ipc=self.ipc,
                 pubsub=self.pubsub,
+                keypoint_ring_dto=self.keypoint_ring.to_dto() if self.keypoint_ring is not None else None,
             )
             self.skeleton_inference_node.start()
 
@@ -506,7 +532,10 @@ class RealtimePipeline:
             return FrontendImagePacket(
                 images_bytearray=frames_bytearray,
                 multiframe_timestamp=mf_timestamp,
-                frontend_payload=FrontendPayload.from_aggregation_output(aggregation_output),
+                frontend_payload=FrontendPayload.from_aggregation_output(
+                    aggregation_output,
+                    keypoint_ring=self.keypoint_ring,
+                ),
                 keypoints_binary_payload=keypoints_binary_payload,
             )
         return None
@@ -20,6 +20,10 @@ class RealtimePipelineConfig(BaseModel):
     # reads all camera ring buffers directly and dispatches inference via process_batch.
     # When False, each camera node runs its own tracker inline (legacy per-process path).
     use_centralized_inference: bool = True
+    # When True, skeleton keypoints travel through a shared-memory ring buffer and
+    # node output messages carry only a slot index instead of pickled Observations.
+    # Fixed when the pipeline is created; a config update does not toggle it.
+    shared_memory_keypoints: bool = True
     log_pipeline_times: bool = True
 
     skeleton_inference_node_config: RealtimeSkeletonInferenceNodeConfig = Field(
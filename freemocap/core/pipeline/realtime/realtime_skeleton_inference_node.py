@@ -19,7 +19,9 @@ Topology:
   - Subscribes to ProcessFrameNumberTopic (same trigger the camera nodes use).
   - Reads frame N's image directly from each camera's shared-memory ring buffer.
   - Calls tracker.process_batch(images_dict, ...) — one call for all cameras.
-  - Publishes a SkeletonInferenceResultMessage per frame with per-camera Observations.
+  - Publishes a SkeletonInferenceResultMessage per frame with per-camera Observations,
+    or, with the shared-memory keypoint ring enabled, writes the keypoints there and
+    publishes only the ring slot.
   - The aggregator merges this with per-camera CameraNodeOutputMessage (charuco only
     in centralized mode) by frame_number.
 
@@ -59,6 +61,10 @@ from skellytracker.core.sessions.onnx_session import OnnxSession
 
 from freemocap.core.pipeline.abcs.pipeline_ipc import PipelineIPC
 from freemocap.core.pipeline.abcs.source_node_abc import SourceNode
+from freemocap.core.pipeline.realtime.keypoint_ring_buffer import (
+    KeypointRingBufferDTO,
+    KeypointSharedMemoryRingBuffer,
+)
 from freemocap.core.pipeline.realtime.realtime_pipeline_config import RealtimePipelineConfig
 from freemocap.core.pipeline.pipeline_stage_timer import PipelineStageTimer
 from freemocap.core.types.type_overloads import TopicPublicationQueue
@@ -91,6 +97,7 @@ class RealtimeSkeletonInferenceNode(SourceNode):
             config: RealtimePipelineConfig,
             ipc: PipelineIPC,
             pubsub: PubSubTopicManager,
+            keypoint_ring_dto: KeypointRingBufferDTO | None = None,
     ) -> "RealtimeSkeletonInferenceNode":
         shutdown_self_flag, worker = cls._create_worker(
             target=cls._run,
@@ -103,6 +110,7 @@ class RealtimeSkeletonInferenceNode(SourceNode):
                 pipeline_config=config,
                 ipc=ipc,
                 camera_group_shm_dto=camera_group_shm_dto,
+                keypoint_ring_dto=keypoint_ring_dto,
                 process_frame_number_sub=pubsub.get_subscription(ProcessFrameNumberTopic),
                 pipeline_config_sub=pubsub.get_subscription(PipelineConfigUpdateTopic),
                 skeleton_result_pub=pubsub.get_publication_queue(SkeletonInferenceResultTopic),
@@ -127,6 +135,7 @@ class RealtimeSkeletonInferenceNode(SourceNode):
             pipeline_config_sub: TopicSubscriptionQueue,
             skeleton_result_pub: TopicPublicationQueue,
             timing_pub: TopicPublicationQueue,
+            keypoint_ring_dto: KeypointRingBufferDTO | None = None,
     ) -> None:
         logger.debug(f"RealtimeSkeletonInferenceNode [{camera_group_id}] initializing")
 
@@ -141,6 +150,9 @@ class RealtimeSkeletonInferenceNode(SourceNode):
             )
             for camera_id in camera_ids
         }
+        keypoint_ring: KeypointSharedMemoryRingBuffer | None = None
+        if keypoint_ring_dto is not None:
+            keypoint_ring = KeypointSharedMemoryRingBuffer.recreate(dto=keypoint_ring_dto)
 
         tracker, session = _build_session_and_tracker(pipeline_config, num_cameras=len(camera_ids))
         if tracker is None:
@@ -284,6 +296,7 @@ class RealtimeSkeletonInferenceNode(SourceNode):
                 # ---- Apply confidence gating per camera ----
                 conf_threshold = pipeline_config.camera_node_config.confidence_threshold
                 per_camera_skeleton: dict[CameraIdString, Observation | None] = {}
+                keypoints_slot: int | None = None
                 for camera_id, obs in observations.items():
                     body_stage = obs.stages.get("body")
                     if body_stage is not None and body_stage.keypoints is not None:
@@ -291,16 +304,29 @@ class RealtimeSkeletonInferenceNode(SourceNode):
                         low_conf = kpts.visibility < conf_threshold
                         if low_conf.any():
                             kpts.xyz[low_conf, :2] = np.nan
+                    # Cameras written to the shared-memory ring are read back by
+                    # slot; only the ones it can't represent ship the Observation.
+                    if keypoint_ring is not None:
+                        slot = keypoint_ring.write_observation(
+                            frame_number=requested_frame_number,
+                            camera_id=camera_id,
+                            observation=obs,
+                        )
+                        if slot is not None:
+                            keypoints_slot = slot
+                            continue
                     per_camera_skeleton[camera_id] = obs
 
                 # Cameras whose frame we couldn't read get None.
                 for camera_id in camera_ids:
-                    per_camera_skeleton.setdefault(camera_id, None)
+                    if camera_id not in observations:
+                        per_camera_skeleton.setdefault(camera_id, None)
 
                 skeleton_result_pub.put(
                     SkeletonInferenceResultMessage(
                         frame_number=requested_frame_number,
                         per_camera_skeleton=per_camera_skeleton,
+                        keypoints_slot=keypoints_slot,
                     ),
                 )
                 if timer is not None:
@@ -319,6 +345,8 @@ class RealtimeSkeletonInferenceNode(SourceNode):
         finally:
             if tracker is not None:
                 tracker.close()
+            if keypoint_ring is not None:
+                keypoint_ring.close()
             logger.debug(f"RealtimeSkeletonInferenceNode [{camera_group_id}] exiting")
 
 
@@ -1,21 +1,22 @@
 """Bundle-adjustment solver operating directly on list[CameraModel].
 
-Free-function port of what was AniposeCameraGroup. The optimizer mutates
-the supplied cameras list in place: each iteration replaces extrinsics
-and overwrites intrinsics fields per `camera_model_solver_ops`.
+Free-function port of what was AniposeCameraGroup. The optimizer works on
+a packed parameter vector; once scipy returns, the supplied cameras are
+updated in place per `camera_model_solver_ops`.
 """
 from __future__ import annotations
 
 import logging
 import multiprocessing.synchronize  # noqa: TC003
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Literal
 
 import cv2
 import numpy as np
 from freemocap.core.tasks.calibration.shared.transform_math import build_transformation_matrix, get_rtvec
 from numpy.typing import NDArray  # noqa: TC002
 from scipy import optimize
-from scipy.sparse import dok_matrix
+from scipy.sparse import csr_matrix, dok_matrix
 from skellycam.core.types.type_overloads import CameraIdString
 
 from freemocap.core.tasks.calibration.charuco_board import charuco_board_ops
@@ -35,9 +36,8 @@ from freemocap.core.tasks.calibration.anipose_calibration.helpers.freemocap_anip
     remap_ids,
     resample_points,
     subset_extra,
-    transform_points, BoardObservations,
+    BoardObservations,
 )
-from freemocap.core.tasks.calibration.shared.camera_extrinsics import CameraExtrinsics
 from freemocap.core.tasks.calibration.shared.camera_model import CameraModel  # noqa: TC001
 from skellytracker.core.detectors.keypoint_detectors.charuco import CharucoBoardDefinition  # noqa: TC002
 
@@ -262,8 +262,13 @@ def bundle_adjust(
         ftol: float = 1e-4,
         max_nfev: int = 1000,
         start_params: NDArray[np.float64] | None = None,
+        jacobian: Literal["analytic", "numeric"] = "analytic",
 ) -> float:
-    """Single scipy.least_squares bundle-adjust pass; mutates cameras in place."""
+    """Single scipy.least_squares bundle-adjust pass; mutates cameras in place.
+
+    ``jacobian="numeric"`` falls back to scipy's sparse finite differences
+    over `_jac_sparsity_bundle`; "analytic" passes `_jac_bundle` as ``jac=``.
+    """
     if points_2d.shape[0] != len(cameras):
         raise ValueError(
             f"First dim should equal number of cameras ({len(cameras)}), "
@@ -279,11 +284,13 @@ def bundle_adjust(
         num_camera_params = PARAMS_PER_CAMERA
 
     jac_sparse = _jac_sparsity_bundle(cameras, points_2d, num_camera_params, board_observations)
+    layout = _BundleLayout.build(cameras, points_2d, num_camera_params, board_observations, jac_sparse)
 
     opt = optimize.least_squares(
         _error_fun_bundle,
         x0,
-        jac_sparsity=jac_sparse,
+        jac=_jac_bundle if jacobian == "analytic" else "2-point",
+        jac_sparsity=jac_sparse if jacobian == "numeric" else None,
         f_scale=threshold,
         x_scale="jac",
         loss=loss,
@@ -292,7 +299,7 @@ def bundle_adjust(
         tr_solver="lsmr",
         verbose=2,
         max_nfev=max_nfev,
-        args=(cameras, points_2d, num_camera_params, board_observations),
+        args=(layout,),
     )
 
     for camera_index, cam in enumerate(cameras):
@@ -303,93 +310,248 @@ def bundle_adjust(
     return average_error(cameras, points_2d)
 
 
-def _error_fun_bundle(
-        params: NDArray[np.float64],
-        cameras: list[CameraModel],
-        points_2d: NDArray[np.float64],
-        num_camera_params: int,
-        board_observations: BoardObservations,
-) -> NDArray[np.float64]:
-    """Residual function for scipy.least_squares bundle adjustment.
+@dataclass
+class _BundleLayout:
+    """Fixed index structure of one bundle-adjust problem.
 
-    Previously decorated with ``@jit(parallel=True, forceobj=True)`` which
-    forced Numba into *object mode* — it cannot compile functions that
-    mutate Python objects (CameraModel) or call arbitrary Python functions
-    (reprojection_error → Triangulator).  Object-mode Numba provides zero
-    speed benefit and emitted a type-inference warning on every run.
-
-    Instead, we now inline the two hot-path operations:
-
-    1. **apply_camera_params** — directly set camera attributes from the
-       param slice, avoiding the function-call / object-construction
-       overhead of ``CameraExtrinsics.from_rodrigues`` inside the old
-       helper.
-    2. **reprojection_error** — directly call ``cv2.projectPoints`` per
-       camera instead of building a full ``Triangulator`` object on every
-       solver iteration.
+    Built once per `bundle_adjust` call so the residual and Jacobian work on
+    the packed parameter vector alone: no CameraModel is touched while
+    scipy iterates. Observations are stored per (camera, point) pair that
+    has at least one finite coordinate; ``coordinate_mask`` selects the
+    finite coordinates, which gives the same residual order as
+    ``(points_2d - projected)[~np.isnan(points_2d)]``.
     """
-    good = ~np.isnan(points_2d)
-    num_cameras = len(cameras)
-    num_points = points_2d.shape[1]
 
-    # -- Inline apply_camera_params: mutate cameras directly from params --
-    for camera_index in range(num_cameras):
-        param_start = camera_index * num_camera_params
-        p = params[param_start: param_start + num_camera_params]
-        cam = cameras[camera_index]
-        focal = float(p[6])
-        cam.intrinsics.fx = focal
-        cam.intrinsics.fy = focal
-        cam.intrinsics.k1 = float(p[7])
-        cam.intrinsics.k2 = 0.0
-        cam.intrinsics.p1 = 0.0
-        cam.intrinsics.p2 = 0.0
-        cam.extrinsics = CameraExtrinsics.from_rodrigues(
-            rvec=np.asarray(p[0:3], dtype=np.float64),
-            tvec=np.asarray(p[3:6], dtype=np.float64),
+    num_cameras: int
+    num_points: int
+    num_boards: int
+    principal_points: NDArray[np.float64]  # (num_cameras, 2), held fixed
+    pair_cameras: NDArray[np.int64]
+    pair_points: NDArray[np.int64]
+    pair_observed: NDArray[np.float64]  # (num_pairs, 2)
+    coordinate_mask: NDArray[np.bool_]  # (num_pairs, 2)
+    board_ids: NDArray[np.int64]  # (num_points,)
+    object_points: NDArray[np.float64]  # (num_points, 3)
+    board_weight: float
+    jacobian_structure: csr_matrix
+    jacobian_order: NDArray[np.int64]  # CSR data position -> analytic value index
+
+    @classmethod
+    def build(
+            cls,
+            cameras: list[CameraModel],
+            points_2d: NDArray[np.float64],
+            num_camera_params: int,
+            board_observations: BoardObservations,
+            jac_sparsity: dok_matrix,
+    ) -> "_BundleLayout":
+        if num_camera_params != PARAMS_PER_CAMERA:
+            raise ValueError(f"Expected {PARAMS_PER_CAMERA} params per camera, got {num_camera_params}")
+        num_cameras, num_points, _ = points_2d.shape
+        good = ~np.isnan(points_2d)
+        pair_cameras, pair_points = np.nonzero(good.any(axis=2))
+        board_ids = np.asarray(board_observations.corner_ids_map, dtype=np.int64)
+        object_points = np.asarray(board_observations.object_points, dtype=np.float64)
+
+        layout = cls(
+            num_cameras=num_cameras,
+            num_points=num_points,
+            num_boards=int(np.max(board_ids)) + 1,
+            principal_points=np.array([[cam.intrinsics.cx, cam.intrinsics.cy] for cam in cameras], dtype=np.float64),
+            pair_cameras=pair_cameras.astype(np.int64),
+            pair_points=pair_points.astype(np.int64),
+            pair_observed=points_2d[pair_cameras, pair_points],
+            coordinate_mask=good[pair_cameras, pair_points],
+            board_ids=board_ids,
+            object_points=object_points,
+            board_weight=2.0 / float(np.min(object_points[object_points > 0])),
+            jacobian_structure=jac_sparsity.tocsr(),
+            jacobian_order=np.empty(0, dtype=np.int64),
         )
+        layout.jacobian_structure.sort_indices()
+        layout.jacobian_order = layout._match_jacobian_structure()
+        return layout
+
+    @property
+    def point_offset(self) -> int:
+        return self.num_cameras * PARAMS_PER_CAMERA
+
+    @property
+    def board_offset(self) -> int:
+        return self.point_offset + self.num_points * 3
+
+    def _analytic_entries(self) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """(row, col) of every value `_jac_bundle` computes, in the order it computes them."""
+        rows = np.arange(int(self.coordinate_mask.sum()), dtype=np.int64)
+        num_reproj = len(rows)
+        row_cameras = np.broadcast_to(self.pair_cameras[:, None], self.coordinate_mask.shape)[self.coordinate_mask]
+        row_points = np.broadcast_to(self.pair_points[:, None], self.coordinate_mask.shape)[self.coordinate_mask]
+
+        board_rows = num_reproj + np.arange(self.num_points * 3, dtype=np.int64).reshape(-1, 3)  # (points, xyz)
+        board_cols = self.board_offset + 3 * self.board_ids[:, None] + np.arange(3)  # (points, k)
+        row_blocks = [
+            np.repeat(rows, PARAMS_PER_CAMERA),
+            np.repeat(rows, 3),
+            board_rows.ravel(),
+            np.repeat(board_rows.ravel(), 3),
+            np.repeat(board_rows.ravel(), 3),
+        ]
+        col_blocks = [
+            (PARAMS_PER_CAMERA * row_cameras[:, None] + np.arange(PARAMS_PER_CAMERA)).ravel(),
+            (self.point_offset + 3 * row_points[:, None] + np.arange(3)).ravel(),
+            self.point_offset + np.arange(self.num_points * 3, dtype=np.int64),
+            np.broadcast_to(board_cols[:, None, :], (self.num_points, 3, 3)).ravel(),
+            np.broadcast_to(board_cols[:, None, :] + 3 * self.num_boards, (self.num_points, 3, 3)).ravel(),
+        ]
+        return np.concatenate(row_blocks), np.concatenate(col_blocks)
+
+    def _match_jacobian_structure(self) -> NDArray[np.int64]:
+        structure = self.jacobian_structure
+        num_cols = structure.shape[1]
+        structure_rows = np.repeat(np.arange(structure.shape[0], dtype=np.int64), np.diff(structure.indptr))
+        structure_keys = structure_rows * num_cols + structure.indices
+        rows, cols = self._analytic_entries()
+        positions = np.searchsorted(structure_keys, rows * num_cols + cols)
+        if len(positions) != len(structure_keys) or not np.array_equal(
+                np.sort(positions), np.arange(len(structure_keys))
+        ):
+            raise ValueError("Analytic bundle Jacobian does not match the _jac_sparsity_bundle pattern")
+        order = np.empty(len(positions), dtype=np.int64)
+        order[positions] = np.arange(len(positions))
+        return order
+
+
+def _skew(vectors: NDArray[np.float64]) -> NDArray[np.float64]:
+    """(N, 3, 3) cross-product matrices, ``_skew(a) @ b == cross(a, b)``."""
+    out = np.zeros(vectors.shape[:-1] + (3, 3), dtype=np.float64)
+    out[..., 0, 1] = -vectors[..., 2]
+    out[..., 0, 2] = vectors[..., 1]
+    out[..., 1, 0] = vectors[..., 2]
+    out[..., 1, 2] = -vectors[..., 0]
+    out[..., 2, 0] = -vectors[..., 1]
+    out[..., 2, 1] = vectors[..., 0]
+    return out
 
-    # -- Extract 3D points from param vector --
-    total_cam_params = num_camera_params * num_cameras
-    num_3d_params = num_points * 3
-    points_3d_test = params[total_cam_params: total_cam_params + num_3d_params].reshape(-1, 3)
-
-    # -- Inline reprojection error (avoids Triangulator construction) --
-    nan_mask = np.isnan(points_3d_test).any(axis=1)
-    valid_pts = points_3d_test[~nan_mask].reshape(-1, 1, 3)
-    projected_all = np.empty((num_cameras, num_points, 2), dtype=np.float64)
-    for cam_idx, cam in enumerate(cameras):
-        if valid_pts.shape[0] == 0:
-            projected_all[cam_idx] = np.nan
-            continue
-        proj, _ = cv2.projectPoints(
-            valid_pts,
-            cam.extrinsics.rodrigues_vector,
-            cam.extrinsics.translation,
-            cam.intrinsics.to_camera_matrix(),
-            cam.intrinsics.to_dist_coeffs(),
-        )
-        full = np.full((num_points, 2), np.nan, dtype=np.float64)
-        full[~nan_mask] = proj.reshape(-1, 2)
-        projected_all[cam_idx] = full
 
-    signed_errors = points_2d - projected_all  # (num_cameras, num_points, 2)
-    errors_reproj = signed_errors[good]
+def _rodrigues_with_tangent(rvecs: NDArray[np.float64]) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Rotation matrices R(r) and right Jacobians J(r) for (N, 3) Rodrigues vectors.
 
-    # -- Board-object constraint residuals (unchanged logic) --
-    ids = board_observations.corner_ids_map
-    objp = board_observations.object_points
-    min_scale = np.min(objp[objp > 0])
-    num_boards = int(np.max(ids)) + 1
-    board_param_start = total_cam_params + num_3d_params
-    rvecs = params[board_param_start: board_param_start + num_boards * 3].reshape(-1, 3)
-    tvecs = params[board_param_start + num_boards * 3: board_param_start + num_boards * 6].reshape(-1, 3)
-    expected = transform_points(objp, rvecs[ids], tvecs[ids])
-    errors_obj = 2 * (points_3d_test - expected).ravel() / min_scale
+    d(R(r) p)/dr = -R [p]x J(r). Small-angle series keep both exact to
+    double precision as theta -> 0.
+    """
+    theta = np.linalg.norm(rvecs, axis=-1)[:, None, None]
+    small = theta < 1e-2
+    theta_sq = theta * theta
+    sin_over_theta = np.sinc(theta / np.pi)
+    # (1 - cos) / theta^2 via the half-angle form, which does not cancel
+    one_minus_cos = 0.5 * np.sinc(theta / (2.0 * np.pi)) ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        theta_minus_sin = np.where(small, 1.0 / 6.0 - theta_sq / 120.0, (theta - np.sin(theta)) / (theta_sq * theta))
+
+    skew = _skew(rvecs)
+    skew_sq = skew @ skew
+    identity = np.eye(3)
+    rotations = identity + sin_over_theta * skew + one_minus_cos * skew_sq
+    right_jacobians = identity - one_minus_cos * skew + theta_minus_sin * skew_sq
+    return rotations, right_jacobians
+
+
+def _unpack_bundle_params(
+        params: NDArray[np.float64],
+        layout: _BundleLayout,
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """Views of (camera params, 3d points, board rvecs, board tvecs) in the packed vector."""
+    board_start = layout.board_offset
+    return (
+        params[:layout.point_offset].reshape(-1, PARAMS_PER_CAMERA),
+        params[layout.point_offset:board_start].reshape(-1, 3),
+        params[board_start:board_start + layout.num_boards * 3].reshape(-1, 3),
+        params[board_start + layout.num_boards * 3:board_start + layout.num_boards * 6].reshape(-1, 3),
+    )
+
+
+def _error_fun_bundle(params: NDArray[np.float64], layout: _BundleLayout) -> NDArray[np.float64]:
+    """Residual function for scipy.least_squares bundle adjustment.
+
+    Reprojection residuals (observed - projected) for every finite
+    coordinate, followed by the board-object constraint residuals. The
+    projection is the same model ``cv2.projectPoints`` applied to the
+    solver cameras: one focal length, the camera's fixed principal point
+    and k1 as the only distortion term.
+    """
+    camera_params, points_3d, board_rvecs, board_tvecs = _unpack_bundle_params(params, layout)
+    rotations, _ = _rodrigues_with_tangent(camera_params[:, :3])
+
+    cams = layout.pair_cameras
+    points_cam = np.einsum("nij,nj->ni", rotations[cams], points_3d[layout.pair_points]) + camera_params[cams, 3:6]
+    xy = points_cam[:, :2] / points_cam[:, 2:3]
+    radial = 1.0 + camera_params[cams, 7:8] * np.sum(xy * xy, axis=1, keepdims=True)
+    projected = camera_params[cams, 6:7] * xy * radial + layout.principal_points[cams]
+    errors_reproj = (layout.pair_observed - projected)[layout.coordinate_mask]
+
+    board_rotations, _ = _rodrigues_with_tangent(board_rvecs)
+    ids = layout.board_ids
+    expected = np.einsum("nij,nj->ni", board_rotations[ids], layout.object_points) + board_tvecs[ids]
+    errors_obj = layout.board_weight * (points_3d - expected).ravel()
 
     return np.hstack([errors_reproj, errors_obj])
 
 
+def _jac_bundle(params: NDArray[np.float64], layout: _BundleLayout) -> csr_matrix:
+    """Analytic Jacobian of `_error_fun_bundle`, on the `_jac_sparsity_bundle` pattern."""
+    camera_params, points_3d, board_rvecs, _ = _unpack_bundle_params(params, layout)
+    rotations, right_jacobians = _rodrigues_with_tangent(camera_params[:, :3])
+
+    cams = layout.pair_cameras
+    points = points_3d[layout.pair_points]
+    pair_rotations = rotations[cams]
+    points_cam = np.einsum("nij,nj->ni", pair_rotations, points) + camera_params[cams, 3:6]
+    inv_z = 1.0 / points_cam[:, 2]
+    x = points_cam[:, 0] * inv_z
+    y = points_cam[:, 1] * inv_z
+    r2 = x * x + y * y
+    focal = camera_params[cams, 6]
+    k1 = camera_params[cams, 7]
+    radial = 1.0 + k1 * r2
+
+    d_normalized_d_cam = np.zeros((len(cams), 2, 3))
+    d_normalized_d_cam[:, 0, 0] = inv_z
+    d_normalized_d_cam[:, 0, 2] = -x * inv_z
+    d_normalized_d_cam[:, 1, 1] = inv_z
+    d_normalized_d_cam[:, 1, 2] = -y * inv_z
+    d_distorted_d_normalized = np.empty((len(cams), 2, 2))
+    d_distorted_d_normalized[:, 0, 0] = radial + 2.0 * k1 * x * x
+    d_distorted_d_normalized[:, 0, 1] = 2.0 * k1 * x * y
+    d_distorted_d_normalized[:, 1, 0] = d_distorted_d_normalized[:, 0, 1]
+    d_distorted_d_normalized[:, 1, 1] = radial + 2.0 * k1 * y * y
+    # Residuals are observed - projected, hence the leading minus
+    d_res_d_cam = -focal[:, None, None] * (d_distorted_d_normalized @ d_normalized_d_cam)
+
+    jac_camera = np.empty((len(cams), 2, PARAMS_PER_CAMERA))
+    jac_camera[:, :, 0:3] = d_res_d_cam @ (-pair_rotations @ _skew(points) @ right_jacobians[cams])
+    jac_camera[:, :, 3:6] = d_res_d_cam
+    jac_camera[:, 0, 6] = -x * radial
+    jac_camera[:, 1, 6] = -y * radial
+    jac_camera[:, 0, 7] = -focal * x * r2
+    jac_camera[:, 1, 7] = -focal * y * r2
+    jac_point = d_res_d_cam @ pair_rotations
+
+    board_rotations, board_right_jacobians = _rodrigues_with_tangent(board_rvecs)
+    ids = layout.board_ids
+    weight = layout.board_weight
+    d_expected_d_rvec = -board_rotations[ids] @ _skew(layout.object_points) @ board_right_jacobians[ids]
+
+    values = np.concatenate([
+        jac_camera[layout.coordinate_mask].ravel(),
+        jac_point[layout.coordinate_mask].ravel(),
+        np.full(layout.num_points * 3, weight),
+        (-weight * d_expected_d_rvec).ravel(),
+        np.broadcast_to(-weight * np.eye(3), (layout.num_points, 3, 3)).ravel(),
+    ])
+    structure = layout.jacobian_structure
+    return csr_matrix((values[layout.jacobian_order], structure.indices, structure.indptr), shape=structure.shape)
+
+
 def _jac_sparsity_bundle(
         cameras: list[CameraModel],
         points_2d: NDArray[np.float64],
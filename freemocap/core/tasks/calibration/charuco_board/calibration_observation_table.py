@@ -0,0 +1,212 @@
+"""Columnar store of charuco corner observations for calibration.
+
+One row per detected corner: camera index, frame index, corner id, pixel xy,
+weight and outlier flag, each a contiguous numpy array. Solver setup, error
+computation and ground-plane triangulation work on these arrays directly, so
+their cost scales with the number of corners rather than with the number of
+Python objects per corner (`CharucoCornersObservation` / `CornerObservation`).
+"""
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import BaseModel, ConfigDict, model_validator
+from skellytracker.core.data_primitives.observation import Observation
+from skellytracker.core.detectors.keypoint_detectors.charuco import CharucoBoardDefinition
+
+from freemocap.core.tasks.calibration.charuco_board.charuco_corners import (
+    CharucoCornersObservation,
+    CornerObservation,
+)
+
+_CHARUCO_CORNER_PREFIX = "CharucoCorner-"
+
+
+class CalibrationObservationTable(BaseModel):
+    """Charuco corner observations as a structure of arrays.
+
+    ``camera_index`` indexes into ``camera_ids``. ``frame_index`` is the
+    frame's position in the recording (the same index the per-frame
+    `CharucoCornersObservation.frame_index` uses). ``weight`` scales each
+    corner's reprojection residual; ``is_outlier`` is updated in place by the
+    solver's outlier rejection.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    camera_ids: list[str]
+    camera_index: NDArray[np.int64]
+    frame_index: NDArray[np.int64]
+    corner_id: NDArray[np.int64]
+    pixel_xy: NDArray[np.float64]
+    weight: NDArray[np.float64]
+    is_outlier: NDArray[np.bool_]
+
+    @model_validator(mode="after")
+    def validate_columns(self) -> "CalibrationObservationTable":
+        n = len(self.corner_id)
+        if self.pixel_xy.shape != (n, 2):
+            raise ValueError(f"pixel_xy must have shape ({n}, 2), got {self.pixel_xy.shape}")
+        for name in ("camera_index", "frame_index", "weight", "is_outlier"):
+            if getattr(self, name).shape != (n,):
+                raise ValueError(f"{name} must have shape ({n},), got {getattr(self, name).shape}")
+        if n > 0 and (self.camera_index.min() < 0 or self.camera_index.max() >= len(self.camera_ids)):
+            raise ValueError(f"camera_index out of range [0, {len(self.camera_ids)})")
+        return self
+
+    @classmethod
+    def from_columns(
+        cls,
+        *,
+        camera_ids: list[str],
+        camera_index: NDArray[np.integer],
+        frame_index: NDArray[np.integer],
+        corner_id: NDArray[np.integer],
+        pixel_xy: NDArray[np.floating],
+        weight: NDArray[np.floating] | None = None,
+    ) -> "CalibrationObservationTable":
+        n = len(corner_id)
+        return cls(
+            camera_ids=list(camera_ids),
+            camera_index=np.ascontiguousarray(camera_index, dtype=np.int64),
+            frame_index=np.ascontiguousarray(frame_index, dtype=np.int64),
+            corner_id=np.ascontiguousarray(corner_id, dtype=np.int64),
+            pixel_xy=np.ascontiguousarray(pixel_xy, dtype=np.float64).reshape(n, 2),
+            weight=np.ones(n, dtype=np.float64) if weight is None else np.ascontiguousarray(weight, dtype=np.float64),
+            is_outlier=np.zeros(n, dtype=bool),
+        )
+
+    @classmethod
+    def from_frame_observations(
+        cls,
+        observations_by_frame: list[dict[str, Observation]],
+        camera_ids: list[str],
+        board: CharucoBoardDefinition,
+    ) -> "CalibrationObservationTable":
+        """Build the table from per-frame ``{camera_id: Observation}`` charuco dicts.
+
+        A frame's index is its position in ``observations_by_frame``. A camera
+        missing from a frame's dict contributes no rows for that frame.
+        Corners are the charuco stage's ``CharucoCorner-<id>`` keypoints;
+        NaN or zero-visibility points are skipped.
+        """
+        corner_lookup: dict[tuple[str, ...], tuple[NDArray[np.int64], NDArray[np.int64]]] = {}
+        columns: dict[str, list[NDArray]] = {"camera_index": [], "frame_index": [], "corner_id": [], "pixel_xy": []}
+
+        for camera_index, camera_id in enumerate(camera_ids):
+            for frame_index, frame_observations in enumerate(observations_by_frame):
+                observation = frame_observations.get(camera_id)
+                if observation is None:
+                    continue
+                corner_ids, pixel_xy = _charuco_corners(
+                    observation=observation, n_corners=board.n_corners, corner_lookup=corner_lookup
+                )
+                if len(corner_ids) == 0:
+                    continue
+                columns["camera_index"].append(np.full(len(corner_ids), camera_index, dtype=np.int64))
+                columns["frame_index"].append(np.full(len(corner_ids), frame_index, dtype=np.int64))
+                columns["corner_id"].append(corner_ids)
+                columns["pixel_xy"].append(pixel_xy)
+
+        if not columns["corner_id"]:
+            return cls.from_columns(
+                camera_ids=list(camera_ids),
+                camera_index=np.empty(0, dtype=np.int64),
+                frame_index=np.empty(0, dtype=np.int64),
+                corner_id=np.empty(0, dtype=np.int64),
+                pixel_xy=np.empty((0, 2), dtype=np.float64),
+            )
+        return cls.from_columns(
+            camera_ids=list(camera_ids),
+            **{name: np.concatenate(arrays) for name, arrays in columns.items()},
+        )
+
+    def __len__(self) -> int:
+        return len(self.corner_id)
+
+    def subset(self, rows: NDArray[np.bool_] | NDArray[np.integer]) -> "CalibrationObservationTable":
+        """New table holding only ``rows`` (a boolean mask or index array)."""
+        return CalibrationObservationTable(
+            camera_ids=list(self.camera_ids),
+            camera_index=self.camera_index[rows],
+            frame_index=self.frame_index[rows],
+            corner_id=self.corner_id[rows],
+            pixel_xy=self.pixel_xy[rows],
+            weight=self.weight[rows],
+            is_outlier=self.is_outlier[rows],
+        )
+
+    def camera_frame_groups(self) -> tuple[NDArray[np.int64], NDArray[np.int64], list[NDArray[np.int64]]]:
+        """Rows grouped by (camera, frame).
+
+        Returns (camera_index, frame_index, row_indices), one entry per group,
+        sorted by camera then frame. Rows within a group keep table order.
+        """
+        return _split_runs(np.lexsort((self.frame_index, self.camera_index)), self.camera_index, self.frame_index)
+
+    def corners_per_camera_frame(self) -> NDArray[np.int64]:
+        """Per-row count of corners sharing the row's (camera, frame)."""
+        keys = self.camera_index * (int(self.frame_index.max(initial=0)) + 1) + self.frame_index
+        _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        return counts[inverse]
+
+    def to_corners_observations(self) -> list[CharucoCornersObservation]:
+        """Per-(camera, frame) observation models, frame-major in camera order, corners by id."""
+        order = np.lexsort((self.corner_id, self.camera_index, self.frame_index))
+        cams, frames, groups = _split_runs(order, self.camera_index, self.frame_index)
+        return [
+            CharucoCornersObservation(
+                camera_name=self.camera_ids[camera_index],
+                frame_index=int(frame_index),
+                corners=[
+                    CornerObservation(corner_id=int(self.corner_id[row]), pixel_xy=self.pixel_xy[row])
+                    for row in rows
+                ],
+            )
+            for camera_index, frame_index, rows in zip(cams, frames, groups)
+        ]
+
+
+def _split_runs(
+    order: NDArray[np.int64],
+    camera_index: NDArray[np.int64],
+    frame_index: NDArray[np.int64],
+) -> tuple[NDArray[np.int64], NDArray[np.int64], list[NDArray[np.int64]]]:
+    """Split ``order`` (rows sorted so each (camera, frame) is contiguous) into per-group row arrays."""
+    if len(order) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, []
+    cams = camera_index[order]
+    frames = frame_index[order]
+    starts = np.flatnonzero(np.r_[True, (cams[1:] != cams[:-1]) | (frames[1:] != frames[:-1])])
+    return cams[starts], frames[starts], np.split(order, starts[1:])
+
+
+def _charuco_corners(
+    *,
+    observation: Observation,
+    n_corners: int,
+    corner_lookup: dict[tuple[str, ...], tuple[NDArray[np.int64], NDArray[np.int64]]],
+) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+    """(corner ids, pixel xy) of one observation's valid charuco corners, by corner id."""
+    stage = observation.stages.get("charuco")
+    if stage is None or stage.keypoints is None:
+        return np.empty(0, dtype=np.int64), np.empty((0, 2), dtype=np.float64)
+
+    keypoints = stage.keypoints
+    names = tuple(keypoints.names)
+    if names not in corner_lookup:
+        # Point names are the same for every frame of a tracker, so this runs once per layout.
+        rows: list[int] = []
+        ids: list[int] = []
+        for row, name in enumerate(names):
+            if name.startswith(_CHARUCO_CORNER_PREFIX):
+                corner_id = int(name[len(_CHARUCO_CORNER_PREFIX):])
+                if corner_id < n_corners:
+                    rows.append(row)
+                    ids.append(corner_id)
+        id_order = np.argsort(ids, kind="stable")
+        corner_lookup[names] = (np.array(rows, dtype=np.int64)[id_order], np.array(ids, dtype=np.int64)[id_order])
+    keypoint_rows, corner_ids = corner_lookup[names]
+
+    xyz = np.asarray(keypoints.xyz)[keypoint_rows]
+    valid = (np.asarray(keypoints.visibility)[keypoint_rows] > 0.0) & ~np.isnan(xyz[:, 0])
+    return corner_ids[valid], xyz[valid, :2].astype(np.float64)
@@ -16,7 +16,6 @@ import json
 import logging
 from pathlib import Path
 
-import numpy as np
 from skellycam.core.recorders.videos.recording_info import RecordingInfo
 from skellycam.core.types.type_overloads import CameraIdString
 from skellytracker.core.data_primitives.observation import Observation
@@ -29,7 +28,7 @@ from freemocap.core.tasks.calibration.anipose_calibration.run_anipose_calibratio
 from freemocap.core.tasks.calibration.calibration_task_config import PosthocCalibrationPipelineConfig, \
     CalibrationSolverMethod
 from freemocap.core.tasks.calibration.shared.calibration_result import CalibrationResult
-from freemocap.core.tasks.calibration.charuco_board.charuco_corners import CornerObservation, CharucoCornersObservation
+from freemocap.core.tasks.calibration.charuco_board.calibration_observation_table import CalibrationObservationTable
 from freemocap.core.tasks.calibration.shared.calibration_paths import get_last_successful_calibration_toml_path
 from freemocap.core.tasks.calibration.shared.calibration_save import save_calibration_copies
 from freemocap.core.tasks.calibration.shared.compare_calibrations import compute_calibration_health
@@ -55,79 +54,6 @@ def _create_board(task_config: PosthocCalibrationPipelineConfig) -> CharucoBoard
     )
 
 
-# =============================================================================
-# SHARED: OBSERVATION CONVERSION
-# =============================================================================
-
-
-def _observation_to_frame_observation(
-        *,
-        observation: Observation,
-        board_def: CharucoBoardDefinition,
-        camera_name: str,
-        frame_index: int,
-) -> CharucoCornersObservation:
-    """Convert a charuco Observation to a CharucoCornersObservation.
-
-    Extracts the charuco stage keypoints; the first n_corners keypoints are
-    charuco corners (named "CharucoCorner-{id}"). NaN or zero-visibility
-    points are skipped.
-    """
-    stage = observation.stages.get("charuco")
-    if stage is None or stage.keypoints is None:
-        return CharucoCornersObservation(
-            camera_name=camera_name,
-            frame_index=frame_index,
-            corners=[],
-        )
-
-    kpts = stage.keypoints
-    n_corners = board_def.n_corners
-    corners: list[CornerObservation] = []
-
-    for corner_id in range(n_corners):
-        name = f"CharucoCorner-{corner_id}"
-        if not kpts.has_name(name):
-            continue
-        idx = kpts.index_of(name)
-        if kpts.visibility[idx] <= 0.0 or np.isnan(kpts.xyz[idx, 0]):
-            continue
-        corners.append(
-            CornerObservation(
-                corner_id=corner_id,
-                pixel_xy=kpts.xyz[idx, :2].copy(),
-            )
-        )
-
-    return CharucoCornersObservation(
-        camera_name=camera_name,
-        frame_index=frame_index,
-        corners=corners,
-    )
-
-
-def _convert_all_observations(
-        *,
-        charuco_observations_by_frame: list[dict[CameraIdString, Observation]],
-        board_def: CharucoBoardDefinition,
-) -> list[CharucoCornersObservation]:
-    """Convert all charuco observations to CharucoCornersObservation models."""
-    all_frame_obs: list[CharucoCornersObservation] = []
-
-    for frame_idx, frame_obs_by_camera in enumerate(charuco_observations_by_frame):
-        for camera_name, obs in frame_obs_by_camera.items():
-            frame_obs = _observation_to_frame_observation(
-                observation=obs,
-                board_def=board_def,
-                camera_name=camera_name,
-                frame_index=frame_idx,
-            )
-            if frame_obs.n_corners > 0:
-                all_frame_obs.append(frame_obs)
-
-    return all_frame_obs
-
-
 # =============================================================================
 # SHARED: SAVE CALIBRATION RESULT
 # =============================================================================
@@ -170,7 +96,7 @@ def _save_result(
 
 def _run_pyceres_path(
         *,
-        all_observations: list[CharucoCornersObservation],
+        observations: CalibrationObservationTable,
         board: CharucoBoardDefinition,
         task_config: PosthocCalibrationPipelineConfig,
         video_metadata: dict[CameraIdString, VideoMetadata],
@@ -185,7 +111,7 @@ def _run_pyceres_path(
             "`uv sync --group pyceres`, or select the 'Anipose legacy' solver instead."
         ) from e
 
-    if len(all_observations) == 0:
+    if len(observations) == 0:
         raise ValueError("No valid charuco observations found")
 
     camera_ids = list(video_metadata.keys())
@@ -196,7 +122,7 @@ def _run_pyceres_path(
 
     result, ground_plane = run_pyceres_calibration(
         board=board,
-        all_observations=all_observations,
+        observations=observations,
         image_sizes=image_sizes,
         camera_ids=camera_ids,
         config=task_config.pyceres_solver_config,
@@ -280,11 +206,13 @@ def run_posthoc_calibration_task(
     # ---- Create shared board definition ----
     board = _create_board(task_config=task_config)
 
-    # ---- Convert to shared observation format (used by pyceres and health check) ----
-    all_observations = _convert_all_observations(
-        charuco_observations_by_frame=charuco_observations_by_frame,
-        board_def=board,
+    # ---- Convert to shared observation formats: columnar for pyceres, per-frame for JSON and health check ----
+    observation_table = CalibrationObservationTable.from_frame_observations(
+        observations_by_frame=charuco_observations_by_frame,
+        camera_ids=camera_ids,
+        board=board,
     )
+    all_observations = observation_table.to_corners_observations()
 
     # Save observations so comparison tools can run board reconstruction tests
     observations_json_path = Path(recording_info.full_recording_path) / "output_data" / "charuco_observations.json"
@@ -310,7 +238,7 @@ def run_posthoc_calibration_task(
             )
         case CalibrationSolverMethod.PYCERES:
             result, ground_plane = _run_pyceres_path(
-                all_observations=all_observations,
+                observations=observation_table,
                 board=board,
                 task_config=task_config,
                 video_metadata=video_metadata,
@@ -9,6 +9,11 @@ import pyceres
 from numpy.typing import NDArray
 from scipy.spatial.transform import Rotation
 
+from freemocap.core.tasks.calibration.pyceres_calibration.helpers.charuco_reprojection_kernel import (
+    charuco_frame_residuals_and_jacobians,
+    charuco_reprojection_residual_and_jacobians,
+)
+
 
 # =============================================================================
 # PROJECTION HELPERS
@@ -167,6 +172,135 @@ class CharucoReprojectionCost(pyceres.CostFunction):
         return True
 
 
+class AnalyticCharucoReprojectionCost(pyceres.CostFunction):
+    """`CharucoReprojectionCost` with closed-form Jacobians from a numba kernel.
+
+    Same parameter blocks, residuals and behind-camera handling; see
+    `charuco_reprojection_kernel`. Jacobian blocks Ceres doesn't ask for are
+    computed into scratch arrays and discarded.
+    """
+
+    _BLOCK_SIZES = (4, 3, 8, 4, 3)
+
+    def __init__(
+        self,
+        *,
+        observed_pixel: NDArray[np.float64],
+        board_point_3d: NDArray[np.float64],
+        weight: float = 1.0,
+    ) -> None:
+        super().__init__()
+        self.observed_pixel = observed_pixel.copy().astype(np.float64)
+        self.board_point_3d = board_point_3d.copy().astype(np.float64)
+        self.weight = weight
+        self._scratch_jacobians = [np.empty((2, size), dtype=np.float64) for size in self._BLOCK_SIZES]
+        self.set_num_residuals(2)
+        self.set_parameter_block_sizes(list(self._BLOCK_SIZES))
+
+    def Evaluate(
+        self,
+        parameters: list[NDArray[np.float64]],
+        residuals: NDArray[np.float64],
+        jacobians: list[NDArray[np.float64]] | None,
+    ) -> bool:
+        # Ceres' row-major (2 * block_size) buffers reshape to writable (2, block_size) views.
+        blocks = self._scratch_jacobians
+        if jacobians is not None:
+            blocks = [
+                scratch if jacobian is None else jacobian.reshape(2, size)
+                for scratch, jacobian, size in zip(self._scratch_jacobians, jacobians, self._BLOCK_SIZES)
+            ]
+        charuco_reprojection_residual_and_jacobians(
+            self.observed_pixel,
+            self.board_point_3d,
+            self.weight,
+            parameters[0],
+            parameters[1],
+            parameters[2],
+            parameters[3],
+            parameters[4],
+            residuals,
+            *blocks,
+        )
+        return True
+
+
+class CharucoFrameReprojectionCost(pyceres.CostFunction):
+    """Reprojection error for every corner one camera observed in one board frame.
+
+    Connects the same five parameter blocks as `CharucoReprojectionCost`, so
+    the problem's sparsity is unchanged, but evaluates all n corners in one
+    callback: 2n residuals, corner c on rows 2c and 2c + 1, with closed-form
+    Jacobians from `charuco_frame_residuals_and_jacobians`. ``weights``
+    scales each corner's residual (default 1).
+
+    A loss function on the residual block would robustify the whole board at
+    once, so the per-corner Huber loss is applied inside the kernel instead:
+    add this block with ``loss=None``. Corners whose ``active`` entry is False
+    (outliers) contribute nothing. ``active`` and ``huber_threshold`` can be
+    changed between solves.
+    """
+
+    _BLOCK_SIZES = (4, 3, 8, 4, 3)
+
+    def __init__(
+        self,
+        *,
+        observed_pixels: NDArray[np.float64],
+        board_points_3d: NDArray[np.float64],
+        weights: NDArray[np.float64] | None = None,
+        huber_threshold: float | None = None,
+    ) -> None:
+        super().__init__()
+        if observed_pixels.ndim != 2 or observed_pixels.shape[1] != 2:
+            raise ValueError(f"Expected observed_pixels shape (n, 2), got {observed_pixels.shape}")
+        if board_points_3d.shape != (observed_pixels.shape[0], 3):
+            raise ValueError(
+                f"Expected board_points_3d shape ({observed_pixels.shape[0]}, 3), got {board_points_3d.shape}"
+            )
+        self.observed_pixels = np.ascontiguousarray(observed_pixels, dtype=np.float64)
+        self.board_points_3d = np.ascontiguousarray(board_points_3d, dtype=np.float64)
+        self.weights = (
+            np.ones(observed_pixels.shape[0], dtype=np.float64)
+            if weights is None
+            else np.ascontiguousarray(weights, dtype=np.float64)
+        )
+        self.active = np.ones(observed_pixels.shape[0], dtype=bool)
+        self.huber_threshold = np.inf if huber_threshold is None else float(huber_threshold)
+        n_residuals = 2 * observed_pixels.shape[0]
+        self._scratch_jacobians = [np.empty((n_residuals, size), dtype=np.float64) for size in self._BLOCK_SIZES]
+        self.set_num_residuals(n_residuals)
+        self.set_parameter_block_sizes(list(self._BLOCK_SIZES))
+
+    def Evaluate(
+        self,
+        parameters: list[NDArray[np.float64]],
+        residuals: NDArray[np.float64],
+        jacobians: list[NDArray[np.float64]] | None,
+    ) -> bool:
+        blocks = self._scratch_jacobians
+        if jacobians is not None:
+            blocks = [
+                scratch if jacobian is None else jacobian.reshape(scratch.shape)
+                for scratch, jacobian in zip(self._scratch_jacobians, jacobians)
+            ]
+        charuco_frame_residuals_and_jacobians(
+            self.observed_pixels,
+            self.board_points_3d,
+            self.weights,
+            self.active,
+            self.huber_threshold,
+            parameters[0],
+            parameters[1],
+            parameters[2],
+            parameters[3],
+            parameters[4],
+            residuals,
+            *blocks,
+        )
+        return True
+
+
 # =============================================================================
 # INTRINSICS PRIOR
 # =============================================================================
@@ -5,6 +5,8 @@ CameraModel, CornerObservation, CharucoCornersObservation, CalibrationResult)
 are imported from shared.models and re-exported here for backward compatibility.
 """
 
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, model_validator
 
 
@@ -70,6 +72,13 @@ class PyceresCalibrationSolverConfig(BaseModel):
     initial_outlier_threshold_px: float = 15.0
     final_outlier_threshold_px: float = 2.0
     min_corners_per_frame: int = 4
+    # "per_frame": one CharucoFrameReprojectionCost per (camera, board frame), covering
+    # all of its corners in one callback (always analytic, per-corner Huber in the kernel).
+    # "per_corner": one residual block per corner, with the cost picked below.
+    residual_blocks: Literal["per_frame", "per_corner"] = "per_frame"
+    # Per-corner blocks only. "analytic": closed-form Jacobians from a numba kernel
+    # (AnalyticCharucoReprojectionCost). "numeric": the finite-difference CharucoReprojectionCost.
+    reprojection_jacobian: Literal["analytic", "numeric"] = "analytic"
     verbose: bool = True
 
     @model_validator(mode="after")
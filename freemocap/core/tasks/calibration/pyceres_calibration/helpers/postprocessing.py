@@ -12,7 +12,7 @@ from scipy.spatial.transform import Rotation
 
 from freemocap.core.tasks.calibration.shared.camera_extrinsics import CameraExtrinsics
 from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
-from freemocap.core.tasks.calibration.charuco_board.charuco_corners import CharucoCornersObservation
+from freemocap.core.tasks.calibration.charuco_board.calibration_observation_table import CalibrationObservationTable
 from skellytracker.core.detectors.keypoint_detectors.charuco import CharucoBoardDefinition
 from freemocap.core.tasks.calibration.shared.camera_id_resolution import resolve_camera_id_or_raise
 from freemocap.core.tasks.calibration.shared.groundplane_alignment import GroundPlaneResult, \
@@ -102,62 +102,51 @@ def pin_camera_to_origin(
 def _triangulate_charuco_corners(
     *,
     cameras: list[CameraModel],
-    all_observations: list[CharucoCornersObservation],
+    observations: CalibrationObservationTable,
     board: CharucoBoardDefinition,
 ) -> NDArray[np.float64]:
     """Triangulate charuco corners into 3D for ground plane estimation.
 
-    Uses DLT triangulation across all cameras for each frame, then stacks
-    into (n_frames, n_corners, 3). Missing corners are filled with NaN.
+    DLT-triangulates every (frame, corner) seen by at least two cameras,
+    batching points with the same number of views into one stacked SVD, and
+    returns them as (n_frames, n_corners, 3). Missing corners are NaN.
 
     Returns:
         (n_frames, n_corners, 3) array of triangulated 3D positions.
     """
-    # Group observations by frame
     cam_name_to_model = {cam.id: cam for cam in cameras}
-    frame_groups: dict[int, dict[str, CharucoCornersObservation]] = {}
-    for obs in all_observations:
-        if obs.frame_index not in frame_groups:
-            frame_groups[obs.frame_index] = {}
-        frame_groups[obs.frame_index][obs.camera_name] = obs
+    projection_matrices = np.stack(
+        [cam_name_to_model[cam_id].projection_matrix for cam_id in observations.camera_ids]
+    )
 
-    sorted_frames = sorted(frame_groups.keys())
+    sorted_frames, frame_positions = np.unique(observations.frame_index, return_inverse=True)
     n_frames = len(sorted_frames)
     n_corners = board.n_corners
 
     result = np.full((n_frames, n_corners, 3), np.nan, dtype=np.float64)
 
-    for fi, frame_idx in enumerate(sorted_frames):
-        frame_obs = frame_groups[frame_idx]
-
-        for corner_id in range(n_corners):
-            # Collect 2D observations of this corner across cameras
-            cam_observations: list[tuple[NDArray[np.float64], NDArray[np.float64]]] = []
-
-            for cam_name, obs in frame_obs.items():
-                cam = cam_name_to_model[cam_name]
-                for c in obs.corners:
-                    if c.corner_id == corner_id:
-                        P = cam.projection_matrix
-                        cam_observations.append((c.pixel_xy, P))
-                        break
-
-            if len(cam_observations) < 2:
-                continue
-
-            # DLT triangulation
-            n_views = len(cam_observations)
-            A = np.zeros((n_views * 2, 4), dtype=np.float64)
-            for vi, (px, P) in enumerate(cam_observations):
-                x, y = px
-                A[vi * 2] = x * P[2] - P[0]
-                A[vi * 2 + 1] = y * P[2] - P[1]
-
-            _, _, vh = np.linalg.svd(A, full_matrices=False)
-            pt_h = vh[-1]
-            if abs(pt_h[3]) < 1e-10:
-                continue
-            result[fi, corner_id] = pt_h[:3] / pt_h[3]
+    # Rows sorted so each (frame, corner) point's views are contiguous
+    point_keys = frame_positions.astype(np.int64) * n_corners + observations.corner_id
+    order = np.argsort(point_keys, kind="stable")
+    sorted_keys = point_keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    n_views_per_point = np.diff(np.r_[starts, len(order)])
+
+    for n_views in np.unique(n_views_per_point[n_views_per_point >= 2]):
+        point_starts = starts[n_views_per_point == n_views]
+        rows = order[point_starts[:, None] + np.arange(n_views)]  # (n_points, n_views)
+        P = projection_matrices[observations.camera_index[rows]]  # (n_points, n_views, 3, 4)
+        px = observations.pixel_xy[rows]  # (n_points, n_views, 2)
+
+        # DLT triangulation
+        A = np.empty((len(rows), 2 * n_views, 4), dtype=np.float64)
+        A[:, 0::2] = px[..., 0:1] * P[:, :, 2] - P[:, :, 0]
+        A[:, 1::2] = px[..., 1:2] * P[:, :, 2] - P[:, :, 1]
+        _, _, vh = np.linalg.svd(A, full_matrices=False)
+        pt_h = vh[:, -1]
+        valid = np.abs(pt_h[:, 3]) >= 1e-10
+        keys = sorted_keys[point_starts[valid]]
+        result[keys // n_corners, keys % n_corners] = pt_h[valid, :3] / pt_h[valid, 3:4]
 
     return result
 
@@ -166,7 +155,7 @@ def estimate_charuco_groundplane(
     *,
     cameras: list[CameraModel],
     board: CharucoBoardDefinition,
-    all_observations: list[CharucoCornersObservation],
+    observations: CalibrationObservationTable,
 ) -> GroundPlaneResult:
     """Estimate the ground plane from charuco board observations.
 
@@ -176,7 +165,7 @@ def estimate_charuco_groundplane(
     Args:
         cameras: Calibrated camera models.
         board: Board definition.
-        all_observations: All frame observations for triangulation.
+        observations: All corner observations, for triangulation.
 
     Returns:
         GroundPlaneResult with origin at board corner 0 and basis from board edges.
@@ -185,7 +174,7 @@ def estimate_charuco_groundplane(
 
     charuco_3d = _triangulate_charuco_corners(
         cameras=cameras,
-        all_observations=all_observations,
+        observations=observations,
         board=board,
     )
 
@@ -213,7 +202,7 @@ def align_to_charuco_groundplane(
     *,
     cameras: list[CameraModel],
     board: CharucoBoardDefinition,
-    all_observations: list[CharucoCornersObservation],
+    observations: CalibrationObservationTable,
 ) -> tuple[list[CameraModel], GroundPlaneResult]:
     """Transform the world frame so the charuco board defines the ground plane.
 
@@ -223,7 +212,7 @@ def align_to_charuco_groundplane(
     Args:
         cameras: Calibrated camera models.
         board: Board definition.
-        all_observations: All frame observations for triangulation.
+        observations: All corner observations, for triangulation.
 
     Returns:
         Tuple of (camera models with adjusted extrinsics, ground plane result).
@@ -231,6 +220,6 @@ def align_to_charuco_groundplane(
     ground_plane = estimate_charuco_groundplane(
         cameras=cameras,
         board=board,
-        all_observations=all_observations,
+        observations=observations,
     )
     return apply_groundplane_to_cameras(cameras, ground_plane), ground_plane
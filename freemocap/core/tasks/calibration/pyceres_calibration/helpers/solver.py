@@ -6,49 +6,43 @@ and 2D corner observations. Supports iterative outlier rejection.
 
 import logging
 import time
-from collections import defaultdict
 
 import numpy as np
 import pyceres
 from numpy.typing import NDArray
 from scipy.spatial.transform import Rotation
 
-from freemocap.core.tasks.calibration.pyceres_calibration.helpers.cost_functions import CharucoReprojectionCost, \
-    IntrinsicsPriorCost
+from freemocap.core.tasks.calibration.pyceres_calibration.helpers.cost_functions import (
+    AnalyticCharucoReprojectionCost,
+    CharucoFrameReprojectionCost,
+    CharucoReprojectionCost,
+    IntrinsicsPriorCost,
+)
 from freemocap.core.tasks.calibration.pyceres_calibration.helpers.models import PyceresCalibrationSolverConfig
 from freemocap.core.tasks.calibration.shared.camera_intrinsics import CameraIntrinsics
 from freemocap.core.tasks.calibration.shared.camera_extrinsics import CameraExtrinsics
 from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
 from freemocap.core.tasks.calibration.shared.calibration_result import CalibrationResult
-from freemocap.core.tasks.calibration.charuco_board.charuco_corners import CharucoCornersObservation
+from freemocap.core.tasks.calibration.charuco_board.calibration_observation_table import CalibrationObservationTable
 from skellytracker.core.detectors.keypoint_detectors.charuco import CharucoBoardDefinition
 
 logger = logging.getLogger(__name__)
 
 
 # =============================================================================
-# OBSERVATION INDEXING
+# RESIDUAL BLOCKS
 # =============================================================================
 
 
-class _ObservationRecord:
-    """Tracks a single 2D observation and which parameter blocks it connects."""
+class _FrameResidualBlock:
+    """A per-(camera, board frame) residual block and the observations it covers."""
 
-    __slots__ = ("camera_name", "frame_index", "corner_id", "pixel_xy", "is_outlier")
+    __slots__ = ("cost", "record_indices", "block_id")
 
-    def __init__(
-        self,
-        *,
-        camera_name: str,
-        frame_index: int,
-        corner_id: int,
-        pixel_xy: NDArray[np.float64],
-    ) -> None:
-        self.camera_name = camera_name
-        self.frame_index = frame_index
-        self.corner_id = corner_id
-        self.pixel_xy = pixel_xy.copy()
-        self.is_outlier = False
+    def __init__(self, *, cost: CharucoFrameReprojectionCost, record_indices: NDArray[np.int64]) -> None:
+        self.cost = cost
+        self.record_indices = record_indices
+        self.block_id = None
 
 
 # =============================================================================
@@ -56,59 +50,52 @@ class _ObservationRecord:
 # =============================================================================
 
 
+def _quat_wxyz_to_rotation_matrices(quats_wxyz: NDArray[np.float64]) -> NDArray[np.float64]:
+    """(n, 4) [w, x, y, z] quaternions -> (n, 3, 3) rotation matrices."""
+    return Rotation.from_quat(quats_wxyz[:, [1, 2, 3, 0]]).as_matrix()
+
+
 def _compute_reprojection_errors(
     *,
-    observations: list[_ObservationRecord],
-    board: CharucoBoardDefinition,
-    cam_quats: dict[str, NDArray[np.float64]],
-    cam_trans: dict[str, NDArray[np.float64]],
-    cam_intrinsics: dict[str, NDArray[np.float64]],
-    board_quats: dict[int, NDArray[np.float64]],
-    board_trans: dict[int, NDArray[np.float64]],
+    pixels: NDArray[np.float64],
+    board_points: NDArray[np.float64],
+    camera_indices: NDArray[np.int64],
+    frame_positions: NDArray[np.int64],
+    cam_quats: NDArray[np.float64],
+    cam_trans: NDArray[np.float64],
+    cam_intrinsics: NDArray[np.float64],
+    board_quats: NDArray[np.float64],
+    board_trans: NDArray[np.float64],
 ) -> NDArray[np.float64]:
-    """Compute per-observation reprojection errors (in pixels).
+    """Compute per-observation reprojection errors (in pixels), in one vectorized pass.
+
+    Observations are stacked: (n, 2) pixels, (n, 3) board-frame corner
+    positions, and per-observation indices into the (n_cams, ...) camera and
+    (n_board_frames, ...) board pose arrays.
 
     Returns array of shape (n_observations,) with pixel-space L2 error.
+    Points at or behind the camera get an error of 1e6.
     """
-    board_pts = board.corner_positions_board_frame
-    errors = np.zeros(len(observations), dtype=np.float64)
-
-    for idx, obs in enumerate(observations):
-        cq = cam_quats[obs.camera_name]
-        ct = cam_trans[obs.camera_name]
-        ci = cam_intrinsics[obs.camera_name]
-        bq = board_quats[obs.frame_index]
-        bt = board_trans[obs.frame_index]
-
-        # Board → world
-        w, x, y, z = bq
-        R_board = Rotation.from_quat([x, y, z, w]).as_matrix()
-        p_world = R_board @ board_pts[obs.corner_id] + bt
-
-        # World → camera
-        w, x, y, z = cq
-        R_cam = Rotation.from_quat([x, y, z, w]).as_matrix()
-        p_cam = R_cam @ p_world + ct
-
-        if p_cam[2] <= 1e-6:
-            errors[idx] = 1e6
-            continue
-
-        # Project
-        fx, fy, cx, cy, k1, k2, p1, p2 = ci
-        xn = p_cam[0] / p_cam[2]
-        yn = p_cam[1] / p_cam[2]
-        r2 = xn * xn + yn * yn
-        radial = 1.0 + k1 * r2 + k2 * r2 * r2
-        xd = xn * radial + 2.0 * p1 * xn * yn + p2 * (r2 + 2.0 * xn * xn)
-        yd = yn * radial + p1 * (r2 + 2.0 * yn * yn) + 2.0 * p2 * xn * yn
-        u = fx * xd + cx
-        v = fy * yd + cy
-
-        diff = obs.pixel_xy - np.array([u, v])
-        errors[idx] = np.linalg.norm(diff)
-
-    return errors
+    R_board = _quat_wxyz_to_rotation_matrices(board_quats)[frame_positions]
+    p_world = np.einsum("nij,nj->ni", R_board, board_points) + board_trans[frame_positions]
+
+    R_cam = _quat_wxyz_to_rotation_matrices(cam_quats)[camera_indices]
+    p_cam = np.einsum("nij,nj->ni", R_cam, p_world) + cam_trans[camera_indices]
+
+    in_front = p_cam[:, 2] > 1e-6
+    z = np.where(in_front, p_cam[:, 2], 1.0)
+    fx, fy, cx, cy, k1, k2, p1, p2 = cam_intrinsics[camera_indices].T
+    xn = p_cam[:, 0] / z
+    yn = p_cam[:, 1] / z
+    r2 = xn * xn + yn * yn
+    radial = 1.0 + k1 * r2 + k2 * r2 * r2
+    xd = xn * radial + 2.0 * p1 * xn * yn + p2 * (r2 + 2.0 * xn * xn)
+    yd = yn * radial + p1 * (r2 + 2.0 * yn * yn) + 2.0 * p2 * xn * yn
+    u = fx * xd + cx
+    v = fy * yd + cy
+
+    errors = np.hypot(pixels[:, 0] - u, pixels[:, 1] - v)
+    return np.where(in_front, errors, 1e6)
 
 
 # =============================================================================
@@ -120,7 +107,7 @@ def run_pyceres_bundle_adjustment(
     *,
     cameras: list[CameraModel],
     board: CharucoBoardDefinition,
-    all_observations: list[CharucoCornersObservation],
+    observations: CalibrationObservationTable,
     board_poses_init: dict[int, tuple[NDArray[np.float64], NDArray[np.float64]]],
     config: PyceresCalibrationSolverConfig,
 ) -> CalibrationResult:
@@ -129,7 +116,8 @@ def run_pyceres_bundle_adjustment(
     Args:
         cameras: Initial camera models (intrinsics + extrinsics).
         board: Charuco board definition.
-        all_observations: All frame observations across all cameras.
+        observations: All corner observations across all cameras. Its
+            ``is_outlier`` column is updated with the corners rejected here.
         board_poses_init: Initial board poses {frame_idx: (quat_wxyz, translation)}.
         config: Solver configuration.
 
@@ -141,50 +129,46 @@ def run_pyceres_bundle_adjustment(
     board_pts_3d = board.corner_positions_board_frame
 
     # =========================================================================
-    # BUILD OBSERVATION RECORDS
+    # SELECT OBSERVATIONS
     # =========================================================================
-    obs_records: list[_ObservationRecord] = []
-    frame_indices_set: set[int] = set()
-
-    for frame_obs in all_observations:
-        cam_name = frame_obs.camera_name
-        if cam_name not in camera_name_to_idx:
-            raise ValueError(f"Observation references unknown camera '{cam_name}'")
-
-        if frame_obs.n_corners < config.min_corners_per_frame:
-            continue
-
-        for corner in frame_obs.corners:
-            if corner.corner_id < 0 or corner.corner_id >= board.n_corners:
-                raise ValueError(
-                    f"Corner ID {corner.corner_id} out of range [0, {board.n_corners})"
-                )
-            obs_records.append(
-                _ObservationRecord(
-                    camera_name=cam_name,
-                    frame_index=frame_obs.frame_index,
-                    corner_id=corner.corner_id,
-                    pixel_xy=corner.pixel_xy,
-                )
-            )
-            frame_indices_set.add(frame_obs.frame_index)
+    # Map the table's camera indices onto the order of `cameras`
+    table_to_camera_idx = np.array(
+        [camera_name_to_idx.get(cam_id, -1) for cam_id in observations.camera_ids], dtype=np.int64
+    )
+    unknown_rows = table_to_camera_idx[observations.camera_index] < 0
+    if unknown_rows.any():
+        cam_name = observations.camera_ids[observations.camera_index[np.argmax(unknown_rows)]]
+        raise ValueError(f"Observation references unknown camera '{cam_name}'")
+    bad_corner_rows = (observations.corner_id < 0) | (observations.corner_id >= board.n_corners)
+    if bad_corner_rows.any():
+        raise ValueError(
+            f"Corner ID {observations.corner_id[np.argmax(bad_corner_rows)]} out of range [0, {board.n_corners})"
+        )
 
-    if len(obs_records) == 0:
+    used_rows = np.flatnonzero(observations.corners_per_camera_frame() >= config.min_corners_per_frame)
+    if len(used_rows) == 0:
         raise ValueError("No valid observations after filtering")
+    obs_table = observations.subset(used_rows)
 
-    sorted_frame_indices = sorted(frame_indices_set)
-    frame_idx_to_pos = {fi: pos for pos, fi in enumerate(sorted_frame_indices)}
+    sorted_frame_indices_arr, obs_frame_positions = np.unique(obs_table.frame_index, return_inverse=True)
+    sorted_frame_indices: list[int] = sorted_frame_indices_arr.tolist()
 
-    logger.info(f"Total observations: {len(obs_records)}")
+    logger.info(f"Total observations: {len(obs_table)}")
     logger.info(f"Cameras: {len(cameras)}")
     logger.info(f"Board frames: {len(sorted_frame_indices)}")
 
+    # Stacked per-observation arrays, in `cameras` / sorted-frame index space
+    obs_pixels = obs_table.pixel_xy
+    obs_board_points = board_pts_3d[obs_table.corner_id]
+    obs_weights = obs_table.weight
+    obs_camera_indices = table_to_camera_idx[obs_table.camera_index]
+    obs_frame_positions = obs_frame_positions.astype(np.int64)
+    is_outlier = obs_table.is_outlier
+
     # Per-camera observation counts
-    cam_obs_counts: dict[str, int] = defaultdict(int)
-    for obs in obs_records:
-        cam_obs_counts[obs.camera_name] += 1
+    cam_obs_counts = np.bincount(obs_camera_indices, minlength=len(cameras))
     for cam in cameras:
-        logger.info(f"  Camera '{cam.id}': {cam_obs_counts.get(cam.id, 0)} corner observations")
+        logger.info(f"  Camera '{cam.id}': {cam_obs_counts[camera_name_to_idx[cam.id]]} corner observations")
 
     # =========================================================================
     # ALLOCATE PARAMETER ARRAYS
@@ -220,44 +204,21 @@ def run_pyceres_bundle_adjustment(
         cam.id: cam.intrinsics.to_param_array() for cam in cameras
     }
 
-    # =========================================================================
-    # ITERATIVE OUTLIER REJECTION
-    # =========================================================================
-    n_rejected_total = 0
-    initial_cost = 0.0
-    final_cost = 0.0
-    total_iterations = 0
-
-    n_outlier_iters = config.outlier_rejection_iterations
-    thresholds = np.exp(
-        np.linspace(
-            np.log(config.initial_outlier_threshold_px),
-            np.log(config.final_outlier_threshold_px),
-            num=n_outlier_iters,
+    def compute_errors(mask: NDArray[np.bool_] | slice = slice(None)) -> NDArray[np.float64]:
+        return _compute_reprojection_errors(
+            pixels=obs_pixels[mask],
+            board_points=obs_board_points[mask],
+            camera_indices=obs_camera_indices[mask],
+            frame_positions=obs_frame_positions[mask],
+            cam_quats=np.stack([cam_quat_arrays[cam.id] for cam in cameras]),
+            cam_trans=np.stack([cam_trans_arrays[cam.id] for cam in cameras]),
+            cam_intrinsics=np.stack([cam_intrinsics_arrays[cam.id] for cam in cameras]),
+            board_quats=np.stack([board_quat_arrays[fi] for fi in sorted_frame_indices]),
+            board_trans=np.stack([board_trans_arrays[fi] for fi in sorted_frame_indices]),
         )
-    )
-
-    for outlier_iter in range(n_outlier_iters):
-        threshold = float(thresholds[outlier_iter])
-        active_obs = [obs for obs in obs_records if not obs.is_outlier]
-
-        if len(active_obs) == 0:
-            raise RuntimeError(
-                "All observations marked as outliers. "
-                "Calibration data may be too noisy or initialization too far off."
-            )
 
-        logger.info(
-            f"\n{'='*60}\n"
-            f"Outlier iteration {outlier_iter + 1}/{n_outlier_iters} | "
-            f"threshold={threshold:.2f}px | "
-            f"active observations: {len(active_obs)}\n"
-            f"{'='*60}"
-        )
-
-        # =====================================================================
-        # BUILD CERES PROBLEM
-        # =====================================================================
+    def build_problem() -> pyceres.Problem:
+        """Problem with every parameter block, manifold, pin and intrinsics prior; no reprojection costs."""
         problem = pyceres.Problem()
 
         # Register camera parameter blocks
@@ -308,27 +269,6 @@ def run_pyceres_bundle_adjustment(
             problem.set_manifold(bq, pyceres.QuaternionManifold())
             problem.add_parameter_block(bt, 3)
 
-        # Add reprojection cost for each active observation
-        n_residuals_added = 0
-        for obs in active_obs:
-            cost = CharucoReprojectionCost(
-                observed_pixel=obs.pixel_xy,
-                board_point_3d=board_pts_3d[obs.corner_id],
-                weight=1.0,
-            )
-            problem.add_residual_block(
-                cost,
-                pyceres.HuberLoss(threshold),  # Robust loss
-                [
-                    cam_quat_arrays[obs.camera_name],
-                    cam_trans_arrays[obs.camera_name],
-                    cam_intrinsics_arrays[obs.camera_name],
-                    board_quat_arrays[obs.frame_index],
-                    board_trans_arrays[obs.frame_index],
-                ],
-            )
-            n_residuals_added += 1
-
         # Add intrinsics priors
         if config.intrinsics_prior_weight > 0:
             for cam in cameras:
@@ -341,6 +281,114 @@ def run_pyceres_bundle_adjustment(
                     None,
                     [cam_intrinsics_arrays[cam.id]],
                 )
+        return problem
+
+    # =========================================================================
+    # ITERATIVE OUTLIER REJECTION
+    # =========================================================================
+    n_rejected_total = 0
+    initial_cost = 0.0
+    final_cost = 0.0
+    total_iterations = 0
+
+    n_outlier_iters = config.outlier_rejection_iterations
+    thresholds = np.exp(
+        np.linspace(
+            np.log(config.initial_outlier_threshold_px),
+            np.log(config.final_outlier_threshold_px),
+            num=n_outlier_iters,
+        )
+    )
+
+    # Per-frame blocks hold their Huber threshold and outlier mask themselves, so
+    # that problem is built once and only updated between solves. Per-corner
+    # blocks bind a HuberLoss at creation, so that layout is rebuilt each iteration.
+    problem: pyceres.Problem | None = None
+    frame_blocks: list[_FrameResidualBlock] = []
+    if config.residual_blocks == "per_frame":
+        problem = build_problem()
+        for table_cam_idx, frame_idx, record_indices in zip(*obs_table.camera_frame_groups()):
+            cam_name = observations.camera_ids[table_cam_idx]
+            frame_idx = int(frame_idx)
+            frame_block = _FrameResidualBlock(
+                cost=CharucoFrameReprojectionCost(
+                    observed_pixels=obs_pixels[record_indices],
+                    board_points_3d=obs_board_points[record_indices],
+                    weights=obs_weights[record_indices],
+                ),
+                record_indices=record_indices,
+            )
+            frame_block.block_id = problem.add_residual_block(
+                frame_block.cost,
+                None,  # Robust loss is applied per corner inside the cost
+                [
+                    cam_quat_arrays[cam_name],
+                    cam_trans_arrays[cam_name],
+                    cam_intrinsics_arrays[cam_name],
+                    board_quat_arrays[frame_idx],
+                    board_trans_arrays[frame_idx],
+                ],
+            )
+            frame_blocks.append(frame_block)
+
+    for outlier_iter in range(n_outlier_iters):
+        threshold = float(thresholds[outlier_iter])
+        n_active = int((~is_outlier).sum())
+
+        if n_active == 0:
+            raise RuntimeError(
+                "All observations marked as outliers. "
+                "Calibration data may be too noisy or initialization too far off."
+            )
+
+        logger.info(
+            f"\n{'='*60}\n"
+            f"Outlier iteration {outlier_iter + 1}/{n_outlier_iters} | "
+            f"threshold={threshold:.2f}px | "
+            f"active observations: {n_active}\n"
+            f"{'='*60}"
+        )
+
+        # =====================================================================
+        # BUILD / UPDATE CERES PROBLEM
+        # =====================================================================
+        if config.residual_blocks == "per_frame":
+            for frame_block in frame_blocks:
+                if frame_block.block_id is None:
+                    continue
+                active_mask = ~is_outlier[frame_block.record_indices]
+                if not active_mask.any():
+                    problem.remove_residual_block(frame_block.block_id)
+                    frame_block.block_id = None
+                    continue
+                frame_block.cost.active[:] = active_mask
+                frame_block.cost.huber_threshold = threshold
+        else:
+            problem = build_problem()
+            reprojection_cost_type = (
+                AnalyticCharucoReprojectionCost
+                if config.reprojection_jacobian == "analytic"
+                else CharucoReprojectionCost
+            )
+            for record_idx in np.flatnonzero(~is_outlier):
+                cam_name = cameras[obs_camera_indices[record_idx]].id
+                frame_idx = int(obs_table.frame_index[record_idx])
+                cost = reprojection_cost_type(
+                    observed_pixel=obs_pixels[record_idx],
+                    board_point_3d=obs_board_points[record_idx],
+                    weight=float(obs_weights[record_idx]),
+                )
+                problem.add_residual_block(
+                    cost,
+                    pyceres.HuberLoss(threshold),  # Robust loss
+                    [
+                        cam_quat_arrays[cam_name],
+                        cam_trans_arrays[cam_name],
+                        cam_intrinsics_arrays[cam_name],
+                        board_quat_arrays[frame_idx],
+                        board_trans_arrays[frame_idx],
+                    ],
+                )
 
         logger.info(f"Problem: {problem.num_residual_blocks()} residual blocks, "
                      f"{problem.num_parameters()} parameters")
@@ -375,24 +423,14 @@ def run_pyceres_bundle_adjustment(
         # MARK OUTLIERS
         # =====================================================================
         if outlier_iter < n_outlier_iters - 1:
-            errors = _compute_reprojection_errors(
-                observations=obs_records,
-                board=board,
-                cam_quats=cam_quat_arrays,
-                cam_trans=cam_trans_arrays,
-                cam_intrinsics=cam_intrinsics_arrays,
-                board_quats=board_quat_arrays,
-                board_trans=board_trans_arrays,
-            )
+            errors = compute_errors()
 
-            n_newly_rejected = 0
-            for idx, obs in enumerate(obs_records):
-                if not obs.is_outlier and errors[idx] > threshold:
-                    obs.is_outlier = True
-                    n_newly_rejected += 1
-                    n_rejected_total += 1
+            newly_rejected = ~is_outlier & (errors > threshold)
+            n_newly_rejected = int(newly_rejected.sum())
+            is_outlier |= newly_rejected
+            n_rejected_total += n_newly_rejected
 
-            active_errors = errors[~np.array([obs.is_outlier for obs in obs_records])]
+            active_errors = errors[~is_outlier]
             if len(active_errors) > 0:
                 logger.info(
                     f"Reprojection error: "
@@ -406,15 +444,8 @@ def run_pyceres_bundle_adjustment(
     # =========================================================================
     # COMPUTE FINAL ERROR
     # =========================================================================
-    final_errors = _compute_reprojection_errors(
-        observations=[obs for obs in obs_records if not obs.is_outlier],
-        board=board,
-        cam_quats=cam_quat_arrays,
-        cam_trans=cam_trans_arrays,
-        cam_intrinsics=cam_intrinsics_arrays,
-        board_quats=board_quat_arrays,
-        board_trans=board_trans_arrays,
-    )
+    final_errors = compute_errors(~is_outlier)
+    observations.is_outlier[used_rows] = is_outlier
 
     median_error = float(np.median(final_errors)) if len(final_errors) > 0 else float("inf")
     logger.info(f"\nFinal median reprojection error: {median_error:.4f} px")
@@ -436,6 +467,7 @@ def run_pyceres_bundle_adjustment(
         result_cameras.append(
             CameraModel(
                 id=cam.id,
+                index=cam.index,
                 image_size=cam.image_size,
                 intrinsics=new_intrinsics,
                 extrinsics=new_extrinsics,
@@ -443,7 +475,7 @@ def run_pyceres_bundle_adjustment(
         )
 
     elapsed = time.perf_counter() - t_start
-    n_used = sum(1 for obs in obs_records if not obs.is_outlier)
+    n_used = int((~is_outlier).sum())
 
     return CalibrationResult(
         cameras=result_cameras,
@@ -12,6 +12,8 @@ Orchestrates the full calibration flow:
 
 import logging
 
+import numpy as np
+
 from freemocap.core.tasks.calibration.pyceres_calibration.helpers.initialization import initialize_intrinsics, \
     initialize_extrinsics, initialize_board_poses
 from freemocap.core.tasks.calibration.pyceres_calibration.helpers.models import PyceresCalibrationSolverConfig
@@ -20,7 +22,7 @@ from freemocap.core.tasks.calibration.pyceres_calibration.helpers.postprocessing
 from freemocap.core.tasks.calibration.pyceres_calibration.helpers.solver import run_pyceres_bundle_adjustment
 from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
 from freemocap.core.tasks.calibration.shared.calibration_result import CalibrationResult
-from freemocap.core.tasks.calibration.charuco_board.charuco_corners import CharucoCornersObservation
+from freemocap.core.tasks.calibration.charuco_board.calibration_observation_table import CalibrationObservationTable
 from skellytracker.core.detectors.keypoint_detectors.charuco import CharucoBoardDefinition
 from freemocap.core.tasks.calibration.shared.groundplane_alignment import GroundPlaneResult
 
@@ -30,7 +32,7 @@ logger = logging.getLogger(__name__)
 def run_pyceres_calibration(
     *,
     board: CharucoBoardDefinition,
-    all_observations: list[CharucoCornersObservation],
+    observations: CalibrationObservationTable,
     image_sizes: dict[str, tuple[int, int]],
     camera_ids: list[str],
     config: PyceresCalibrationSolverConfig,
@@ -40,7 +42,7 @@ def run_pyceres_calibration(
 
     Args:
         board: Charuco board definition.
-        all_observations: All FrameObservation records across all cameras and frames.
+        observations: All charuco corner observations across all cameras and frames.
         image_sizes: Per-camera image size as {name: (width, height)}.
         camera_ids: Ordered list of camera names. Camera 0 is the reference.
         config: Solver configuration.
@@ -55,23 +57,24 @@ def run_pyceres_calibration(
     if len(camera_ids) < 2:
         raise ValueError(f"Need at least 2 cameras, got {len(camera_ids)}")
 
-    if len(all_observations) == 0:
+    if len(observations) == 0:
         raise ValueError("No observations provided")
 
     for camera_id in camera_ids:
         if camera_id not in image_sizes:
             raise KeyError(f"No image size for camera '{camera_id}'")
 
-    # Group observations by camera
-    observations_by_camera: dict[str, list[CharucoCornersObservation]] = {
-        name: [] for name in camera_ids
-    }
-    for obs in all_observations:
-        if obs.camera_name not in observations_by_camera:
-            raise ValueError(
-                f"Observation references unknown camera '{obs.camera_name}'. "
-                f"Known cameras: {camera_ids}"
-            )
+    observed_camera_ids = {observations.camera_ids[i] for i in np.unique(observations.camera_index)}
+    unknown_cameras = observed_camera_ids - set(camera_ids)
+    if unknown_cameras:
+        raise ValueError(
+            f"Observations reference unknown cameras {sorted(unknown_cameras)}. "
+            f"Known cameras: {camera_ids}"
+        )
+
+    # Per-frame views of the table, grouped by camera, for the cv2-based initializers
+    observations_by_camera = {name: [] for name in camera_ids}
+    for obs in observations.to_corners_observations():
         observations_by_camera[obs.camera_name].append(obs)
 
     for camera_id in camera_ids:
@@ -128,7 +131,7 @@ def run_pyceres_calibration(
     logger.info("STEP 3: INITIALIZE BOARD POSES")
     logger.info("=" * 80)
 
-    all_frame_indices = sorted({obs.frame_index for obs in all_observations})
+    all_frame_indices: list[int] = np.unique(observations.frame_index).tolist()
     board_poses_init = initialize_board_poses(
         board=board,
         observations_by_camera=observations_by_camera,
@@ -147,7 +150,7 @@ def run_pyceres_calibration(
     result = run_pyceres_bundle_adjustment(
         cameras=initial_cameras,
         board=board,
-        all_observations=all_observations,
+        observations=observations,
         board_poses_init=board_poses_init,
         config=config,
     )
@@ -174,7 +177,7 @@ def run_pyceres_calibration(
             final_cameras, ground_plane_result = align_to_charuco_groundplane(
                 cameras=final_cameras,
                 board=board,
-                all_observations=all_observations,
+                observations=observations,
             )
         except RuntimeError as e:
             logger.warning(f"Ground plane alignment failed: {e}")
@@ -20,8 +20,9 @@ from skellytracker.core.data_primitives.observation import Observation
 from freemocap.core.tasks.calibration.shared.calibration_result import CalibrationResult
 from freemocap.core.tasks.calibration.shared.calibration_paths import get_last_successful_calibration_toml_path
 from freemocap.core.tasks.calibration.shared.camera_id_resolution import resolve_camera_id_or_raise
+from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
 from freemocap.core.tasks.triangulation.helpers.angulation_result import AngulationResult
-from freemocap.core.tasks.triangulation.helpers.project_single_camera import project_2d_observation_to_3d
+from freemocap.core.tasks.triangulation.helpers.project_single_camera import project_2d_points_to_3d
 from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
 from freemocap.core.tasks.triangulation.triangulator import Triangulator
 
@@ -78,18 +79,28 @@ class CalibrationStateTracker:
         # Rate-limit per-frame diagnostic logs (fire once per root cause category).
         self._logged_no_visible_pts: bool = False
         self._logged_all_reproj_bad: bool = False
+        # Grid step of the precomputed undistortion lookup built on each calibration
+        # load. None => triangulate with cv2.undistortPoints.
+        self._undistortion_lookup_step_px: float | None = None
         # self._timer = PipelineStageTimer(name="CalibrationStateTracker")
 
     @classmethod
-    def create_and_try_load(cls, calibration_toml_path: Path | None = None) -> "CalibrationStateTracker":
+    def create_and_try_load(
+        cls,
+        calibration_toml_path: Path | None = None,
+        undistortion_lookup_step_px: float | None = None,
+    ) -> "CalibrationStateTracker":
         """Create a tracker and optimistically try to load a calibration.
 
         Args:
             calibration_toml_path: Explicit calibration TOML to load from.
                 If None, the canonical most-recent calibration is used.
+            undistortion_lookup_step_px: If set, build a precomputed undistortion
+                lookup with this grid step whenever a calibration is loaded.
         """
         tracker = cls()
         tracker._configured_path = calibration_toml_path
+        tracker._undistortion_lookup_step_px = undistortion_lookup_step_px
         tracker._try_load_latest()
         return tracker
 
@@ -110,6 +121,22 @@ class CalibrationStateTracker:
         self._configured_path = calibration_toml_path
         return self._try_load_from_path(self._resolve_source_path())
 
+    def set_undistortion_lookup_step(self, undistortion_lookup_step_px: float | None) -> bool:
+        """Change the undistortion lookup grid step (live update); None disables the lookup.
+
+        Rebuilds the lookup for the loaded calibration immediately.
+
+        Returns:
+            True if the step changed.
+        """
+        if undistortion_lookup_step_px == self._undistortion_lookup_step_px:
+            return False
+        self._undistortion_lookup_step_px = undistortion_lookup_step_px
+        if self._triangulator is not None:
+            self._triangulator = self._build_triangulator(cameras=self._triangulator.cameras)
+            self._subset_triangulator_cache.clear()
+        return True
+
     @property
     def is_valid(self) -> bool:
         return self._is_valid and self._triangulator is not None
@@ -182,7 +209,7 @@ class CalibrationStateTracker:
         try:
             calibration = CalibrationResult.load_anipose_toml(path)
             cameras = calibration.cameras
-            triangulator = Triangulator(cameras=cameras)
+            triangulator = self._build_triangulator(cameras=cameras)
 
             # Only swap state after everything succeeded
             self._triangulator = triangulator
@@ -205,6 +232,18 @@ class CalibrationStateTracker:
             logger.warning(f"Failed to load calibration from {path}: {e}", exc_info=True)
             return False
 
+    def _build_triangulator(self, *, cameras: list[CameraModel]) -> Triangulator:
+        """Triangulator for `cameras`, with the undistortion lookup built if one is configured."""
+        triangulator = Triangulator(cameras=cameras)
+        if self._undistortion_lookup_step_px is not None:
+            lookup = triangulator.enable_undistortion_lookup(grid_step_px=self._undistortion_lookup_step_px)
+            logger.info(
+                f"Built undistortion lookup ({self._undistortion_lookup_step_px}px grid) - max approximation "
+                f"error per camera: "
+                + ", ".join(f"{cam.id}={err:.4f}px" for cam, err in zip(cameras, lookup.max_error_px))
+            )
+        return triangulator
+
     def try_angulate(
         self,
         *,
@@ -224,13 +263,51 @@ class CalibrationStateTracker:
         path, where reprojection error is undefined) — or None if no valid
         calibration is loaded or triangulation failed.
         """
+        keypoints_by_camera = {
+            cam_id: obs.to_keypoints() for cam_id, obs in frame_observations_by_camera.items()
+        }
+        point_names = tuple(next(iter(keypoints_by_camera.values())).names) if keypoints_by_camera else ()
+        return self.try_angulate_keypoints(
+            frame_number=frame_number,
+            keypoints_2d_by_camera={cam_id: kpts.xyz[:, :2] for cam_id, kpts in keypoints_by_camera.items()},
+            point_names=point_names,
+            image_size_by_camera={
+                cam_id: (int(obs.image_size[0]), int(obs.image_size[1]))
+                for cam_id, obs in frame_observations_by_camera.items()
+            },
+            max_reprojection_error_px=max_reprojection_error_px,
+            triangulation_config=triangulation_config,
+        )
+
+    def try_angulate_keypoints(
+        self,
+        *,
+        frame_number: int,
+        keypoints_2d_by_camera: dict[CameraIdString, NDArray[np.floating]],
+        point_names: tuple[str, ...],
+        image_size_by_camera: dict[CameraIdString, tuple[int, int]],
+        max_reprojection_error_px: float,
+        triangulation_config: TriangulationConfig | None = None,
+    ) -> AngulationResult | None:
+        """``try_angulate`` for keypoints that are already arrays.
+
+        ``keypoints_2d_by_camera`` maps camera id -> (n_points, 2) pixel
+        coordinates, every camera sharing the ``point_names`` order;
+        ``image_size_by_camera`` gives (height, width) for the single-camera
+        planar projection. This is the path for keypoints read straight out of
+        the shared-memory keypoint ring, with no Observation to unpack.
+        """
         if not self.is_valid:
             # Single-camera: projection doesn't need calibration
-            if len(frame_observations_by_camera) == 1:
-                obs = next(iter(frame_observations_by_camera.values()))
+            if len(keypoints_2d_by_camera) == 1:
+                cam_id, points_2d = next(iter(keypoints_2d_by_camera.items()))
                 self._consecutive_failure_count = 0
                 return AngulationResult(
-                    points=project_2d_observation_to_3d(observation=obs),
+                    points=project_2d_points_to_3d(
+                        points_2d=points_2d,
+                        point_names=point_names,
+                        image_size=image_size_by_camera[cam_id],
+                    ),
                     errors_px=None,
                 )
             return None
@@ -243,59 +320,61 @@ class CalibrationStateTracker:
 
             # Detect when the incoming camera set changes (rare: reconnect, etc.)
             # and clear the name-resolution cache so stale entries don't linger.
-            incoming_cam_ids: frozenset[str] = frozenset(frame_observations_by_camera.keys())
+            incoming_cam_ids: frozenset[str] = frozenset(keypoints_2d_by_camera.keys())
             if incoming_cam_ids != self._last_incoming_cam_ids:
                 self._cam_id_name_cache.clear()
                 self._last_incoming_cam_ids = incoming_cam_ids
 
             # Resolve runtime cam_id -> calibration camera name once per cam.
-            matched_obs_by_cam: dict[str, Observation] = {}
-            for cam_id, obs in frame_observations_by_camera.items():
+            matched_points_by_cam: dict[str, NDArray[np.floating]] = {}
+            matched_size_by_cam: dict[str, tuple[int, int]] = {}
+            for cam_id, points_2d in keypoints_2d_by_camera.items():
                 if cam_id not in self._cam_id_name_cache:
                     self._cam_id_name_cache[cam_id] = _match_camera_name(
                         cam_id=cam_id,
                         calibration_camera_names=calibration_camera_ids,
                     )
-                matched_obs_by_cam[self._cam_id_name_cache[cam_id]] = obs
+                matched_points_by_cam[self._cam_id_name_cache[cam_id]] = points_2d
+                matched_size_by_cam[self._cam_id_name_cache[cam_id]] = image_size_by_camera[cam_id]
 
-            if len(matched_obs_by_cam) == 0:
+            if len(matched_points_by_cam) == 0:
                 return AngulationResult(points={}, errors_px={})
-            if len(matched_obs_by_cam) == 1:
-                obs = next(iter(matched_obs_by_cam.values()))
-                result = project_2d_observation_to_3d(observation=obs)
+            if len(matched_points_by_cam) == 1:
+                cam_name, points_2d = next(iter(matched_points_by_cam.items()))
+                result = project_2d_points_to_3d(
+                    points_2d=points_2d,
+                    point_names=point_names,
+                    image_size=matched_size_by_cam[cam_name],
+                )
                 self._consecutive_failure_count = 0
                 return AngulationResult(points=result, errors_px=None)
 
             # Reuse a cached sub-triangulator for this camera subset; only build
             # a new one when we see a novel active-camera combination.
-            active_cam_set: frozenset[str] = frozenset(matched_obs_by_cam.keys())
+            active_cam_set: frozenset[str] = frozenset(matched_points_by_cam.keys())
             if active_cam_set == frozenset(calibration_camera_ids):
                 sub_triangulator = self._triangulator
             elif active_cam_set in self._subset_triangulator_cache:
                 sub_triangulator = self._subset_triangulator_cache[active_cam_set]
             else:
-                sub_triangulator = Triangulator(
-                    cameras=[
-                        cam for cam in self._triangulator.cameras
-                        if cam.id in matched_obs_by_cam
+                # subset() carries the undistortion lookup over, if there is one.
+                sub_triangulator = self._triangulator.subset(
+                    camera_ids=[
+                        cam.id for cam in self._triangulator.cameras
+                        if cam.id in matched_points_by_cam
                     ]
                 )
                 self._subset_triangulator_cache[active_cam_set] = sub_triangulator
             ordered_cam_names: list[str] = sub_triangulator.camera_ids
             n_cameras = len(ordered_cam_names)
 
-            # All observations are now the same Observation type; use to_keypoints()
-            # uniformly. Stack (n_cameras, n_points, 2) then filter to ≥2-camera points.
-            ordered_obs: list[Observation] = [
-                matched_obs_by_cam[c] for c in ordered_cam_names
-            ]
-            first_kpts = ordered_obs[0].to_keypoints()
-            canonical_names: tuple[str, ...] = first_kpts.names
+            # Stack (n_cameras, n_points, 2) then filter to ≥2-camera points.
+            canonical_names: tuple[str, ...] = point_names
 
             _t0 = time.perf_counter()
             stacked = np.stack(
-                [np.ascontiguousarray(obs.to_keypoints().xyz[:, :2], dtype=np.float64)
-                 for obs in ordered_obs]
+                [np.ascontiguousarray(matched_points_by_cam[c], dtype=np.float64)
+                 for c in ordered_cam_names]
             )
             point_names_seq: tuple[str, ...] = canonical_names
             # Filter to points visible in ≥2 cameras
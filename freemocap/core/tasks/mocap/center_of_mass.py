@@ -28,6 +28,15 @@ Confidence tiers
 A ``CoMConfidence`` enum and ``directly_observed_mass`` float are
 included in every result so consumers can make their own validity
 decisions. The CoM is always computed — never NaN-gated.
+
+Compiled kernel
+---------------
+``CenterOfMassKernel`` is the same calculation with the segment
+connections, COM fractions, masses and redistribution chains resolved to
+index/weight arrays once. It computes a whole ``(frames, points, 3)``
+trajectory in a few array operations, with ``calculate_xcom_trajectory`` for
+the XCoM. A single frame is no faster than the dict functions, so the
+realtime aggregator keeps using those.
 """
 from __future__ import annotations
 
@@ -391,3 +400,224 @@ def calculate_center_of_mass_from_canonical(
         directly_observed_mass=directly_observed,
         confidence=_confidence_from_mass(directly_observed),
     )
+
+
+# ---------------------------------------------------------------------------
+# Compiled (index-array) kernel
+# ---------------------------------------------------------------------------
+
+
+_MISSING_POINT = np.full(3, np.nan)
+
+
+@dataclass(slots=True)
+class CenterOfMassTrajectory:
+    """Center of mass for every frame of a ``(frames, points, 3)`` trajectory.
+
+    Attributes
+    ----------
+    total_body_com : np.ndarray of shape (F, 3)
+        Whole-body CoM per frame (zeros when nothing is visible, as the
+        per-frame path).
+    segment_coms : np.ndarray of shape (F, S, 3)
+        Per-segment CoM in ``segment_names`` order; NaN where the segment's
+        endpoints were not both observed.
+    directly_observed_mass : np.ndarray of shape (F,)
+    segment_names : tuple[str, ...]
+    xcom : np.ndarray of shape (F, 3) or None
+        Extrapolated CoM when timestamps were given; NaN rows where XCoM is
+        undefined (first frame, CoM at or below the ground, or dt <= 0).
+    """
+
+    total_body_com: np.ndarray
+    segment_coms: np.ndarray
+    directly_observed_mass: np.ndarray
+    segment_names: tuple[str, ...]
+    xcom: np.ndarray | None = None
+
+
+class CenterOfMassKernel:
+    """``calculate_center_of_mass_from_canonical`` compiled to index/weight arrays.
+
+    Built once from ``BodyBiomechanics``. Points are addressed by position in
+    ``point_names``; a point is missing when any of its coordinates is NaN.
+    Every COM-defined segment keeps its position in ``segment_names``; a
+    segment whose connection is not in the model is simply never visible.
+
+    Mass redistribution walks each chain column by column (distal to
+    proximal), vectorized over frames and chains: a visible segment takes
+    its own mass plus whatever its invisible distal neighbours accumulated,
+    and what is left at the proximal end of a chain lands on the spine.
+    """
+
+    __slots__ = (
+        "point_names", "segment_names",
+        "_proximal", "_distal", "_com_fraction", "_mass",
+        "_chain_segments", "_spine", "_head",
+    )
+
+    def __init__(
+        self,
+        *,
+        point_names: tuple[str, ...],
+        segment_names: tuple[str, ...],
+        proximal: np.ndarray,
+        distal: np.ndarray,
+        com_fraction: np.ndarray,
+        mass: np.ndarray,
+        chain_segments: np.ndarray,
+        spine: int,
+        head: int,
+    ) -> None:
+        self.point_names = point_names
+        self.segment_names = segment_names
+        self._proximal = proximal            # (S,) point index, -1 = no connection
+        self._distal = distal                # (S,)
+        self._com_fraction = com_fraction    # (S,)
+        self._mass = mass                    # (S,)
+        self._chain_segments = chain_segments  # (n_chains, max_len) segment index, -1 = padding
+        self._spine = spine                  # segment index, -1 = not in model
+        self._head = head
+
+    @classmethod
+    def from_biomechanics(cls, biomechanics: BodyBiomechanics) -> "CenterOfMassKernel":
+        if biomechanics.center_of_mass_definitions is None:
+            raise ValueError("No center_of_mass_definitions in biomechanics.")
+        if biomechanics.segment_connections is None:
+            raise ValueError("No segment_connections in biomechanics.")
+        com_defs = biomechanics.center_of_mass_definitions
+        connections = biomechanics.segment_connections
+
+        segment_names = tuple(com_defs)
+        segment_index = {name: i for i, name in enumerate(segment_names)}
+        point_names = tuple(dict.fromkeys(
+            name
+            for seg_name in segment_names
+            if seg_name in connections
+            for name in (connections[seg_name]["proximal"], connections[seg_name]["distal"])
+        ))
+        point_index = {name: i for i, name in enumerate(point_names)}
+
+        def endpoint(seg_name: str, end: str) -> int:
+            connection = connections.get(seg_name)
+            return -1 if connection is None else point_index[connection[end]]
+
+        # Chain members outside the COM table have no mass and are never
+        # visible, so they cannot change the redistribution; drop them.
+        chains = [
+            [segment_index[name] for name in chain if name in segment_index]
+            for chain in biomechanics.segment_chains
+        ]
+        max_len = max((len(chain) for chain in chains), default=0)
+        chain_segments = np.full((len(chains), max_len), -1, dtype=np.intp)
+        for row, chain in enumerate(chains):
+            chain_segments[row, :len(chain)] = chain
+
+        return cls(
+            point_names=point_names,
+            segment_names=segment_names,
+            proximal=np.array([endpoint(name, "proximal") for name in segment_names], dtype=np.intp),
+            distal=np.array([endpoint(name, "distal") for name in segment_names], dtype=np.intp),
+            com_fraction=np.array([com_defs[name]["segment_com_length"] for name in segment_names], dtype=float),
+            mass=np.array([biomechanics.mass_percentages.get(name, 0.0) for name in segment_names], dtype=float),
+            chain_segments=chain_segments,
+            spine=segment_index.get("spine", -1),
+            head=segment_index.get("head", -1),
+        )
+
+    def positions_from_dict(self, canonical_positions: dict[str, np.ndarray]) -> np.ndarray:
+        """``(points, 3)`` array in ``point_names`` order; NaN for absent points."""
+        return np.array(
+            [canonical_positions.get(name, _MISSING_POINT) for name in self.point_names],
+            dtype=float,
+        )
+
+    def compute(
+        self,
+        positions: np.ndarray,
+        *,
+        timestamps: np.ndarray | None = None,
+    ) -> CenterOfMassTrajectory:
+        """Center of mass for a ``(points, 3)`` frame or ``(frames, points, 3)`` trajectory.
+
+        A single frame comes back as a one-frame trajectory. Pass
+        ``timestamps`` (seconds, shape ``(frames,)``) to also get the XCoM.
+        """
+        if positions.ndim == 2:
+            positions = positions[None]
+        n_frames = positions.shape[0]
+        n_segments = len(self.segment_names)
+
+        point_present = np.isfinite(positions).all(axis=2)                    # (F, P)
+        connected = self._proximal >= 0
+        proximal = positions[:, self._proximal]                             # (F, S, 3)
+        distal = positions[:, self._distal]
+        visible = connected & point_present[:, self._proximal] & point_present[:, self._distal]
+        segment_coms = proximal + (distal - proximal) * self._com_fraction[:, None]
+        segment_coms[~visible] = np.nan
+
+        # Effective mass per segment after redistribution, and directly-observed mass.
+        effective_mass = np.zeros((n_frames, n_segments))
+        accumulated = np.zeros((n_frames, self._chain_segments.shape[0]))
+        for column in self._chain_segments.T:
+            in_chain = column >= 0
+            segments = column[in_chain]
+            seg_visible = visible[:, segments]
+            seg_mass = self._mass[segments]
+            effective_mass[:, segments] = np.where(seg_visible, seg_mass + accumulated[:, in_chain], 0.0)
+            accumulated[:, in_chain] = np.where(seg_visible, 0.0, accumulated[:, in_chain] + seg_mass)
+        chain_members = self._chain_segments[self._chain_segments >= 0]
+        directly_observed = (visible[:, chain_members] * self._mass[chain_members]).sum(axis=1)
+
+        if self._spine >= 0:
+            spine_visible = visible[:, self._spine]
+            effective_mass[:, self._spine] = np.where(
+                spine_visible, self._mass[self._spine] + accumulated.sum(axis=1), 0.0,
+            )
+            directly_observed = directly_observed + spine_visible * self._mass[self._spine]
+        if self._head >= 0:
+            head_visible = visible[:, self._head]
+            effective_mass[:, self._head] = np.where(head_visible, self._mass[self._head], 0.0)
+            directly_observed = directly_observed + head_visible * self._mass[self._head]
+
+        total_body_com = np.einsum(
+            "fs,fsk->fk", effective_mass, np.where(visible[..., None], segment_coms, 0.0),
+        )
+
+        return CenterOfMassTrajectory(
+            total_body_com=total_body_com,
+            segment_coms=segment_coms,
+            directly_observed_mass=directly_observed,
+            segment_names=self.segment_names,
+            xcom=None if timestamps is None else calculate_xcom_trajectory(
+                com=total_body_com, timestamps=timestamps,
+            ),
+        )
+
+
+def calculate_xcom_trajectory(
+    *,
+    com: np.ndarray,
+    timestamps: np.ndarray,
+) -> np.ndarray:
+    """``calculate_xcom`` over a whole ``(F, 3)`` CoM trajectory.
+
+    Uses each frame's backward difference for the velocity. Rows where the
+    XCoM is undefined — the first frame, a CoM at or below the ground plane,
+    or a non-increasing timestamp — are NaN (the realtime loop publishes no
+    XCoM for those frames).
+    """
+    xcom = np.full(com.shape, np.nan)
+    if com.shape[0] < 2:
+        return xcom
+    dt = np.diff(timestamps)
+    height = com[1:, 2]
+    valid = (height > 0.0) & (dt > 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        omega_0 = np.sqrt(_GRAVITY / height)
+        velocity = (com[1:] - com[:-1]) / dt[:, None]
+        xcom[1:, :2] = com[1:, :2] + velocity[:, :2] / omega_0[:, None]
+    xcom[1:, 2] = 0.0
+    xcom[1:][~valid] = np.nan
+    return xcom
+
@@ -1,5 +1,7 @@
 
 import logging
+import tempfile
+from collections.abc import Callable
 from pathlib import Path
 
 import numpy as np
@@ -11,9 +13,11 @@ from skellyforge.post_processing.interpolation.interpolation_config import Inter
 from skellyforge.skellymodels.managers.human import Human
 
 
+from freemocap.core.pipeline.posthoc.task_progress_reporter import TaskProgressReporter
 from freemocap.core.tasks.calibration.shared.calibration_result import CalibrationResult
+from freemocap.core.tasks.triangulation.helpers.sharded_triangulation import triangulate_sharded
 from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
-from freemocap.core.tracking.observation_buffer import ObservationBuffer
+from freemocap.core.tasks.triangulation.helpers.triangulation_result import TriangulationResult
 from skellycam.core.types.type_overloads import CameraIdString
 
 from freemocap.core.tasks.triangulation.helpers.project_single_camera import project_2d_batch_to_3d
@@ -22,21 +26,60 @@ from freemocap.core.tasks.triangulation.triangulator import Triangulator
 logger = logging.getLogger(__name__)
 
 
-def skeleton_from_mediapipe_observation_recorders(
+def skeleton_from_keypoint_arrays(
     detector:str,
-    observation_recorders: dict[CameraIdString, ObservationBuffer],
+    keypoints_by_camera: dict[CameraIdString, np.ndarray],
     path_to_calibration_toml: Path | str | None,
     path_to_output_data_folder: Path | str,
     triangulation_config: TriangulationConfig | None = None,
     interp_config: InterpolationConfig | None = None,
     filter_config: FilterConfig | None = None,
+    reporter: TaskProgressReporter | None = None,
 ) -> Human:
     """Triangulate skeleton 2D observations into a 3D skeleton.
 
-    Camera matching: observation_recorders keys (CameraIdString)
+    `keypoints_by_camera` holds one (frames, keypoints, 3) array per camera.
+    Camera matching: keypoints_by_camera keys (CameraIdString)
     are matched to calibration camera names. Each key must have an exact match
     in the calibration file's camera names.
+
+    `reporter` receives per-shard triangulation progress when
+    `triangulation_config.num_shard_workers` is set.
     """
+    Path(path_to_output_data_folder).mkdir(parents=True, exist_ok=True)
+    # Chunked triangulation memory-maps its full-length outputs into a scratch folder in the
+    # system temp dir. _skeleton_from_keypoint_arrays drops every reference to them before
+    # returning, so they are closed before the folder is removed; cleanup errors are only
+    # ignored for a failed run, whose traceback can still hold them open.
+    with tempfile.TemporaryDirectory(
+        prefix="freemocap_triangulation_",
+        ignore_cleanup_errors=True,
+    ) as scratch_folder:
+        return _skeleton_from_keypoint_arrays(
+            detector=detector,
+            keypoints_by_camera=keypoints_by_camera,
+            path_to_calibration_toml=path_to_calibration_toml,
+            path_to_output_data_folder=path_to_output_data_folder,
+            triangulation_config=triangulation_config,
+            interp_config=interp_config,
+            filter_config=filter_config,
+            reporter=reporter,
+            scratch_folder=Path(scratch_folder),
+        )
+
+
+def _skeleton_from_keypoint_arrays(
+    *,
+    detector: str,
+    keypoints_by_camera: dict[CameraIdString, np.ndarray],
+    path_to_calibration_toml: Path | str | None,
+    path_to_output_data_folder: Path | str,
+    triangulation_config: TriangulationConfig | None,
+    interp_config: InterpolationConfig | None,
+    filter_config: FilterConfig | None,
+    reporter: TaskProgressReporter | None,
+    scratch_folder: Path,
+) -> Human:
     if triangulation_config is None:
         triangulation_config = TriangulationConfig()
     if interp_config is None:
@@ -44,22 +87,16 @@ def skeleton_from_mediapipe_observation_recorders(
     if filter_config is None:
         filter_config = FilterConfig()
 
-    Path(path_to_output_data_folder).mkdir(parents=True, exist_ok=True)
-
-    if len(observation_recorders) == 0:
-        raise ValueError("No observation recorders provided to process.")
+    if len(keypoints_by_camera) == 0:
+        raise ValueError("No camera keypoints provided to process.")
 
-    # Extract 2D data from observation buffers
-    data2d_by_camera: dict[CameraIdString, np.ndarray] = {}
-    for camera_id, buf in observation_recorders.items():
-        data2d_fr_id_xyc = buf.to_keypoints_array().copy()
-        logger.info(f"Processing camera ID: {camera_id} with 2D data shape: {data2d_fr_id_xyc.shape}")
-        data2d_by_camera[camera_id] = data2d_fr_id_xyc[..., :2]
-
-    camera_ids = list(data2d_by_camera.keys())
+    camera_ids = list(keypoints_by_camera.keys())
+    sharded = triangulation_config.num_shard_workers is not None and len(camera_ids) > 1
+    # Sharding takes precedence; chunk_size_frames then sets the shard size.
+    chunked = triangulation_config.chunk_size_frames is not None and len(camera_ids) > 1 and not sharded
 
     if len(camera_ids) == 1:
-        data2d = data2d_by_camera[camera_ids[0]]
+        data2d = keypoints_by_camera[camera_ids[0]][..., :2].astype(np.float64)
         result = project_2d_batch_to_3d(data2d=data2d)
     else:
         calibration = CalibrationResult.load_anipose_toml(Path(path_to_calibration_toml))
@@ -67,10 +104,30 @@ def skeleton_from_mediapipe_observation_recorders(
             calibration=calibration,
             camera_ids=camera_ids,
         )
-        result = triangulator.triangulate(
-            data2d=data2d_by_camera,
-            config=triangulation_config,
-        )
+        if sharded:
+            result = triangulate_sharded(
+                triangulator=triangulator,
+                load_chunk=_keypoint_chunk_loader(keypoints_by_camera=keypoints_by_camera),
+                n_frames=_common_frame_count(keypoints_by_camera=keypoints_by_camera),
+                config=triangulation_config,
+                reporter=reporter,
+            )
+        elif chunked:
+            result = _triangulate_keypoints_chunked(
+                triangulator=triangulator,
+                keypoints_by_camera=keypoints_by_camera,
+                triangulation_config=triangulation_config,
+                scratch_folder=scratch_folder,
+            )
+        else:
+            data2d_by_camera: dict[CameraIdString, np.ndarray] = {}
+            for camera_id, keypoints in keypoints_by_camera.items():
+                logger.info(f"Processing camera ID: {camera_id} with 2D data shape: {keypoints.shape}")
+                data2d_by_camera[camera_id] = keypoints[..., :2].astype(np.float64)
+            result = triangulator.triangulate(
+                data2d=data2d_by_camera,
+                config=triangulation_config,
+            )
     raw_3d = result.points_3d
 
     # Persist per-camera weights as a sibling NPY (only useful when outlier rejection is on,
@@ -86,7 +143,10 @@ def skeleton_from_mediapipe_observation_recorders(
         start_frame=0,
         end_frame=n_frames,
         triangulated_data=raw_3d,
-        reprojection_error=np.nanmean(result.reprojection_error, axis=0),
+        reprojection_error=_mean_over_cameras(
+            reprojection_error_by_camera=result.reprojection_error,
+            chunk_size_frames=triangulation_config.chunk_size_frames or n_frames,
+        ),
         reprojection_error_by_camera=result.reprojection_error,
     )
 
@@ -111,10 +171,16 @@ def skeleton_from_mediapipe_observation_recorders(
         case _:
             raise ValueError(f"Unknown detector: {detector}")
 
+    tracked_points = filtered_trajectory_3d.triangulated_data
+    if _is_memory_mapped(tracked_points):  # interpolation and filtering were no-ops
+        tracked_points = np.array(tracked_points)
+    # Close the chunked triangulation's memory maps (if any) before the scratch folder goes.
+    del result, raw_3d, raw_trajectory_3d, interpolated_trajectory_3d, filtered_trajectory_3d
+
     skeleton: Human = Human.from_tracked_points_numpy_array(
         name="human",
         model_info=model_info,
-        tracked_points_numpy_array=filtered_trajectory_3d.triangulated_data,
+        tracked_points_numpy_array=tracked_points,
     )
 
     print("DETECTOR: ", detector)
@@ -142,3 +208,82 @@ def skeleton_from_mediapipe_observation_recorders(
     skeleton.save_out_all_xyz_numpy_data(path_to_output_data_folder)
 
     return skeleton
+
+
+def _triangulate_keypoints_chunked(
+    *,
+    triangulator: Triangulator,
+    keypoints_by_camera: dict[CameraIdString, np.ndarray],
+    triangulation_config: TriangulationConfig,
+    scratch_folder: Path,
+) -> TriangulationResult:
+    """Stream the keypoints through `Triangulator.triangulate_chunked`, one frame window at a time.
+
+    Only one window of 2D data is ever converted to float64, and the outputs
+    (points, per-camera weights and per-camera reprojection error) are
+    memory-mapped into `scratch_folder`. This removes the full-length float64
+    copy of every camera's 2D data and the in-RAM outputs from the task's peak,
+    but not the full-length arrays that come after it: the float32 keypoint
+    arrays passed in, and the (frames, points, 3) float64 trajectories that
+    interpolation, filtering and the skeleton each keep in RAM.
+    """
+    n_frames = _common_frame_count(keypoints_by_camera=keypoints_by_camera)
+
+    logger.info(
+        f"Triangulating {n_frames} frames from {len(keypoints_by_camera)} cameras in chunks of "
+        f"{triangulation_config.chunk_size_frames} frames"
+    )
+
+    return triangulator.triangulate_chunked(
+        load_chunk=_keypoint_chunk_loader(keypoints_by_camera=keypoints_by_camera),
+        n_frames=n_frames,
+        config=triangulation_config,
+        output_folder=scratch_folder,
+    )
+
+
+def _common_frame_count(*, keypoints_by_camera: dict[CameraIdString, np.ndarray]) -> int:
+    frame_counts = {camera_id: keypoints.shape[0] for camera_id, keypoints in keypoints_by_camera.items()}
+    n_frames = next(iter(frame_counts.values()))
+    if any(count != n_frames for count in frame_counts.values()):
+        raise ValueError(f"Camera keypoints have mismatched frame counts: {frame_counts}")
+    return n_frames
+
+
+def _keypoint_chunk_loader(
+    *,
+    keypoints_by_camera: dict[CameraIdString, np.ndarray],
+) -> Callable[[int, int], dict[CameraIdString, np.ndarray]]:
+    """`load_chunk(start, stop)` that converts only frames [start, stop) to float64 2D data."""
+    def _load_chunk(start: int, stop: int) -> dict[CameraIdString, np.ndarray]:
+        return {
+            camera_id: keypoints[start:stop, :, :2].astype(np.float64)
+            for camera_id, keypoints in keypoints_by_camera.items()
+        }
+    return _load_chunk
+
+
+def _is_memory_mapped(array: np.ndarray) -> bool:
+    """True if `array` is, or is a view of, an `np.memmap`."""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base if isinstance(array, np.ndarray) else None
+    return False
+
+
+def _mean_over_cameras(
+    *,
+    reprojection_error_by_camera: np.ndarray,
+    chunk_size_frames: int,
+) -> np.ndarray:
+    """nanmean over the camera axis of (n_cameras, n_frames, n_points), one frame window at a time.
+
+    Keeps nanmean's full-size temporaries bounded when the input is a memory map.
+    """
+    n_frames = reprojection_error_by_camera.shape[1]
+    out = np.empty(reprojection_error_by_camera.shape[1:], dtype=np.float64)
+    for start in range(0, n_frames, chunk_size_frames):
+        stop = min(start + chunk_size_frames, n_frames)
+        out[start:stop] = np.nanmean(reprojection_error_by_camera[:, start:stop], axis=0)
+    return out
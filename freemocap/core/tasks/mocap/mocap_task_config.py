@@ -95,6 +95,32 @@ class PosthocMocapPipelineConfig(BaseModel):
         gt=0.0,
         description="Frames per second of the recorded video. Used to compute redetect_interval (redetect every 5 s). Set this from cv2.CAP_PROP_FPS before constructing the config for accurate cadence.",
     )
+    inference_batch_size: int = Field(
+        default=1,
+        alias="inferenceBatchSize",
+        ge=1,
+        le=64,
+        description="Consecutive video frames per detector call in the posthoc video nodes. 8-16 raises CPU ONNX throughput substantially; frames within a batch all start from the tracker state left by the previous batch, so 1 keeps strictly frame-by-frame bbox tracking.",
+    )
+    frame_queue_depth: int = Field(
+        default=4,
+        alias="frameQueueDepth",
+        ge=1,
+        le=64,
+        description="Decoded frames buffered ahead of detection (and annotated frames ahead of the video encoder) per posthoc video node. Each buffered 4K frame is ~24 MB.",
+    )
+    frame_shards_per_video: int = Field(
+        default=1,
+        alias="frameShardsPerVideo",
+        ge=1,
+        le=64,
+        description="Split each video into up to this many contiguous frame ranges detected in parallel (each with its own tracker). Useful when there are more cores than cameras; sharded videos get no annotated video output.",
+    )
+    use_detection_cache: bool = Field(
+        default=False,
+        alias="useDetectionCache",
+        description="Save each camera's 2D detections (keypoints only, no bounding boxes) under output_data/detection_cache and reuse them on later runs with the same video, detector config and skellytracker version; interrupted runs resume after the last saved frame. Nothing prunes the folder; delete it to reclaim space.",
+    )
     tracker_config: TrackerConfig | None = Field(default=None)
     calibration_toml_path: str | None = Field(
         default=None,
@@ -1,7 +1,7 @@
 """
 run_mocap_task: posthoc motion capture processing.
 
-Receives collected mediapipe observations, builds skeleton via triangulation.
+Receives collected skeleton keypoints, builds skeleton via triangulation.
 
 Called by PosthocAggregationNode after all frames are collected.
 Pre-bind task_config via functools.partial when creating the pipeline.
@@ -22,7 +22,6 @@ from pathlib import Path
 import pyarrow  # noqa: F401
 
 from freemocap.core.tasks.mocap.mocap_task_config import PosthocMocapPipelineConfig  # noqa: TC001
-from skellytracker.core.data_primitives.observation import Observation  # noqa: TC002
 from skellycam.core.recorders.videos.recording_info import RecordingInfo  # noqa: TC002
 
 from freemocap.core.blender.export_to_blender import export_to_blender
@@ -31,8 +30,8 @@ from freemocap.core.pipeline.posthoc.task_progress_reporter import TaskProgressR
 from freemocap.core.tasks.calibration.shared.calibration_paths import get_last_successful_calibration_toml_path
 from freemocap.core.tasks.mocap.mocap_helpers.recording_framerate import get_recording_framerate
 from freemocap.core.tasks.mocap.mocap_helpers.skeleton_from_mediapipe_observations import \
-    skeleton_from_mediapipe_observation_recorders
-from freemocap.core.tracking.observation_buffer import ObservationBuffer
+    skeleton_from_keypoint_arrays
+from freemocap.core.tracking.keypoint_columns import KeypointColumns  # noqa: TC001
 from freemocap.core.tracking.tracker_definitions import RTMPOSE_WHOLEBODY_DEFINITION
 from skellycam.core.types.type_overloads import CameraIdString  # noqa: TC002
 
@@ -42,7 +41,7 @@ logger = logging.getLogger(__name__)
 
 def run_posthoc_mocap_aggregator_task(
         *,
-        frame_observations: list[dict[CameraIdString, Observation]],
+        keypoint_columns: KeypointColumns,
         recording_info: RecordingInfo,
         video_metadata: dict[CameraIdString, VideoMetadata],
         task_config: PosthocMocapPipelineConfig,
@@ -52,7 +51,7 @@ def run_posthoc_mocap_aggregator_task(
     Run posthoc motion capture on collected skeleton observations.
 
     Args:
-        frame_observations: Per-frame dict of {camera_id: Observation}.
+        keypoint_columns: Collected (camera, frame, point, xyz) keypoints.
         recording_info: Recording metadata.
         video_metadata: Per-camera metadata.
         reporter: Progress reporter for named stage updates.
@@ -61,16 +60,10 @@ def run_posthoc_mocap_aggregator_task(
     _reporter = reporter or TaskProgressReporter.noop()
     camera_ids = list(video_metadata.keys())
 
-    # ---- Build observation buffers ----
-    _reporter.report(stage=MocapStage.BUILDING_RECORDERS, detail="Building observation buffers")
+    # ---- Per-camera keypoint arrays (views into the aggregation node's columns) ----
+    _reporter.report(stage=MocapStage.BUILDING_RECORDERS, detail="Gathering per-camera keypoints")
 
-    observation_recorders: dict[CameraIdString, ObservationBuffer] = {
-        cam_id: ObservationBuffer() for cam_id in camera_ids
-    }
-
-    for frame_idx, frame_obs in enumerate(frame_observations):
-        for cam_id, obs in frame_obs.items():
-            observation_recorders[cam_id].add_observation(obs)
+    keypoints_by_camera = {cam_id: keypoint_columns.camera_xyz(cam_id) for cam_id in camera_ids}
 
     # ---- Get calibration path: not needed for single-camera (planar projection fallback) ----
     recording_folder = Path(recording_info.full_recording_path)
@@ -130,13 +123,14 @@ def run_posthoc_mocap_aggregator_task(
 
     output_folder = Path(recording_info.full_recording_path) / "output_data"
 
-    skeleton = skeleton_from_mediapipe_observation_recorders(
+    skeleton = skeleton_from_keypoint_arrays(
         detector= task_config.detector_type,
-        observation_recorders=observation_recorders,
+        keypoints_by_camera=keypoints_by_camera,
         path_to_calibration_toml=calibration_toml_path,
         path_to_output_data_folder=output_folder,
         filter_config=filter_config,
-        triangulation_config=task_config.triangulation_config
+        triangulation_config=task_config.triangulation_config,
+        reporter=_reporter,
     )
 
     # ---- Save tracker schema alongside outputs ----
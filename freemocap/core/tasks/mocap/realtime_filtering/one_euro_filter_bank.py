@@ -0,0 +1,161 @@
+"""
+One Euro filter bank: many independent One Euro filters stepped as arrays.
+
+Same maths as ``OneEuroFilter1D`` (see one_euro_filter.py for the filter
+itself and the reference), but the state of every point lives in
+``(n_points, dims)`` arrays so a whole skeleton is smoothed in a handful of
+numpy operations instead of ``n_points * dims`` Python method calls.
+
+Each row is one point; each column one axis, filtered independently exactly
+as a tuple of ``OneEuroFilter1D`` would. Rows are stepped selectively through
+boolean masks, and each row keeps its own previous timestamp, so points that
+are missing for a while see the true elapsed time when they come back.
+
+Usage:
+    bank = OneEuroFilterBank(n_points=133, dims=3, min_cutoff=1.0, beta=0.007)
+    for t, xyz, observed in stream:                 # xyz (133, 3), observed (133,)
+        smooth = bank(t=t, x=xyz, observed=observed)
+        gap = bank.initialized & ~observed
+        smooth[gap] = bank.predict(t=t, mask=gap, velocity_decay=0.75)[gap]
+"""
+
+import math
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class OneEuroFilterBank:
+    """``n_points`` independent ``dims``-axis One Euro filters with array state."""
+
+    __slots__ = ("dims", "min_cutoff", "beta", "d_cutoff", "x_prev", "dx_prev", "t_prev", "initialized")
+
+    def __init__(
+        self,
+        *,
+        n_points: int,
+        dims: int = 3,
+        min_cutoff: float = 1.0,
+        beta: float = 0.0,
+        d_cutoff: float = 1.0,
+    ) -> None:
+        if n_points < 0 or dims < 1:
+            raise ValueError(f"Need n_points >= 0 and dims >= 1, got n_points={n_points}, dims={dims}")
+        self.dims: int = dims
+        self.min_cutoff: float = min_cutoff
+        self.beta: float = beta
+        self.d_cutoff: float = d_cutoff
+        self.x_prev: NDArray[np.float64] = np.zeros((n_points, dims))
+        self.dx_prev: NDArray[np.float64] = np.zeros((n_points, dims))
+        self.t_prev: NDArray[np.float64] = np.zeros(n_points)
+        # Rows that have been seeded with a first observation. Uninitialized
+        # rows are never filtered or predicted.
+        self.initialized: NDArray[np.bool_] = np.zeros(n_points, dtype=bool)
+
+    @property
+    def n_points(self) -> int:
+        return self.initialized.shape[0]
+
+    def add_points(self, count: int) -> int:
+        """Append ``count`` uninitialized rows; returns the index of the first new row."""
+        first_row = self.n_points
+        self.x_prev = np.concatenate([self.x_prev, np.zeros((count, self.dims))])
+        self.dx_prev = np.concatenate([self.dx_prev, np.zeros((count, self.dims))])
+        self.t_prev = np.concatenate([self.t_prev, np.zeros(count)])
+        self.initialized = np.concatenate([self.initialized, np.zeros(count, dtype=bool)])
+        return first_row
+
+    def _elapsed(self, *, t: float, rows: NDArray[np.intp]) -> NDArray[np.float64]:
+        t_e = t - self.t_prev[rows]
+        if np.any(t_e <= 0.0):
+            raise ValueError(
+                f"Time must be strictly increasing: "
+                f"t_prev={self.t_prev[rows].max()}, t={t}"
+            )
+        return t_e
+
+    def __call__(
+        self,
+        *,
+        t: float,
+        x: NDArray[np.floating],
+        observed: NDArray[np.bool_],
+    ) -> NDArray[np.float64]:
+        """Filter the ``observed`` rows of ``x`` (shape ``(n_points, dims)``).
+
+        Observed rows that were not initialized yet are seeded and returned
+        unfiltered, like a freshly constructed ``OneEuroFilter1D``. Rows that
+        were not observed are left untouched and come back as NaN.
+        """
+        if x.shape != (self.n_points, self.dims) or observed.shape != (self.n_points,):
+            raise ValueError(
+                f"Expected x {(self.n_points, self.dims)} and observed {(self.n_points,)}, "
+                f"got {x.shape} and {observed.shape}"
+            )
+        out = np.full((self.n_points, self.dims), np.nan)
+        rows = np.flatnonzero(observed & self.initialized)
+        seed = np.flatnonzero(observed & ~self.initialized)
+
+        if rows.size:
+            t_e = self._elapsed(t=t, rows=rows)[:, None]
+            x_rows = x[rows]
+            x_prev = self.x_prev[rows]
+
+            # Filtered derivative
+            r_d = 2.0 * math.pi * self.d_cutoff * t_e
+            a_d = r_d / (r_d + 1.0)
+            dx = (x_rows - x_prev) / t_e
+            dx_hat = a_d * dx + (1.0 - a_d) * self.dx_prev[rows]
+
+            # Adaptive cutoff
+            cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+            r = 2.0 * math.pi * cutoff * t_e
+            a = r / (r + 1.0)
+            x_hat = a * x_rows + (1.0 - a) * x_prev
+
+            self.x_prev[rows] = x_hat
+            self.dx_prev[rows] = dx_hat
+            self.t_prev[rows] = t
+            out[rows] = x_hat
+
+        if seed.size:
+            self.x_prev[seed] = x[seed]
+            self.dx_prev[seed] = 0.0
+            self.t_prev[seed] = t
+            self.initialized[seed] = True
+            out[seed] = x[seed]
+        return out
+
+    def predict(
+        self,
+        *,
+        t: float,
+        mask: NDArray[np.bool_],
+        velocity_decay: float,
+    ) -> NDArray[np.float64]:
+        """Extrapolate the ``mask`` rows from their stored filtered velocity.
+
+        Same semantics as ``OneEuroFilter1D.predict``: state is advanced to
+        ``t`` and the velocity decays by ``velocity_decay`` per call. Rows
+        outside ``mask`` are left untouched and come back as NaN.
+        """
+        if mask.shape != (self.n_points,):
+            raise ValueError(f"Expected mask {(self.n_points,)}, got {mask.shape}")
+        if np.any(mask & ~self.initialized):
+            raise ValueError("Cannot predict points that have never been observed")
+        out = np.full((self.n_points, self.dims), np.nan)
+        rows = np.flatnonzero(mask)
+        if rows.size:
+            t_e = self._elapsed(t=t, rows=rows)[:, None]
+            dx_prev = self.dx_prev[rows]
+            x_predicted = self.x_prev[rows] + dx_prev * t_e
+
+            self.x_prev[rows] = x_predicted
+            self.dx_prev[rows] = dx_prev * velocity_decay
+            self.t_prev[rows] = t
+            out[rows] = x_predicted
+        return out
+
+    def reset(self) -> None:
+        """Forget every point's state (rows stay allocated but uninitialized)."""
+        self.initialized[:] = False
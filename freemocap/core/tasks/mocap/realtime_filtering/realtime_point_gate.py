@@ -14,9 +14,14 @@ and accepts the next observation unconditionally.
 The gate always returns positions for every input point — rejected points
 get their last-accepted position substituted. The `held_names` field on
 `GateResult` tells the caller which points are held vs. freshly accepted.
+
+State lives in fixed ``(n_points, 3)`` arrays: each point name gets a row the
+first time it is seen and keeps it, so ``gate_array`` checks a whole frame
+with boolean masks. ``gate`` is the dict adapter over it.
 """
 
 import logging
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 import numpy as np
@@ -37,6 +42,17 @@ class GateResult:
     held_names: frozenset[str]
 
 
+@dataclass(frozen=True)
+class ArrayGateResult:
+    """Result from ``RealtimePointGate.gate_array``, in the gate's row layout."""
+
+    # (n_points, 3): present rows hold the fresh or held position, absent rows are NaN.
+    positions: NDArray[np.float64]
+
+    # (n_points,) bool: rows whose position is held (i.e. were rejected this frame).
+    held: NDArray[np.bool_]
+
+
 class RealtimePointGate:
     """Rejects 3D points whose frame-to-frame velocity exceeds a threshold.
 
@@ -52,9 +68,103 @@ class RealtimePointGate:
     ) -> None:
         self._max_velocity: float = max_velocity_mm_per_s
         self._max_rejected_streak: int = max_rejected_streak
-        self._accepted_positions: dict[str, NDArray[np.float64]] = {}
         self._previous_t: float | None = None
-        self._rejected_streak: dict[str, int] = {}
+        # Row layout: fixed once a name is assigned, new names are appended.
+        self._point_names: list[str] = []
+        self._row_by_name: dict[str, int] = {}
+        self._accepted_positions: NDArray[np.float64] = np.zeros((0, 3))
+        self._seen: NDArray[np.bool_] = np.zeros(0, dtype=bool)
+        self._rejected_streak: NDArray[np.int64] = np.zeros(0, dtype=np.int64)
+
+    @property
+    def point_names(self) -> list[str]:
+        """Point name of each row, in row order."""
+        return self._point_names
+
+    def rows_for(self, names: Iterable[str]) -> NDArray[np.intp]:
+        """Row index for each name, assigning rows to names not seen before."""
+        rows = []
+        for name in names:
+            row = self._row_by_name.get(name)
+            if row is None:
+                row = len(self._point_names)
+                self._row_by_name[name] = row
+                self._point_names.append(name)
+            rows.append(row)
+        added = len(self._point_names) - self._seen.shape[0]
+        if added:
+            self._accepted_positions = np.concatenate([self._accepted_positions, np.zeros((added, 3))])
+            self._seen = np.concatenate([self._seen, np.zeros(added, dtype=bool)])
+            self._rejected_streak = np.concatenate([self._rejected_streak, np.zeros(added, dtype=np.int64)])
+        return np.asarray(rows, dtype=np.intp)
+
+    def pack(
+        self,
+        points: dict[str, NDArray[np.float64]],
+    ) -> tuple[NDArray[np.float64], NDArray[np.bool_]]:
+        """``(n_points, 3)`` positions (NaN where absent) and presence mask for a point dict."""
+        rows = self.rows_for(points)
+        positions = np.full((len(self._point_names), 3), np.nan)
+        present = np.zeros(len(self._point_names), dtype=bool)
+        if rows.size:
+            positions[rows] = np.stack(list(points.values()))
+            present[rows] = True
+        return positions, present
+
+    def gate_array(
+        self,
+        *,
+        t: float,
+        positions: NDArray[np.float64],
+        present: NDArray[np.bool_],
+    ) -> ArrayGateResult:
+        """Gate a whole frame in the gate's row layout (see ``rows_for`` / ``pack``).
+
+        Args:
+            t: timestamp in seconds (must be strictly increasing).
+            positions: (n_points, 3) raw triangulated positions.
+            present: (n_points,) rows observed this frame; other rows are
+                ignored and their state is left untouched.
+
+        Returns:
+            ArrayGateResult with a position for every present row and the held mask.
+        """
+        n_points = len(self._point_names)
+        if positions.shape != (n_points, 3) or present.shape != (n_points,):
+            raise ValueError(
+                f"Expected positions {(n_points, 3)} and present {(n_points,)}, "
+                f"got {positions.shape} and {present.shape}"
+            )
+
+        if self._previous_t is None:
+            # First frame — accept everything
+            accept = present.copy()
+        else:
+            dt = t - self._previous_t
+            if dt <= 0.0:
+                raise ValueError(
+                    f"Time must be strictly increasing: "
+                    f"prev={self._previous_t}, t={t}, dt={dt}"
+                )
+            # Never-before-seen points and points past the staleness timeout
+            # are accepted unconditionally to prevent lockout.
+            unconditional = ~self._seen | (self._rejected_streak >= self._max_rejected_streak)
+            velocity = np.linalg.norm(positions - self._accepted_positions, axis=1) / dt
+            with np.errstate(invalid="ignore"):
+                accept = present & (unconditional | (velocity <= self._max_velocity))
+        held = present & ~accept
+
+        # Rejected — return held position, do NOT update reference
+        self._accepted_positions[accept] = positions[accept]
+        self._seen |= accept
+        self._rejected_streak[accept] = 0
+        self._rejected_streak[held] += 1
+        self._previous_t = t
+
+        gated = np.full((n_points, 3), np.nan)
+        gated[accept] = positions[accept]
+        gated[held] = self._accepted_positions[held]
+        return ArrayGateResult(positions=gated, held=held)
 
     def gate(
         self,
@@ -64,6 +174,8 @@ class RealtimePointGate:
     ) -> GateResult:
         """Return positions for all input points, holding last-accepted for rejected ones.
 
+        Dict adapter over ``gate_array``.
+
         Args:
             t: timestamp in seconds (must be strictly increasing).
             points: raw triangulated positions, mapping name -> (3,) array.
@@ -71,65 +183,15 @@ class RealtimePointGate:
         Returns:
             GateResult with positions for every input point and the set of held names.
         """
-        if self._previous_t is None:
-            # First frame — accept everything, store state
-            self._accepted_positions = {
-                name: pos.copy() for name, pos in points.items()
-            }
-            self._previous_t = t
-            self._rejected_streak = {name: 0 for name in points}
-            return GateResult(
-                positions=dict(points),
-                held_names=frozenset(),
-            )
-
-        dt = t - self._previous_t
-        if dt <= 0.0:
-            raise ValueError(
-                f"Time must be strictly increasing: "
-                f"prev={self._previous_t}, t={t}, dt={dt}"
-            )
-
-        result_positions: dict[str, NDArray[np.float64]] = {}
-        held: set[str] = set()
-
-        for name, pos in points.items():
-            if name not in self._accepted_positions:
-                # Never-before-seen point — accept unconditionally
-                result_positions[name] = pos
-                self._accepted_positions[name] = pos.copy()
-                self._rejected_streak[name] = 0
-                continue
-
-            streak = self._rejected_streak.get(name, 0)
-            if streak >= self._max_rejected_streak:
-                # Staleness timeout — accept unconditionally to prevent lockout
-                result_positions[name] = pos
-                self._accepted_positions[name] = pos.copy()
-                self._rejected_streak[name] = 0
-                continue
-
-            distance = float(np.linalg.norm(pos - self._accepted_positions[name]))
-            velocity = distance / dt
-
-            if velocity <= self._max_velocity:
-                result_positions[name] = pos
-                self._accepted_positions[name] = pos.copy()
-                self._rejected_streak[name] = 0
-            else:
-                # Rejected — return held position, do NOT update reference
-                result_positions[name] = self._accepted_positions[name].copy()
-                self._rejected_streak[name] = streak + 1
-                held.add(name)
-
-        self._previous_t = t
+        positions, present = self.pack(points)
+        result = self.gate_array(t=t, positions=positions, present=present)
         return GateResult(
-            positions=result_positions,
-            held_names=frozenset(held),
+            positions={name: result.positions[self._row_by_name[name]] for name in points},
+            held_names=frozenset(self._point_names[row] for row in np.flatnonzero(result.held).tolist()),
         )
 
     def reset(self) -> None:
         """Clear all state. Call when calibration changes."""
-        self._accepted_positions.clear()
         self._previous_t = None
-        self._rejected_streak.clear()
+        self._seen[:] = False
+        self._rejected_streak[:] = 0
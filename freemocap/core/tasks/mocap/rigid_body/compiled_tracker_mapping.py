@@ -0,0 +1,91 @@
+"""Tracker->canonical keypoint mappings resolved to a weight matrix.
+
+``TrackerMapping.apply`` remaps a ``dict[name, (3,) ndarray]`` one canonical
+point at a time. The realtime rigidifier applies three mappings (body, right
+hand, left hand) to two keypoint sets every frame, so it compiles them once
+into a ``(n_canonical, n_sources)`` weight matrix over a shared source index
+and remaps a whole frame with one matrix product.
+
+Supported entry forms (the shapes used by the mapping YAMLs):
+
+    canonical_name: tracker_name                      # copy
+    canonical_name: [tracker_a, tracker_b]            # mean
+    canonical_name: {tracker_a: 0.7, tracker_b: 0.3}  # weighted sum
+
+A canonical point is present only when every tracker point it draws on is
+present. Any other entry form raises ``ValueError``, which fails
+``RealtimeSkeletonRigidifier.create`` loudly.
+"""
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray  # noqa: TC002
+
+
+def parse_mapping_entries(entries: dict, *, prefix: str = "") -> dict[str, dict[str, float]]:
+    """``canonical -> {prefixed tracker name: weight}`` for every mapping entry."""
+    parsed: dict[str, dict[str, float]] = {}
+    for canonical, spec in entries.items():
+        if isinstance(spec, str):
+            weights = {spec: 1.0}
+        elif isinstance(spec, (list, tuple)) and spec and all(isinstance(name, str) for name in spec):
+            weights = {name: 1.0 / len(spec) for name in spec}
+        elif isinstance(spec, dict) and spec and all(
+            isinstance(name, str) and isinstance(weight, (int, float)) for name, weight in spec.items()
+        ):
+            weights = {name: float(weight) for name, weight in spec.items()}
+        else:
+            raise ValueError(f"Cannot compile tracker mapping entry {canonical!r}: {spec!r}")
+        parsed[str(canonical)] = {f"{prefix}{name}": weight for name, weight in weights.items()}
+    return parsed
+
+
+class CompiledTrackerMapping:
+    """One tracker->canonical mapping as a dense weight matrix over a shared source index.
+
+    Rows follow ``canonical_names`` (typically a ``TreeRigidifier``'s joint
+    order); names with no mapping entry are never present.
+    """
+
+    __slots__ = ("canonical_names", "_weights", "_uses_source", "_mapped")
+
+    def __init__(
+        self,
+        *,
+        sources_by_canonical: dict[str, dict[str, float]],
+        canonical_names: tuple[str, ...],
+        source_index: dict[str, int],
+    ) -> None:
+        self.canonical_names = canonical_names
+        self._weights = np.zeros((len(canonical_names), len(source_index)))
+        self._uses_source = np.zeros((len(canonical_names), len(source_index)), dtype=np.int64)
+        self._mapped = np.array([name in sources_by_canonical for name in canonical_names], dtype=bool)
+        for row, name in enumerate(canonical_names):
+            for source_name, weight in sources_by_canonical.get(name, {}).items():
+                column = source_index[source_name]
+                self._weights[row, column] = weight
+                self._uses_source[row, column] = 1
+
+    def apply(
+        self,
+        xyz: NDArray[np.float64],
+        present: NDArray[np.bool_],
+    ) -> tuple[NDArray[np.float64], NDArray[np.bool_]]:
+        """Remap ``(n_sources, 3)`` tracker positions to ``(n_canonical, 3)``.
+
+        Returns the canonical positions (NaN where absent) and their presence mask.
+        """
+        canonical_present = self._mapped & ((self._uses_source @ (~present).astype(np.int64)) == 0)
+        canonical = self._weights @ np.where(present[:, None], xyz, 0.0)
+        canonical[~canonical_present] = np.nan
+        return canonical, canonical_present
+
+
+def build_source_index(*parsed_mappings: dict[str, dict[str, float]]) -> dict[str, int]:
+    """Column index for every tracker name referenced by any of the mappings."""
+    source_index: dict[str, int] = {}
+    for parsed in parsed_mappings:
+        for sources in parsed.values():
+            for source_name in sources:
+                source_index.setdefault(source_name, len(source_index))
+    return source_index
@@ -12,13 +12,20 @@ A plain rolling median — no trust region, no agreement gating, no error
 weighting, no age decay. The median is inherently robust to the occasional
 mis-triangulated frame, and lengths are measured only from really-observed
 (non-extrapolated) endpoints, so a hidden limb contributes nothing.
+
+The median is maintained incrementally: each bone keeps its window both in
+arrival order (for eviction) and as a sorted list (for the median), so a frame
+costs one bisect-insert per measured bone and one bisect-delete per evicted
+sample instead of a full ``np.median`` per bone on every read.
 """
 from __future__ import annotations
 
+from bisect import bisect_left, insort
 from collections import deque
 from dataclasses import dataclass, field
 
 import numpy as np
+from numpy.typing import NDArray
 
 
 @dataclass
@@ -28,6 +35,8 @@ class RollingBoneLengths:
     ``update`` is called once per frame with the current canonical-named 3D
     positions of **real** (measured, not extrapolated) keypoints; ``lengths``
     returns the current median length estimate per bone for the rigidifier.
+    ``update_lengths`` / ``lengths_array`` are the same operations on arrays
+    in ``bone_keys`` order, for callers that measure every bone at once.
 
     Parameters
     ----------
@@ -44,13 +53,28 @@ class RollingBoneLengths:
     window_s: float
 
     _endpoints: dict[str, tuple[str, str]] = field(default_factory=dict, init=False, repr=False)
-    _windows: dict[str, deque[tuple[float, float]]] = field(default_factory=dict, init=False, repr=False)
+    _bone_keys: tuple[str, ...] = field(default=(), init=False, repr=False)
+    # Per bone, in bone_keys order: (t, length) samples in arrival order, the
+    # same lengths kept sorted, and the current median (seed while empty).
+    _windows: list[deque[tuple[float, float]]] = field(default_factory=list, init=False, repr=False)
+    _sorted_lengths: list[list[float]] = field(default_factory=list, init=False, repr=False)
+    _seed_array: NDArray[np.float64] = field(init=False, repr=False)
+    _medians: NDArray[np.float64] = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         for bone_key in self.bone_seeds:
             parent, child = bone_key.split("->", 1)
             self._endpoints[bone_key] = (parent, child)
-            self._windows[bone_key] = deque()
+        self._bone_keys = tuple(self.bone_seeds)
+        self._windows = [deque() for _ in self._bone_keys]
+        self._sorted_lengths = [[] for _ in self._bone_keys]
+        self._seed_array = np.array([self.bone_seeds[key] for key in self._bone_keys], dtype=float)
+        self._medians = self._seed_array.copy()
+
+    @property
+    def bone_keys(self) -> tuple[str, ...]:
+        """Bone order used by ``update_lengths`` and ``lengths_array``."""
+        return self._bone_keys
 
     @property
     def endpoints(self) -> dict[str, tuple[str, str]]:
@@ -69,30 +93,59 @@ class RollingBoneLengths:
         measured this frame or not — drops samples older than ``window_s`` so a
         bone that leaves view eventually falls back to its seed.
         """
-        cutoff = t - self.window_s
-        for bone_key, (parent, child) in self._endpoints.items():
-            window = self._windows[bone_key]
+        lengths = np.full(len(self._bone_keys), np.nan)
+        for i, (parent, child) in enumerate(self._endpoints.values()):
             p = positions.get(parent)
             c = positions.get(child)
             if p is not None and c is not None:
-                length = float(np.linalg.norm(np.asarray(c, dtype=float) - np.asarray(p, dtype=float)))
-                if np.isfinite(length) and length > 0.0:
-                    window.append((t, length))
+                lengths[i] = np.linalg.norm(np.asarray(c, dtype=float) - np.asarray(p, dtype=float))
+        self.update_lengths(lengths, t=t)
+
+    def update_lengths(self, lengths: NDArray[np.float64], *, t: float) -> None:
+        """Append one frame of per-bone lengths (``bone_keys`` order), then age the windows.
+
+        Non-finite or non-positive entries count as "not measured this frame".
+        """
+        cutoff = t - self.window_s
+        with np.errstate(invalid="ignore"):
+            measured = np.flatnonzero(np.isfinite(lengths) & (lengths > 0.0))
+        changed: set[int] = set()
+        for i in measured.tolist():
+            length = float(lengths[i])
+            self._windows[i].append((t, length))
+            insort(self._sorted_lengths[i], length)
+            changed.add(i)
+        for i, window in enumerate(self._windows):
             while window and window[0][0] < cutoff:
-                window.popleft()
+                _, length = window.popleft()
+                ordered = self._sorted_lengths[i]
+                del ordered[bisect_left(ordered, length)]
+                changed.add(i)
+        for i in changed:
+            self._medians[i] = self._median(i)
+
+    def _median(self, i: int) -> float:
+        ordered = self._sorted_lengths[i]
+        n = len(ordered)
+        if n == 0:
+            return float(self._seed_array[i])
+        if n % 2:
+            return ordered[n // 2]
+        return (ordered[n // 2 - 1] + ordered[n // 2]) / 2.0
 
     @property
     def lengths(self) -> dict[str, float]:
         """Current median length estimate (mm) per bone, or the seed if empty."""
-        out: dict[str, float] = {}
-        for bone_key, window in self._windows.items():
-            if window:
-                out[bone_key] = float(np.median([length for _, length in window]))
-            else:
-                out[bone_key] = self.bone_seeds[bone_key]
-        return out
+        return dict(zip(self._bone_keys, self._medians.tolist()))
+
+    @property
+    def lengths_array(self) -> NDArray[np.float64]:
+        """``lengths`` as an array in ``bone_keys`` order (a copy)."""
+        return self._medians.copy()
 
     def reset(self) -> None:
         """Forget every bone's measurements — all estimates fall back to their seeds."""
-        for window in self._windows.values():
+        for window, ordered in zip(self._windows, self._sorted_lengths):
             window.clear()
+            ordered.clear()
+        self._medians[:] = self._seed_array
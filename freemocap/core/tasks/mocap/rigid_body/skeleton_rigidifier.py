@@ -16,6 +16,7 @@ collapsing onto its parent.
 """
 from __future__ import annotations
 
+import logging
 import math
 from collections import deque
 from dataclasses import dataclass, field
@@ -41,10 +42,16 @@ from skellytracker.core.detectors.keypoint_detectors.rtmpose.body.rtmpose_body_d
 from skellytracker.core.detectors.keypoint_detectors.rtmpose.hand.rtmpose_hand_detector import (
     RTMPoseHandDetector,
 )
-from skellytracker.core.io.tracker_mapping import TrackerMapping
 
+from freemocap.core.tasks.mocap.rigid_body.compiled_tracker_mapping import (
+    CompiledTrackerMapping,
+    build_source_index,
+    parse_mapping_entries,
+)
 from freemocap.core.tasks.mocap.rigid_body.online_segment_lengths import RollingBoneLengths
 
+logger = logging.getLogger(__name__)
+
 # Direction used for a bone that has never been observed (no carried direction).
 _FALLBACK_DIRECTION: np.ndarray = np.array([0.0, 1.0, 0.0])
 
@@ -67,6 +74,13 @@ class TreeRigidifier:
     The tree topology (roots + BFS edge order) is computed once at construction;
     ``rigidify`` is the per-frame hot path. Stateful across calls: it remembers
     each bone's last-good direction.
+
+    ``rigidify_array`` is the same pass over integer-indexed arrays (joints in
+    ``joint_names`` order, bones in ``bone_keys`` order). It places every bone
+    of one BFS depth at once, which is exact for a tree because each joint is
+    placed by exactly one bone, one level below its parent. Its carried
+    directions are kept separately from ``rigidify``'s, so use one entry point
+    per instance.
     """
 
     def __init__(self, *, joint_hierarchy: dict[str, list[str]]) -> None:
@@ -93,6 +107,34 @@ class TreeRigidifier:
         self._edges: tuple[tuple[str, str], ...] = tuple(edges)
         self._last_direction: dict[str, np.ndarray] = {}
 
+        # ---- Integer-indexed form for rigidify_array ----
+        self.joint_names: tuple[str, ...] = tuple(dict.fromkeys(
+            [*roots, *(name for parent, children in children_of.items() for name in (parent, *children))]
+        ))
+        self.bone_keys: tuple[str, ...] = tuple(f"{parent}->{child}" for parent, child in edges)
+        joint_index = {name: i for i, name in enumerate(self.joint_names)}
+        self._root_index = np.array([joint_index[root] for root in roots], dtype=np.intp)
+        parents = np.array([joint_index[p] for p, _ in edges], dtype=np.intp)
+        children = np.array([joint_index[c] for _, c in edges], dtype=np.intp)
+
+        if len(set(children.tolist())) == len(edges):  # every joint has a single parent
+            depth = {joint_index[root]: 0 for root in roots}
+            edge_depth = []
+            for parent, child in zip(parents.tolist(), children.tolist()):
+                edge_depth.append(depth[parent])
+                depth[child] = depth[parent] + 1
+            edge_levels = [
+                np.flatnonzero(np.asarray(edge_depth) == level) for level in range(max(edge_depth, default=-1) + 1)
+            ]
+        else:
+            # A joint with several parents is placed more than once; keep the
+            # original one-bone-at-a-time order so the last placement wins.
+            edge_levels = [np.array([i], dtype=np.intp) for i in range(len(edges))]
+        self._levels: tuple[tuple[np.ndarray, np.ndarray, np.ndarray], ...] = tuple(
+            (parents[level], children[level], level) for level in edge_levels
+        )
+        self._last_direction_array: np.ndarray = np.tile(_FALLBACK_DIRECTION, (len(edges), 1))
+
     def rigidify(
         self,
         positions: dict[str, np.ndarray],
@@ -138,9 +180,61 @@ class TreeRigidifier:
 
         return corrected
 
+    def rigidify_array(
+        self,
+        positions: np.ndarray,
+        present: np.ndarray,
+        bone_lengths: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Array form of ``rigidify``.
+
+        Parameters
+        ----------
+        positions : (n_joints, 3) ndarray
+            Observed positions in ``joint_names`` order (any value where absent).
+        present : (n_joints,) bool ndarray
+            Which joints were observed this frame.
+        bone_lengths : (n_bones,) ndarray
+            Length (mm) to enforce per bone in ``bone_keys`` order. Bones
+            without a positive length are skipped (their subtree is not placed).
+
+        Returns
+        -------
+        (corrected, placed) : ((n_joints, 3) ndarray, (n_joints,) bool ndarray)
+            Rigidified positions (NaN where not placed) and which joints were placed.
+        """
+        corrected = np.full((len(self.joint_names), 3), np.nan)
+        placed = np.zeros(len(self.joint_names), dtype=bool)
+        roots = self._root_index[present[self._root_index]]
+        corrected[roots] = positions[roots]
+        placed[roots] = True
+
+        for parents, children, bones in self._levels:
+            lengths = bone_lengths[bones]
+            active = placed[parents] & (lengths > 0.0)
+            if not active.any():
+                continue
+            parents, children, bones, lengths = parents[active], children[active], bones[active], lengths[active]
+
+            parent_pos = corrected[parents]
+            vector = positions[children] - parent_pos
+            norm = np.linalg.norm(vector, axis=1)
+            has_direction = present[children] & np.isfinite(norm) & (norm > 1e-6)
+            if has_direction.any():
+                self._last_direction_array[bones[has_direction]] = (
+                    vector[has_direction] / norm[has_direction, None]
+                )
+            direction = self._last_direction_array[bones]
+
+            corrected[children] = parent_pos + direction * lengths[:, None]
+            placed[children] = True
+
+        return corrected, placed
+
     def reset(self) -> None:
         """Forget all carried directions (e.g. on calibration reload)."""
         self._last_direction.clear()
+        self._last_direction_array[:] = _FALLBACK_DIRECTION
 
 
 # ===========================================================================
@@ -148,22 +242,23 @@ class TreeRigidifier:
 # ===========================================================================
 
 
-def _build_hand_mapping(yaml_path: Path, *, side: str) -> tuple[TrackerMapping, dict[str, str]]:
-    """Build a hand tracker->canonical mapping + a canonical->tracker reverse map.
+def _load_mapping_yaml(yaml_path: Path) -> dict:
+    import yaml
+    with open(yaml_path, "r", encoding="utf-8") as fh:
+        return yaml.safe_load(fh)
+
+
+def _hand_name_to_tracker(hand_entries: dict, *, side: str) -> dict[str, str]:
+    """Canonical hand name -> the detector's side-prefixed tracker name.
 
     Both RTMPose and MediaPipe compose hand landmarks with a uniform
-    ``{side}_hand_`` prefix (``right_hand_thumb1`` ...), so the mapping strips
-    that prefix to match the unprefixed entries in the mapping YAML
-    (``thumb1`` ...). The reverse map converts fitted canonical hand names back
-    to tracker names so they key into the frontend's hand schema.
+    ``{side}_hand_`` prefix (``right_hand_thumb1`` ...) on top of the
+    unprefixed entries in the mapping YAML (``thumb1`` ...). The map converts
+    fitted canonical hand names back to tracker names so they key into the
+    frontend's hand schema.
     """
-    import yaml
-    with open(yaml_path, "r", encoding="utf-8") as fh:
-        raw = yaml.safe_load(fh)
     prefix = f"{side}_hand_"
-    mapping = TrackerMapping(entries=raw, prefix=prefix)
-    reverse_map = {canonical: f"{prefix}{relative}" for canonical, relative in raw.items()}
-    return mapping, reverse_map
+    return {canonical: f"{prefix}{relative}" for canonical, relative in hand_entries.items()}
 
 
 def _seeds_from_ratios(
@@ -217,6 +312,97 @@ class RigidifyResult:
     right_hand_positions: dict[str, np.ndarray]
 
 
+@dataclass(slots=True)
+class _CompiledTree:
+    """One tree's mapping, topology and bone bookkeeping resolved to index arrays."""
+
+    mapping: CompiledTrackerMapping
+    tree: TreeRigidifier
+    lengths: RollingBoneLengths
+    # tree.bone_keys position -> lengths.bone_keys position
+    edge_bones: np.ndarray
+    # lengths.bone_keys position -> tree joint index of each endpoint
+    bone_parents: np.ndarray
+    bone_children: np.ndarray
+    # tree joint index -> key in the RigidifyResult dict (None = not reported)
+    output_names: tuple[str | None, ...]
+
+    @classmethod
+    def compile(
+        cls,
+        *,
+        sources_by_canonical: dict[str, dict[str, float]],
+        source_index: dict[str, int],
+        tree: TreeRigidifier,
+        lengths: RollingBoneLengths,
+        output_names: dict[str, str] | None = None,
+    ) -> "_CompiledTree":
+        joint_index = {name: i for i, name in enumerate(tree.joint_names)}
+        bone_index = {bone_key: i for i, bone_key in enumerate(lengths.bone_keys)}
+        endpoints = lengths.endpoints
+        return cls(
+            mapping=CompiledTrackerMapping(
+                sources_by_canonical=sources_by_canonical,
+                canonical_names=tree.joint_names,
+                source_index=source_index,
+            ),
+            tree=tree,
+            lengths=lengths,
+            edge_bones=np.array([bone_index[key] for key in tree.bone_keys], dtype=np.intp),
+            bone_parents=np.array([joint_index[endpoints[key][0]] for key in lengths.bone_keys], dtype=np.intp),
+            bone_children=np.array([joint_index[endpoints[key][1]] for key in lengths.bone_keys], dtype=np.intp),
+            output_names=tuple(
+                name if output_names is None else output_names.get(name)
+                for name in tree.joint_names
+            ),
+        )
+
+    def rigidify(
+        self,
+        xyz: np.ndarray,
+        present: np.ndarray,
+        measured_xyz: np.ndarray,
+        measured_present: np.ndarray,
+        *,
+        t: float,
+    ) -> dict[str, np.ndarray]:
+        canonical, canonical_present = self.mapping.apply(xyz, present)
+        measured, _ = self.mapping.apply(measured_xyz, measured_present)
+        # NaN (unmeasured endpoint) lengths are skipped by update_lengths.
+        self.lengths.update_lengths(
+            np.linalg.norm(measured[self.bone_children] - measured[self.bone_parents], axis=1), t=t,
+        )
+        corrected, placed = self.tree.rigidify_array(
+            canonical, canonical_present, self.lengths.lengths_array[self.edge_bones],
+        )
+        return {
+            self.output_names[j]: corrected[j]
+            for j in np.flatnonzero(placed).tolist()
+            if self.output_names[j] is not None
+        }
+
+
+@dataclass(slots=True)
+class _CompiledSkeleton:
+    """All three trees over one shared tracker-name -> row index."""
+
+    source_index: dict[str, int]
+    body: _CompiledTree
+    right_hand: _CompiledTree
+    left_hand: _CompiledTree
+
+    def gather(self, positions: dict[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+        """Tracker-named positions -> ((n_sources, 3) array, presence mask)."""
+        xyz = np.full((len(self.source_index), 3), np.nan)
+        present = np.zeros(len(self.source_index), dtype=bool)
+        for name, pos in positions.items():
+            row = self.source_index.get(name)
+            if row is not None:
+                xyz[row] = pos
+                present[row] = True
+        return xyz, present
+
+
 @dataclass
 class RealtimeSkeletonRigidifier:
     """Per-frame rigid-body skeleton correction: map -> estimate -> rigidify.
@@ -231,22 +417,13 @@ class RealtimeSkeletonRigidifier:
     This is the streaming counterpart of the posthoc rigid-bones step
     (skellyforge ``enforce_rigid_bones``): same median-length + forward-pass
     method, applied online instead of over a whole recording.
-    """
 
-    _body_mapping: TrackerMapping = field(repr=False)
-    _hand_mapping_r: TrackerMapping = field(repr=False)
-    _hand_mapping_l: TrackerMapping = field(repr=False)
-
-    _body_tree: TreeRigidifier = field(repr=False)
-    _hand_tree_r: TreeRigidifier = field(repr=False)
-    _hand_tree_l: TreeRigidifier = field(repr=False)
-
-    _body_lengths: RollingBoneLengths = field(repr=False)
-    _rhand_lengths: RollingBoneLengths = field(repr=False)
-    _lhand_lengths: RollingBoneLengths = field(repr=False)
+    ``create`` compiles the tracker mappings, trees and bone endpoints to
+    integer index arrays (``_CompiledSkeleton``) so a frame is a handful of
+    array operations instead of dict remaps and per-bone dict lookups.
+    """
 
-    _hand_name_to_tracker_r: dict[str, str] = field(repr=False)
-    _hand_name_to_tracker_l: dict[str, str] = field(repr=False)
+    _skeleton: _CompiledSkeleton = field(repr=False)
 
     height_mm: float = 1750.0
 
@@ -282,10 +459,8 @@ class RealtimeSkeletonRigidifier:
         if hand_anatomy.joint_hierarchy is None:
             raise ValueError("Canonical hand model has no joint_hierarchy")
 
-        body_mapping = TrackerMapping.from_yaml(_BODY_MAPPING_YAML_BY_DETECTOR[detector_type])
-        hand_yaml = _HAND_MAPPING_YAML_BY_DETECTOR[detector_type]
-        hand_mapping_r, name_to_tracker_r = _build_hand_mapping(hand_yaml, side="right")
-        hand_mapping_l, name_to_tracker_l = _build_hand_mapping(hand_yaml, side="left")
+        body_entries = _load_mapping_yaml(_BODY_MAPPING_YAML_BY_DETECTOR[detector_type])
+        hand_entries = _load_mapping_yaml(_HAND_MAPPING_YAML_BY_DETECTOR[detector_type])
 
         body_seeds = _seeds_from_ratios(
             joint_hierarchy=body_anatomy.joint_hierarchy,
@@ -301,24 +476,31 @@ class RealtimeSkeletonRigidifier:
         def make_lengths(seeds: dict[str, float]) -> RollingBoneLengths:
             return RollingBoneLengths(bone_seeds=seeds, window_s=window_s)
 
-        body_lengths = make_lengths(body_seeds)
-        rhand_lengths = make_lengths(hand_seeds)
-        lhand_lengths = make_lengths(hand_seeds)
-
-        return cls(
-            _body_mapping=body_mapping,
-            _hand_mapping_r=hand_mapping_r,
-            _hand_mapping_l=hand_mapping_l,
-            _body_tree=TreeRigidifier(joint_hierarchy=body_anatomy.joint_hierarchy),
-            _hand_tree_r=TreeRigidifier(joint_hierarchy=hand_anatomy.joint_hierarchy),
-            _hand_tree_l=TreeRigidifier(joint_hierarchy=hand_anatomy.joint_hierarchy),
-            _body_lengths=body_lengths,
-            _rhand_lengths=rhand_lengths,
-            _lhand_lengths=lhand_lengths,
-            _hand_name_to_tracker_r=name_to_tracker_r,
-            _hand_name_to_tracker_l=name_to_tracker_l,
-            height_mm=height_mm,
+        body_sources = parse_mapping_entries(body_entries)
+        rhand_sources = parse_mapping_entries(hand_entries, prefix="right_hand_")
+        lhand_sources = parse_mapping_entries(hand_entries, prefix="left_hand_")
+        source_index = build_source_index(body_sources, rhand_sources, lhand_sources)
+        skeleton = _CompiledSkeleton(
+            source_index=source_index,
+            body=_CompiledTree.compile(
+                sources_by_canonical=body_sources, source_index=source_index,
+                tree=TreeRigidifier(joint_hierarchy=body_anatomy.joint_hierarchy),
+                lengths=make_lengths(body_seeds),
+            ),
+            right_hand=_CompiledTree.compile(
+                sources_by_canonical=rhand_sources, source_index=source_index,
+                tree=TreeRigidifier(joint_hierarchy=hand_anatomy.joint_hierarchy),
+                lengths=make_lengths(hand_seeds),
+                output_names=_hand_name_to_tracker(hand_entries, side="right"),
+            ),
+            left_hand=_CompiledTree.compile(
+                sources_by_canonical=lhand_sources, source_index=source_index,
+                tree=TreeRigidifier(joint_hierarchy=hand_anatomy.joint_hierarchy),
+                lengths=make_lengths(hand_seeds),
+                output_names=_hand_name_to_tracker(hand_entries, side="left"),
+            ),
         )
+        return cls(_skeleton=skeleton, height_mm=height_mm)
 
     def rigidify_frame(
         self,
@@ -342,37 +524,12 @@ class RealtimeSkeletonRigidifier:
             Frame timestamp (s); drives the rolling window's eviction. The
             caller owns the clock.
         """
-        canonical_body = self._body_mapping.apply(tracker_positions)
-        canonical_rhand = self._hand_mapping_r.apply(tracker_positions)
-        canonical_lhand = self._hand_mapping_l.apply(tracker_positions)
-
-        measured_body = self._body_mapping.apply(measured)
-        measured_rhand = self._hand_mapping_r.apply(measured)
-        measured_lhand = self._hand_mapping_l.apply(measured)
-
-        self._body_lengths.update(measured_body, t=t)
-        self._rhand_lengths.update(measured_rhand, t=t)
-        self._lhand_lengths.update(measured_lhand, t=t)
-
-        body_out = self._body_tree.rigidify(canonical_body, self._body_lengths.lengths)
-        rhand_out = self._hand_tree_r.rigidify(canonical_rhand, self._rhand_lengths.lengths)
-        lhand_out = self._hand_tree_l.rigidify(canonical_lhand, self._lhand_lengths.lengths)
-
-        rhand_tracker = {
-            self._hand_name_to_tracker_r[name]: pos
-            for name, pos in rhand_out.items()
-            if name in self._hand_name_to_tracker_r
-        }
-        lhand_tracker = {
-            self._hand_name_to_tracker_l[name]: pos
-            for name, pos in lhand_out.items()
-            if name in self._hand_name_to_tracker_l
-        }
-
+        xyz, present = self._skeleton.gather(tracker_positions)
+        measured_xyz, measured_present = self._skeleton.gather(measured)
         return RigidifyResult(
-            body_positions=body_out,
-            left_hand_positions=lhand_tracker,
-            right_hand_positions=rhand_tracker,
+            body_positions=self._skeleton.body.rigidify(xyz, present, measured_xyz, measured_present, t=t),
+            left_hand_positions=self._skeleton.left_hand.rigidify(xyz, present, measured_xyz, measured_present, t=t),
+            right_hand_positions=self._skeleton.right_hand.rigidify(xyz, present, measured_xyz, measured_present, t=t),
         )
 
     def reset(self) -> None:
@@ -382,21 +539,18 @@ class RealtimeSkeletonRigidifier:
         anthropometric seeds) and the carried per-bone gap-fill directions, so
         the next frames re-derive everything from fresh observations.
         """
-        self._body_tree.reset()
-        self._hand_tree_r.reset()
-        self._hand_tree_l.reset()
-        self._body_lengths.reset()
-        self._rhand_lengths.reset()
-        self._lhand_lengths.reset()
+        for compiled_tree in (self._skeleton.body, self._skeleton.right_hand, self._skeleton.left_hand):
+            compiled_tree.tree.reset()
+            compiled_tree.lengths.reset()
 
     @property
     def body_bone_lengths(self) -> dict[str, float]:
-        return self._body_lengths.lengths
+        return self._skeleton.body.lengths.lengths
 
     @property
     def right_hand_bone_lengths(self) -> dict[str, float]:
-        return self._rhand_lengths.lengths
+        return self._skeleton.right_hand.lengths.lengths
 
     @property
     def left_hand_bone_lengths(self) -> dict[str, float]:
-        return self._lhand_lengths.lengths
+        return self._skeleton.left_hand.lengths.lengths
@@ -0,0 +1,51 @@
+import numpy as np
+from numpy.typing import NDArray
+
+
+def project_points_multi_camera(
+    *,
+    points_3d: NDArray[np.float64],
+    extrinsics_mats: NDArray[np.float64],
+    intrinsics_params: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Project 3D world points through every camera at once (pinhole + Brown-Conrady distortion).
+
+    Vectorized equivalent of calling `cv2.projectPoints` once per camera with
+    4-element [k1, k2, p1, p2] distortion: rotation, translation, perspective
+    divide, radial + tangential distortion and intrinsics are each a single
+    broadcast numpy op over (n_cameras, n_points).
+
+    Args:
+        points_3d: shape (n_points, 3) shared by all cameras, or
+            (n_cameras, n_points, 3) with one point set per camera.
+        extrinsics_mats: shape (n_cameras, 3, 4) - [R|t] matrices.
+        intrinsics_params: shape (n_cameras, 8) - `CameraIntrinsics.to_param_array()`
+            rows: [fx, fy, cx, cy, k1, k2, p1, p2].
+
+    Returns:
+        shape (n_cameras, n_points, 2) pixel coordinates. NaN wherever the 3D
+        point was NaN.
+    """
+    rotations = extrinsics_mats[:, :, :3]                       # (C, 3, 3)
+    translations = extrinsics_mats[:, None, :, 3]               # (C, 1, 3)
+    if points_3d.ndim == 2:
+        cam_points = np.einsum("cij,pj->cpi", rotations, points_3d)
+    else:
+        cam_points = np.einsum("cij,cpj->cpi", rotations, points_3d)
+    cam_points += translations                                  # (C, P, 3)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = cam_points[..., 0] / cam_points[..., 2]             # (C, P)
+        y = cam_points[..., 1] / cam_points[..., 2]
+
+    fx, fy, cx, cy, k1, k2, p1, p2 = (intrinsics_params[:, i, None] for i in range(8))
+    xy = x * y
+    x2 = x * x
+    y2 = y * y
+    r2 = x2 + y2
+    radial = 1.0 + r2 * (k1 + k2 * r2)
+
+    out = np.empty((*x.shape, 2), dtype=np.float64)
+    out[..., 0] = fx * (x * radial + 2.0 * p1 * xy + p2 * (r2 + 2.0 * x2)) + cx
+    out[..., 1] = fy * (y * radial + p1 * (r2 + 2.0 * y2) + 2.0 * p2 * xy) + cy
+    return out
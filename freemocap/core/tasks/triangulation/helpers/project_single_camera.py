@@ -24,14 +24,27 @@ def project_2d_observation_to_3d(
     try_angulate() produces for multi-camera triangulation.
     """
     kpts = observation.to_keypoints()
-    xy = kpts.xyz[:, :2]  # (n_points, 2)
-    names = kpts.names  # tuple[str, ...]
-    h, w = observation.image_size  # (height, width) in pixels
+    return project_2d_points_to_3d(
+        points_2d=kpts.xyz[:, :2],
+        point_names=kpts.names,
+        image_size=(int(observation.image_size[0]), int(observation.image_size[1])),
+    )
+
+
+def project_2d_points_to_3d(
+    *,
+    points_2d: NDArray[np.floating],  # (n_points, 2)
+    point_names: tuple[str, ...],
+    image_size: tuple[int, int],  # (height, width) in pixels
+) -> dict[str, NDArray[np.float64]]:
+    """Array form of ``project_2d_observation_to_3d``, for keypoints that arrive
+    without an Observation (e.g. from the shared-memory keypoint ring)."""
+    h, w = image_size
 
     # Strip the stage prefix that Observation.to_keypoints() adds ("body.nose" → "nose")
     result: dict[str, NDArray[np.float64]] = {}
-    for i, name in enumerate(names):
-        u, v = xy[i]
+    for i, name in enumerate(point_names):
+        u, v = points_2d[i]
         if np.isnan(u) or np.isnan(v):
             continue
         dot = name.find(".")
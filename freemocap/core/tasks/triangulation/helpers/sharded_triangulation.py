@@ -0,0 +1,285 @@
+"""Frame-sharded posthoc triangulation across a process pool.
+
+Every frame is triangulated independently, so a recording can be split into
+contiguous frame ranges ("shards") and solved in parallel. The 2D input and the
+three outputs live in `multiprocessing.shared_memory` blocks: the parent writes
+each shard's input once, workers read their slice and write their results in
+place, and nothing but `(start, stop)` tuples crosses the process boundary.
+
+Workers are started with the "spawn" context (same as the rest of the app) and
+rebuild their own `Triangulator` from the pickled camera models once, in the pool
+initializer. The posthoc aggregator that calls this may itself be a daemonic
+worker, so the pool is allowed to start from one (see `_allow_worker_children`).
+"""
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from numpy.typing import NDArray
+from skellycam.core.types.type_overloads import CameraIdString
+
+from freemocap.core.pipeline.posthoc.pipeline_phases import MocapStage
+from freemocap.core.pipeline.posthoc.task_progress_reporter import TaskProgressReporter
+from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
+from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
+from freemocap.core.tasks.triangulation.helpers.triangulation_result import TriangulationResult
+from freemocap.core.tasks.triangulation.triangulator import ChunkLoader, Triangulator
+
+logger = logging.getLogger(__name__)
+
+# Shards per worker when the shard size is not given: small enough for useful
+# progress updates and load balancing, big enough to amortise per-task overhead.
+_SHARDS_PER_WORKER: int = 4
+
+# (shared memory name, shape) for input, points_3d, per_camera_weights, reprojection_error
+_SharedArraySpec = tuple[str, tuple[int, ...]]
+
+# Per-worker state, set once by `_init_worker`.
+_worker_triangulator: Triangulator | None = None
+_worker_config: TriangulationConfig | None = None
+_worker_blocks: list[SharedMemory] = []
+_worker_arrays: list[NDArray[np.float64]] = []
+
+
+def _attach_array(*, name: str, shape: tuple[int, ...]) -> tuple[SharedMemory, NDArray[np.float64]]:
+    shm = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _exit_with_parent() -> None:
+    """Block until the parent process is gone, then exit this worker.
+
+    The parent may be a daemonic worker that gets terminated without shutting
+    the pool down; idle pool workers would otherwise wait on their call queue forever.
+    """
+    multiprocessing.parent_process().join()
+    os._exit(1)
+
+
+def _init_worker(
+        cameras: list[CameraModel],
+        config: TriangulationConfig,
+        array_specs: list[_SharedArraySpec],
+) -> None:
+    global _worker_triangulator, _worker_config, _worker_blocks, _worker_arrays
+    threading.Thread(target=_exit_with_parent, name="exit-with-parent", daemon=True).start()
+    _worker_triangulator = Triangulator(cameras=cameras)
+    _worker_config = config
+    attached = [_attach_array(name=name, shape=shape) for name, shape in array_specs]
+    _worker_blocks = [shm for shm, _ in attached]
+    _worker_arrays = [array for _, array in attached]
+
+
+def _triangulate_shard_in_worker(start: int, stop: int) -> tuple[int, int]:
+    _triangulate_shard(
+        triangulator=_worker_triangulator,
+        config=_worker_config,
+        arrays=_worker_arrays,
+        start=start,
+        stop=stop,
+    )
+    return start, stop
+
+
+def _triangulate_shard(
+        *,
+        triangulator: Triangulator,
+        config: TriangulationConfig,
+        arrays: list[NDArray[np.float64]],
+        start: int,
+        stop: int,
+) -> None:
+    """Triangulate frames [start, stop) of the shared input into the shared outputs."""
+    data2d, points_3d, per_camera_weights, reprojection_error = arrays
+    result = triangulator.triangulate(data2d=data2d[:, start:stop], config=config)
+    points_3d[start:stop] = result.points_3d
+    per_camera_weights[start:stop] = result.per_camera_weights
+    reprojection_error[:, start:stop] = result.reprojection_error
+
+
+def _write_input_shard(
+        *,
+        data2d: NDArray[np.float64],
+        chunk: dict[CameraIdString, NDArray[np.float64]],
+        camera_ids: list[CameraIdString],
+        start: int,
+        stop: int,
+) -> None:
+    """Copy one loaded shard (dict keyed by camera id) into the (n_cameras, n_frames, n_points, 2) input."""
+    unknown = set(chunk) - set(camera_ids)
+    if unknown:
+        raise KeyError(f"Cameras {sorted(unknown)} not found in triangulator. Known cameras: {camera_ids}")
+    for cam_idx, camera_id in enumerate(camera_ids):
+        if camera_id not in chunk:
+            data2d[cam_idx, start:stop] = np.nan
+            continue
+        values = chunk[camera_id]
+        expected_shape = (stop - start, *data2d.shape[2:])
+        if values.shape != expected_shape:
+            raise ValueError(
+                f"load_chunk({start}, {stop}) returned shape {values.shape} for camera '{camera_id}', "
+                f"expected {expected_shape}"
+            )
+        data2d[cam_idx, start:stop] = values
+
+
+@contextmanager
+def _allow_worker_children() -> Iterator[None]:
+    """Let the current process start the pool's workers even if it is daemonic.
+
+    multiprocessing refuses children of a daemonic process because they could
+    outlive it. Pool workers don't: the pool is shut down before
+    `triangulate_sharded` returns, and a worker exits on its own if its parent
+    is killed first (`_exit_with_parent`). The flag is restored on exit.
+    """
+    process = multiprocessing.current_process()
+    daemonic = process.daemon
+    if daemonic:
+        logger.debug(f"Starting triangulation workers from daemonic process '{process.name}'")
+        process.daemon = False
+    try:
+        yield
+    finally:
+        process.daemon = daemonic
+
+
+def triangulate_sharded(
+        *,
+        triangulator: Triangulator,
+        load_chunk: ChunkLoader,
+        n_frames: int,
+        config: TriangulationConfig | None = None,
+        num_workers: int | None = None,
+        shard_size_frames: int | None = None,
+        reporter: TaskProgressReporter | None = None,
+        progress_stage: str = MocapStage.TRIANGULATING,
+) -> TriangulationResult:
+    """Triangulate a multi-frame recording with frame ranges solved in parallel worker processes.
+
+    Args:
+        triangulator: the calibrated triangulator; its cameras are sent to each worker once.
+        load_chunk: returns `{camera_id: (stop - start, n_points, 2)}` pixel observations
+            for frames [start, stop). Called once per shard, in the parent.
+        n_frames: total number of frames to triangulate.
+        config: triangulation config. `num_shard_workers` / `chunk_size_frames` are used
+            when `num_workers` / `shard_size_frames` are not passed explicitly.
+        num_workers: worker processes (defaults to the config value, then the CPU count).
+        shard_size_frames: frames per shard (defaults to the config's `chunk_size_frames`,
+            then an even split into a few shards per worker).
+        reporter: receives one update per finished shard, with a measured `fraction`.
+        progress_stage: the stage those updates are reported under.
+
+    Returns:
+        A multi-frame `TriangulationResult` (same shapes and values as `triangulate`
+        with dict input), copied out of shared memory into regular arrays.
+    """
+    if config is None:
+        config = TriangulationConfig()
+    if n_frames < 1:
+        raise ValueError(f"n_frames must be positive, got {n_frames}")
+    _reporter = reporter or TaskProgressReporter.noop()
+
+    if num_workers is None:
+        num_workers = config.num_shard_workers or multiprocessing.cpu_count()
+    if num_workers < 1:
+        raise ValueError(f"num_workers must be a positive int, got {num_workers}")
+    if shard_size_frames is None:
+        shard_size_frames = config.chunk_size_frames or math.ceil(n_frames / (num_workers * _SHARDS_PER_WORKER))
+    if shard_size_frames < 1:
+        raise ValueError(f"shard_size_frames must be a positive int, got {shard_size_frames}")
+
+    shards = [(start, min(start + shard_size_frames, n_frames)) for start in range(0, n_frames, shard_size_frames)]
+    num_workers = min(num_workers, len(shards))
+    in_process = num_workers == 1
+
+    first_chunk = load_chunk(*shards[0])
+    n_points = next(iter(first_chunk.values())).shape[1]
+    n_cameras = triangulator.n_cameras
+    shapes = [
+        (n_cameras, n_frames, n_points, 2),
+        (n_frames, n_points, 3),
+        (n_frames, n_points, n_cameras),
+        (n_cameras, n_frames, n_points),
+    ]
+
+    logger.info(
+        f"Triangulating {n_frames} frames from {n_cameras} cameras in {len(shards)} shards of "
+        f"{shard_size_frames} frames on {1 if in_process else num_workers} "
+        f"{'thread (in-process)' if in_process else 'worker processes'}"
+    )
+
+    blocks = [SharedMemory(create=True, size=max(math.prod(shape) * 8, 1)) for shape in shapes]
+    try:
+        arrays = [np.ndarray(shape, dtype=np.float64, buffer=shm.buf) for shm, shape in zip(blocks, shapes)]
+
+        def _report(n_done: int, start: int, stop: int) -> None:
+            _reporter.report(
+                stage=progress_stage,
+                detail=f"Triangulated frames {start}-{stop - 1} ({n_done}/{len(shards)} shards)",
+                fraction=n_done / len(shards),
+            )
+
+        def _load_shard(shard_idx: int) -> None:
+            start, stop = shards[shard_idx]
+            _write_input_shard(
+                data2d=arrays[0],
+                chunk=first_chunk if shard_idx == 0 else load_chunk(start, stop),
+                camera_ids=triangulator.camera_ids,
+                start=start,
+                stop=stop,
+            )
+
+        if in_process:
+            for shard_idx, (start, stop) in enumerate(shards):
+                _load_shard(shard_idx)
+                _triangulate_shard(triangulator=triangulator, config=config, arrays=arrays, start=start, stop=stop)
+                _report(shard_idx + 1, start, stop)
+        else:
+            with _allow_worker_children(), ProcessPoolExecutor(
+                    max_workers=num_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(
+                        triangulator.cameras,
+                        config,
+                        [(shm.name, shape) for shm, shape in zip(blocks, shapes)],
+                    ),
+            ) as pool:
+                # Load shard inputs as they are submitted, so workers start on the
+                # first shards while the parent is still converting the later ones.
+                pending: set[Future] = set()
+                for shard_idx, (start, stop) in enumerate(shards):
+                    _load_shard(shard_idx)
+                    pending.add(pool.submit(_triangulate_shard_in_worker, start, stop))
+                n_done = 0
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        start, stop = future.result()
+                        n_done += 1
+                        _report(n_done, start, stop)
+
+        _, points_3d, per_camera_weights, reprojection_error = (array.copy() for array in arrays)
+        del arrays
+    finally:
+        for shm in blocks:
+            try:
+                shm.close()
+            except BufferError:
+                # A traceback still holds a view into the block; unlinking below
+                # still frees it once that view is gone.
+                pass
+            shm.unlink()
+
+    return TriangulationResult(
+        points_3d=points_3d,
+        per_camera_weights=per_camera_weights,
+        reprojection_error=reprojection_error,
+    )
@@ -0,0 +1,268 @@
+"""Numba-compiled triangulation kernel.
+
+Fused, parallel equivalent of the numpy dispatch in `Triangulator.triangulate`:
+plain DLT or subset-ensemble outlier rejection, over points with any camera
+visibility pattern, in a single `prange` pass. Operates on undistorted-normalized
+2D coordinates and [R|t] (3x4) extrinsics, same as the numpy primitives.
+
+Parity notes (so the two backends agree within floating-point tolerance):
+    - Points visible in ALL cameras mirror `Triangulator._batch_outlier_rejection`
+      (every drop level is explored; zero total weight falls back to the best
+      subset with zero camera weights).
+    - Points with partial visibility mirror `triangulate_with_outlier_rejection`
+      on the valid cameras (early exit once a drop level reaches the target;
+      zero total weight falls back to the best subset with weight 1.0).
+    - Camera subsets are enumerated in `itertools.combinations` order, so
+      "best subset" ties resolve identically.
+
+The `@njit` kernels are deliberately unannotated: `beartype_this_package()`
+wraps every annotated function in a Python-level checker, which would hide the
+numba dispatcher from the kernels that call it. Only the public wrapper at the
+bottom carries type hints.
+"""
+import sys
+
+import numpy as np
+from numba import njit, prange
+from numpy.typing import NDArray
+
+from freemocap.core.tasks.triangulation.helpers.outlier_rejection import _WEIGHT_DECAY_K
+
+# PyInstaller builds ship no .py sources, so numba has no cache locator there.
+_CACHE_KERNELS: bool = not getattr(sys, "frozen", False)
+
+
+@njit(cache=_CACHE_KERNELS, error_model="numpy")
+def _dlt_subset(
+        points_2d,
+        extrinsics_mats,
+        cam_indices,
+        out_p3d,
+):
+    """DLT-triangulate one point from the cameras listed in `cam_indices` into `out_p3d`."""
+    n_sel = cam_indices.shape[0]
+    a_matrix = np.empty((2 * n_sel, 4), dtype=np.float64)
+    for k in range(n_sel):
+        c = cam_indices[k]
+        x = points_2d[c, 0]
+        y = points_2d[c, 1]
+        for j in range(4):
+            a_matrix[2 * k, j] = x * extrinsics_mats[c, 2, j] - extrinsics_mats[c, 0, j]
+            a_matrix[2 * k + 1, j] = y * extrinsics_mats[c, 2, j] - extrinsics_mats[c, 1, j]
+    _, _, vh = np.linalg.svd(a_matrix, False)
+    w = vh[3, 3]
+    out_p3d[0] = vh[3, 0] / w
+    out_p3d[1] = vh[3, 1] / w
+    out_p3d[2] = vh[3, 2] / w
+
+
+@njit(cache=_CACHE_KERNELS, error_model="numpy")
+def _mean_subset_error(
+        points_2d,
+        extrinsics_mats,
+        cam_indices,
+        p3d,
+):
+    """Mean normalized-coordinate reprojection error of `p3d` over the listed cameras."""
+    n_sel = cam_indices.shape[0]
+    total = 0.0
+    for k in range(n_sel):
+        c = cam_indices[k]
+        px = (extrinsics_mats[c, 0, 0] * p3d[0] + extrinsics_mats[c, 0, 1] * p3d[1]
+              + extrinsics_mats[c, 0, 2] * p3d[2] + extrinsics_mats[c, 0, 3])
+        py = (extrinsics_mats[c, 1, 0] * p3d[0] + extrinsics_mats[c, 1, 1] * p3d[1]
+              + extrinsics_mats[c, 1, 2] * p3d[2] + extrinsics_mats[c, 1, 3])
+        pz = (extrinsics_mats[c, 2, 0] * p3d[0] + extrinsics_mats[c, 2, 1] * p3d[1]
+              + extrinsics_mats[c, 2, 2] * p3d[2] + extrinsics_mats[c, 2, 3])
+        du = px / pz - points_2d[c, 0]
+        dv = py / pz - points_2d[c, 1]
+        total += np.sqrt(du * du + dv * dv)
+    return total / n_sel
+
+
+@njit(cache=_CACHE_KERNELS, error_model="numpy")
+def _triangulate_point(
+        points_2d,
+        valid,
+        extrinsics_mats,
+        minimum_cameras_for_triangulation,
+        maximum_cameras_to_drop,
+        target_reprojection_error,
+        use_outlier_rejection,
+        out_p3d,
+        out_weights,
+):
+    """Triangulate a single point; writes into `out_p3d` (3,) and `out_weights` (n_cameras,).
+
+    `out_weights` entries for cameras without an observation are left untouched (NaN).
+    """
+    n_cameras = points_2d.shape[0]
+    n_valid = 0
+    for c in range(n_cameras):
+        if valid[c]:
+            n_valid += 1
+    if n_valid < minimum_cameras_for_triangulation:
+        return
+
+    valid_idx = np.empty(n_valid, dtype=np.int64)
+    k = 0
+    for c in range(n_cameras):
+        if valid[c]:
+            valid_idx[k] = c
+            k += 1
+    full_visibility = n_valid == n_cameras
+
+    default_p3d = np.empty(3, dtype=np.float64)
+    _dlt_subset(points_2d, extrinsics_mats, valid_idx, default_p3d)
+
+    if not use_outlier_rejection:
+        out_p3d[:] = default_p3d
+        for k in range(n_valid):
+            out_weights[valid_idx[k]] = 1.0 / n_valid
+        return
+
+    default_error = _mean_subset_error(points_2d, extrinsics_mats, valid_idx, default_p3d)
+    if default_error < target_reprojection_error:
+        out_p3d[:] = default_p3d
+        for k in range(n_valid):
+            out_weights[valid_idx[k]] = 1.0
+        return
+
+    default_weight = np.exp(-_WEIGHT_DECAY_K * default_error / target_reprojection_error)
+    weighted_sum = default_p3d * default_weight
+    total_weight = default_weight
+    cam_weights = np.full(n_valid, default_weight)
+
+    best_p3d = default_p3d.copy()
+    best_error = default_error
+    best_combo_mask = np.ones(n_valid, dtype=np.bool_)
+
+    candidate_p3d = np.empty(3, dtype=np.float64)
+    for drop_count in range(1, maximum_cameras_to_drop + 1):
+        n_selected = n_valid - drop_count
+        if n_selected < minimum_cameras_for_triangulation:
+            break
+
+        # Lexicographic combinations of local indices, matching itertools.combinations.
+        combo = np.arange(n_selected)
+        cam_indices = np.empty(n_selected, dtype=np.int64)
+        while True:
+            for k in range(n_selected):
+                cam_indices[k] = valid_idx[combo[k]]
+            _dlt_subset(points_2d, extrinsics_mats, cam_indices, candidate_p3d)
+            candidate_error = _mean_subset_error(points_2d, extrinsics_mats, cam_indices, candidate_p3d)
+
+            weight = np.exp(-_WEIGHT_DECAY_K * candidate_error / target_reprojection_error)
+            for j in range(3):
+                weighted_sum[j] += candidate_p3d[j] * weight
+            total_weight += weight
+            for k in range(n_selected):
+                cam_weights[combo[k]] += weight
+
+            if candidate_error < best_error:
+                best_error = candidate_error
+                best_p3d[:] = candidate_p3d
+                best_combo_mask[:] = False
+                for k in range(n_selected):
+                    best_combo_mask[combo[k]] = True
+
+            i = n_selected - 1
+            while i >= 0 and combo[i] == i + n_valid - n_selected:
+                i -= 1
+            if i < 0:
+                break
+            combo[i] += 1
+            for j in range(i + 1, n_selected):
+                combo[j] = combo[j - 1] + 1
+
+        if not full_visibility and best_error < target_reprojection_error:
+            break
+
+    if best_error >= default_error:
+        out_p3d[:] = default_p3d
+        for k in range(n_valid):
+            out_weights[valid_idx[k]] = 1.0
+        return
+
+    if total_weight > 1e-12:
+        for j in range(3):
+            out_p3d[j] = weighted_sum[j] / total_weight
+        for k in range(n_valid):
+            out_weights[valid_idx[k]] = cam_weights[k] / total_weight
+    else:
+        out_p3d[:] = best_p3d
+        for k in range(n_valid):
+            if full_visibility:
+                out_weights[valid_idx[k]] = 0.0
+            else:
+                out_weights[valid_idx[k]] = 1.0 if best_combo_mask[k] else 0.0
+
+
+@njit(parallel=True, cache=_CACHE_KERNELS, error_model="numpy")
+def _triangulate_flat_kernel(
+        points_2d_flat,
+        valid,
+        extrinsics_mats,
+        minimum_cameras_for_triangulation,
+        maximum_cameras_to_drop,
+        target_reprojection_error,
+        use_outlier_rejection,
+        out_points_3d,
+        out_weights,
+):
+    n_flat = points_2d_flat.shape[0]
+    for pt_idx in prange(n_flat):
+        _triangulate_point(
+            points_2d_flat[pt_idx],
+            valid[pt_idx],
+            extrinsics_mats,
+            minimum_cameras_for_triangulation,
+            maximum_cameras_to_drop,
+            target_reprojection_error,
+            use_outlier_rejection,
+            out_points_3d[pt_idx],
+            out_weights[pt_idx],
+        )
+
+
+def triangulate_flat_numba(
+        *,
+        points_2d_flat: NDArray[np.float64],
+        extrinsics_mats: NDArray[np.float64],
+        minimum_cameras_for_triangulation: int,
+        maximum_cameras_to_drop: int,
+        target_reprojection_error: float,
+        use_outlier_rejection: bool,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Triangulate every point in a flat batch with the compiled kernel.
+
+    Args:
+        points_2d_flat: shape (n_cameras, n_flat, 2) - undistorted-normalized 2D
+            observations; NaN where a camera did not see the point.
+        extrinsics_mats: shape (n_cameras, 3, 4) - [R|t] matrices.
+        minimum_cameras_for_triangulation: points seen by fewer cameras stay NaN.
+        maximum_cameras_to_drop: deepest subset search for outlier rejection.
+        target_reprojection_error: normalized-coords target / weight scale.
+        use_outlier_rejection: subset-ensemble outlier rejection vs plain DLT.
+
+    Returns:
+        (points_3d, per_camera_weights): shapes (n_flat, 3) and (n_flat, n_cameras),
+        NaN-filled where untriangulated / unobserved - same layout as the numpy path.
+    """
+    n_cameras, n_flat, _ = points_2d_flat.shape
+    points_by_point = np.ascontiguousarray(points_2d_flat.transpose(1, 0, 2), dtype=np.float64)
+    valid = ~np.isnan(points_by_point[:, :, 0])
+    points_3d = np.full((n_flat, 3), np.nan, dtype=np.float64)
+    weights = np.full((n_flat, n_cameras), np.nan, dtype=np.float64)
+    _triangulate_flat_kernel(
+        points_by_point,
+        valid,
+        np.ascontiguousarray(extrinsics_mats, dtype=np.float64),
+        int(minimum_cameras_for_triangulation),
+        int(maximum_cameras_to_drop),
+        float(target_reprojection_error),
+        bool(use_outlier_rejection),
+        points_3d,
+        weights,
+    )
+    return points_3d, weights
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, Field
 
 from freemocap.core.tasks.triangulation.helpers.default_triangulation_values import DEFAULT_MIN_CAMERAS, \
@@ -56,3 +58,53 @@ class TriangulationConfig(BaseModel):
             "achieves this error, no subsets are tried. Ignored when use_outlier_rejection=False."
         ),
     )
+    backend: Literal["numpy", "numba"] = Field(
+        default="numpy",
+        alias="backend",
+        description=(
+            "Which implementation runs the per-point triangulation. 'numpy' groups points "
+            "by which cameras observed them and solves each group with one batched SVD "
+            "per camera subset. 'numba' runs every point - any visibility pattern, with or "
+            "without outlier rejection - through one fused, parallel JIT-compiled kernel. "
+            "Results match within floating-point tolerance; the first 'numba' call in a "
+            "process pays a one-off compile (cached on disk between runs)."
+        ),
+    )
+    chunk_size_frames: int | None = Field(
+        default=None,
+        alias="chunkSizeFrames",
+        ge=1,
+        description=(
+            "Posthoc only. If set, recordings are triangulated in windows of this many "
+            "frames (undistortion -> DLT -> reprojection error per window), with results "
+            "written into preallocated / memory-mapped outputs, so peak memory no longer "
+            "grows with recording length. None triangulates the whole recording at once."
+        ),
+    )
+    num_shard_workers: int | None = Field(
+        default=None,
+        alias="numShardWorkers",
+        ge=0,
+        description=(
+            "Posthoc only. If set, the recording's frame range is split into shards that are "
+            "triangulated in parallel by this many worker processes (0 = one per CPU core), "
+            "with inputs and outputs in shared memory. Shards are chunk_size_frames long when "
+            "that is set, otherwise a few per worker. Worth it for long recordings; with the "
+            "'numba' backend, which already runs in parallel, prefer leaving this unset. "
+            "None triangulates in the aggregator process."
+        ),
+    )
+    undistortion_lookup_step_px: float | None = Field(
+        default=None,
+        alias="undistortionLookupStepPx",
+        gt=0.0,
+        description=(
+            "Realtime only. If set, each calibration load precomputes a per-camera remap "
+            "grid with nodes this many pixels apart, and undistortion becomes a bilinear "
+            "lookup in that grid instead of cv2.undistortPoints' per-point iterative solve. "
+            "Smaller steps are more accurate but use more memory; the measured maximum "
+            "approximation error is logged when the grid is built (a 4-8 px step is "
+            "typically well under 0.01 px for ordinary lens distortion). None always "
+            "uses cv2.undistortPoints."
+        ),
+    )
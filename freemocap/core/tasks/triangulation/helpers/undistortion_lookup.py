@@ -0,0 +1,226 @@
+"""Precomputed undistortion lookup: a dense per-camera remap grid with bilinear lookup.
+
+`cv2.undistortPoints` runs an iterative solver for every point, every call. The
+intrinsics only change when a calibration is (re)loaded, so the mapping
+pixel -> undistorted-normalized coordinates can be sampled once on a regular
+grid over each camera's image and then evaluated as a bilinear gather.
+
+All cameras' grids are padded into one (n_cameras, max_rows, max_cols, 2) array,
+so a lookup for a (n_cameras, n_points, 2) batch is a single compiled gather
+across every camera. Points outside a camera's grid fall back to
+`cv2.undistortPoints`, so the lookup never silently extrapolates. As in
+`triangulate_numba.py`, the `@njit` kernel is left unannotated.
+"""
+import math
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from numba import njit
+from numpy.typing import NDArray
+
+from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
+from freemocap.core.tasks.triangulation.helpers.triangulate_numba import _CACHE_KERNELS
+
+
+def _undistort_exact(
+        *,
+        points_2d: NDArray[np.float64],
+        camera_matrix: NDArray[np.float64],
+        dist_coeffs: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    undistorted = cv2.undistortPoints(points_2d.reshape(-1, 1, 2).astype(np.float64), camera_matrix, dist_coeffs)
+    return undistorted.reshape(-1, 2)
+
+
+@dataclass(slots=True, frozen=True)
+class UndistortionLookup:
+    """Per-camera pixel -> undistorted-normalized remap grids for a fixed set of cameras.
+
+    Grid node (row, col) of camera c sits at pixel (col * grid_step_px, row * grid_step_px)
+    and spans the full image. `max_error_normalized` / `max_error_px` are the largest
+    lookup-vs-`cv2.undistortPoints` differences measured at every grid-cell centre
+    when the lookup was built (the pixel figure is the normalized error times the
+    camera's mean focal length).
+    """
+
+    grid_step_px: float
+    grids: NDArray[np.float64]              # (n_cameras, max_rows, max_cols, 2), NaN padded
+    max_node_index: NDArray[np.int64]       # (n_cameras, 2): last valid (col, row) node per camera
+    camera_matrices: NDArray[np.float64]    # (n_cameras, 3, 3), for the out-of-grid fallback
+    dist_coeffs: NDArray[np.float64]        # (n_cameras, 4)
+    max_error_normalized: NDArray[np.float64]  # (n_cameras,)
+    max_error_px: NDArray[np.float64]          # (n_cameras,)
+
+    @property
+    def n_cameras(self) -> int:
+        return self.grids.shape[0]
+
+    @property
+    def _all_camera_indices(self) -> NDArray[np.intp]:
+        return np.arange(self.n_cameras, dtype=np.intp)
+
+    @classmethod
+    def build(cls, *, cameras: list[CameraModel], grid_step_px: float) -> "UndistortionLookup":
+        """Sample `cv2.undistortPoints` on a `grid_step_px` grid over each camera's image."""
+        if grid_step_px <= 0:
+            raise ValueError(f"grid_step_px must be positive, got {grid_step_px}")
+
+        n_nodes = np.array(
+            [
+                [math.ceil((cam.image_size[0] - 1) / grid_step_px) + 1,
+                 math.ceil((cam.image_size[1] - 1) / grid_step_px) + 1]
+                for cam in cameras
+            ],
+            dtype=np.int64,
+        )  # (n_cameras, 2) as (cols, rows)
+        max_cols, max_rows = (int(v) for v in n_nodes.max(axis=0))
+        grids = np.full((len(cameras), max_rows, max_cols, 2), np.nan, dtype=np.float64)
+        camera_matrices = np.stack([cam.intrinsics.to_camera_matrix() for cam in cameras])
+        dist_coeffs = np.stack([cam.intrinsics.to_dist_coeffs() for cam in cameras])
+
+        for cam_idx, (n_cols, n_rows) in enumerate(n_nodes):
+            xs = np.arange(n_cols, dtype=np.float64) * grid_step_px
+            ys = np.arange(n_rows, dtype=np.float64) * grid_step_px
+            nodes = np.stack(np.meshgrid(xs, ys), axis=-1)  # (n_rows, n_cols, 2)
+            grids[cam_idx, :n_rows, :n_cols] = _undistort_exact(
+                points_2d=nodes,
+                camera_matrix=camera_matrices[cam_idx],
+                dist_coeffs=dist_coeffs[cam_idx],
+            ).reshape(n_rows, n_cols, 2)
+
+        lookup = cls(
+            grid_step_px=float(grid_step_px),
+            grids=grids,
+            max_node_index=n_nodes - 1,
+            camera_matrices=camera_matrices,
+            dist_coeffs=dist_coeffs,
+            max_error_normalized=np.zeros(len(cameras), dtype=np.float64),
+            max_error_px=np.zeros(len(cameras), dtype=np.float64),
+        )
+        lookup._measure_max_error()
+        return lookup
+
+    def _measure_max_error(self) -> None:
+        """Fill max_error_* by comparing the lookup against the exact solver at every cell centre.
+
+        Bilinear error peaks mid-cell, so cell centres bound the error over the image.
+        """
+        for cam_idx, (n_cell_cols, n_cell_rows) in enumerate(self.max_node_index):
+            xs = (np.arange(n_cell_cols, dtype=np.float64) + 0.5) * self.grid_step_px
+            ys = (np.arange(n_cell_rows, dtype=np.float64) + 0.5) * self.grid_step_px
+            centres = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+            exact = _undistort_exact(
+                points_2d=centres,
+                camera_matrix=self.camera_matrices[cam_idx],
+                dist_coeffs=self.dist_coeffs[cam_idx],
+            )
+            interpolated, _ = self._interpolate(
+                points_2d=centres[None, :, :],
+                camera_indices=np.array([cam_idx]),
+            )
+            error = float(np.linalg.norm(interpolated[0] - exact, axis=1).max())
+            focal = 0.5 * (self.camera_matrices[cam_idx, 0, 0] + self.camera_matrices[cam_idx, 1, 1])
+            self.max_error_normalized[cam_idx] = error
+            self.max_error_px[cam_idx] = error * focal
+
+    def subset(self, camera_indices: list[int]) -> "UndistortionLookup":
+        """The lookup restricted to (and reordered as) `camera_indices`."""
+        idx = np.asarray(camera_indices, dtype=np.intp)
+        return UndistortionLookup(
+            grid_step_px=self.grid_step_px,
+            grids=self.grids[idx],
+            max_node_index=self.max_node_index[idx],
+            camera_matrices=self.camera_matrices[idx],
+            dist_coeffs=self.dist_coeffs[idx],
+            max_error_normalized=self.max_error_normalized[idx],
+            max_error_px=self.max_error_px[idx],
+        )
+
+    def undistort(self, points_2d: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Pixel -> undistorted-normalized coordinates for every camera at once.
+
+        Args:
+            points_2d: shape (n_cameras, ..., 2) pixel coordinates, first axis aligned
+                with the cameras this lookup was built for. NaN stays NaN.
+
+        Returns:
+            Same shape as `points_2d`, in undistorted-normalized coordinates.
+        """
+        if points_2d.shape[0] != self.n_cameras:
+            raise ValueError(f"points_2d has {points_2d.shape[0]} cameras, lookup has {self.n_cameras}")
+        flat = points_2d.reshape(self.n_cameras, -1, 2)
+        out, in_grid = self._interpolate(points_2d=flat, camera_indices=self._all_camera_indices)
+        if in_grid.all():
+            return out.reshape(points_2d.shape)
+
+        outside = ~in_grid & ~np.isnan(flat).any(axis=2)
+        for cam_idx in np.flatnonzero(outside.any(axis=1)):
+            mask = outside[cam_idx]
+            out[cam_idx, mask] = _undistort_exact(
+                points_2d=flat[cam_idx, mask],
+                camera_matrix=self.camera_matrices[cam_idx],
+                dist_coeffs=self.dist_coeffs[cam_idx],
+            )
+        return out.reshape(points_2d.shape)
+
+    def _interpolate(
+            self,
+            *,
+            points_2d: NDArray[np.float64],
+            camera_indices: NDArray[np.intp],
+    ) -> tuple[NDArray[np.float64], NDArray[np.bool_]]:
+        """Bilinear lookup of (k, n, 2) points in the grids of `camera_indices` (k,).
+
+        Returns (values, in_grid); values are NaN wherever in_grid is False.
+        """
+        values = np.empty(points_2d.shape, dtype=np.float64)
+        in_grid = np.empty(points_2d.shape[:2], dtype=np.bool_)
+        _bilinear_lookup_kernel(
+            np.ascontiguousarray(points_2d, dtype=np.float64),
+            self.grids,
+            self.max_node_index,
+            np.ascontiguousarray(camera_indices, dtype=np.int64),
+            self.grid_step_px,
+            values,
+            in_grid,
+        )
+        return values, in_grid
+
+
+@njit(cache=_CACHE_KERNELS, error_model="numpy")
+def _bilinear_lookup_kernel(
+        points_2d,
+        grids,
+        max_node_index,
+        camera_indices,
+        grid_step_px,
+        out_values,
+        out_in_grid,
+):
+    """Fused bilinear gather. A few hundred points per frame is far too small a batch
+    for chains of numpy ops to beat `cv2.undistortPoints`; one compiled loop is."""
+    n_sel, n_points, _ = points_2d.shape
+    for k in range(n_sel):
+        c = camera_indices[k]
+        max_col = max_node_index[c, 0]
+        max_row = max_node_index[c, 1]
+        for p in range(n_points):
+            gx = points_2d[k, p, 0] / grid_step_px
+            gy = points_2d[k, p, 1] / grid_step_px
+            # NaN fails every comparison, so unobserved points land here too.
+            if not (gx >= 0.0 and gy >= 0.0 and gx <= max_col and gy <= max_row):
+                out_in_grid[k, p] = False
+                out_values[k, p, 0] = np.nan
+                out_values[k, p, 1] = np.nan
+                continue
+            out_in_grid[k, p] = True
+            # Clamp the lower corner so the +1 neighbour exists on the last row/col.
+            ix = min(int(gx), max_col - 1)
+            iy = min(int(gy), max_row - 1)
+            tx = gx - ix
+            ty = gy - iy
+            for d in range(2):
+                top = grids[c, iy, ix, d] * (1.0 - tx) + grids[c, iy, ix + 1, d] * tx
+                bottom = grids[c, iy + 1, ix, d] * (1.0 - tx) + grids[c, iy + 1, ix + 1, d] * tx
+                out_values[k, p, d] = top * (1.0 - ty) + bottom * ty
@@ -5,10 +5,13 @@ Single source of triangulation in the codebase. One class, one public method
 and dispatches to either simple DLT or the subset-ensemble outlier-rejection
 algorithm based on the supplied `TriangulationConfig`.
 
-Pure numpy + cv2 (for undistortion). No aniposelib coupling.
+Pure numpy + cv2 (for undistortion). No aniposelib coupling. An optional
+numba kernel (`TriangulationConfig.backend="numba"`) replaces the per-point
+work with one fused parallel pass; see `helpers/triangulate_numba.py`.
 """
 import itertools
 import logging
+from collections.abc import Callable
 from pathlib import Path
 
 import cv2
@@ -19,18 +22,24 @@ from skellycam.core.types.type_overloads import CameraIdString
 
 from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
 from freemocap.core.tasks.calibration.shared.calibration_result import CalibrationResult
-from freemocap.core.tasks.triangulation.helpers.outlier_rejection import (
-    triangulate_with_outlier_rejection,
-)
-from freemocap.core.tasks.triangulation.helpers.triangulate_simple import triangulate_simple, triangulate_simple_batch
+from freemocap.core.tasks.triangulation.helpers.project_multi_camera import project_points_multi_camera
+from freemocap.core.tasks.triangulation.helpers.triangulate_simple import triangulate_simple_batch
 from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
 from freemocap.core.tasks.triangulation.helpers.triangulation_result import TriangulationResult
+from freemocap.core.tasks.triangulation.helpers.undistortion_lookup import UndistortionLookup
 
 logger = logging.getLogger(__name__)
 
 PointsByCamera = dict[str, NDArray[np.float64]]
 PointsArray = NDArray[np.float64]
 TriangulateInput = PointsByCamera | PointsArray
+# (start_frame, stop_frame) -> the multi-frame input for that window (dict or 4D array)
+ChunkLoader = Callable[[int, int], TriangulateInput]
+
+# File names of the memory-mapped outputs written by `Triangulator.triangulate_chunked`.
+CHUNKED_POINTS_3D_NPY: str = "triangulated_points_3d.npy"
+CHUNKED_PER_CAMERA_WEIGHTS_NPY: str = "per_camera_weights.npy"
+CHUNKED_REPROJECTION_ERROR_NPY: str = "reprojection_error_by_camera.npy"
 
 
 def _undistort_points_for_camera(
@@ -46,6 +55,51 @@ def _undistort_points_for_camera(
     return undistorted.reshape(-1, 2)
 
 
+def _batch_mean_reprojection_error(
+        *,
+        points_3d: NDArray[np.float64],
+        points_2d: NDArray[np.float64],
+        extrinsics_mats: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Mean normalized-coordinate reprojection error per point.
+
+    Args:
+        points_3d: (P, 3) world points.
+        points_2d: (P, k, 2) undistorted-normalized observations.
+        extrinsics_mats: (k, 3, 4) [R|t] matrices.
+
+    Returns:
+        (P,) mean Euclidean error across the k cameras.
+    """
+    n_pts = points_3d.shape[0]
+    hom = np.concatenate(
+        [points_3d, np.ones((n_pts, 1), dtype=np.float64)], axis=1
+    )  # (P, 4)
+    proj = extrinsics_mats @ hom.T   # (k, 3, P)
+    z = proj[:, 2, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        proj_2d = proj[:, :2, :] / z[:, None, :]   # (k, 2, P)
+    proj_2d_T = proj_2d.transpose(2, 0, 1)          # (P, k, 2)
+    return np.linalg.norm(proj_2d_T - points_2d, axis=2).mean(axis=1)
+
+
+def _allocate_output(
+        *,
+        shape: tuple[int, ...],
+        output_folder: Path | None,
+        file_name: str,
+) -> NDArray[np.float64]:
+    """Uninitialised float64 output: an in-RAM array, or an `.npy` memory map in output_folder.
+
+    Left uninitialised on purpose - every frame window overwrites its full slice.
+    """
+    if output_folder is None:
+        return np.empty(shape, dtype=np.float64)
+    return np.lib.format.open_memmap(
+        Path(output_folder) / file_name, mode="w+", dtype=np.float64, shape=shape,
+    )
+
+
 class Triangulator(BaseModel):
     """Triangulates 2D observations into 3D using calibrated CameraModels."""
 
@@ -54,28 +108,29 @@ class Triangulator(BaseModel):
     cameras: list[CameraModel]
 
     _extrinsics_mats: NDArray[np.float64] | None = None
-    # Cached per-camera cv2 inputs (computed once at construction, not on every project() call)
-    _rvecs: list | None = None   # list of (3,1) Rodrigues vectors
-    _tvecs: list | None = None   # list of (3,) translation vectors
+    # (n_cameras, 8) [fx, fy, cx, cy, k1, k2, p1, p2] rows for the vectorized projection
+    _intrinsics_params: NDArray[np.float64] | None = None
+    # Cached per-camera cv2 inputs (computed once at construction, not on every undistort call)
     _Ks: list | None = None      # list of (3,3) camera matrices
     _dists: list | None = None   # list of distortion coefficient arrays
+    # Optional precomputed remap grids replacing cv2.undistortPoints (see enable_undistortion_lookup)
+    _undistortion_lookup: UndistortionLookup | None = None
 
     @model_validator(mode="after")
     def _precompute(self) -> "Triangulator":
         if len(self.cameras) < 2:
             raise ValueError(f"Triangulator requires at least 2 cameras, got {len(self.cameras)}")
         ext = np.zeros((len(self.cameras), 3, 4), dtype=np.float64)
-        rvecs, tvecs, Ks, dists = [], [], [], []
+        intrinsics_params = np.zeros((len(self.cameras), 8), dtype=np.float64)
+        Ks, dists = [], []
         for i, cam in enumerate(self.cameras):
             ext[i, :, :3] = cam.extrinsics.rotation_matrix
             ext[i, :, 3] = cam.extrinsics.translation
-            rvecs.append(cam.extrinsics.rodrigues_vector.reshape(3, 1))
-            tvecs.append(cam.extrinsics.translation)
+            intrinsics_params[i] = cam.intrinsics.to_param_array()
             Ks.append(cam.intrinsics.to_camera_matrix())
             dists.append(cam.intrinsics.to_dist_coeffs())
         object.__setattr__(self, "_extrinsics_mats", ext)
-        object.__setattr__(self, "_rvecs", rvecs)
-        object.__setattr__(self, "_tvecs", tvecs)
+        object.__setattr__(self, "_intrinsics_params", intrinsics_params)
         object.__setattr__(self, "_Ks", Ks)
         object.__setattr__(self, "_dists", dists)
         return self
@@ -126,7 +181,30 @@ class Triangulator(BaseModel):
         missing = [n for n in camera_ids if n not in by_id]
         if missing:
             raise KeyError(f"Unknown cameras: {missing}. Known: {self.camera_ids}")
-        return Triangulator(cameras=[by_id[n] for n in camera_ids])
+        subset = Triangulator(cameras=[by_id[n] for n in camera_ids])
+        if self._undistortion_lookup is not None:
+            index_by_id = {cam_id: i for i, cam_id in enumerate(self.camera_ids)}
+            object.__setattr__(
+                subset,
+                "_undistortion_lookup",
+                self._undistortion_lookup.subset([index_by_id[n] for n in camera_ids]),
+            )
+        return subset
+
+    def enable_undistortion_lookup(self, *, grid_step_px: float) -> UndistortionLookup:
+        """Build per-camera remap grids and use them instead of `cv2.undistortPoints`.
+
+        Worth it when the same cameras triangulate many frames (realtime). Points
+        outside an image still go through `cv2.undistortPoints`. The returned
+        lookup reports its measured maximum approximation error per camera.
+        """
+        lookup = UndistortionLookup.build(cameras=self.cameras, grid_step_px=grid_step_px)
+        object.__setattr__(self, "_undistortion_lookup", lookup)
+        return lookup
+
+    @property
+    def undistortion_lookup(self) -> UndistortionLookup | None:
+        return self._undistortion_lookup
 
     # =========================================================================
     # PROJECTION
@@ -135,29 +213,21 @@ class Triangulator(BaseModel):
     def project(self, points_3d: NDArray[np.float64]) -> NDArray[np.float64]:
         """Project 3D points through all cameras (with intrinsics + distortion).
 
+        One vectorized pass over every camera (see `helpers/project_multi_camera.py`),
+        using the parameter tensors cached at construction.
+
         Args:
-            points_3d: shape (n_points, 3) world coordinates. NaN-rows are skipped.
+            points_3d: shape (n_points, 3) world coordinates.
 
         Returns:
             shape (n_cameras, n_points, 2) pixel coordinates. NaN where the
             corresponding 3D point was NaN.
         """
-        n_points = points_3d.shape[0]
-        out = np.empty((self.n_cameras, n_points, 2), dtype=np.float64)
-        nan_mask = np.isnan(points_3d).any(axis=1)
-        valid_pts = points_3d[~nan_mask].reshape(-1, 1, 3)
-        for cam_idx in range(self.n_cameras):
-            if valid_pts.shape[0] == 0:
-                out[cam_idx] = np.nan
-                continue
-            projected, _ = cv2.projectPoints(
-                valid_pts, self._rvecs[cam_idx], self._tvecs[cam_idx],
-                self._Ks[cam_idx], self._dists[cam_idx],
-            )
-            full = np.full((n_points, 2), np.nan, dtype=np.float64)
-            full[~nan_mask] = projected.reshape(-1, 2)
-            out[cam_idx] = full
-        return out
+        return project_points_multi_camera(
+            points_3d=np.asarray(points_3d, dtype=np.float64),
+            extrinsics_mats=self._extrinsics_mats,
+            intrinsics_params=self._intrinsics_params,
+        )
 
     # =========================================================================
     # CORE TRIANGULATION
@@ -210,6 +280,8 @@ class Triangulator(BaseModel):
 
         if assume_undistorted_normalized:
             undistorted = stacked
+        elif self._undistortion_lookup is not None:
+            undistorted = self._undistortion_lookup.undistort(stacked)
         else:
             undistorted = np.empty_like(stacked)
             for cam_idx in range(self.n_cameras):
@@ -222,82 +294,10 @@ class Triangulator(BaseModel):
         n_flat = n_frames * n_points
         und_flat = undistorted.reshape(self.n_cameras, n_flat, 2)
 
-        points_3d_flat = np.full((n_flat, 3), np.nan, dtype=np.float64)
-        weights_flat = np.full((n_flat, self.n_cameras), np.nan, dtype=np.float64)
-
-        # Per-point validity: True where the 2D observation is not NaN.
-        valid_all = ~np.isnan(und_flat[:, :, 0])  # (n_cameras, n_flat)
-        n_valid_per_pt = valid_all.sum(axis=0)     # (n_flat,)
-
-        # --- Batch path: points visible in ALL cameras (common case for RTMPose) ---
-        all_cams_valid = valid_all.all(axis=0) & (n_valid_per_pt >= config.minimum_cameras_for_triangulation)
-        batch_idx = np.where(all_cams_valid)[0]
-
-        if batch_idx.size > 0:
-            # (n_batch, n_cameras, 2) — rearrange from (n_cameras, n_batch, 2)
-            pts_batch = np.ascontiguousarray(und_flat[:, batch_idx, :].transpose(1, 0, 2))
-            p3d_batch = triangulate_simple_batch(
-                points_batch=pts_batch, extrinsics_mats=self._extrinsics_mats
-            )  # (n_batch, 3)
-
-            if config.use_outlier_rejection:
-                logger.info("Using outlier rejection with target reprojection error %.4f", config.target_reprojection_error)
-                # Batch-project to check normalized reprojection error
-                n_batch = batch_idx.size
-                hom = np.concatenate(
-                    [p3d_batch, np.ones((n_batch, 1), dtype=np.float64)], axis=1
-                )  # (n_batch, 4)
-                proj = self._extrinsics_mats @ hom.T  # (n_cameras, 3, n_batch)
-                z = proj[:, 2, :]
-                with np.errstate(invalid="ignore", divide="ignore"):
-                    proj_2d = proj[:, :2, :] / z[:, None, :]  # (n_cameras, 2, n_batch)
-                proj_2d_T = proj_2d.transpose(2, 0, 1)  # (n_batch, n_cameras, 2)
-                mean_errors = np.linalg.norm(proj_2d_T - pts_batch, axis=2).mean(axis=1)  # (n_batch,)
-
-                good_mask = mean_errors < config.target_reprojection_error
-                good_global = batch_idx[good_mask]
-                points_3d_flat[good_global] = p3d_batch[good_mask]
-                weights_flat[good_global, :] = 1.0
-
-                # For batch points above error threshold, use vectorized batch outlier rejection
-                bad_local = np.where(~good_mask)[0]
-                n_bad = len(bad_local)
-                if n_bad > 0:
-                    bad_global = batch_idx[bad_local]
-                    p3d_rej, cam_w_rej = self._batch_outlier_rejection(
-                        pts_batch=pts_batch[bad_local],
-                        p3d_default=p3d_batch[bad_local],
-                        default_mean_errors=mean_errors[bad_local],
-                        config=config,
-                    )
-                    points_3d_flat[bad_global] = p3d_rej
-                    weights_flat[bad_global, :] = cam_w_rej
-            else:
-                points_3d_flat[batch_idx] = p3d_batch
-                weights_flat[batch_idx, :] = 1.0 / self.n_cameras
-
-        # --- Per-point path: points with partial camera coverage ---
-        for pt_idx in np.where(~all_cams_valid & (n_valid_per_pt >= config.minimum_cameras_for_triangulation))[0]:
-            subp = und_flat[:, pt_idx, :]  # (n_cameras, 2)
-            valid_idx = np.where(valid_all[:, pt_idx])[0]
-            n_valid = len(valid_idx)
-            valid_pts = subp[valid_idx]
-            valid_ext = self._extrinsics_mats[valid_idx]
-
-            if config.use_outlier_rejection:
-                p3d, cam_weights_valid = triangulate_with_outlier_rejection(
-                    points_2d=valid_pts,
-                    extrinsics_mats=valid_ext,
-                    minimum_cameras_for_triangulation=config.minimum_cameras_for_triangulation,
-                    maximum_cameras_to_drop=config.maximum_cameras_to_drop,
-                    target_reprojection_error=config.target_reprojection_error,
-                )
-            else:
-                p3d = triangulate_simple(points=valid_pts, extrinsics_mats=valid_ext)
-                cam_weights_valid = np.full(n_valid, 1.0 / n_valid, dtype=np.float64)
-
-            points_3d_flat[pt_idx] = p3d
-            weights_flat[pt_idx, valid_idx] = cam_weights_valid
+        if config.backend == "numba":
+            points_3d_flat, weights_flat = self._triangulate_flat_numba(und_flat=und_flat, config=config)
+        else:
+            points_3d_flat, weights_flat = self._triangulate_flat_numpy(und_flat=und_flat, config=config)
 
         if assume_undistorted_normalized:
             reprojection_error_flat = self._compute_reprojection_error_flat_normalized(
@@ -325,17 +325,235 @@ class Triangulator(BaseModel):
             reprojection_error=reprojection_error,
         )
 
+    def triangulate_chunked(
+            self,
+            *,
+            load_chunk: ChunkLoader,
+            n_frames: int,
+            config: TriangulationConfig | None = None,
+            chunk_size_frames: int | None = None,
+            output_folder: Path | None = None,
+    ) -> TriangulationResult:
+        """Triangulate a multi-frame recording one frame-window at a time.
+
+        Each window is fetched with `load_chunk(start, stop)` (a dict or 4D array,
+        exactly what `triangulate` accepts for multi-frame input), pushed through
+        undistortion -> DLT -> reprojection error, and written into outputs that
+        are allocated once up front. The triangulation's working memory is bounded
+        by the window size, not by `n_frames`; the outputs themselves are
+        full-length, `n_frames * n_points * (3 + 2 * n_cameras)` float64 values,
+        and stay in RAM unless `output_folder` is given.
+
+        Args:
+            load_chunk: returns the 2D observations for frames [start, stop).
+            n_frames: total number of frames to triangulate.
+            config: triangulation config. Its `chunk_size_frames` is used when
+                `chunk_size_frames` is not passed explicitly.
+            chunk_size_frames: frames per window (overrides the config value).
+            output_folder: if given, outputs are `.npy` memory maps in this folder
+                (`CHUNKED_*_NPY` names) instead of in-RAM arrays.
+
+        Returns:
+            A multi-frame `TriangulationResult` (same shapes as `triangulate` with
+            dict / 4D input), backed by the preallocated outputs.
+        """
+        if config is None:
+            config = TriangulationConfig()
+        if chunk_size_frames is None:
+            chunk_size_frames = config.chunk_size_frames
+        if chunk_size_frames is None or chunk_size_frames < 1:
+            raise ValueError(f"chunk_size_frames must be a positive int, got {chunk_size_frames}")
+        if n_frames < 1:
+            raise ValueError(f"n_frames must be positive, got {n_frames}")
+        if output_folder is not None:
+            Path(output_folder).mkdir(parents=True, exist_ok=True)
+
+        points_3d: NDArray[np.float64] | None = None
+        per_camera_weights: NDArray[np.float64] | None = None
+        reprojection_error: NDArray[np.float64] | None = None
+
+        for start in range(0, n_frames, chunk_size_frames):
+            stop = min(start + chunk_size_frames, n_frames)
+            chunk_result = self.triangulate(data2d=load_chunk(start, stop), config=config)
+            if chunk_result.points_3d.ndim != 3 or chunk_result.points_3d.shape[0] != stop - start:
+                raise ValueError(
+                    f"load_chunk({start}, {stop}) must return multi-frame input with {stop - start} frames; "
+                    f"got points_3d of shape {chunk_result.points_3d.shape}"
+                )
+
+            if points_3d is None:
+                n_points = chunk_result.points_3d.shape[1]
+                points_3d = _allocate_output(
+                    shape=(n_frames, n_points, 3),
+                    output_folder=output_folder,
+                    file_name=CHUNKED_POINTS_3D_NPY,
+                )
+                per_camera_weights = _allocate_output(
+                    shape=(n_frames, n_points, self.n_cameras),
+                    output_folder=output_folder,
+                    file_name=CHUNKED_PER_CAMERA_WEIGHTS_NPY,
+                )
+                reprojection_error = _allocate_output(
+                    shape=(self.n_cameras, n_frames, n_points),
+                    output_folder=output_folder,
+                    file_name=CHUNKED_REPROJECTION_ERROR_NPY,
+                )
+
+            points_3d[start:stop] = chunk_result.points_3d
+            per_camera_weights[start:stop] = chunk_result.per_camera_weights
+            reprojection_error[:, start:stop] = chunk_result.reprojection_error
+            logger.debug(f"Triangulated frames [{start}, {stop}) of {n_frames}")
+
+        if output_folder is not None:
+            for out in (points_3d, per_camera_weights, reprojection_error):
+                out.flush()
+
+        return TriangulationResult(
+            points_3d=points_3d,
+            per_camera_weights=per_camera_weights,
+            reprojection_error=reprojection_error,
+        )
+
     # =========================================================================
     # INTERNAL HELPERS
     # =========================================================================
 
+    def _triangulate_flat_numpy(
+            self,
+            *,
+            und_flat: NDArray[np.float64],
+            config: TriangulationConfig,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Numpy backend: masked batch DLT, one batched SVD per camera-visibility pattern.
+
+        Points are grouped by the bitmask of cameras that observed them, so a
+        partially-occluded keypoint is solved together with every other point
+        seen by exactly the same cameras - a handful of batched SVD calls per
+        frame instead of one Python iteration per point.
+
+        Fully-visible points use the batch outlier-rejection semantics (every drop
+        level explored); partially-visible groups reproduce
+        `triangulate_with_outlier_rejection` (early exit once a drop level reaches
+        the target), so results match the per-point reference.
+
+        Args:
+            und_flat: (n_cameras, n_flat, 2) undistorted-normalized coords, NaN where unobserved.
+
+        Returns:
+            (points_3d_flat, weights_flat): shapes (n_flat, 3) and (n_flat, n_cameras).
+        """
+        n_flat = und_flat.shape[1]
+        points_3d_flat = np.full((n_flat, 3), np.nan, dtype=np.float64)
+        weights_flat = np.full((n_flat, self.n_cameras), np.nan, dtype=np.float64)
+
+        # Per-point validity: True where the 2D observation is not NaN.
+        valid_all = ~np.isnan(und_flat[:, :, 0])  # (n_cameras, n_flat)
+        n_valid_per_pt = valid_all.sum(axis=0)     # (n_flat,)
+        triangulable = n_valid_per_pt >= config.minimum_cameras_for_triangulation
+        if not triangulable.any():
+            return points_3d_flat, weights_flat
+
+        if config.use_outlier_rejection:
+            logger.info("Using outlier rejection with target reprojection error %.4f", config.target_reprojection_error)
+
+        # Visibility bitmask per point; bit c set when camera c observed it.
+        camera_bits = np.left_shift(np.int64(1), np.arange(self.n_cameras, dtype=np.int64))
+        visibility_keys = (valid_all.T.astype(np.int64) * camera_bits).sum(axis=1)  # (n_flat,)
+        all_cameras_key = int(camera_bits.sum())
+
+        candidate_idx = np.flatnonzero(triangulable)
+        group_keys, group_inverse = np.unique(visibility_keys[candidate_idx], return_inverse=True)
+        for group_number, key in enumerate(group_keys.tolist()):
+            point_idx = candidate_idx[group_inverse == group_number]
+            cam_idx = np.flatnonzero(np.bitwise_and(key, camera_bits))
+            # (n_group, n_group_cameras, 2) — rearrange from (n_group_cameras, n_group, 2)
+            pts_group = np.ascontiguousarray(und_flat[cam_idx][:, point_idx, :].transpose(1, 0, 2))
+            p3d_group, cam_weights_group = self._triangulate_visibility_group(
+                pts_group=pts_group,
+                extrinsics_mats=self._extrinsics_mats[cam_idx],
+                config=config,
+                early_exit=key != all_cameras_key,
+            )
+            points_3d_flat[point_idx] = p3d_group
+            weights_flat[point_idx[:, None], cam_idx[None, :]] = cam_weights_group
+
+        return points_3d_flat, weights_flat
+
+    def _triangulate_visibility_group(
+            self,
+            *,
+            pts_group: NDArray[np.float64],
+            extrinsics_mats: NDArray[np.float64],
+            config: TriangulationConfig,
+            early_exit: bool,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Triangulate P points that share one camera-visibility pattern.
+
+        Args:
+            pts_group: (P, k, 2) undistorted-normalized coords from the k observing cameras, no NaNs.
+            extrinsics_mats: (k, 3, 4) [R|t] matrices of those cameras.
+            config: triangulation config.
+            early_exit: passed through to `_batch_outlier_rejection`.
+
+        Returns:
+            (points_3d, camera_weights): shapes (P, 3) and (P, k).
+        """
+        n_group, n_group_cameras, _ = pts_group.shape
+        p3d_group = triangulate_simple_batch(
+            points_batch=pts_group, extrinsics_mats=extrinsics_mats
+        )  # (P, 3)
+
+        if not config.use_outlier_rejection:
+            return p3d_group, np.full((n_group, n_group_cameras), 1.0 / n_group_cameras, dtype=np.float64)
+
+        mean_errors = _batch_mean_reprojection_error(
+            points_3d=p3d_group, points_2d=pts_group, extrinsics_mats=extrinsics_mats,
+        )  # (P,)
+        cam_weights = np.ones((n_group, n_group_cameras), dtype=np.float64)
+
+        # Points above the error threshold go through vectorized batch outlier rejection
+        bad_local = np.flatnonzero(mean_errors >= config.target_reprojection_error)
+        if bad_local.size > 0:
+            p3d_rej, cam_w_rej = self._batch_outlier_rejection(
+                pts_batch=pts_group[bad_local],
+                extrinsics_mats=extrinsics_mats,
+                p3d_default=p3d_group[bad_local],
+                default_mean_errors=mean_errors[bad_local],
+                config=config,
+                early_exit=early_exit,
+            )
+            p3d_group[bad_local] = p3d_rej
+            cam_weights[bad_local] = cam_w_rej
+        return p3d_group, cam_weights
+
+    def _triangulate_flat_numba(
+            self,
+            *,
+            und_flat: NDArray[np.float64],
+            config: TriangulationConfig,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Numba backend: every point, any visibility pattern, in one fused parallel kernel."""
+        # Imported lazily so worker processes that never select this backend skip numba's import cost.
+        from freemocap.core.tasks.triangulation.helpers.triangulate_numba import triangulate_flat_numba
+
+        return triangulate_flat_numba(
+            points_2d_flat=und_flat,
+            extrinsics_mats=self._extrinsics_mats,
+            minimum_cameras_for_triangulation=config.minimum_cameras_for_triangulation,
+            maximum_cameras_to_drop=config.maximum_cameras_to_drop,
+            target_reprojection_error=config.target_reprojection_error,
+            use_outlier_rejection=config.use_outlier_rejection,
+        )
+
     def _batch_outlier_rejection(
             self,
             *,
             pts_batch: NDArray[np.float64],
+            extrinsics_mats: NDArray[np.float64],
             p3d_default: NDArray[np.float64],
             default_mean_errors: NDArray[np.float64],
             config: "TriangulationConfig",
+            early_exit: bool = False,
     ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
         """Vectorized subset-ensemble outlier rejection for P points simultaneously.
 
@@ -344,16 +562,21 @@ class Triangulator(BaseModel):
         combination — O(n_combos) SVD calls instead of O(P × n_combos).
 
         Args:
-            pts_batch: (P, n_cameras, 2) undistorted-normalized coords, no NaNs.
-            p3d_default: (P, 3) triangulated from all cameras.
+            pts_batch: (P, k, 2) undistorted-normalized coords, no NaNs.
+            extrinsics_mats: (k, 3, 4) [R|t] matrices of the k cameras in pts_batch.
+            p3d_default: (P, 3) triangulated from all k cameras.
             default_mean_errors: (P,) mean reprojection error for the default result.
             config: triangulation config (target_reprojection_error, max_drop, etc.)
+            early_exit: if True, mirror triangulate_with_outlier_rejection exactly -
+                a point stops exploring deeper drop levels once its best subset
+                reaches the target, and a zero-total-weight point falls back to its
+                best subset with weight 1.0 (instead of 0.0) on those cameras.
 
         Returns:
-            (points_3d, camera_weights): shapes (P, 3) and (P, n_cameras).
+            (points_3d, camera_weights): shapes (P, 3) and (P, k).
         """
         P = pts_batch.shape[0]
-        n_cam = self.n_cameras
+        n_cam = pts_batch.shape[1]
         target = config.target_reprojection_error
         min_cams = config.minimum_cameras_for_triangulation
         max_drop = config.maximum_cameras_to_drop
@@ -367,6 +590,8 @@ class Triangulator(BaseModel):
 
         best_p3d = p3d_default.copy()          # (P, 3)
         best_errors = default_mean_errors.copy()  # (P,)
+        best_combo_mask = np.ones((P, n_cam), dtype=bool)
+        active = np.ones(P, dtype=bool)
 
         local_indices = list(range(n_cam))
 
@@ -378,40 +603,42 @@ class Triangulator(BaseModel):
             for combo in itertools.combinations(local_indices, selected):
                 combo_arr = np.array(combo, dtype=np.intp)
                 pts_sub = pts_batch[:, combo_arr, :]        # (P, selected, 2)
-                ext_sub = self._extrinsics_mats[combo_arr]  # (selected, 3, 4)
+                ext_sub = extrinsics_mats[combo_arr]        # (selected, 3, 4)
 
                 # Triangulate all P points for this camera subset in one SVD call
                 p3d_sub = triangulate_simple_batch(
                     points_batch=pts_sub, extrinsics_mats=ext_sub
                 )  # (P, 3)
+                mean_errs = _batch_mean_reprojection_error(
+                    points_3d=p3d_sub, points_2d=pts_sub, extrinsics_mats=ext_sub,
+                )  # (P,)
 
-                # Batch-project through subset cameras to get mean reprojection error per point
-                hom = np.concatenate(
-                    [p3d_sub, np.ones((P, 1), dtype=np.float64)], axis=1
-                )  # (P, 4)
-                proj = ext_sub @ hom.T   # (selected, 3, P)
-                z = proj[:, 2, :]
-                with np.errstate(invalid="ignore", divide="ignore"):
-                    proj_2d = proj[:, :2, :] / z[:, None, :]   # (selected, 2, P)
-                proj_2d_T = proj_2d.transpose(2, 0, 1)          # (P, selected, 2)
-                mean_errs = np.linalg.norm(proj_2d_T - pts_sub, axis=2).mean(axis=1)  # (P,)
-
-                # Accumulate weighted ensemble
+                # Accumulate weighted ensemble (points that already exited contribute nothing)
                 weights = np.exp(-5.0 * mean_errs / target)     # (P,)
-                weighted_p3d_sum += p3d_sub * weights[:, None]
-                total_weight += weights
-                cam_weights_acc[:, combo_arr] += weights[:, None]
+                weighted_p3d_sum += np.where(active[:, None], p3d_sub * weights[:, None], 0.0)
+                total_weight += np.where(active, weights, 0.0)
+                cam_weights_acc[:, combo_arr] += np.where(active, weights, 0.0)[:, None]
 
                 # Update per-point best
-                improved = mean_errs < best_errors
+                improved = (mean_errs < best_errors) & active
                 best_p3d = np.where(improved[:, None], p3d_sub, best_p3d)
                 best_errors = np.where(improved, mean_errs, best_errors)
+                if early_exit:
+                    combo_mask = np.zeros(n_cam, dtype=bool)
+                    combo_mask[combo_arr] = True
+                    best_combo_mask = np.where(improved[:, None], combo_mask[None, :], best_combo_mask)
+
+            if early_exit:
+                active &= ~(best_errors < target)
+                if not active.any():
+                    break
 
         # Build output: weighted ensemble where weight > threshold, else best
         valid_w = total_weight > 1e-12
         safe_w = np.where(valid_w, total_weight, 1.0)
         weighted_p3d = np.where(valid_w[:, None], weighted_p3d_sum / safe_w[:, None], best_p3d)
-        cam_weights = np.where(valid_w[:, None], cam_weights_acc / safe_w[:, None], 0.0)
+        fallback_weights = best_combo_mask.astype(np.float64) if early_exit else 0.0
+        cam_weights = np.where(valid_w[:, None], cam_weights_acc / safe_w[:, None], fallback_weights)
 
         # If best never improved over default, revert to default with flat weights
         no_improvement = best_errors >= default_mean_errors
@@ -499,12 +726,10 @@ class Triangulator(BaseModel):
             data2d_pixel_flat: NDArray[np.float64],
     ) -> NDArray[np.float64]:
         """Compute per-camera Euclidean pixel reprojection error. Returns (n_cameras, n_flat)."""
-        projected = self.project(points_3d=points_3d_flat)
-        diff = data2d_pixel_flat - projected
-        nan_mask = np.isnan(data2d_pixel_flat).any(axis=2)
-        norm = np.linalg.norm(diff, axis=2)
-        norm[nan_mask] = np.nan
-        return norm
+        diff = self.project(points_3d=points_3d_flat)
+        np.subtract(data2d_pixel_flat, diff, out=diff)
+        # NaN observations (and untriangulated points) propagate to NaN error.
+        return np.hypot(diff[..., 0], diff[..., 1])
 
     def _compute_reprojection_error_flat_normalized(
             self,
@@ -552,10 +777,9 @@ class Triangulator(BaseModel):
             (n_cameras, n_points, 2) signed error = observation - projection.
             NaN where the original observation was NaN.
         """
-        projected = self.project(points_3d=points_3d)
-        error = points_2d_pixel - projected
-        nan_mask = np.isnan(points_2d_pixel)
-        error[nan_mask] = np.nan
+        error = self.project(points_3d=points_3d)
+        # NaN observations propagate through the subtraction.
+        np.subtract(points_2d_pixel, error, out=error)
         return error
 
     def mean_reprojection_error(
@@ -568,12 +792,13 @@ class Triangulator(BaseModel):
 
         Returns shape (n_points,) - NaN for points with fewer than 2 valid observations.
         """
-        signed = self.signed_reprojection_error(
-            points_3d=points_3d, points_2d_pixel=points_2d_pixel,
-        )
-        norm = np.linalg.norm(signed, axis=2)  # (n_cameras, n_points)
+        # Runs on every realtime frame - reuse the projection buffer instead of
+        # materialising the signed error.
+        diff = self.project(points_3d=points_3d)
+        np.subtract(points_2d_pixel, diff, out=diff)
+        norm = np.hypot(diff[..., 0], diff[..., 1])  # (n_cameras, n_points); NaN if unobserved
         valid = ~np.isnan(norm)
-        norm_zeroed = np.where(valid, norm, 0.0)
+        norm[~valid] = 0.0
         denom = np.sum(valid, axis=0).astype(np.float64)
         denom[denom < 1.5] = np.nan
-        return np.sum(norm_zeroed, axis=0) / denom
+        return np.sum(norm, axis=0) / denom
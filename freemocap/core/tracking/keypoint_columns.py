@@ -0,0 +1,90 @@
+"""KeypointColumns: columnar per-camera keypoint storage for posthoc aggregation.
+
+The posthoc aggregation node used to keep every Observation in per-frame
+dicts and np.stack them again per camera once collection finished. Here the
+(n_cameras, n_frames, n_points, 3) float32 array is allocated once, as soon
+as the first observation tells us n_points, and each observation's merged
+keypoints are written into it in place as they arrive — the Observation can
+be dropped immediately afterwards.
+"""
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray  # noqa: TC002
+from skellycam.core.types.type_overloads import CameraIdString  # noqa: TC002
+from skellytracker.core.data_primitives.observation import Observation  # noqa: TC002
+
+
+class KeypointColumns:
+    """(camera, frame, point, xyz) keypoints for a fixed camera set and frame range.
+
+    Frame numbers passed to `add` are absolute; row ``i`` of the frame axis
+    holds frame ``start_frame + i``, i.e. that frame's
+    `Observation.to_keypoints().xyz` in float32.
+    """
+
+    def __init__(
+        self,
+        *,
+        camera_ids: list[CameraIdString],
+        start_frame: int,
+        n_frames: int,
+    ) -> None:
+        if n_frames < 0:
+            raise ValueError(f"n_frames must be >= 0, got {n_frames}")
+        self.camera_ids: list[CameraIdString] = list(camera_ids)
+        self.start_frame = start_frame
+        self.n_frames = n_frames
+        self._camera_index = {camera_id: index for index, camera_id in enumerate(self.camera_ids)}
+        self.xyz: NDArray[np.float32] | None = None
+        self.received: NDArray[np.bool_] = np.zeros((len(self.camera_ids), n_frames), dtype=bool)
+
+    @property
+    def n_points(self) -> int | None:
+        return None if self.xyz is None else self.xyz.shape[2]
+
+    def add(self, *, camera_id: CameraIdString, frame_number: int, observation: Observation) -> None:
+        """Write one observation's keypoints into its (camera, frame) slot."""
+        camera_index = self._camera_index.get(camera_id)
+        if camera_index is None:
+            raise ValueError(f"Unexpected camera ID '{camera_id}' — expected one of {self.camera_ids}")
+        row = frame_number - self.start_frame
+        if not 0 <= row < self.n_frames:
+            raise ValueError(
+                f"Unexpected frame number {frame_number} — "
+                f"expected range [{self.start_frame}, {self.start_frame + self.n_frames})"
+            )
+        if self.received[camera_index, row]:
+            raise ValueError(f"Duplicate output for camera {camera_id} frame {frame_number}")
+
+        keypoints_xyz = observation.to_keypoints().xyz
+        if self.xyz is None:
+            self.xyz = np.full(
+                (len(self.camera_ids), self.n_frames, keypoints_xyz.shape[0], 3),
+                np.nan,
+                dtype=np.float32,
+            )
+        elif keypoints_xyz.shape[0] != self.xyz.shape[2]:
+            raise ValueError(
+                f"Camera {camera_id} frame {frame_number} has {keypoints_xyz.shape[0]} keypoints, "
+                f"expected {self.xyz.shape[2]}"
+            )
+        self.xyz[camera_index, row] = keypoints_xyz
+        self.received[camera_index, row] = True
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.received.all())
+
+    def missing_frame_numbers(self) -> list[int]:
+        """Frame numbers still missing an observation from at least one camera."""
+        return [self.start_frame + int(row) for row in np.flatnonzero(~self.received.all(axis=0))]
+
+    def camera_xyz(self, camera_id: CameraIdString) -> NDArray[np.float32]:
+        """(n_frames, n_points, 3) view of one camera's keypoints."""
+        if self.xyz is None:
+            raise ValueError("No observations have been added")
+        return self.xyz[self._camera_index[camera_id]]
+
+    def xyz_by_camera(self) -> dict[CameraIdString, NDArray[np.float32]]:
+        return {camera_id: self.camera_xyz(camera_id) for camera_id in self.camera_ids}
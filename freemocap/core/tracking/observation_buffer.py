@@ -23,14 +23,6 @@ class ObservationBuffer:
     def add_observation(self, observation: Observation) -> None:
         self.observations.append(observation)
 
-    def to_keypoints_array(self) -> NDArray[np.float64]:
-        """Return (frames, keypoints, 3) array by merging all stages per frame.
-
-        Equivalent to the old BaseRecorder.to_array which called
-        observation.to_2d_array() (which itself returned full xyz).
-        """
-        return np.stack([obs.to_keypoints().xyz for obs in self.observations]).astype(np.float64)
-
     def to_stage_array(self, stage_name: str, n_points: int | None = None) -> NDArray[np.float64]:
         """Return (frames, n_points, 3) array from a single named stage.
 
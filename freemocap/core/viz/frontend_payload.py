@@ -8,6 +8,7 @@ from skellycam.core.types.type_overloads import CameraIdString, CameraGroupIdStr
 from skellyforge.data_models.trajectory_3d import Point3d
 
 from freemocap.core.kinematics.body_kinematics_state import BodyKinematicsState
+from freemocap.core.pipeline.realtime.keypoint_ring_buffer import KeypointSharedMemoryRingBuffer
 from freemocap.core.types.type_overloads import TrackedPointNameString, PipelineIdString, FrameNumberInt
 from freemocap.core.viz.image_overlay.charuco_overlay_data import CharucoOverlayData
 from freemocap.pubsub.pubsub_topics import AggregationNodeOutputMessage
@@ -40,8 +41,13 @@ class FrontendPayload(msgspec.Struct):
     def from_aggregation_output(
             cls,
             aggregation_output: AggregationNodeOutputMessage,
+            keypoint_ring: KeypointSharedMemoryRingBuffer | None = None,
     ) -> "FrontendPayload":
-        """Create frontend payload from aggregation node output."""
+        """Create frontend payload from aggregation node output.
+
+        `keypoint_ring` resolves skeleton overlays whose keypoints were sent
+        through the shared-memory keypoint ring rather than as Observations.
+        """
         com = aggregation_output.center_of_mass_result
         com_point = None
         if com is not None and not np.any(np.isnan(com.total_body_com)):
@@ -57,7 +63,7 @@ class FrontendPayload(msgspec.Struct):
             camera_group_id=aggregation_output.camera_group_id,
             pipeline_id=aggregation_output.pipeline_id,
             charuco_overlays=aggregation_output.charuco_overlay_data,
-            skeleton_overlays=aggregation_output.skeleton_overlay_data,
+            skeleton_overlays=aggregation_output.build_skeleton_overlay_data(keypoint_ring=keypoint_ring),
             center_of_mass=com_point,
             xcom=aggregation_output.xcom,
             body_kinematics=aggregation_output.body_kinematics,
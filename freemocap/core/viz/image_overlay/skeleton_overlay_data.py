@@ -15,6 +15,7 @@ import numpy as np
 from skellycam.core.types.type_overloads import CameraIdString
 from skellytracker.core.data_primitives.observation import Observation
 
+from freemocap.core.pipeline.realtime.keypoint_ring_buffer import KeypointFrameView
 from freemocap.core.tracking.tracker_definitions import RTMPOSE_WHOLEBODY_DEFINITION, MEDIAPIPE_WHOLEBODY_DEFINITION
 
 
@@ -113,3 +114,45 @@ class SkeletonOverlayData(msgspec.Struct):
             bbox_y2=bbox_y2,
             bbox_from_detector=bbox_from_detector,
         )
+
+    @classmethod
+    def from_keypoint_frame(
+            cls,
+            *,
+            keypoints: KeypointFrameView,
+            scale: float = 1.0,
+            tracker_definition_name: str = RTMPOSE_WHOLEBODY_DEFINITION.name,
+    ) -> "SkeletonOverlayData":
+        """Same payload as `from_observation`, built from a shared-memory keypoint ring view."""
+        xyz: np.ndarray = keypoints.xyz * scale
+        visibility: np.ndarray = keypoints.visibility
+        points: list[SkeletonPointModel] = []
+        for i, name in enumerate(keypoints.point_names):
+            x, y, z = xyz[i]
+            if np.isnan(x) or np.isnan(y):
+                continue
+            points.append(
+                SkeletonPointModel(
+                    name=name,
+                    x=float(x),
+                    y=float(y),
+                    z=float(z),
+                    visibility=float(visibility[i]),
+                )
+            )
+
+        x1, y1, x2, y2 = (float(v) * scale for v in keypoints.bbox_xyxy)
+        return cls(
+            camera_id=keypoints.camera_id,
+            frame_number=keypoints.frame_number,
+            tracker_id=tracker_definition_name,
+            image_width=keypoints.image_size[1],
+            image_height=keypoints.image_size[0],
+            message_type="skeleton_overlay",
+            points=points,
+            bbox_x1=x1,
+            bbox_y1=y1,
+            bbox_x2=x2,
+            bbox_y2=y2,
+            bbox_from_detector=keypoints.bbox_from_detector,
+        )
@@ -1,5 +1,6 @@
 import logging
 import multiprocessing
+import pickle
 from dataclasses import dataclass, field
 from queue import Empty, Full
 from typing import TypeVar, Generic, ClassVar
@@ -9,6 +10,9 @@ from freemocap.core.types.type_overloads import TopicPublicationQueue, TopicSubs
 logger = logging.getLogger(__name__)
 
 _TOPIC_QUEUE_MAXSIZE: int = 100  # prevents unbounded growth when consumers lag
+# How long eviction waits for a full subscription's oldest entry to come out of
+# its feeder thread; only reached if a consumer emptied the queue meanwhile.
+_EVICT_TIMEOUT_S: float = 0.1
 
 
 @dataclass
@@ -20,6 +24,43 @@ class TopicMessageABC:
 MessageType = TypeVar('MessageType', bound=TopicMessageABC)
 
 
+class PreSerializedMessage:
+    """A message that was pickled once, by its publisher, and is forwarded as bytes.
+
+    Putting this on a subscription queue only copies the bytes (no walk over
+    the message's object graph), and unpickling it on the subscriber side
+    yields the original message, so subscribers never see the wrapper.
+    """
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: bytes) -> None:
+        self.payload = payload
+
+    def __reduce__(self):
+        return pickle.loads, (self.payload,)
+
+
+def get_serialized_nowait(queue: TopicPublicationQueue) -> bytes | None:
+    """`queue.get_nowait()` without the unpickle: the raw pickled bytes, or None if empty.
+
+    Mirrors multiprocessing.Queue.get() (reader lock, poll, recv, release the
+    bounded semaphore) so it interoperates with ordinary put()/get() callers.
+    Only for the relay's reads of publication queues, whose pipe it has just
+    seen become readable; a message still in the putter's feeder thread reads
+    as None.
+    """
+    if not queue._rlock.acquire(False):
+        return None
+    try:
+        if not queue._poll():
+            return None
+        payload = queue._recv_bytes()
+        queue._sem.release()
+    finally:
+        queue._rlock.release()
+    return payload
+
+
 @dataclass(eq=False)
 class PubSubTopicABC(Generic[MessageType]):
     """
@@ -73,7 +114,7 @@ class PubSubTopicABC(Generic[MessageType]):
     def relay_to_subscribers(self) -> int:
         """
         Drain the publication queue and fan out to all subscribers.
-        Called by the PubSubRelay thread while holding the subscriptions lock.
+        Called by the PubSubRelay thread while holding this topic's lock.
         Returns the number of messages relayed.
         """
         relayed = 0
@@ -82,20 +123,43 @@ class PubSubTopicABC(Generic[MessageType]):
                 message = self.publication.get_nowait()
             except Empty:
                 break
-            for sub in self.subscriptions:
+            self._fan_out(message)
+            relayed += 1
+        return relayed
+
+    def relay_serialized_to_subscribers(self) -> int:
+        """
+        Like relay_to_subscribers(), but never unpickles: each message's
+        publisher-side pickle is forwarded to every subscriber as-is, so a
+        message is serialized once however many subscribers it has.
+        Returns the number of messages relayed.
+        """
+        relayed = 0
+        while True:
+            payload = get_serialized_nowait(self.publication)
+            if payload is None:
+                break
+            self._fan_out(PreSerializedMessage(payload))
+            relayed += 1
+        return relayed
+
+    def _fan_out(self, message: object) -> None:
+        """Put one message on every subscription queue, evicting the oldest entry when full."""
+        for sub in self.subscriptions:
+            try:
+                sub.put_nowait(message)
+            except Full:
+                # Evict the oldest entry. It may still be in the queue's feeder thread
+                # rather than the pipe, so block for it instead of polling; Empty means
+                # a consumer drained the queue in the meantime.
+                try:
+                    sub.get(timeout=_EVICT_TIMEOUT_S)
+                except Empty:
+                    pass
                 try:
                     sub.put_nowait(message)
                 except Full:
-                    try:
-                        sub.get_nowait()  # evict oldest to make room
-                    except Empty:
-                        pass
-                    try:
-                        sub.put_nowait(message)
-                    except Full:
-                        pass  # concurrent consumer drained it between our get and put
-            relayed += 1
-        return relayed
+                    logger.warning(f"Dropped a {self.message_type.__name__} for a full subscription queue")
 
     def close(self) -> None:
         if hasattr(self.publication, 'close'):
@@ -15,7 +15,7 @@ from multiprocessing.sharedctypes import Synchronized
 
 from freemocap.core.types.type_overloads import TopicPublicationQueue, TopicSubscriptionQueue
 from freemocap.pubsub.pubsub_abcs import PubSubTopicABC, MessageType
-from freemocap.pubsub.pubsub_relay import PubSubRelay
+from freemocap.pubsub.pubsub_relay import PubSubRelay, PubSubRelayMode
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +37,11 @@ class PubSubTopicManager:
     _relay: PubSubRelay | None = None
 
     @classmethod
-    def create(cls, global_kill_flag: Synchronized) -> "PubSubTopicManager":
+    def create(
+            cls,
+            global_kill_flag: Synchronized,
+            relay_mode: PubSubRelayMode = PubSubRelayMode.EVENT_DRIVEN,
+    ) -> "PubSubTopicManager":
         """
         Factory: creates manager, instantiates all registered topics,
         and starts the relay thread.
@@ -53,6 +57,7 @@ class PubSubTopicManager:
         manager._relay = PubSubRelay(
             topics=manager.topics,
             global_kill_flag=global_kill_flag,
+            mode=relay_mode,
         )
         manager._relay.start()
         logger.debug(
@@ -106,7 +111,7 @@ class PubSubTopicManager:
         """Flush pending messages from publication queues to subscription queues.
 
         Safe to call while the relay thread is running — both this method and
-        the relay loop acquire the subscriptions lock before touching queues,
+        the relay loop acquire a topic's lock before touching its queues,
         so they never race. Use this to capture messages that a worker process
         put into a publication queue just before exiting.
         """
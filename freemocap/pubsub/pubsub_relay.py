@@ -7,8 +7,18 @@ This decouples publishers from subscribers:
   - The relay (in the main process) handles distribution
   - Subscriptions can be added at any time without ordering constraints
 
-The relay owns the subscriptions lock, coordinating between the main thread
-(adding subscriptions) and the relay thread (iterating subscriptions).
+The relay owns one lock per topic, coordinating between the main thread
+(adding subscriptions) and the relay thread (iterating subscriptions) without
+a busy topic holding up the others.
+
+Two modes:
+  - EVENT_DRIVEN (default): the relay thread sleeps in
+    multiprocessing.connection.wait() on every publication queue's pipe and
+    wakes as soon as any of them has data. Messages are never unpickled in the
+    relay; the publisher's pickled bytes are forwarded to each subscriber.
+  - POLLING: the original loop - get_nowait() on every topic, then a 1ms
+    sleep when nothing was found. Each message is unpickled by the relay and
+    re-pickled once per subscriber.
 
 If the relay thread dies from an unhandled exception, it sets the global_kill_flag
 to bring down all processes.
@@ -19,6 +29,8 @@ import multiprocessing
 import threading
 import time
 from dataclasses import dataclass, field
+from enum import Enum
+from multiprocessing.connection import Connection, wait
 from multiprocessing.sharedctypes import Synchronized
 
 from freemocap.core.types.type_overloads import TopicPublicationQueue, TopicSubscriptionQueue
@@ -26,33 +38,50 @@ from freemocap.pubsub.pubsub_abcs import PubSubTopicABC
 
 logger = logging.getLogger(__name__)
 
-RELAY_POLL_INTERVAL_SECONDS: float = 0.001  # 1ms idle sleep when no messages
+RELAY_POLL_INTERVAL_SECONDS: float = 0.001  # 1ms idle sleep when no messages (POLLING mode)
+# Upper bound on one wait() in EVENT_DRIVEN mode. Stop requests wake the
+# relay immediately; this only bounds how long a missed wakeup could go unnoticed.
+RELAY_WAIT_TIMEOUT_SECONDS: float = 0.1
 RELAY_SHUTDOWN_TIMEOUT_SECONDS: float = 5.0
 RELAY_DRAIN_TIMEOUT_SECONDS: float = 2.0
 
 
+class PubSubRelayMode(str, Enum):
+    EVENT_DRIVEN = "event_driven"
+    POLLING = "polling"
+
+
 @dataclass
 class PubSubRelay:
     """
     Fan-out relay thread for the pubsub system.
 
-    Polls all topic publication queues in a tight loop. When a message
-    is found, it is distributed to every subscription queue for that topic.
-    On shutdown, remaining messages are drained before the thread exits.
+    Waits on (EVENT_DRIVEN) or polls (POLLING) all topic publication queues.
+    When a message arrives, it is distributed to every subscription queue for
+    that topic. On shutdown, remaining messages are drained before the thread
+    exits.
 
-    Owns the subscriptions lock — both create_subscription() and the relay
-    loop acquire it, so subscriptions can be safely added while the relay
-    is running.
+    Owns one lock per topic — both create_subscription() and the relay loop
+    acquire it, so subscriptions can be safely added while the relay is
+    running, and adding a subscriber to one topic never waits on another
+    topic's fan-out.
 
     If the relay thread crashes, global_kill_flag is set immediately to
     bring down all processes.
     """
     topics: dict[type[PubSubTopicABC], PubSubTopicABC]
     global_kill_flag: Synchronized
-    _subscriptions_lock: _thread.LockType = field(default_factory=threading.Lock)
+    mode: PubSubRelayMode = PubSubRelayMode.EVENT_DRIVEN
+    _topic_locks: dict[type[PubSubTopicABC], _thread.LockType] = field(init=False)
     _stop_event: threading.Event = field(default_factory=threading.Event)
     _thread: threading.Thread | None = field(default=None, init=False)
     _fatal_error: BaseException | None = field(default=None, init=False)
+    # Self-pipe that lets stop() interrupt an EVENT_DRIVEN wait() immediately.
+    _wakeup_reader: Connection | None = field(default=None, init=False)
+    _wakeup_writer: Connection | None = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        self._topic_locks = {topic_type: threading.Lock() for topic_type in self.topics}
 
     def create_subscription(self, topic_type: type[PubSubTopicABC]) -> TopicSubscriptionQueue:
         """
@@ -65,7 +94,7 @@ class PubSubRelay:
                 f"Unknown topic type: {topic_type.__name__}. "
                 f"Available topics: {[t.__name__ for t in self.topics.keys()]}"
             )
-        with self._subscriptions_lock:
+        with self._topic_locks[topic_type]:
             return self.topics[topic_type].get_subscription()
 
     def get_publication_queue(self, topic_type: type[PubSubTopicABC]) -> TopicPublicationQueue:
@@ -87,22 +116,24 @@ class PubSubRelay:
             raise RuntimeError("PubSubRelay is already running")
 
         self._stop_event.clear()
+        if self.mode == PubSubRelayMode.EVENT_DRIVEN:
+            self._wakeup_reader, self._wakeup_writer = multiprocessing.Pipe(duplex=False)
         self._thread = threading.Thread(
             target=self._relay_loop,
             name="PubSubRelay",
             daemon=False,
         )
         self._thread.start()
-        logger.debug("PubSubRelay thread started")
+        logger.debug(f"PubSubRelay thread started ({self.mode.value})")
 
     def _relay_loop(self) -> None:
-        """Main relay loop. Polls all publication queues and fans out messages."""
+        """Main relay loop. Waits for (or polls) publication queues and fans out messages."""
         logger.debug("PubSubRelay loop entering")
         try:
-            while not self._stop_event.is_set():
-                relayed_any = self._relay_one_pass()
-                if not relayed_any:
-                    time.sleep(RELAY_POLL_INTERVAL_SECONDS)
+            if self.mode == PubSubRelayMode.EVENT_DRIVEN:
+                self._event_driven_loop()
+            else:
+                self._polling_loop()
         except Exception as e:
             self._fatal_error = e
             logger.exception("Fatal error in PubSubRelay thread — setting global kill flag")
@@ -111,19 +142,47 @@ class PubSubRelay:
         finally:
             logger.debug("PubSubRelay loop exiting")
 
+    def _polling_loop(self) -> None:
+        while not self._stop_event.is_set():
+            relayed_any = self._relay_one_pass()
+            if not relayed_any:
+                time.sleep(RELAY_POLL_INTERVAL_SECONDS)
+
+    def _event_driven_loop(self) -> None:
+        # A queue's pipe reader becomes readable once its feeder thread has
+        # flushed a message into it, which is exactly when get() would succeed.
+        topic_types_by_reader: dict[Connection, type[PubSubTopicABC]] = {
+            topic.publication._reader: topic_type
+            for topic_type, topic in self.topics.items()
+        }
+        wait_on: list[Connection] = [*topic_types_by_reader, self._wakeup_reader]
+        while not self._stop_event.is_set():
+            for ready in wait(wait_on, timeout=RELAY_WAIT_TIMEOUT_SECONDS):
+                topic_type = topic_types_by_reader.get(ready)
+                if topic_type is None:
+                    continue  # wakeup pipe: loop re-checks the stop event
+                with self._topic_locks[topic_type]:
+                    self.topics[topic_type].relay_serialized_to_subscribers()
+
+    def _relay_topic(self, topic_type: type[PubSubTopicABC]) -> int:
+        """Relay one topic's pending messages under that topic's lock."""
+        with self._topic_locks[topic_type]:
+            topic = self.topics[topic_type]
+            if self.mode == PubSubRelayMode.EVENT_DRIVEN:
+                return topic.relay_serialized_to_subscribers()
+            return topic.relay_to_subscribers()
+
     def _relay_one_pass(self) -> bool:
         """
         Do one pass over all topics, relaying any pending messages.
-        Holds the subscriptions lock while iterating to coordinate
-        with create_subscription().
+        Each topic is relayed under its own lock to coordinate with
+        create_subscription().
         Returns True if any messages were relayed.
         """
         relayed_any = False
-        with self._subscriptions_lock:
-            for topic in self.topics.values():
-                count = topic.relay_to_subscribers()
-                if count > 0:
-                    relayed_any = True
+        for topic_type in self.topics:
+            if self._relay_topic(topic_type) > 0:
+                relayed_any = True
         return relayed_any
 
     def _drain(self) -> None:
@@ -135,10 +194,7 @@ class PubSubRelay:
         total_drained = 0
 
         while time.perf_counter() < deadline:
-            drained_this_pass = 0
-            with self._subscriptions_lock:
-                for topic in self.topics.values():
-                    drained_this_pass += topic.relay_to_subscribers()
+            drained_this_pass = sum(self._relay_topic(topic_type) for topic_type in self.topics)
             total_drained += drained_this_pass
             if drained_this_pass == 0:
                 break
@@ -177,6 +233,8 @@ class PubSubRelay:
 
         logger.debug("PubSubRelay stopping — signaling thread to exit")
         self._stop_event.set()
+        if self._wakeup_writer is not None:
+            self._wakeup_writer.send_bytes(b"")
         self._thread.join(timeout=RELAY_SHUTDOWN_TIMEOUT_SECONDS)
 
         if self._thread.is_alive():
@@ -186,6 +244,10 @@ class PubSubRelay:
             )
 
         self._drain()
+        if self._wakeup_writer is not None:
+            self._wakeup_writer.close()
+            self._wakeup_reader.close()
+            self._wakeup_writer = self._wakeup_reader = None
         logger.debug("PubSubRelay stopped")
 
     @property
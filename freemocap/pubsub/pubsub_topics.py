@@ -26,6 +26,7 @@ from freemocap.pubsub.pubsub_abcs import TopicMessageABC, create_topic
 
 if TYPE_CHECKING:
     from freemocap.core.viz.image_overlay.charuco_overlay_data import CharucoOverlayData
+    from freemocap.core.pipeline.realtime.keypoint_ring_buffer import KeypointSharedMemoryRingBuffer
     from freemocap.core.viz.image_overlay.skeleton_overlay_data import SkeletonOverlayData
 
 logger = logging.getLogger(__name__)
@@ -63,6 +64,10 @@ class CameraNodeOutputMessage(TopicMessageABC):
     frame_number: FrameNumberInt = 0
     charuco_observation: Observation | None = None
     skeleton_observation: Observation | None = None
+    # Set instead of `skeleton_observation` when the skeleton keypoints were
+    # written to the shared-memory keypoint ring (read them with
+    # KeypointSharedMemoryRingBuffer.read(frame_number=..., slot=...)).
+    skeleton_keypoints_slot: int | None = None
 
     def __post_init__(self) -> None:
         if self.frame_number < 0:
@@ -76,12 +81,15 @@ class CameraNodeOutputMessage(TopicMessageABC):
 # per processed multi-camera frame, holding per-camera skeleton observations
 # from a single batched ONNX call. Aggregator merges this with per-camera
 # CameraNodeOutputMessage (which carries charuco only in this mode) by
-# (frame_number).
+# (frame_number). When the shared-memory keypoint ring is in use, cameras whose
+# keypoints went into the ring are absent from `per_camera_skeleton` and are
+# read from `keypoints_slot` instead.
 
 @dataclass
 class SkeletonInferenceResultMessage(TopicMessageABC):
     frame_number: FrameNumberInt = 0
     per_camera_skeleton: dict[CameraIdString, Observation | None] = field(default_factory=dict)
+    keypoints_slot: int | None = None
 
     def __post_init__(self) -> None:
         if self.frame_number < 0:
@@ -146,6 +154,16 @@ class AggregationNodeOutputMessage(TopicMessageABC):
 
     @property
     def skeleton_overlay_data(self) -> dict:
+        return self.build_skeleton_overlay_data()
+
+    def build_skeleton_overlay_data(
+            self,
+            *,
+            keypoint_ring: "KeypointSharedMemoryRingBuffer | None" = None,
+    ) -> dict:
+        """Per-camera skeleton overlays. Cameras whose keypoints travelled through
+        the shared-memory keypoint ring need `keypoint_ring` to be drawn; their
+        overlay is skipped if the ring slot has since been reused."""
         from freemocap.core.viz.image_overlay.skeleton_overlay_data import SkeletonOverlayData
         from freemocap.core.tracking.tracker_definitions import RTMPOSE_WHOLEBODY_DEFINITION, MEDIAPIPE_WHOLEBODY_DEFINITION
 
@@ -168,9 +186,19 @@ class AggregationNodeOutputMessage(TopicMessageABC):
                     observation=cam_output.skeleton_observation,
                     tracker_definition_name=tracker_def_name,
                 )
+            elif cam_output.skeleton_keypoints_slot is not None and keypoint_ring is not None:
+                keypoints = keypoint_ring.read(
+                    frame_number=cam_output.frame_number,
+                    slot=cam_output.skeleton_keypoints_slot,
+                    camera_id=camera_id,
+                )
+                if keypoints is not None:
+                    overlay_data[camera_id] = SkeletonOverlayData.from_keypoint_frame(
+                        keypoints=keypoints,
+                        tracker_definition_name=tracker_def_name,
+                    )
         return overlay_data
 
-
     @property
     def camera_ids(self) -> list[CameraIdString]:
         return list(self.camera_node_outputs.keys())
@@ -0,0 +1,97 @@
+"""Benchmark: analytic vs finite-difference Jacobian in the anipose bundle adjust.
+
+Builds a synthetic charuco recording (a board waved in front of a camera
+ring, default 6 cameras x 40 frames x 24 corners), perturbs the cameras and
+times one `bundle_adjust` pass per Jacobian mode, plus a single Jacobian
+evaluation each way. Emits JSON on stdout.
+
+    python -m freemocap.tests.benchmarks.benchmark_anipose_bundle_adjust --n-frames 80
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+
+import numpy as np
+from scipy.optimize._numdiff import approx_derivative
+
+from freemocap.core.tasks.calibration.anipose_calibration.helpers.bundle_adjust import (
+    _BundleLayout,
+    _error_fun_bundle,
+    _initialize_params_bundle,
+    _jac_bundle,
+    _jac_sparsity_bundle,
+    bundle_adjust,
+)
+from freemocap.core.tasks.calibration.anipose_calibration.helpers.freemocap_anipose import remap_ids
+from freemocap.tests.calibration.helpers import make_charuco_bundle_problem
+
+
+def _best_of(repeats: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        tik = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - tik)
+    return best
+
+
+def run_benchmark(*, n_cameras: int, n_frames: int, repeats: int) -> dict:
+    _, perturbed_cameras, points_2d, board_observations = make_charuco_bundle_problem(
+        n_cameras=n_cameras, n_frames=n_frames
+    )
+
+    board_observations.corner_ids_map = remap_ids(board_observations.corner_ids)
+    np.random.seed(0)
+    x0, num_camera_params = _initialize_params_bundle(perturbed_cameras, points_2d, board_observations)
+    jac_sparsity = _jac_sparsity_bundle(perturbed_cameras, points_2d, num_camera_params, board_observations)
+    layout = _BundleLayout.build(perturbed_cameras, points_2d, num_camera_params, board_observations, jac_sparsity)
+    jacobian_seconds = {
+        "analytic": _best_of(repeats, lambda: _jac_bundle(x0, layout)),
+        "numeric": _best_of(
+            repeats, lambda: approx_derivative(_error_fun_bundle, x0, sparsity=jac_sparsity, args=(layout,))
+        ),
+    }
+
+    solve_seconds = {}
+    final_error_px = {}
+    for jacobian in ("numeric", "analytic"):
+        best = float("inf")
+        for _ in range(repeats):
+            cameras = [camera.model_copy(deep=True) for camera in perturbed_cameras]
+            np.random.seed(0)
+            # scipy's verbose progress goes to stdout; keep stdout for the JSON report
+            with contextlib.redirect_stdout(sys.stderr):
+                tik = time.perf_counter()
+                final_error_px[jacobian] = bundle_adjust(cameras, points_2d, board_observations, jacobian=jacobian)
+                best = min(best, time.perf_counter() - tik)
+        solve_seconds[jacobian] = best
+
+    return {
+        "n_cameras": n_cameras,
+        "n_frames": n_frames,
+        "n_points": int(points_2d.shape[1]),
+        "n_residuals": int(jac_sparsity.shape[0]),
+        "n_params": int(jac_sparsity.shape[1]),
+        "residual_seconds": _best_of(repeats, lambda: _error_fun_bundle(x0, layout)),
+        "jacobian_seconds": jacobian_seconds,
+        "bundle_adjust_seconds": solve_seconds,
+        "bundle_adjust_speedup": solve_seconds["numeric"] / solve_seconds["analytic"],
+        "final_mean_error_px": final_error_px,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-cameras", type=int, default=6)
+    parser.add_argument("--n-frames", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    report = run_benchmark(n_cameras=args.n_cameras, n_frames=args.n_frames, repeats=args.repeats)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: scalar vs vectorized RealtimeKeypointFilter backends.
+
+Feeds both backends the same synthetic wholebody stream (default 133 points
+random-walking in mm, with a fraction dropping out each frame so gap
+prediction runs too), then reports the per-frame cost of each backend and the
+max deviation between their outputs. Emits JSON on stdout.
+
+    python -m freemocap.tests.benchmarks.benchmark_keypoint_filter_backends --n-points 133
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from freemocap.core.pipeline.realtime.realtime_keypoint_filter import RealtimeKeypointFilter
+
+
+def _make_stream(*, n_frames: int, n_points: int, dropout: float, seed: int) -> list[dict[str, np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    names = [f"point_{i}" for i in range(n_points)]
+    positions = rng.normal(scale=500.0, size=(n_points, 3))
+    stream = []
+    for _ in range(n_frames):
+        positions = positions + rng.normal(scale=10.0, size=positions.shape)
+        present = rng.random(n_points) >= dropout
+        stream.append({name: positions[i].copy() for i, name in enumerate(names) if present[i]})
+    return stream
+
+
+def run_benchmark(*, n_frames: int, n_points: int, dropout: float, repeats: int) -> dict:
+    stream = _make_stream(n_frames=n_frames, n_points=n_points, dropout=dropout, seed=0)
+    fps = 30.0
+
+    outputs = {}
+    timings_s = {}
+    for backend in ("scalar", "vectorized"):
+        best = float("inf")
+        for _ in range(repeats):
+            keypoint_filter = RealtimeKeypointFilter(dims=3, backend=backend)
+            frames = []
+            tik = time.perf_counter()
+            for frame, raw_keypoints in enumerate(stream):
+                frames.append(keypoint_filter.filter(t=frame / fps, raw_keypoints=raw_keypoints))
+            best = min(best, time.perf_counter() - tik)
+        outputs[backend] = frames
+        timings_s[backend] = best
+
+    max_abs_difference = 0.0
+    for expected, actual in zip(outputs["scalar"], outputs["vectorized"]):
+        for name, position in expected.positions.items():
+            max_abs_difference = max(
+                max_abs_difference, float(np.max(np.abs(actual.positions[name] - position)))
+            )
+
+    return {
+        "n_frames": n_frames,
+        "n_points": n_points,
+        "dropout": dropout,
+        "microseconds_per_frame": {backend: seconds / n_frames * 1e6 for backend, seconds in timings_s.items()},
+        "speedup": timings_s["scalar"] / timings_s["vectorized"],
+        "max_abs_position_difference": max_abs_difference,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-frames", type=int, default=1000)
+    parser.add_argument("--n-points", type=int, nargs="+", default=[33, 133])
+    parser.add_argument("--dropout", type=float, default=0.1)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    report = [
+        run_benchmark(n_frames=args.n_frames, n_points=n_points, dropout=args.dropout, repeats=args.repeats)
+        for n_points in args.n_points
+    ]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Benchmark: pub/sub relay throughput, hop latency, relay CPU, and evict-oldest drops.
+
+Spins up a `PubSubTopicManager` with synthetic publishers in child processes
+(one per camera for camera-node-sized messages, one for aggregator-sized
+messages) and subscribers in the main process, one of which is deliberately
+slow so the evict-oldest policy kicks in. Each scenario runs once per relay
+mode. Message payloads mimic the shapes of `CameraNodeOutputMessage` (a
+wholebody skeleton plus charuco corners) and `AggregationNodeOutputMessage`
+(every camera's output plus a dict of named 3d keypoints) without needing
+cameras or trackers. Emits JSON on stdout.
+
+    python -m freemocap.tests.benchmarks.benchmark_pubsub --n-messages 1000 --rates-hz 0 30
+"""
+import argparse
+import json
+import multiprocessing
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing.synchronize import Event as EventType
+
+import numpy as np
+
+from freemocap.core.types.type_overloads import TopicPublicationQueue, TopicSubscriptionQueue
+from freemocap.pubsub.pubsub_abcs import TopicMessageABC, create_topic
+from freemocap.pubsub.pubsub_manager import PubSubTopicManager
+from freemocap.pubsub.pubsub_relay import PubSubRelayMode
+
+_N_CHARUCO_CORNERS: int = 35  # 5x7 board
+
+
+@dataclass
+class SyntheticCameraNodeOutputMessage(TopicMessageABC):
+    """Roughly the pickled footprint of a CameraNodeOutputMessage carrying Observations."""
+    publisher_id: int = 0
+    sequence: int = 0
+    published_ns: int = 0
+    camera_id: str = ""
+    skeleton_xyz: np.ndarray | None = None
+    skeleton_visibility: np.ndarray | None = None
+    skeleton_point_names: tuple[str, ...] = ()
+    charuco_corners: np.ndarray | None = None
+    charuco_ids: np.ndarray | None = None
+
+
+@dataclass
+class SyntheticAggregationNodeOutputMessage(TopicMessageABC):
+    """Roughly the pickled footprint of an AggregationNodeOutputMessage."""
+    publisher_id: int = 0
+    sequence: int = 0
+    published_ns: int = 0
+    camera_node_outputs: dict[str, SyntheticCameraNodeOutputMessage] = field(default_factory=dict)
+    keypoints_arrays: dict[str, np.ndarray] = field(default_factory=dict)
+    skeleton: dict[str, np.ndarray] = field(default_factory=dict)
+
+
+SyntheticCameraNodeOutputTopic = create_topic(SyntheticCameraNodeOutputMessage)
+SyntheticAggregationNodeOutputTopic = create_topic(SyntheticAggregationNodeOutputMessage)
+
+_MESSAGE_KINDS = {
+    "camera_node_output": SyntheticCameraNodeOutputTopic,
+    "aggregation_output": SyntheticAggregationNodeOutputTopic,
+}
+
+
+def _camera_message(*, publisher_id: int, n_points: int, point_names: tuple[str, ...]) -> SyntheticCameraNodeOutputMessage:
+    rng = np.random.default_rng(publisher_id)
+    return SyntheticCameraNodeOutputMessage(
+        publisher_id=publisher_id,
+        camera_id=f"cam_{publisher_id}",
+        skeleton_xyz=rng.random((n_points, 3)),
+        skeleton_visibility=rng.random(n_points),
+        skeleton_point_names=point_names,
+        charuco_corners=rng.random((_N_CHARUCO_CORNERS, 2)),
+        charuco_ids=np.arange(_N_CHARUCO_CORNERS),
+    )
+
+
+def _template_message(*, kind: str, publisher_id: int, n_cameras: int, n_points: int) -> TopicMessageABC:
+    point_names = tuple(f"point_{i}" for i in range(n_points))
+    if kind == "camera_node_output":
+        return _camera_message(publisher_id=publisher_id, n_points=n_points, point_names=point_names)
+    rng = np.random.default_rng(publisher_id)
+    return SyntheticAggregationNodeOutputMessage(
+        publisher_id=publisher_id,
+        camera_node_outputs={
+            f"cam_{i}": _camera_message(publisher_id=i, n_points=n_points, point_names=point_names)
+            for i in range(n_cameras)
+        },
+        keypoints_arrays={name: rng.random(3) for name in point_names},
+        skeleton={name: rng.random(3) for name in point_names},
+    )
+
+
+def _publisher_process(
+        *,
+        publication_queue: TopicPublicationQueue,
+        kind: str,
+        publisher_id: int,
+        n_messages: int,
+        rate_hz: float,
+        n_cameras: int,
+        n_points: int,
+        start_event: EventType,
+) -> None:
+    message = _template_message(kind=kind, publisher_id=publisher_id, n_cameras=n_cameras, n_points=n_points)
+    period_ns = int(1e9 / rate_hz) if rate_hz > 0 else 0
+    start_event.wait()
+    next_publish_ns = time.perf_counter_ns()
+    for sequence in range(n_messages):
+        if period_ns:
+            sleep_ns = next_publish_ns - time.perf_counter_ns()
+            if sleep_ns > 0:
+                time.sleep(sleep_ns / 1e9)
+            next_publish_ns += period_ns
+        message.sequence = sequence
+        # perf_counter is the system-wide monotonic clock on Linux, macOS and
+        # Windows, so stamps are comparable across processes.
+        message.published_ns = time.perf_counter_ns()
+        publication_queue.put(message)
+
+
+class _SubscriberStats:
+    """Drains one subscription on a thread, recording hop latency per message."""
+
+    def __init__(self, *, subscription: TopicSubscriptionQueue, consume_delay_s: float) -> None:
+        self._subscription = subscription
+        self._consume_delay_s = consume_delay_s
+        self._stop = threading.Event()
+        self.latencies_ns: list[int] = []
+        self.last_received_ns: int = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                message = self._subscription.get(timeout=0.2)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            now_ns = time.perf_counter_ns()
+            self.latencies_ns.append(now_ns - message.published_ns)
+            self.last_received_ns = now_ns
+            if self._consume_delay_s:
+                time.sleep(self._consume_delay_s)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self, *, n_published: int, first_publish_ns: int) -> dict:
+        received = len(self.latencies_ns)
+        latencies_ms = np.asarray(self.latencies_ns, dtype=np.float64) / 1e6
+        elapsed_s = (self.last_received_ns - first_publish_ns) / 1e9 if received else 0.0
+        return {
+            "consume_delay_ms": self._consume_delay_s * 1e3,
+            "received": received,
+            "dropped": n_published - received,
+            "msgs_per_second": received / elapsed_s if elapsed_s > 0 else 0.0,
+            "latency_ms_p50": float(np.percentile(latencies_ms, 50)) if received else None,
+            "latency_ms_p99": float(np.percentile(latencies_ms, 99)) if received else None,
+        }
+
+
+def _thread_cpu_seconds(thread: threading.Thread) -> float | None:
+    """CPU time consumed so far by another thread of this process (POSIX only)."""
+    if not hasattr(time, "pthread_getcpuclockid") or thread.ident is None:
+        return None
+    return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+
+
+def run_benchmark(
+        *,
+        relay_mode: PubSubRelayMode,
+        kind: str,
+        n_publishers: int,
+        n_messages: int,
+        rate_hz: float,
+        n_cameras: int,
+        n_points: int,
+        n_fast_subscribers: int,
+        slow_consume_delay_s: float,
+) -> dict:
+    topic_type = _MESSAGE_KINDS[kind]
+    pubsub = PubSubTopicManager.create(global_kill_flag=multiprocessing.Value("b", False), relay_mode=relay_mode)
+    try:
+        relay_thread = pubsub._relay._thread
+        subscribers = [
+            _SubscriberStats(subscription=pubsub.get_subscription(topic_type), consume_delay_s=0.0)
+            for _ in range(n_fast_subscribers)
+        ]
+        if slow_consume_delay_s > 0:
+            subscribers.append(
+                _SubscriberStats(subscription=pubsub.get_subscription(topic_type), consume_delay_s=slow_consume_delay_s)
+            )
+
+        start_event = multiprocessing.Event()
+        publishers = [
+            multiprocessing.Process(
+                target=_publisher_process,
+                kwargs=dict(
+                    publication_queue=pubsub.get_publication_queue(topic_type),
+                    kind=kind,
+                    publisher_id=publisher_id,
+                    n_messages=n_messages,
+                    rate_hz=rate_hz,
+                    n_cameras=n_cameras,
+                    n_points=n_points,
+                    start_event=start_event,
+                ),
+                name=f"SyntheticPublisher-{publisher_id}",
+            )
+            for publisher_id in range(n_publishers)
+        ]
+        for publisher in publishers:
+            publisher.start()
+        # Give the children time to build their template messages so startup
+        # does not count against the relay.
+        time.sleep(0.5)
+
+        relay_cpu_start = _thread_cpu_seconds(relay_thread)
+        process_cpu_start = time.process_time()
+        first_publish_ns = time.perf_counter_ns()
+        start_event.set()
+        for publisher in publishers:
+            publisher.join()
+        pubsub.drain()
+        for subscriber in subscribers:
+            subscriber.stop()
+        relay_cpu_end = _thread_cpu_seconds(relay_thread)
+        process_cpu_s = time.process_time() - process_cpu_start
+        wall_s = (time.perf_counter_ns() - first_publish_ns) / 1e9
+    finally:
+        pubsub.close()
+
+    n_published = n_publishers * n_messages
+    return {
+        "relay_mode": relay_mode.value,
+        "message_kind": kind,
+        "n_publishers": n_publishers,
+        "n_messages_published": n_published,
+        "publish_rate_hz": rate_hz if rate_hz > 0 else "unthrottled",
+        "wall_seconds": wall_s,
+        "relay_thread_cpu_seconds": (
+            relay_cpu_end - relay_cpu_start if relay_cpu_start is not None else None
+        ),
+        "main_process_cpu_seconds": process_cpu_s,
+        "subscribers": [
+            subscriber.summary(n_published=n_published, first_publish_ns=first_publish_ns)
+            for subscriber in subscribers
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-cameras", type=int, default=4)
+    parser.add_argument("--n-points", type=int, default=133)
+    parser.add_argument("--n-messages", type=int, default=300, help="Messages per publisher")
+    parser.add_argument("--rates-hz", type=float, nargs="+", default=[0.0, 30.0],
+                        help="Per-publisher publish rates; 0 publishes as fast as possible")
+    parser.add_argument("--n-fast-subscribers", type=int, default=2)
+    parser.add_argument("--slow-consume-delay-ms", type=float, default=20.0,
+                        help="Per-message delay of the extra slow subscriber; 0 disables it")
+    args = parser.parse_args()
+
+    report = [
+        run_benchmark(
+            relay_mode=relay_mode,
+            kind=kind,
+            n_publishers=args.n_cameras if kind == "camera_node_output" else 1,
+            n_messages=args.n_messages,
+            rate_hz=rate_hz,
+            n_cameras=args.n_cameras,
+            n_points=args.n_points,
+            n_fast_subscribers=args.n_fast_subscribers,
+            slow_consume_delay_s=args.slow_consume_delay_ms / 1e3,
+        )
+        for kind in _MESSAGE_KINDS
+        for rate_hz in args.rates_hz
+        for relay_mode in PubSubRelayMode
+    ]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: numpy vs numba triangulation backends on a synthetic recording.
+
+Mimics a wholebody posthoc job (default 6 cameras x 133 points) with partial
+visibility and gross outliers, then times `Triangulator.triangulate` for each
+backend and reports the max deviation between them. Emits JSON on stdout.
+
+    python -m freemocap.tests.benchmarks.benchmark_triangulation_backends --n-frames 2000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
+from freemocap.core.tasks.triangulation.triangulator import Triangulator
+from freemocap.tests.triangulation.helpers import make_observations, make_ring_cameras
+
+
+def run_benchmark(
+        *,
+        n_cameras: int,
+        n_frames: int,
+        n_points: int,
+        use_outlier_rejection: bool,
+        repeats: int,
+) -> dict:
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=n_cameras))
+    data2d = make_observations(triangulator=triangulator, n_frames=n_frames, n_points=n_points, seed=0)
+
+    results = {}
+    timings_s = {}
+    for backend in ("numpy", "numba"):
+        config = TriangulationConfig(
+            backend=backend,
+            use_outlier_rejection=use_outlier_rejection,
+            target_reprojection_error=0.002,
+        )
+        if backend == "numba":
+            # First call pays the JIT compile (or cache load); keep it out of the timing.
+            triangulator.triangulate(data2d=data2d[:, :1], config=config)
+        best = float("inf")
+        for _ in range(repeats):
+            tik = time.perf_counter()
+            results[backend] = triangulator.triangulate(data2d=data2d, config=config)
+            best = min(best, time.perf_counter() - tik)
+        timings_s[backend] = best
+
+    return {
+        "n_cameras": n_cameras,
+        "n_frames": n_frames,
+        "n_points": n_points,
+        "use_outlier_rejection": use_outlier_rejection,
+        "seconds": timings_s,
+        "speedup": timings_s["numpy"] / timings_s["numba"],
+        "max_abs_points_3d_difference": float(
+            np.nanmax(np.abs(results["numpy"].points_3d - results["numba"].points_3d))
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-cameras", type=int, default=6)
+    parser.add_argument("--n-frames", type=int, default=500)
+    parser.add_argument("--n-points", type=int, default=133)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    report = [
+        run_benchmark(
+            n_cameras=args.n_cameras,
+            n_frames=args.n_frames,
+            n_points=args.n_points,
+            use_outlier_rejection=use_outlier_rejection,
+            repeats=args.repeats,
+        )
+        for use_outlier_rejection in (False, True)
+    ]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
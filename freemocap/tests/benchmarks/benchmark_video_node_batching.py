@@ -0,0 +1,114 @@
+"""Benchmark: posthoc VideoNode detection throughput per inference batch size.
+
+Runs the same decode -> detect loop as ``VideoNode._run`` (minus publishing
+and annotation) over a video, once per batch size, with the RTMPose tracker
+the posthoc mocap pipeline builds. By default the video is a synthetic clip of
+moving shapes written to a temp dir; pass ``--video`` to time a real
+recording instead (a clip with a person in it exercises RTMPose, not just the
+YOLOX detector). Emits JSON on stdout.
+
+    python -m freemocap.tests.benchmarks.benchmark_video_node_batching --batch-sizes 1 8 16
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+from skellytracker.core.tracker.tracker_state import TrackerState
+
+from freemocap.core.pipeline.posthoc.video_node import _build_tracker, _get_observations
+from freemocap.core.tasks.mocap.mocap_task_config import PosthocMocapPipelineConfig
+
+
+def _write_synthetic_video(*, path: Path, n_frames: int, width: int, height: int, fps: float) -> None:
+    rng = np.random.default_rng(0)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"Failed to create synthetic video at {path}")
+    background = rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+    for frame in range(n_frames):
+        image = background.copy()
+        x = int(width * (0.2 + 0.6 * (frame / max(n_frames - 1, 1))))
+        cv2.ellipse(image, (x, height // 4), (40, 50), 0, 0, 360, (200, 180, 160), -1)
+        cv2.rectangle(image, (x - 60, height // 4 + 50), (x + 60, height // 4 + 300), (80, 60, 200), -1)
+        writer.write(image)
+    writer.release()
+
+
+def run_benchmark(*, video_path: Path, batch_size: int, max_frames: int, model_name: str) -> dict:
+    tracker_config = PosthocMocapPipelineConfig(rtmpose_model_name=model_name).tracker_config
+    tracker, _ = _build_tracker(tracker_config, inference_batch_size=batch_size)
+    reader = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+    if not reader.isOpened():
+        raise RuntimeError(f"Failed to open video file: {video_path}")
+    try:
+        state = TrackerState()
+        frame_number = 0
+        success, image = reader.read()
+        tik: float | None = None
+        timed_frames = 0
+        while success and frame_number < max_frames:
+            images = []
+            while success and len(images) < batch_size:
+                images.append(image)
+                success, image = reader.read()
+            _, state = _get_observations(
+                first_frame_number=frame_number,
+                images=images,
+                tracker=tracker,
+                state=state,
+                cache=None,
+            )
+            frame_number += len(images)
+            if tik is None:
+                # First batch pays session warm-up; keep it out of the timing.
+                tik = time.perf_counter()
+            else:
+                timed_frames += len(images)
+        elapsed = time.perf_counter() - tik if tik is not None else 0.0
+    finally:
+        reader.release()
+        tracker.close()
+
+    return {
+        "batch_size": batch_size,
+        "timed_frames": timed_frames,
+        "seconds": elapsed,
+        "frames_per_second": timed_frames / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--video", type=Path, default=None)
+    parser.add_argument("--n-frames", type=int, default=240)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--model-name", default="rtmw-x-l_256x192")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = args.video
+        if video_path is None:
+            video_path = Path(tmp) / "synthetic.mp4"
+            _write_synthetic_video(
+                path=video_path, n_frames=args.n_frames, width=args.width, height=args.height, fps=30.0,
+            )
+        report = [
+            run_benchmark(
+                video_path=video_path,
+                batch_size=batch_size,
+                max_frames=args.n_frames,
+                model_name=args.model_name,
+            )
+            for batch_size in args.batch_sizes
+        ]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
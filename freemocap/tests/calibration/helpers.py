@@ -0,0 +1,90 @@
+"""Shared synthetic-scene helpers for the calibration tests and benchmarks."""
+import cv2
+import numpy as np
+
+from freemocap.core.tasks.calibration.anipose_calibration.helpers.camera_model_solver_ops import (
+    apply_camera_params,
+    pack_camera_params,
+)
+from freemocap.core.tasks.calibration.anipose_calibration.helpers.freemocap_anipose import BoardObservations
+from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
+from freemocap.core.tasks.calibration.shared.transform_math import build_transformation_matrix, get_rtvec
+from freemocap.tests.triangulation.helpers import make_ring_cameras
+
+
+def make_charuco_bundle_problem(
+        *,
+        n_cameras: int,
+        n_frames: int,
+        squares_x: int = 7,
+        squares_y: int = 5,
+        square_length_mm: float = 60.0,
+        noise_px: float = 0.3,
+        dropout_fraction: float = 0.2,
+        seed: int = 0,
+) -> tuple[list[CameraModel], list[CameraModel], np.ndarray, BoardObservations]:
+    """A charuco board waved in front of a camera ring, in `bundle_adjust`'s input format.
+
+    Returns (true cameras, perturbed cameras, points_2d (n_cameras, N, 2),
+    board observations). Cameras follow the solver model (shared focal, k1
+    only), so the true cameras are an exact optimum up to pixel noise.
+    Every corner is kept in at least two cameras.
+    """
+    rng = np.random.default_rng(seed)
+    true_cameras = make_ring_cameras(n_cameras=n_cameras)
+    for camera in true_cameras:
+        camera.intrinsics.k2 = 0.0
+
+    grid = np.stack(
+        np.meshgrid(np.arange(squares_x - 1), np.arange(squares_y - 1), indexing="xy"), axis=-1
+    ).reshape(-1, 2)
+    corners = np.column_stack([grid * square_length_mm, np.zeros(len(grid))])
+    corners -= corners.mean(axis=0)
+
+    board_rvecs = rng.normal(scale=0.4, size=(n_frames, 3))
+    board_tvecs = rng.uniform(-400.0, 400.0, size=(n_frames, 3))
+    object_points = np.tile(corners, (n_frames, 1))
+    corner_ids = np.repeat(np.arange(n_frames, dtype=np.int32), len(corners))
+    points_3d = np.concatenate(
+        [cv2.Rodrigues(rvec)[0] @ corners.T + tvec[:, None] for rvec, tvec in zip(board_rvecs, board_tvecs)], axis=1
+    ).T
+
+    n_points = len(points_3d)
+    points_2d = np.empty((n_cameras, n_points, 2))
+    rotation_vectors = np.empty((n_cameras, n_points, 3))
+    translation_vectors = np.empty((n_cameras, n_points, 3))
+    for camera_index, camera in enumerate(true_cameras):
+        projected, _ = cv2.projectPoints(
+            points_3d.reshape(-1, 1, 3),
+            camera.extrinsics.rodrigues_vector,
+            camera.extrinsics.translation,
+            camera.intrinsics.to_camera_matrix(),
+            camera.intrinsics.to_dist_coeffs(),
+        )
+        points_2d[camera_index] = projected.reshape(-1, 2) + rng.normal(scale=noise_px, size=(n_points, 2))
+        camera_matrix = build_transformation_matrix(camera.extrinsics.rodrigues_vector, camera.extrinsics.translation)
+        for frame, (rvec, tvec) in enumerate(zip(board_rvecs, board_tvecs)):
+            rvec_cam, tvec_cam = get_rtvec(camera_matrix @ build_transformation_matrix(rvec, tvec))
+            rows = corner_ids == frame
+            rotation_vectors[camera_index, rows] = rvec_cam
+            translation_vectors[camera_index, rows] = tvec_cam
+
+    dropped = rng.random((n_cameras, n_points)) < dropout_fraction
+    dropped[:, (n_cameras - dropped.sum(axis=0)) < 2] = False
+    points_2d[dropped] = np.nan
+
+    perturbed_cameras = [camera.model_copy(deep=True) for camera in true_cameras]
+    for camera in perturbed_cameras:
+        params = pack_camera_params(camera)
+        params[0:3] += rng.normal(scale=0.02, size=3)
+        params[3:6] += rng.normal(scale=20.0, size=3)
+        params[6] *= 1.0 + rng.normal(scale=0.02)
+        apply_camera_params(camera, params)
+
+    board_observations = BoardObservations(
+        object_points=object_points,
+        corner_ids=corner_ids,
+        rotation_vectors=rotation_vectors,
+        translation_vectors=translation_vectors,
+    )
+    return true_cameras, perturbed_cameras, points_2d, board_observations
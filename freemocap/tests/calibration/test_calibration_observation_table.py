@@ -0,0 +1,174 @@
+"""Tests for the columnar charuco observation table."""
+import numpy as np
+from scipy.spatial.transform import Rotation
+from skellytracker.core.data_primitives.keypoints import Keypoints
+from skellytracker.core.data_primitives.observation import Observation, StageObservation
+from skellytracker.core.detectors.keypoint_detectors.charuco import CharucoBoardDefinition
+
+from freemocap.core.tasks.calibration.charuco_board.calibration_observation_table import CalibrationObservationTable
+from freemocap.core.tasks.calibration.charuco_board.charuco_corners import CharucoCornersObservation, CornerObservation
+from freemocap.core.tasks.calibration.pyceres_calibration.helpers.postprocessing import _triangulate_charuco_corners
+from freemocap.core.tasks.calibration.shared.camera_extrinsics import CameraExtrinsics
+from freemocap.core.tasks.calibration.shared.camera_intrinsics import CameraIntrinsics
+from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
+
+
+def _board() -> CharucoBoardDefinition:
+    # 3x4 squares -> 6 inner corners
+    return CharucoBoardDefinition(squares_x=3, squares_y=4, square_length_mm=50.0)
+
+
+def _charuco_observation(frame_number: int, xyz: np.ndarray, visibility: np.ndarray) -> Observation:
+    # Corner keypoints are deliberately listed out of id order, followed by a marker point.
+    names = ("CharucoCorner-3", "CharucoCorner-0", "CharucoCorner-1", "CharucoCorner-2", "Marker-0")
+    return Observation(
+        frame_number=frame_number,
+        image_size=(720, 1280),
+        stages={
+            "charuco": StageObservation(
+                name="charuco", keypoints=Keypoints(names=names, xyz=xyz, visibility=visibility)
+            )
+        },
+    )
+
+
+def test_from_frame_observations_keeps_valid_corners_in_id_order():
+    xyz = np.arange(15, dtype=np.float64).reshape(5, 3)
+    visible = np.ones(5)
+    hidden_corner_0 = visible.copy()
+    hidden_corner_0[1] = 0.0
+    nan_xyz = xyz.copy()
+    nan_xyz[0] = np.nan  # corner 3
+
+    observations_by_frame = [
+        {
+            "cam_a": _charuco_observation(0, xyz, visible),
+            "cam_b": Observation(
+                frame_number=0, image_size=(720, 1280), stages={"charuco": StageObservation(name="charuco")}
+            ),
+        },
+        {"cam_a": _charuco_observation(1, nan_xyz, hidden_corner_0), "cam_b": _charuco_observation(1, xyz, visible)},
+    ]
+    table = CalibrationObservationTable.from_frame_observations(
+        observations_by_frame=observations_by_frame, camera_ids=["cam_a", "cam_b"], board=_board()
+    )
+
+    np.testing.assert_array_equal(table.camera_index, [0, 0, 0, 0, 0, 0, 1, 1, 1, 1])
+    np.testing.assert_array_equal(table.frame_index, [0, 0, 0, 0, 1, 1, 1, 1, 1, 1])
+    np.testing.assert_array_equal(table.corner_id, [0, 1, 2, 3, 1, 2, 0, 1, 2, 3])
+    np.testing.assert_array_equal(table.pixel_xy[:4], xyz[[1, 2, 3, 0], :2])
+    assert table.weight.tolist() == [1.0] * 10
+    assert not table.is_outlier.any()
+
+
+def test_from_frame_observations_skips_cameras_missing_from_a_frame():
+    xyz = np.arange(15, dtype=np.float64).reshape(5, 3)
+    visible = np.ones(5)
+    observations_by_frame = [
+        {"cam_a": _charuco_observation(0, xyz, visible)},
+        {"cam_a": _charuco_observation(1, xyz, visible), "cam_b": _charuco_observation(1, xyz + 1.0, visible)},
+    ]
+    table = CalibrationObservationTable.from_frame_observations(
+        observations_by_frame=observations_by_frame, camera_ids=["cam_a", "cam_b"], board=_board()
+    )
+
+    np.testing.assert_array_equal(table.camera_index, [0] * 8 + [1] * 4)
+    np.testing.assert_array_equal(table.frame_index, [0] * 4 + [1] * 8)
+    np.testing.assert_array_equal(table.pixel_xy[8:], xyz[[1, 2, 3, 0], :2] + 1.0)
+
+
+def test_round_trip_and_grouping():
+    observations = [
+        CharucoCornersObservation(
+            camera_name=camera_name,
+            frame_index=frame_index,
+            corners=[CornerObservation(corner_id=c, pixel_xy=[10.0 * c + frame_index, c]) for c in corner_ids],
+        )
+        for frame_index, camera_name, corner_ids in [
+            (0, "cam_a", [0, 1, 2]),
+            (0, "cam_b", [1, 2]),
+            (3, "cam_a", [4]),
+            (3, "cam_b", [0, 2, 5]),
+        ]
+    ]
+    rows = [
+        (["cam_a", "cam_b"].index(obs.camera_name), obs.frame_index, corner.corner_id, corner.pixel_xy)
+        for obs in observations
+        for corner in obs.corners
+    ]
+    table = CalibrationObservationTable.from_columns(
+        camera_ids=["cam_a", "cam_b"],
+        camera_index=np.array([row[0] for row in rows]),
+        frame_index=np.array([row[1] for row in rows]),
+        corner_id=np.array([row[2] for row in rows]),
+        pixel_xy=np.array([row[3] for row in rows]),
+    )
+
+    assert len(table) == 9
+    np.testing.assert_array_equal(table.corners_per_camera_frame(), [3, 3, 3, 2, 2, 1, 3, 3, 3])
+    cams, frames, groups = table.camera_frame_groups()
+    assert list(zip(cams.tolist(), frames.tolist())) == [(0, 0), (0, 3), (1, 0), (1, 3)]
+    assert [g.tolist() for g in groups] == [[0, 1, 2], [5], [3, 4], [6, 7, 8]]
+
+    def as_tuples(frame_observations: list[CharucoCornersObservation]) -> list[tuple]:
+        return [
+            (obs.camera_name, obs.frame_index, obs.corner_ids, [c.pixel_xy.tolist() for c in obs.corners])
+            for obs in frame_observations
+        ]
+
+    assert as_tuples(table.to_corners_observations()) == as_tuples(observations)
+
+    subset = table.subset(table.corners_per_camera_frame() >= 2)
+    assert len(subset) == 8 and 4 not in subset.corner_id.tolist()
+
+
+def test_batched_triangulation_recovers_board_points():
+    rng = np.random.default_rng(0)
+    n_frames, n_corners = 3, _board().n_corners
+    points = rng.uniform(-200.0, 200.0, size=(n_frames, n_corners, 3))
+
+    cameras = []
+    poses = [
+        ([0.0, 0.0, 0.0], [0.0, 0.0, 2000.0]),
+        ([0.0, 0.4, 0.0], [-500.0, 0.0, 2100.0]),
+        ([0.2, -0.3, 0.0], [400.0, 200.0, 1900.0]),
+    ]
+    for index, (rotvec, translation) in enumerate(poses):
+        x, y, z, w = Rotation.from_rotvec(rotvec).as_quat()
+        cameras.append(
+            CameraModel(
+                id=f"cam_{index}",
+                index=index,
+                image_size=(1920, 1080),
+                intrinsics=CameraIntrinsics.from_param_array(np.array([1400.0, 1400.0, 960.0, 540.0, 0, 0, 0, 0])),
+                extrinsics=CameraExtrinsics(quaternion_wxyz=np.array([w, x, y, z]), translation=np.array(translation)),
+            )
+        )
+
+    # Corner 5 of frame 1 is seen by one camera only; corner 0 of frame 2 by two.
+    rows = []
+    for frame in range(n_frames):
+        for corner in range(n_corners):
+            camera_indices = range(3)
+            if (frame, corner) == (1, 5):
+                camera_indices = [2]
+            elif (frame, corner) == (2, 0):
+                camera_indices = [0, 2]
+            for camera_index in camera_indices:
+                homogeneous = cameras[camera_index].projection_matrix @ np.append(points[frame, corner], 1.0)
+                rows.append((camera_index, 10 * frame, corner, homogeneous[:2] / homogeneous[2]))
+    table = CalibrationObservationTable.from_columns(
+        camera_ids=[cam.id for cam in cameras],
+        camera_index=np.array([r[0] for r in rows]),
+        frame_index=np.array([r[1] for r in rows]),
+        corner_id=np.array([r[2] for r in rows]),
+        pixel_xy=np.array([r[3] for r in rows]),
+    )
+
+    triangulated = _triangulate_charuco_corners(cameras=cameras, observations=table, board=_board())
+
+    assert triangulated.shape == (n_frames, n_corners, 3)
+    assert np.isnan(triangulated[1, 5]).all()
+    expected = points.copy()
+    expected[1, 5] = np.nan
+    np.testing.assert_allclose(triangulated, expected, atol=1e-6)
@@ -0,0 +1,183 @@
+"""Closed-form charuco reprojection Jacobians vs finite differences."""
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from freemocap.core.tasks.calibration.pyceres_calibration.helpers.charuco_reprojection_kernel import (
+    charuco_frame_residuals_and_jacobians,
+    charuco_reprojection_residual_and_jacobians,
+)
+
+_BLOCK_SIZES = (4, 3, 8, 4, 3)
+
+
+def _quat_wxyz(rotvec: list[float], scale: float = 1.0) -> np.ndarray:
+    x, y, z, w = Rotation.from_rotvec(rotvec).as_quat()
+    # Deliberately unnormalized: both costs must treat q and c*q alike.
+    return scale * np.array([w, x, y, z], dtype=np.float64)
+
+
+def _case(seed: int) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    observed = rng.uniform(100.0, 1800.0, size=2)
+    board_point = np.array([rng.uniform(0, 300), rng.uniform(0, 200), 0.0])
+    parameters = [
+        _quat_wxyz(rng.normal(scale=0.3, size=3).tolist(), scale=1.3),
+        np.array([rng.normal(scale=50.0), rng.normal(scale=50.0), 1500.0]),
+        np.array([1400.0, 1380.0, 960.0, 540.0, -0.12, 0.05, 1e-3, -2e-3]),
+        _quat_wxyz(rng.normal(scale=0.3, size=3).tolist(), scale=0.8),
+        rng.normal(scale=100.0, size=3),
+    ]
+    return observed, board_point, parameters
+
+
+def _reference_residual(observed, board_point, weight, parameters) -> np.ndarray:
+    cam_quat, cam_trans, intrinsics, board_quat, board_trans = parameters
+
+    def rotation(quat_wxyz: np.ndarray) -> np.ndarray:
+        w, x, y, z = quat_wxyz / np.linalg.norm(quat_wxyz)
+        return Rotation.from_quat([x, y, z, w]).as_matrix()
+
+    p_cam = rotation(cam_quat) @ (rotation(board_quat) @ board_point + board_trans) + cam_trans
+    fx, fy, cx, cy, k1, k2, p1, p2 = intrinsics
+    x, y = p_cam[0] / p_cam[2], p_cam[1] / p_cam[2]
+    r2 = x * x + y * y
+    radial = 1.0 + k1 * r2 + k2 * r2 * r2
+    x_dist = x * radial + 2.0 * p1 * x * y + p2 * (r2 + 2.0 * x * x)
+    y_dist = y * radial + p1 * (r2 + 2.0 * y * y) + 2.0 * p2 * x * y
+    return weight * (observed - np.array([fx * x_dist + cx, fy * y_dist + cy]))
+
+
+def _evaluate_kernel(observed, board_point, weight, parameters) -> tuple[np.ndarray, list[np.ndarray]]:
+    residuals = np.empty(2)
+    jacobians = [np.empty((2, size)) for size in _BLOCK_SIZES]
+    charuco_reprojection_residual_and_jacobians(observed, board_point, weight, *parameters, residuals, *jacobians)
+    return residuals, jacobians
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_kernel_matches_central_differences(seed: int):
+    observed, board_point, parameters = _case(seed)
+    weight = 0.7
+    residuals, jacobians = _evaluate_kernel(observed, board_point, weight, parameters)
+    np.testing.assert_allclose(residuals, _reference_residual(observed, board_point, weight, parameters), rtol=1e-10)
+
+    for block_index, size in enumerate(_BLOCK_SIZES):
+        step = 1e-6 * max(1.0, float(np.abs(parameters[block_index]).max()))
+        numeric = np.empty((2, size))
+        for j in range(size):
+            plus = [p.copy() for p in parameters]
+            minus = [p.copy() for p in parameters]
+            plus[block_index][j] += step
+            minus[block_index][j] -= step
+            numeric[:, j] = (
+                _reference_residual(observed, board_point, weight, plus)
+                - _reference_residual(observed, board_point, weight, minus)
+            ) / (2 * step)
+        scale = max(1.0, float(np.abs(numeric).max()))
+        np.testing.assert_allclose(jacobians[block_index], numeric, atol=1e-5 * scale, err_msg=f"block {block_index}")
+
+
+def test_point_behind_camera_gives_zero_residual_and_jacobians():
+    observed, board_point, parameters = _case(0)
+    parameters[1] = np.array([0.0, 0.0, -5000.0])
+    residuals, jacobians = _evaluate_kernel(observed, board_point, 1.0, parameters)
+    assert not residuals.any()
+    assert not any(jacobian.any() for jacobian in jacobians)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_analytic_cost_matches_finite_difference_cost(seed: int):
+    pytest.importorskip("pyceres")
+    from freemocap.core.tasks.calibration.pyceres_calibration.helpers.cost_functions import (
+        AnalyticCharucoReprojectionCost,
+        CharucoReprojectionCost,
+    )
+
+    observed, board_point, parameters = _case(seed)
+    outputs = []
+    for cost_type in (CharucoReprojectionCost, AnalyticCharucoReprojectionCost):
+        cost = cost_type(observed_pixel=observed, board_point_3d=board_point, weight=1.0)
+        residuals = np.empty(2)
+        jacobians = [np.empty(2 * size) for size in _BLOCK_SIZES]
+        assert cost.Evaluate([p.copy() for p in parameters], residuals, jacobians)
+        outputs.append((residuals, jacobians))
+
+    (numeric_residuals, numeric_jacobians), (analytic_residuals, analytic_jacobians) = outputs
+    np.testing.assert_allclose(analytic_residuals, numeric_residuals, rtol=1e-10)
+    for block_index, (numeric, analytic) in enumerate(zip(numeric_jacobians, analytic_jacobians)):
+        # The existing cost uses forward differences with eps=1e-8, good to ~1e-4 relative.
+        scale = max(1.0, float(np.abs(numeric).max()))
+        np.testing.assert_allclose(analytic, numeric, atol=1e-3 * scale, err_msg=f"block {block_index}")
+
+
+def _frame_case(seed: int, n_corners: int = 12) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+    rng = np.random.default_rng(seed)
+    _, _, parameters = _case(seed)
+    board_points = np.column_stack(
+        [rng.uniform(0, 300, n_corners), rng.uniform(0, 200, n_corners), np.zeros(n_corners)]
+    )
+    observed = np.empty((n_corners, 2))
+    for c in range(n_corners):
+        # Near the true projection, with a few far-off corners to land in Huber's linear region
+        exact = -_reference_residual(np.zeros(2), board_points[c], 1.0, parameters)
+        observed[c] = exact + rng.normal(scale=40.0 if c % 4 == 0 else 0.5, size=2)
+    return observed, board_points, parameters
+
+
+def _evaluate_frame_kernel(observed, board_points, active, threshold, parameters):
+    residuals = np.empty(2 * len(observed))
+    jacobians = [np.empty((2 * len(observed), size)) for size in _BLOCK_SIZES]
+    charuco_frame_residuals_and_jacobians(
+        observed, board_points, np.ones(len(observed)), active, threshold, *parameters, residuals, *jacobians
+    )
+    return residuals, jacobians
+
+
+def test_frame_kernel_stacks_per_corner_kernel_and_masks_outliers():
+    observed, board_points, parameters = _frame_case(0)
+    active = np.ones(len(observed), dtype=bool)
+    active[[2, 7]] = False
+    residuals, jacobians = _evaluate_frame_kernel(observed, board_points, active, np.inf, parameters)
+
+    for c in range(len(observed)):
+        rows = slice(2 * c, 2 * c + 2)
+        if not active[c]:
+            assert not residuals[rows].any()
+            assert not any(jacobian[rows].any() for jacobian in jacobians)
+            continue
+        corner_residuals, corner_jacobians = _evaluate_kernel(observed[c], board_points[c], 1.0, parameters)
+        np.testing.assert_array_equal(residuals[rows], corner_residuals)
+        for jacobian, corner_jacobian in zip(jacobians, corner_jacobians):
+            np.testing.assert_array_equal(jacobian[rows], corner_jacobian)
+
+
+def test_frame_kernel_huber_matches_per_corner_huber_loss():
+    observed, board_points, parameters = _frame_case(1)
+    active = np.ones(len(observed), dtype=bool)
+    threshold = 5.0
+    residuals, jacobians = _evaluate_frame_kernel(observed, board_points, active, threshold, parameters)
+
+    # Each corner's squared residual is Ceres' HuberLoss rho(s) of the plain residual
+    plain = np.array(
+        [_reference_residual(observed[c], board_points[c], 1.0, parameters) for c in range(len(observed))]
+    )
+    s = (plain ** 2).sum(axis=1)
+    rho = np.where(s <= threshold ** 2, s, 2.0 * threshold * np.sqrt(s) - threshold ** 2)
+    assert (s > threshold ** 2).any() and (s <= threshold ** 2).any()
+    np.testing.assert_allclose((residuals.reshape(-1, 2) ** 2).sum(axis=1), rho, rtol=1e-10)
+
+    def robust_residuals(params: list[np.ndarray]) -> np.ndarray:
+        return _evaluate_frame_kernel(observed, board_points, active, threshold, params)[0]
+
+    for block_index, size in enumerate(_BLOCK_SIZES):
+        step = 1e-6 * max(1.0, float(np.abs(parameters[block_index]).max()))
+        numeric = np.empty((2 * len(observed), size))
+        for j in range(size):
+            plus = [p.copy() for p in parameters]
+            minus = [p.copy() for p in parameters]
+            plus[block_index][j] += step
+            minus[block_index][j] -= step
+            numeric[:, j] = (robust_residuals(plus) - robust_residuals(minus)) / (2 * step)
+        scale = max(1.0, float(np.abs(numeric).max()))
+        np.testing.assert_allclose(jacobians[block_index], numeric, atol=1e-5 * scale, err_msg=f"block {block_index}")
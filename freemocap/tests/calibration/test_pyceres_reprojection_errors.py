@@ -0,0 +1,60 @@
+"""Vectorized pyceres reprojection errors vs the per-corner kernel."""
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from freemocap.core.tasks.calibration.pyceres_calibration.helpers.charuco_reprojection_kernel import (
+    charuco_reprojection_residual_and_jacobians,
+)
+
+pytest.importorskip("pyceres")
+from freemocap.core.tasks.calibration.pyceres_calibration.helpers.solver import (  # noqa: E402
+    _compute_reprojection_errors,
+)
+
+
+def _quats_wxyz(rng: np.random.Generator, n: int) -> np.ndarray:
+    return Rotation.from_rotvec(rng.normal(scale=0.3, size=(n, 3))).as_quat()[:, [3, 0, 1, 2]]
+
+
+def test_vectorized_errors_match_per_corner_kernel():
+    rng = np.random.default_rng(0)
+    n_cams, n_frames, n_obs = 3, 7, 200
+    cam_quats = _quats_wxyz(rng, n_cams)
+    cam_trans = np.column_stack([rng.normal(scale=50.0, size=(n_cams, 2)), np.full(n_cams, 1500.0)])
+    cam_intrinsics = np.tile([1400.0, 1380.0, 960.0, 540.0, -0.12, 0.05, 1e-3, -2e-3], (n_cams, 1))
+    board_quats = _quats_wxyz(rng, n_frames)
+    board_trans = rng.normal(scale=100.0, size=(n_frames, 3))
+    # One camera pushed behind the board, so some observations land behind it
+    cam_trans[2, 2] = -1500.0
+
+    camera_indices = rng.integers(0, n_cams, size=n_obs)
+    frame_positions = rng.integers(0, n_frames, size=n_obs)
+    board_points = np.column_stack([rng.uniform(0, 300, n_obs), rng.uniform(0, 200, n_obs), np.zeros(n_obs)])
+    pixels = rng.uniform(0, 1920, size=(n_obs, 2))
+
+    errors = _compute_reprojection_errors(
+        pixels=pixels,
+        board_points=board_points,
+        camera_indices=camera_indices,
+        frame_positions=frame_positions,
+        cam_quats=cam_quats,
+        cam_trans=cam_trans,
+        cam_intrinsics=cam_intrinsics,
+        board_quats=board_quats,
+        board_trans=board_trans,
+    )
+
+    residuals = np.empty(2)
+    jacobians = [np.empty((2, size)) for size in (4, 3, 8, 4, 3)]
+    for i in range(n_obs):
+        c, f = camera_indices[i], frame_positions[i]
+        charuco_reprojection_residual_and_jacobians(
+            pixels[i], board_points[i], 1.0,
+            cam_quats[c], cam_trans[c], cam_intrinsics[c], board_quats[f], board_trans[f],
+            residuals, *jacobians,
+        )
+        if c == 2:
+            assert errors[i] == 1e6
+        else:
+            assert errors[i] == pytest.approx(np.linalg.norm(residuals), rel=1e-9)
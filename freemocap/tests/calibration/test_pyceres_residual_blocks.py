@@ -0,0 +1,183 @@
+"""End-to-end pyceres solve: per-frame residual blocks vs per-corner blocks."""
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+from skellytracker.core.detectors.keypoint_detectors.charuco import CharucoBoardDefinition
+
+from freemocap.core.tasks.calibration.charuco_board.calibration_observation_table import CalibrationObservationTable
+from freemocap.core.tasks.calibration.shared.camera_extrinsics import CameraExtrinsics
+from freemocap.core.tasks.calibration.shared.camera_intrinsics import CameraIntrinsics
+from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
+
+pyceres = pytest.importorskip("pyceres")
+from freemocap.core.tasks.calibration.pyceres_calibration.helpers import solver  # noqa: E402
+from freemocap.core.tasks.calibration.pyceres_calibration.helpers.cost_functions import (  # noqa: E402
+    CharucoFrameReprojectionCost,
+)
+from freemocap.core.tasks.calibration.pyceres_calibration.helpers.models import (  # noqa: E402
+    PyceresCalibrationSolverConfig,
+)
+
+_INTRINSICS = np.array([1400.0, 1400.0, 960.0, 540.0, 0.0, 0.0, 0.0, 0.0])
+# (camera index, frame index) whose detections are all garbage, so every corner of it gets rejected
+_BAD_CAMERA_FRAME = (2, 3)
+
+
+def _quat_wxyz(rotvec: np.ndarray) -> np.ndarray:
+    x, y, z, w = Rotation.from_rotvec(rotvec).as_quat()
+    return np.array([w, x, y, z])
+
+
+def _rotvec(quat_wxyz: np.ndarray) -> np.ndarray:
+    return Rotation.from_quat(np.r_[quat_wxyz[1:], quat_wxyz[0]]).as_rotvec()
+
+
+def _project(cam_quat, cam_trans, board_quat, board_trans, points: np.ndarray) -> np.ndarray:
+    def rotation(quat_wxyz: np.ndarray) -> np.ndarray:
+        return Rotation.from_quat(np.r_[quat_wxyz[1:], quat_wxyz[0]]).as_matrix()
+
+    p_cam = (rotation(cam_quat) @ (rotation(board_quat) @ points.T + board_trans[:, None])).T + cam_trans
+    return _INTRINSICS[:2] * p_cam[:, :2] / p_cam[:, 2:3] + _INTRINSICS[2:4]
+
+
+def _scene(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    board = CharucoBoardDefinition(squares_x=6, squares_y=5, square_length_mm=40.0)
+    board_points = board.corner_positions_board_frame
+    true_cameras = [
+        (_quat_wxyz(np.zeros(3)), np.zeros(3)),
+        (_quat_wxyz(np.array([0.0, 0.35, 0.0])), np.array([-600.0, 0.0, 100.0])),
+        (_quat_wxyz(np.array([0.1, -0.3, 0.0])), np.array([500.0, 100.0, 80.0])),
+    ]
+    true_frames = [
+        (_quat_wxyz(rng.normal(scale=0.3, size=3)), np.array([-100.0, -80.0, 1500.0]) + rng.normal(scale=100.0, size=3))
+        for _ in range(8)
+    ]
+
+    rows = []
+    for camera_index, (cam_quat, cam_trans) in enumerate(true_cameras):
+        for frame_index, (board_quat, board_trans) in enumerate(true_frames):
+            pixels = _project(cam_quat, cam_trans, board_quat, board_trans, board_points)
+            pixels += rng.normal(scale=0.3, size=pixels.shape)
+            if (camera_index, frame_index) == _BAD_CAMERA_FRAME:
+                pixels = rng.uniform([0.0, 0.0], [1920.0, 1080.0], size=pixels.shape)
+            for corner_id, pixel in enumerate(pixels):
+                if rng.random() < 0.15:
+                    continue
+                if rng.random() < 0.03:
+                    pixel = pixel + 30.0  # isolated outlier corner
+                rows.append((camera_index, frame_index, corner_id, pixel))
+
+    camera_ids = ["cam_0", "cam_1", "cam_2"]
+    cameras = [
+        CameraModel(
+            id=camera_ids[index],
+            index=index,
+            image_size=(1920, 1080),
+            intrinsics=CameraIntrinsics.from_param_array(_INTRINSICS * np.r_[1.03, 0.98, 1, 1, 1, 1, 1, 1]),
+            extrinsics=CameraExtrinsics(
+                quaternion_wxyz=_quat_wxyz(_rotvec(cam_quat) + rng.normal(scale=0.02, size=3)),
+                translation=cam_trans + rng.normal(scale=20.0, size=3),
+            ),
+        )
+        for index, (cam_quat, cam_trans) in enumerate(true_cameras)
+    ]
+    # Camera 0 is pinned, so it starts at its true pose
+    cameras[0] = cameras[0].model_copy(
+        update={"extrinsics": CameraExtrinsics(quaternion_wxyz=true_cameras[0][0], translation=true_cameras[0][1])}
+    )
+    board_poses_init = {
+        frame_index: (
+            _quat_wxyz(_rotvec(board_quat) + rng.normal(scale=0.02, size=3)),
+            board_trans + rng.normal(scale=20.0, size=3),
+        )
+        for frame_index, (board_quat, board_trans) in enumerate(true_frames)
+    }
+
+    def observations() -> CalibrationObservationTable:
+        return CalibrationObservationTable.from_columns(
+            camera_ids=camera_ids,
+            camera_index=np.array([row[0] for row in rows]),
+            frame_index=np.array([row[1] for row in rows]),
+            corner_id=np.array([row[2] for row in rows]),
+            pixel_xy=np.array([row[3] for row in rows]),
+        )
+
+    return board, cameras, board_poses_init, observations, true_cameras
+
+
+def test_per_frame_and_per_corner_blocks_converge_to_the_same_solution():
+    board, cameras, board_poses_init, observations, true_cameras = _scene()
+    results = {}
+    tables = {}
+    for residual_blocks in ("per_frame", "per_corner"):
+        tables[residual_blocks] = observations()
+        results[residual_blocks] = solver.run_pyceres_bundle_adjustment(
+            cameras=cameras,
+            board=board,
+            observations=tables[residual_blocks],
+            board_poses_init=board_poses_init,
+            config=PyceresCalibrationSolverConfig(
+                residual_blocks=residual_blocks,
+                outlier_rejection_iterations=3,
+                verbose=False,
+            ),
+        )
+
+    per_frame, per_corner = tables["per_frame"], tables["per_corner"]
+    np.testing.assert_array_equal(per_frame.is_outlier, per_corner.is_outlier)
+    bad_rows = (per_frame.camera_index == _BAD_CAMERA_FRAME[0]) & (per_frame.frame_index == _BAD_CAMERA_FRAME[1])
+    assert per_frame.is_outlier[bad_rows].all()
+    assert per_frame.is_outlier[~bad_rows].sum() < 0.1 * (~bad_rows).sum()
+
+    for result in results.values():
+        assert result.reprojection_error_px < 1.0
+    for frame_camera, corner_camera, (true_quat, true_trans) in zip(
+            results["per_frame"].cameras, results["per_corner"].cameras, true_cameras
+    ):
+        np.testing.assert_allclose(frame_camera.extrinsics.translation, corner_camera.extrinsics.translation, atol=0.5)
+        np.testing.assert_allclose(frame_camera.intrinsics.to_param_array(), corner_camera.intrinsics.to_param_array(),
+                                   rtol=1e-3, atol=1e-3)
+        # Loose: the intrinsics prior pulls focal (and so depth) toward the perturbed initial guess
+        np.testing.assert_allclose(frame_camera.extrinsics.translation, true_trans, atol=30.0)
+
+
+def test_per_frame_problem_is_built_once_and_updated_in_place(monkeypatch):
+    board, cameras, board_poses_init, observations, _ = _scene()
+
+    problems = []
+
+    class RecordingProblem(pyceres.Problem):
+        def __init__(self) -> None:
+            super().__init__()
+            self.frame_costs = {}
+            self.removed = []
+            problems.append(self)
+
+        def add_residual_block(self, cost, loss, parameters):
+            block_id = super().add_residual_block(cost, loss, parameters)
+            if isinstance(cost, CharucoFrameReprojectionCost):
+                self.frame_costs[block_id] = cost
+            return block_id
+
+        def remove_residual_block(self, block_id) -> None:
+            self.removed.append(self.frame_costs.pop(block_id))
+            super().remove_residual_block(block_id)
+
+    monkeypatch.setattr(solver.pyceres, "Problem", RecordingProblem)
+    table = observations()
+    config = PyceresCalibrationSolverConfig(residual_blocks="per_frame", outlier_rejection_iterations=3, verbose=False)
+    solver.run_pyceres_bundle_adjustment(
+        cameras=cameras, board=board, observations=table, board_poses_init=board_poses_init, config=config
+    )
+
+    # One problem for the whole rejection loop; only the all-garbage (camera, frame) block is dropped
+    (problem,) = problems
+    assert len(problem.removed) == 1
+    assert len(problem.frame_costs) == len(cameras) * len(board_poses_init) - 1
+    bad_rows = (table.camera_index == _BAD_CAMERA_FRAME[0]) & (table.frame_index == _BAD_CAMERA_FRAME[1])
+    # The surviving blocks carry the final rejection state and threshold, mutated in place
+    for cost in problem.frame_costs.values():
+        assert cost.huber_threshold == pytest.approx(config.final_outlier_threshold_px)
+    n_masked = sum(int((~cost.active).sum()) for cost in problem.frame_costs.values())
+    assert n_masked == int(table.is_outlier[~bad_rows].sum())
@@ -0,0 +1,90 @@
+"""Tests for the posthoc per-camera detection cache."""
+from pathlib import Path
+
+import numpy as np
+from skellytracker.core import TrackerConfig
+from skellytracker.core.data_primitives.keypoints import Keypoints
+from skellytracker.core.data_primitives.observation import Observation, StageObservation
+
+from freemocap.core.pipeline.posthoc.detection_cache import (
+    CachedDetections,
+    DetectionCacheWriter,
+    detection_cache_dir,
+    video_content_hash,
+)
+
+_NAMES = ("nose", "left_eye", "right_eye")
+
+
+def _observation(frame_number: int, *, detected: bool = True) -> Observation:
+    rng = np.random.default_rng(frame_number)
+    keypoints = None
+    if detected:
+        keypoints = Keypoints(
+            names=_NAMES,
+            xyz=rng.uniform(0, 1000, size=(len(_NAMES), 3)),
+            visibility=rng.uniform(0, 1, size=len(_NAMES)),
+        )
+    return Observation(
+        frame_number=frame_number,
+        image_size=(720, 1280),
+        stages={"body": StageObservation(name="body", keypoints=keypoints)},
+    )
+
+
+def test_flushed_detections_read_back(tmp_path: Path):
+    writer = DetectionCacheWriter(cache_dir=tmp_path, flush_every=4)
+    for frame_number in range(10):
+        writer.add(frame_number=frame_number, observation=_observation(frame_number, detected=frame_number != 3))
+    writer.flush()
+
+    cached = CachedDetections.load(tmp_path)
+    assert len(cached) == 10 and cached.covers(range(10))
+    for frame_number in range(10):
+        expected = _observation(frame_number, detected=frame_number != 3).stages["body"].keypoints
+        actual = cached[frame_number].stages["body"].keypoints
+        assert cached[frame_number].frame_number == frame_number
+        assert cached[frame_number].image_size == (720, 1280)
+        if expected is None:
+            assert actual is None
+            continue
+        assert tuple(actual.names) == _NAMES
+        np.testing.assert_array_equal(actual.xyz, expected.xyz)
+        np.testing.assert_array_equal(actual.visibility, expected.visibility)
+
+
+def test_interrupted_run_keeps_only_flushed_chunks(tmp_path: Path):
+    writer = DetectionCacheWriter(cache_dir=tmp_path, flush_every=4)
+    for frame_number in range(10):
+        writer.add(frame_number=frame_number, observation=_observation(frame_number))
+    # No final flush: frames 8-9 are lost, as if the process had died.
+
+    cached = CachedDetections.load(tmp_path)
+    assert sorted(cached) == list(range(8))
+    assert not cached.covers(range(10))
+
+    # Resuming writes the rest; a gap in frame numbers starts a new chunk.
+    resumed = DetectionCacheWriter(cache_dir=tmp_path, flush_every=4)
+    for frame_number in (8, 9, 12):
+        resumed.add(frame_number=frame_number, observation=_observation(frame_number))
+    resumed.flush()
+    assert sorted(CachedDetections.load(tmp_path)) == [*range(10), 12]
+
+
+def test_cache_folder_depends_on_video_content_and_detector(tmp_path: Path):
+    video_path = tmp_path / "cam0.mp4"
+    video_path.write_bytes(b"\x00" * 5000)
+    config = TrackerConfig(stages=[])
+
+    first = detection_cache_dir(recording_path=tmp_path, camera_id="0", video_path=video_path, detector_config=config)
+    assert first == detection_cache_dir(
+        recording_path=tmp_path, camera_id="0", video_path=video_path, detector_config=config
+    )
+    assert (first / "key.json").exists()
+
+    hash_before = video_content_hash(video_path)
+    video_path.write_bytes(b"\x00" * 4999 + b"\x01")
+    assert video_content_hash(video_path) != hash_before
+    assert first != detection_cache_dir(
+        recording_path=tmp_path, camera_id="0", video_path=video_path, detector_config=config
+    )
@@ -0,0 +1,52 @@
+"""Unit tests for the realtime aggregator's in-flight frame bookkeeping."""
+import pytest
+
+from freemocap.core.pipeline.realtime.frames_in_flight import FramesInFlight
+from freemocap.pubsub.pubsub_topics import CameraNodeOutputMessage
+
+
+def _output(camera_id: str, frame_number: int) -> CameraNodeOutputMessage:
+    return CameraNodeOutputMessage(camera_id=camera_id, frame_number=frame_number)
+
+
+def test_requests_are_capped_and_only_move_forward():
+    frames = FramesInFlight(camera_ids=["a", "b"], max_in_flight=2)
+    assert frames.can_request(latest_shm_frame=0)
+    frames.mark_requested(0)
+    assert not frames.can_request(latest_shm_frame=0)  # nothing newer yet
+    assert frames.can_request(latest_shm_frame=3)
+    frames.mark_requested(3)
+    assert not frames.can_request(latest_shm_frame=9)  # cap reached
+    with pytest.raises(RuntimeError):
+        frames.mark_requested(2)
+
+
+def test_head_is_processed_in_request_order_even_if_later_frame_completes_first():
+    frames = FramesInFlight(camera_ids=["a", "b"], max_in_flight=3)
+    frames.mark_requested(10)
+    frames.mark_requested(11)
+
+    frames.add_output(_output("a", 10))
+    frames.add_output(_output("a", 11))
+    frames.add_output(_output("b", 11))
+    assert frames.head_frame_number == 10
+    assert not frames.head_complete
+
+    frames.add_output(_output("b", 10))
+    assert frames.head_complete
+    frame_number, outputs = frames.pop_head()
+    assert frame_number == 10
+    assert {cam_id: msg.frame_number for cam_id, msg in outputs.items()} == {"a": 10, "b": 10}
+
+    assert frames.head_frame_number == 11
+    assert frames.head_complete
+    assert frames.can_request(latest_shm_frame=12)
+
+
+def test_output_for_unrequested_frame_raises():
+    frames = FramesInFlight(camera_ids=["a"], max_in_flight=1)
+    frames.mark_requested(5)
+    with pytest.raises(RuntimeError, match="WRONG FRAME"):
+        frames.add_output(_output("a", 6))
+    with pytest.raises(ValueError):
+        frames.add_output(_output("z", 5))
@@ -0,0 +1,61 @@
+"""Tests for columnar keypoint collection in the posthoc aggregation node."""
+import numpy as np
+import pytest
+from skellytracker.core.data_primitives.keypoints import Keypoints
+from skellytracker.core.data_primitives.observation import Observation, StageObservation
+
+from freemocap.core.tracking.keypoint_columns import KeypointColumns
+
+_NAMES = ("nose", "left_eye", "right_eye")
+
+
+def _observation(frame_number: int, xyz: np.ndarray) -> Observation:
+    keypoints = Keypoints(names=_NAMES, xyz=xyz, visibility=np.full(len(_NAMES), 0.9))
+    return Observation(
+        frame_number=frame_number,
+        image_size=(720, 1280),
+        stages={"body": StageObservation(name="body", keypoints=keypoints)},
+    )
+
+
+def test_columns_match_merged_observation_keypoints():
+    rng = np.random.default_rng(0)
+    camera_ids = ["cam_a", "cam_b"]
+    start_frame, n_frames = 10, 6
+    columns = KeypointColumns(camera_ids=camera_ids, start_frame=start_frame, n_frames=n_frames)
+
+    observations = {
+        (camera_id, frame_number): _observation(frame_number, rng.uniform(0, 1000, size=(len(_NAMES), 3)))
+        for frame_number in range(start_frame, start_frame + n_frames)
+        for camera_id in camera_ids
+    }
+    for (camera_id, frame_number), observation in reversed(observations.items()):  # arrival order doesn't matter
+        columns.add(camera_id=camera_id, frame_number=frame_number, observation=observation)
+
+    assert columns.complete
+    assert columns.missing_frame_numbers() == []
+    assert columns.xyz.shape == (2, n_frames, len(_NAMES), 3)
+    assert columns.xyz.dtype == np.float32
+    for camera_id in camera_ids:
+        expected = np.stack([
+            observations[camera_id, frame_number].to_keypoints().xyz
+            for frame_number in range(start_frame, start_frame + n_frames)
+        ])
+        np.testing.assert_allclose(columns.camera_xyz(camera_id), expected, rtol=1e-6)
+
+
+def test_missing_and_invalid_outputs_are_reported():
+    columns = KeypointColumns(camera_ids=["cam_a", "cam_b"], start_frame=0, n_frames=3)
+    xyz = np.zeros((len(_NAMES), 3))
+    columns.add(camera_id="cam_a", frame_number=0, observation=_observation(0, xyz))
+    columns.add(camera_id="cam_b", frame_number=0, observation=_observation(0, xyz))
+    columns.add(camera_id="cam_a", frame_number=2, observation=_observation(2, xyz))
+
+    assert not columns.complete
+    assert columns.missing_frame_numbers() == [1, 2]
+    with pytest.raises(ValueError, match="Duplicate"):
+        columns.add(camera_id="cam_a", frame_number=2, observation=_observation(2, xyz))
+    with pytest.raises(ValueError, match="camera"):
+        columns.add(camera_id="cam_c", frame_number=1, observation=_observation(1, xyz))
+    with pytest.raises(ValueError, match="frame number"):
+        columns.add(camera_id="cam_b", frame_number=3, observation=_observation(3, xyz))
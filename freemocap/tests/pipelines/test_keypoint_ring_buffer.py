@@ -0,0 +1,109 @@
+"""Tests for the shared-memory keypoint ring buffer used by the realtime pipeline."""
+import numpy as np
+import pytest
+from skellytracker.core.data_primitives.keypoints import Keypoints
+from skellytracker.core.data_primitives.observation import Observation, StageObservation
+
+from freemocap.core.pipeline.realtime.keypoint_ring_buffer import KeypointSharedMemoryRingBuffer
+
+_LAYOUTS = [("nose", "left_eye", "right_eye"), ("a", "b")]
+
+
+def _observation(*, names: tuple[str, ...], xyz: np.ndarray, extra_stage: bool = False) -> Observation:
+    keypoints = Keypoints(names=names, xyz=xyz, visibility=np.full(len(names), 0.9))
+    stages = {"body": StageObservation(name="body", keypoints=keypoints)}
+    if extra_stage:
+        stages["hands"] = StageObservation(name="hands", keypoints=keypoints)
+    return Observation(frame_number=0, image_size=(720, 1280), stages=stages)
+
+
+@pytest.fixture
+def ring():
+    ring = KeypointSharedMemoryRingBuffer.create(camera_ids=["cam_a", "cam_b"], point_layouts=_LAYOUTS, n_slots=4)
+    yield ring
+    ring.close()
+
+
+def test_written_observation_reads_back_through_an_attached_view(ring):
+    xyz = np.array([[10.0, 20.0, 0.0], [np.nan, np.nan, 0.0], [30.0, 40.0, 0.0]])
+    slot = ring.write_observation(frame_number=6, camera_id="cam_b", observation=_observation(names=_LAYOUTS[0], xyz=xyz))
+    assert slot == 0  # first write from cam_b
+
+    attached = KeypointSharedMemoryRingBuffer.recreate(dto=ring.to_dto())
+    try:
+        view = attached.read(frame_number=6, slot=slot, camera_id="cam_b")
+        assert view is not None
+        assert view.point_names == _LAYOUTS[0]
+        assert view.image_size == (720, 1280)
+        assert np.isnan(view.bbox_xyxy).all()
+        np.testing.assert_allclose(view.xyz, xyz, equal_nan=True)
+        np.testing.assert_allclose(view.visibility, 0.9, rtol=1e-6)
+        assert attached.read(frame_number=6, slot=slot, camera_id="cam_a") is None
+    finally:
+        attached.close()
+
+
+def _write(ring, *, frame_number: int, camera_id: str = "cam_a", value: float = 1.0) -> int:
+    return ring.write_keypoints(
+        frame_number=frame_number, camera_id=camera_id, layout_index=1,
+        xyz=np.full((2, 3), value), visibility=np.ones(2), image_size=(10, 10),
+    )
+
+
+def test_frames_a_multiple_of_n_slots_apart_get_different_slots(ring):
+    # In-flight frame numbers are not consecutive (the aggregator requests the latest multiframe).
+    slot_1 = _write(ring, frame_number=1, value=1.0)
+    slot_5 = _write(ring, frame_number=5, value=5.0)
+    assert slot_1 != slot_5
+    assert float(ring.read(frame_number=1, slot=slot_1, camera_id="cam_a").xyz[0, 0]) == 1.0
+    assert float(ring.read(frame_number=5, slot=slot_5, camera_id="cam_a").xyz[0, 0]) == 5.0
+
+
+def test_reused_slot_reads_as_missing(ring):
+    slot = _write(ring, frame_number=1)
+    for frame_number in range(2, 2 + ring.n_slots):
+        last_slot = _write(ring, frame_number=frame_number)
+    assert last_slot == slot
+    assert ring.read(frame_number=1, slot=slot, camera_id="cam_a") is None
+    assert ring.read(frame_number=1 + ring.n_slots, slot=slot, camera_id="cam_a") is not None
+
+
+def test_slot_reused_during_a_read_reads_as_missing(ring):
+    slot = _write(ring, frame_number=1, value=1.0)
+    reader = KeypointSharedMemoryRingBuffer.recreate(dto=ring.to_dto())
+
+    class _ReuseSlotOnAccess(np.ndarray):
+        """Lets the writer lap the ring between the reader's stamp check and its copy."""
+        def __getitem__(self, key):
+            for frame_number in range(2, 2 + ring.n_slots):
+                _write(ring, frame_number=frame_number, value=float(frame_number))
+            return super().__getitem__(key)
+
+    reader._keypoints = reader._keypoints.view(_ReuseSlotOnAccess)
+    try:
+        assert reader.read(frame_number=1, slot=slot, camera_id="cam_a") is None
+    finally:
+        reader.close()
+
+
+def test_read_returns_a_copy(ring):
+    slot = _write(ring, frame_number=1, value=1.0)
+    view = ring.read(frame_number=1, slot=slot, camera_id="cam_a")
+    for frame_number in range(2, 2 + ring.n_slots):
+        _write(ring, frame_number=frame_number, value=float(frame_number))
+    assert float(view.xyz[0, 0]) == 1.0
+
+
+def test_observations_the_ring_cannot_represent_are_refused(ring):
+    unknown_names = _observation(names=("x", "y", "z"), xyz=np.zeros((3, 3)))
+    split_stages = _observation(names=_LAYOUTS[0], xyz=np.zeros((3, 3)), extra_stage=True)
+    known = _observation(names=_LAYOUTS[0], xyz=np.zeros((3, 3)))
+
+    assert ring.write_observation(frame_number=0, camera_id="cam_a", observation=unknown_names) is None
+    assert ring.write_observation(frame_number=0, camera_id="cam_a", observation=split_stages) is None
+    assert ring.write_observation(frame_number=0, camera_id="cam_z", observation=known) is None
+    with pytest.raises(ValueError):
+        ring.write_keypoints(
+            frame_number=0, camera_id="cam_a", layout_index=1,
+            xyz=np.zeros((3, 3)), visibility=np.zeros(3), image_size=(10, 10),
+        )
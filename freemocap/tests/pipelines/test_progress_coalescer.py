@@ -0,0 +1,78 @@
+"""Unit tests for coalescing posthoc progress messages."""
+from freemocap.core.pipeline.posthoc.pipeline_phases import VideoNodePhase
+from freemocap.core.pipeline.posthoc.progress_coalescer import ProgressCoalescer
+from freemocap.core.pipeline.posthoc.progress_messages import VideoNodeProgressMessage
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _message(pipeline_id: str, phase: VideoNodePhase, fraction: float) -> VideoNodeProgressMessage:
+    return VideoNodeProgressMessage(
+        camera_id=pipeline_id,
+        pipeline_id=pipeline_id,
+        pipeline_type="mocap",
+        phase=phase,
+        progress_fraction=fraction,
+    )
+
+
+def _run_video_node(coalescer: ProgressCoalescer, clock: _FakeClock, *, pipeline_id: str, n_frames: int) -> None:
+    coalescer.put(_message(pipeline_id, VideoNodePhase.SETTING_UP, 0.0))
+    for frame in range(1, n_frames + 1):
+        clock.now += 1 / 300  # 300 fps of detection
+        coalescer.put(_message(pipeline_id, VideoNodePhase.PROCESSING_IMAGES, frame / n_frames))
+    coalescer.put(_message(pipeline_id, VideoNodePhase.COMPLETE, 1.0))
+
+
+def test_long_multi_camera_run_is_coalesced():
+    clock = _FakeClock()
+    sent: list[VideoNodeProgressMessage] = []
+    coalescer = ProgressCoalescer(publish=sent.append, min_interval_s=0.25, min_fraction_delta=0.005, clock=clock)
+
+    n_frames = 100_000
+    for camera in ("cam0", "cam1", "cam2", "cam3"):
+        _run_video_node(coalescer, clock, pipeline_id=camera, n_frames=n_frames)
+
+    for camera in ("cam0", "cam1", "cam2", "cam3"):
+        camera_messages = [message for message in sent if message.pipeline_id == camera]
+        # At most one message per 0.5% of progress, plus first / phase changes / last.
+        assert 3 <= len(camera_messages) <= 1 / 0.005 + 4
+        assert camera_messages[0].phase == VideoNodePhase.SETTING_UP
+        assert camera_messages[1].phase == VideoNodePhase.PROCESSING_IMAGES
+        assert camera_messages[-2].progress_fraction == 1.0
+        assert camera_messages[-1].phase == VideoNodePhase.COMPLETE
+    assert len(sent) < 4 * n_frames / 100
+
+
+def test_failure_is_always_delivered():
+    clock = _FakeClock()
+    sent: list[VideoNodeProgressMessage] = []
+    coalescer = ProgressCoalescer(publish=sent.append, clock=clock)
+
+    coalescer.put(_message("cam0", VideoNodePhase.PROCESSING_IMAGES, 0.1))
+    coalescer.put(_message("cam0", VideoNodePhase.PROCESSING_IMAGES, 0.2))
+    coalescer.put(_message("cam0", VideoNodePhase.FAILED, 0.2))
+
+    assert [message.phase for message in sent] == [VideoNodePhase.PROCESSING_IMAGES, VideoNodePhase.FAILED]
+
+
+def test_slow_progress_waits_for_interval_and_delta():
+    clock = _FakeClock()
+    sent: list[VideoNodeProgressMessage] = []
+    coalescer = ProgressCoalescer(publish=sent.append, min_interval_s=1.0, min_fraction_delta=0.1, clock=clock)
+
+    coalescer.put(_message("cam0", VideoNodePhase.PROCESSING_IMAGES, 0.0))
+    clock.now = 5.0
+    coalescer.put(_message("cam0", VideoNodePhase.PROCESSING_IMAGES, 0.05))  # enough time, too little progress
+    coalescer.put(_message("cam0", VideoNodePhase.PROCESSING_IMAGES, 0.5))  # both
+    clock.now = 5.5
+    coalescer.put(_message("cam0", VideoNodePhase.PROCESSING_IMAGES, 0.9))  # too soon
+    coalescer.put(_message("cam0", VideoNodePhase.PROCESSING_IMAGES, 0.9), force=True)
+
+    assert [message.progress_fraction for message in sent] == [0.0, 0.5, 0.9]
@@ -44,3 +44,27 @@ def test_reset_clears_state():
     out = f.filter(t=0.1, raw_keypoints={})
     assert out.positions == {}
     assert out.predicted_names == frozenset()
+
+
+def test_vectorized_backend_matches_scalar_backend():
+    rng = np.random.default_rng(0)
+    names = [f"point_{i}" for i in range(20)]
+    scalar = RealtimeKeypointFilter(dims=3, backend="scalar")
+    vectorized = RealtimeKeypointFilter(dims=3, backend="vectorized")
+    positions = rng.normal(scale=500.0, size=(len(names), 3))
+
+    for frame in range(60):
+        positions += rng.normal(scale=20.0, size=positions.shape)
+        # Points drop in and out (some for longer than max_prediction_frames),
+        # and the frame interval jitters.
+        present = rng.random(len(names)) > 0.3
+        raw = {name: positions[i].copy() for i, name in enumerate(names) if present[i]}
+        t = frame / 30.0 + rng.uniform(0.0, 0.005)
+
+        expected = scalar.filter(t=t, raw_keypoints=raw)
+        actual = vectorized.filter(t=t, raw_keypoints=raw)
+
+        assert actual.predicted_names == expected.predicted_names
+        assert actual.positions.keys() == expected.positions.keys()
+        for name, position in expected.positions.items():
+            np.testing.assert_allclose(actual.positions[name], position, rtol=1e-12, atol=1e-9)
@@ -0,0 +1,63 @@
+"""Unit tests for the realtime velocity gate (dict adapter and array path)."""
+import numpy as np
+
+from freemocap.core.tasks.mocap.realtime_filtering.realtime_point_gate import RealtimePointGate
+
+
+def _gate() -> RealtimePointGate:
+    return RealtimePointGate(max_velocity_mm_per_s=1000.0, max_rejected_streak=2)
+
+
+def test_spike_is_held_without_moving_the_reference():
+    gate = _gate()
+    gate.gate(t=0.0, points={"nose": np.zeros(3)})
+    spiked = gate.gate(t=0.1, points={"nose": np.array([500.0, 0.0, 0.0])})
+    np.testing.assert_allclose(spiked.positions["nose"], np.zeros(3))
+    assert spiked.held_names == frozenset({"nose"})
+
+    # Still within reach of the last *accepted* position, so accepted.
+    out = gate.gate(t=0.2, points={"nose": np.array([50.0, 0.0, 0.0])})
+    np.testing.assert_allclose(out.positions["nose"], [50.0, 0.0, 0.0])
+    assert out.held_names == frozenset()
+
+
+def test_staleness_timeout_accepts_after_max_streak():
+    gate = _gate()
+    gate.gate(t=0.0, points={"nose": np.zeros(3)})
+    far = {"nose": np.array([5000.0, 0.0, 0.0])}
+    assert gate.gate(t=0.1, points=far).held_names == frozenset({"nose"})
+    assert gate.gate(t=0.2, points=far).held_names == frozenset({"nose"})
+    out = gate.gate(t=0.3, points=far)
+    assert out.held_names == frozenset()
+    np.testing.assert_allclose(out.positions["nose"], far["nose"])
+
+
+def test_new_and_absent_points():
+    gate = _gate()
+    gate.gate(t=0.0, points={"nose": np.zeros(3)})
+    out = gate.gate(t=0.1, points={"left_eye": np.full(3, 9000.0)})
+    assert set(out.positions) == {"left_eye"}  # absent points are not returned
+    assert out.held_names == frozenset()  # never-seen points are accepted
+
+
+def test_array_path_matches_dict_adapter():
+    rng = np.random.default_rng(0)
+    names = [f"point_{i}" for i in range(20)]
+    by_dict, by_array = _gate(), _gate()
+    by_array.rows_for(names)
+    positions = rng.normal(scale=500.0, size=(len(names), 3))
+    for frame in range(60):
+        t = frame / 30.0
+        positions = positions + rng.normal(scale=10.0, size=positions.shape)
+        observed = positions + (rng.random((len(names), 1)) < 0.1) * 800.0
+        present = rng.random(len(names)) >= 0.2
+
+        dict_result = by_dict.gate(
+            t=t, points={name: observed[i] for i, name in enumerate(names) if present[i]},
+        )
+        array_result = by_array.gate_array(t=t, positions=np.where(present[:, None], observed, np.nan), present=present)
+
+        assert dict_result.held_names == {names[i] for i in np.flatnonzero(array_result.held)}
+        for name, position in dict_result.positions.items():
+            np.testing.assert_array_equal(position, array_result.positions[names.index(name)])
+        assert np.all(np.isnan(array_result.positions[~present]))
@@ -0,0 +1,52 @@
+"""Unit tests for the VideoNode background decode thread."""
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from freemocap.core.pipeline.posthoc.video_frame_threads import FramePrefetcher
+
+
+def _write_video(path: Path, n_frames: int) -> None:
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 30.0, (64, 48))
+    for frame in range(n_frames):
+        writer.write(np.full((48, 64, 3), frame * 8, dtype=np.uint8))
+    writer.release()
+
+
+def test_prefetcher_yields_every_frame_in_order(tmp_path: Path):
+    video_path = tmp_path / "video.mp4"
+    _write_video(video_path, n_frames=20)
+
+    reader = cv2.VideoCapture(str(video_path))
+    expected = []
+    while True:
+        success, image = reader.read()
+        if not success:
+            break
+        expected.append(image)
+    reader.release()
+
+    reader = cv2.VideoCapture(str(video_path))
+    prefetcher = FramePrefetcher(reader=reader, depth=2, name="test")
+    frames = []
+    while (image := prefetcher.read()) is not None:
+        frames.append(image)
+    assert prefetcher.read() is None  # stays exhausted
+    prefetcher.close()
+    reader.release()
+
+    assert len(frames) == len(expected) == 20
+    for frame, expected_frame in zip(frames, expected):
+        np.testing.assert_array_equal(frame, expected_frame)
+
+
+def test_prefetcher_close_before_end_does_not_hang(tmp_path: Path):
+    video_path = tmp_path / "video.mp4"
+    _write_video(video_path, n_frames=20)
+
+    reader = cv2.VideoCapture(str(video_path))
+    prefetcher = FramePrefetcher(reader=reader, depth=1, name="test")
+    assert prefetcher.read() is not None
+    prefetcher.close()
+    reader.release()
@@ -0,0 +1,74 @@
+"""Unit tests for frame-range sharding of posthoc videos."""
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from freemocap.core.pipeline.posthoc.video_frame_threads import FramePrefetcher
+from freemocap.core.pipeline.posthoc.video_sharding import FrameRange, plan_frame_ranges, seek_to_frame
+
+
+def _write_video(path: Path, n_frames: int) -> list[np.ndarray]:
+    """Write a video whose frames are easy to tell apart; return the frames as decoded."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 30.0, (64, 48))
+    for frame in range(n_frames):
+        image = np.zeros((48, 64, 3), dtype=np.uint8)
+        cv2.putText(image, str(frame), (2, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+        writer.write(image)
+    writer.release()
+
+    reader = cv2.VideoCapture(str(path))
+    decoded = []
+    while True:
+        success, image = reader.read()
+        if not success:
+            break
+        decoded.append(image)
+    reader.release()
+    return decoded
+
+
+def test_plan_frame_ranges_covers_video_contiguously():
+    ranges = plan_frame_ranges(frame_count=1001, n_shards=4, min_frames_per_shard=100)
+    assert len(ranges) == 4
+    assert ranges[0].start == 0 and ranges[-1].stop == 1001
+    for previous, current in zip(ranges[:-1], ranges[1:]):
+        assert previous.stop == current.start
+    assert max(map(len, ranges)) - min(map(len, ranges)) <= 1
+
+
+def test_plan_frame_ranges_limits_shards_for_short_videos():
+    assert plan_frame_ranges(frame_count=250, n_shards=8, min_frames_per_shard=100) == [
+        FrameRange(0, 125), FrameRange(125, 250),
+    ]
+    assert plan_frame_ranges(frame_count=50, n_shards=8, min_frames_per_shard=100) == [FrameRange(0, 50)]
+
+
+@pytest.mark.parametrize("fps", [30.0, 0.0])  # 0 fps forces the decode-from-start fallback
+def test_shards_decode_the_same_frames_as_a_sequential_read(tmp_path: Path, fps: float):
+    video_path = tmp_path / "video.mp4"
+    expected = _write_video(video_path, n_frames=90)
+
+    frames = []
+    for frame_range in plan_frame_ranges(frame_count=len(expected), n_shards=3, min_frames_per_shard=10):
+        reader = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+        seek_to_frame(reader, frame_number=frame_range.start, fps=fps, warmup_frames=5)
+        prefetcher = FramePrefetcher(reader=reader, depth=4, name="test", max_frames=len(frame_range))
+        while (image := prefetcher.read()) is not None:
+            frames.append(image)
+        prefetcher.close()
+        reader.release()
+
+    assert len(frames) == len(expected)
+    for frame, expected_frame in zip(frames, expected):
+        np.testing.assert_array_equal(frame, expected_frame)
+
+
+def test_seek_past_end_raises(tmp_path: Path):
+    video_path = tmp_path / "video.mp4"
+    _write_video(video_path, n_frames=10)
+    reader = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+    with pytest.raises(RuntimeError):
+        seek_to_frame(reader, frame_number=50, fps=30.0, warmup_frames=5)
+    reader.release()
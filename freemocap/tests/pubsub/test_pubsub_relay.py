@@ -0,0 +1,90 @@
+import multiprocessing
+import pickle
+import time
+from dataclasses import dataclass
+from queue import Empty
+
+import pytest
+
+from freemocap.pubsub.pubsub_abcs import PreSerializedMessage, TopicMessageABC, create_topic
+from freemocap.pubsub.pubsub_relay import PubSubRelay, PubSubRelayMode
+
+
+@dataclass
+class RelayTestMessage(TopicMessageABC):
+    index: int = 0
+    payload: bytes = b""
+
+
+RelayTestTopic = create_topic(RelayTestMessage)
+
+
+@pytest.fixture(params=list(PubSubRelayMode))
+def relay(request):
+    topics = {RelayTestTopic: RelayTestTopic()}
+    relay = PubSubRelay(
+        topics=topics,
+        global_kill_flag=multiprocessing.Value("b", False),
+        mode=request.param,
+    )
+    relay.start()
+    yield relay
+    relay.stop()
+    for topic in topics.values():
+        topic.close()
+
+
+def test_pre_serialized_message_unpickles_to_the_original():
+    message = RelayTestMessage(index=3, payload=b"abc")
+
+    relayed = pickle.loads(pickle.dumps(PreSerializedMessage(pickle.dumps(message))))
+
+    assert relayed == message
+
+
+def test_every_subscriber_gets_every_message_in_order(relay):
+    subscriptions = [relay.create_subscription(RelayTestTopic) for _ in range(3)]
+    topic = relay.topics[RelayTestTopic]
+
+    for index in range(20):
+        topic.publish(RelayTestMessage(index=index, payload=bytes(1000)))
+
+    for subscription in subscriptions:
+        received = [subscription.get(timeout=2.0) for _ in range(20)]
+        assert [message.index for message in received] == list(range(20))
+        assert all(isinstance(message, RelayTestMessage) for message in received)
+
+
+def test_full_subscription_evicts_oldest(relay):
+    subscription = relay.create_subscription(RelayTestTopic)
+    topic = relay.topics[RelayTestTopic]
+    n_messages = RelayTestTopic.queue_maxsize + 10
+
+    for index in range(n_messages):
+        topic.publish(RelayTestMessage(index=index))
+
+    deadline = time.perf_counter() + 5.0
+    last_index = -1
+    while last_index != n_messages - 1 and time.perf_counter() < deadline:
+        last_index = subscription.get(timeout=2.0).index
+    assert last_index == n_messages - 1
+
+
+@pytest.mark.parametrize("pre_serialized", [False, True])
+def test_fan_out_keeps_the_newest_messages_of_a_full_subscription(pre_serialized: bool):
+    # Fanned out back to back, so most evictions find the oldest entry still in
+    # the queue's feeder thread rather than in its pipe.
+    topic = RelayTestTopic()
+    subscription = topic.get_subscription()
+    n_messages = RelayTestTopic.queue_maxsize + 10
+    try:
+        for index in range(n_messages):
+            message = RelayTestMessage(index=index)
+            topic._fan_out(PreSerializedMessage(pickle.dumps(message)) if pre_serialized else message)
+
+        received = [subscription.get(timeout=2.0).index for _ in range(RelayTestTopic.queue_maxsize)]
+        assert received == list(range(10, n_messages))
+        with pytest.raises(Empty):
+            subscription.get(timeout=0.2)
+    finally:
+        topic.close()
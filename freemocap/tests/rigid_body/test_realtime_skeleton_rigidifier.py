@@ -5,8 +5,17 @@ the skellytracker RTMPose->canonical mapping YAMLs in the venv.
 """
 import numpy as np
 import pytest
+from skellyforge.skellymodels.models.anatomical_structure import AnatomicalStructure
+from skellyforge.skellymodels.models.tracking_model_info import CanonicalBodyModelInfo
+from skellytracker.core.io.tracker_mapping import TrackerMapping
 
-from freemocap.core.tasks.mocap.rigid_body.skeleton_rigidifier import RealtimeSkeletonRigidifier
+from freemocap.core.tasks.mocap.rigid_body.online_segment_lengths import RollingBoneLengths
+from freemocap.core.tasks.mocap.rigid_body.skeleton_rigidifier import (
+    _BODY_MAPPING_YAML_BY_DETECTOR,
+    RealtimeSkeletonRigidifier,
+    TreeRigidifier,
+    _seeds_from_ratios,
+)
 
 
 def _upright_rtmpose_pose() -> dict[str, np.ndarray]:
@@ -116,3 +125,33 @@ def test_reset_clears_learned_lengths():
 
     rig.reset()  # forget the rolling window -> back to seeds
     assert rig.body_bone_lengths["left_shoulder->left_elbow"] == pytest.approx(seed)
+
+
+def test_body_matches_the_dict_mapping_and_tree():
+    """The compiled per-frame path reproduces TrackerMapping.apply + TreeRigidifier.rigidify."""
+    rig = RealtimeSkeletonRigidifier.create(height_mm=1750.0)
+    anatomy = AnatomicalStructure.from_model_info(CanonicalBodyModelInfo(), "body")
+    mapping = TrackerMapping.from_yaml(_BODY_MAPPING_YAML_BY_DETECTOR["rtmpose"])
+    tree = TreeRigidifier(joint_hierarchy=anatomy.joint_hierarchy)
+    lengths = RollingBoneLengths(
+        bone_seeds=_seeds_from_ratios(
+            joint_hierarchy=anatomy.joint_hierarchy,
+            bone_length_ratios=anatomy.bone_length_ratios,
+            height_mm=1750.0,
+        ),
+        window_s=10.0,
+    )
+    rng = np.random.default_rng(0)
+    base = _upright_rtmpose_pose()
+    for i in range(40):
+        pose = {name: pos + rng.normal(scale=5.0, size=3) for name, pos in base.items()}
+        if i % 7 == 3:
+            del pose["left_wrist"]  # gap-filled along the carried direction
+        measured = {name: pos for name, pos in pose.items() if rng.random() > 0.1}
+        lengths.update(mapping.apply(measured), t=i / 30.0)
+        expected = tree.rigidify(mapping.apply(pose), lengths.lengths)
+        actual = rig.rigidify_frame(pose, measured=measured, t=i / 30.0)
+        assert actual.body_positions.keys() == expected.keys()
+        for name, position in expected.items():
+            np.testing.assert_allclose(actual.body_positions[name], position, atol=1e-6)
+    assert rig.body_bone_lengths == pytest.approx(lengths.lengths)
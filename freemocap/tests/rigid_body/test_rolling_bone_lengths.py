@@ -84,3 +84,20 @@ def test_reset_restores_seeds():
     assert rolling.lengths["a->b"] == 150.0
     rolling.reset()
     assert rolling.lengths == {"a->b": 100.0, "b->c": 80.0}
+
+
+def test_incremental_median_matches_numpy_median_over_window():
+    rolling = _make(window_s=1.0)
+    rng = np.random.default_rng(0)
+    history: list[tuple[float, float]] = []
+    for frame in range(300):
+        t = frame / 30.0
+        length = float(rng.uniform(90.0, 110.0))
+        measured = rng.random() > 0.2
+        rolling.update_lengths(np.array([length if measured else np.nan, np.nan]), t=t)
+        if measured:
+            history.append((t, length))
+        window = [value for sample_t, value in history if sample_t >= t - 1.0]
+        expected = float(np.median(window)) if window else 100.0
+        assert rolling.lengths["a->b"] == expected
+        assert rolling.lengths_array[0] == expected
@@ -96,3 +96,34 @@ def test_returns_empty_when_root_missing():
     rig = _chain()
     out = rig.rigidify({"mid": np.array([0.0, 120.0, 0.0])}, {"root->mid": 100.0, "mid->tip": 80.0})
     assert out == {}
+
+
+def test_array_pass_matches_dict_pass():
+    # rigidify_array places a whole BFS level at once; it must agree with the
+    # bone-by-bone dict pass, including gap-filling from carried directions.
+    hierarchy = {
+        "pelvis": ["spine", "left_hip", "right_hip"],
+        "spine": ["neck", "left_shoulder", "right_shoulder"],
+        "neck": ["head"],
+        "left_shoulder": ["left_elbow"],
+        "left_elbow": ["left_wrist"],
+        "left_hip": ["left_knee"],
+    }
+    by_dict = TreeRigidifier(joint_hierarchy=hierarchy)
+    by_array = TreeRigidifier(joint_hierarchy=hierarchy)
+    names = by_array.joint_names
+    rng = np.random.default_rng(0)
+    bone_lengths = {key: float(rng.uniform(50.0, 300.0)) for key in by_array.bone_keys}
+    bone_length_array = np.array([bone_lengths[key] for key in by_array.bone_keys])
+
+    for _ in range(50):
+        positions = rng.normal(scale=500.0, size=(len(names), 3))
+        present = rng.random(len(names)) > 0.25
+        expected = by_dict.rigidify(
+            {name: positions[i] for i, name in enumerate(names) if present[i]}, bone_lengths,
+        )
+        corrected, placed = by_array.rigidify_array(positions, present, bone_length_array)
+
+        assert {names[i] for i in np.flatnonzero(placed)} == set(expected)
+        for i in np.flatnonzero(placed):
+            assert np.allclose(corrected[i], expected[names[i]])
@@ -3,14 +3,18 @@
 Covers both entry points: from raw RTMPose tracker keypoints
 (``calculate_center_of_mass_per_frame``) and from already-canonical positions
 (``calculate_center_of_mass_from_canonical`` — the path used by the rigidified
-skeleton, matching the posthoc ``rigid_xyz -> CoM`` flow).
+skeleton, matching the posthoc ``rigid_xyz -> CoM`` flow), plus the compiled
+``CenterOfMassKernel`` against the dict path.
 """
 import numpy as np
 
 from freemocap.core.tasks.mocap.center_of_mass import (
+    CenterOfMassKernel,
     CoMConfidence,
     calculate_center_of_mass_from_canonical,
     calculate_center_of_mass_per_frame,
+    calculate_xcom,
+    calculate_xcom_trajectory,
     load_body_biomechanics,
 )
 
@@ -57,3 +61,49 @@ def test_com_from_canonical_matches_tracker_path():
 
     assert np.allclose(via_tracker.total_body_com, via_canonical.total_body_com)
     assert via_canonical.confidence == via_tracker.confidence
+
+
+def test_kernel_matches_dict_path_with_missing_points():
+    # The compiled kernel must reproduce the per-frame dict path, including
+    # mass redistribution when distal segments (or whole chains) drop out.
+    bio = load_body_biomechanics()
+    kernel = CenterOfMassKernel.from_biomechanics(bio)
+    canonical = bio.tracker_mapping.apply(_upright_rtmpose_pose())
+
+    rng = np.random.default_rng(0)
+    names = list(canonical)
+    frames = []
+    for _ in range(50):
+        keep = rng.random(len(names)) >= 0.3
+        frames.append({
+            name: canonical[name] + rng.normal(scale=20.0, size=3)
+            for name, kept in zip(names, keep) if kept
+        })
+
+    trajectory = kernel.compute(np.stack([kernel.positions_from_dict(frame) for frame in frames]))
+    for i, frame in enumerate(frames):
+        expected = calculate_center_of_mass_from_canonical(frame, bio)
+        assert np.allclose(trajectory.total_body_com[i], expected.total_body_com)
+        assert np.isclose(trajectory.directly_observed_mass[i], expected.directly_observed_mass)
+        for j, name in enumerate(trajectory.segment_names):
+            if name in expected.segment_coms:
+                assert np.allclose(trajectory.segment_coms[i, j], expected.segment_coms[name])
+            else:
+                assert np.all(np.isnan(trajectory.segment_coms[i, j]))
+
+
+def test_xcom_trajectory_matches_per_frame_xcom():
+    rng = np.random.default_rng(1)
+    com = np.cumsum(rng.normal(scale=5.0, size=(40, 3)), axis=0) + np.array([0.0, 0.0, 900.0])
+    com[10, 2] = -5.0  # below the ground plane: no XCoM for this frame
+    timestamps = np.arange(40) / 30.0
+
+    xcom = calculate_xcom_trajectory(com=com, timestamps=timestamps)
+
+    assert np.all(np.isnan(xcom[0]))
+    assert np.all(np.isnan(xcom[10]))
+    for i in range(1, 40):
+        if i == 10:
+            continue
+        expected = calculate_xcom(com=com[i], prev_com=com[i - 1], dt=timestamps[i] - timestamps[i - 1])
+        assert np.allclose(xcom[i], expected)
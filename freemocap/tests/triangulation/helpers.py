@@ -0,0 +1,52 @@
+"""Shared synthetic-scene helpers for the triangulation tests and benchmarks."""
+import cv2
+import numpy as np
+
+from freemocap.core.tasks.calibration.shared.camera_extrinsics import CameraExtrinsics
+from freemocap.core.tasks.calibration.shared.camera_intrinsics import CameraIntrinsics
+from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
+from freemocap.core.tasks.triangulation.triangulator import Triangulator
+
+
+def make_ring_cameras(n_cameras: int) -> list[CameraModel]:
+    """Cameras evenly spaced on a 3m ring at 1m height, looking at the origin."""
+    cameras: list[CameraModel] = []
+    for i in range(n_cameras):
+        angle = 2.0 * np.pi * i / n_cameras
+        pos = np.array([3000.0 * np.cos(angle), 3000.0 * np.sin(angle), 1000.0])
+        forward = -pos / np.linalg.norm(pos)
+        right = np.cross(forward, np.array([0.0, 0.0, 1.0]))
+        right = right / np.linalg.norm(right)
+        up = np.cross(right, forward)
+        R = np.stack([right, -up, forward], axis=0)
+        t = -R @ pos
+        cameras.append(
+            CameraModel(
+                id=f"cam_{i}",
+                index=i,
+                image_size=(1280, 720),
+                intrinsics=CameraIntrinsics(fx=900.0, fy=900.0, cx=640.0, cy=360.0, k1=-0.05, k2=0.01),
+                extrinsics=CameraExtrinsics.from_rodrigues(rvec=cv2.Rodrigues(R)[0].ravel(), tvec=t),
+            )
+        )
+    return cameras
+
+
+def make_observations(
+        triangulator: Triangulator,
+        n_frames: int,
+        n_points: int,
+        seed: int,
+        dropout_fraction: float = 0.25,
+        outlier_fraction: float = 0.05,
+) -> np.ndarray:
+    """Noisy pixel observations (n_cameras, n_frames, n_points, 2) with random dropouts and gross outliers."""
+    rng = np.random.default_rng(seed)
+    truth = rng.uniform(-500.0, 500.0, size=(n_frames * n_points, 3))
+    obs = triangulator.project(points_3d=truth)  # (n_cameras, n_flat, 2)
+    obs += rng.normal(0.0, 0.5, size=obs.shape)
+    outliers = rng.random(obs.shape[:2]) < outlier_fraction
+    obs[outliers] += rng.uniform(-80.0, 80.0, size=(int(outliers.sum()), 2))
+    dropped = rng.random(obs.shape[:2]) < dropout_fraction
+    obs[dropped] = np.nan
+    return obs.reshape(triangulator.n_cameras, n_frames, n_points, 2)
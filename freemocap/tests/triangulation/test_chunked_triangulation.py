@@ -0,0 +1,46 @@
+"""Tests for frame-windowed (chunked) triangulation."""
+import numpy as np
+import pytest
+
+from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
+from freemocap.core.tasks.triangulation.triangulator import (
+    CHUNKED_PER_CAMERA_WEIGHTS_NPY,
+    CHUNKED_POINTS_3D_NPY,
+    CHUNKED_REPROJECTION_ERROR_NPY,
+    Triangulator,
+)
+from freemocap.tests.triangulation.helpers import make_observations, make_ring_cameras
+
+
+@pytest.mark.parametrize("use_memmap", [False, True])
+def test_chunked_triangulation_matches_whole_recording(use_memmap: bool, tmp_path) -> None:
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=4))
+    data2d = make_observations(triangulator=triangulator, n_frames=23, n_points=9, seed=11)
+    data2d_by_camera = {cam_id: data2d[i] for i, cam_id in enumerate(triangulator.camera_ids)}
+    config = TriangulationConfig(target_reprojection_error=0.002, chunk_size_frames=5)
+
+    expected = triangulator.triangulate(data2d=data2d_by_camera, config=config)
+    chunked = triangulator.triangulate_chunked(
+        load_chunk=lambda start, stop: {k: v[start:stop] for k, v in data2d_by_camera.items()},
+        n_frames=23,
+        config=config,
+        output_folder=tmp_path if use_memmap else None,
+    )
+
+    np.testing.assert_allclose(chunked.points_3d, expected.points_3d, equal_nan=True)
+    np.testing.assert_allclose(chunked.per_camera_weights, expected.per_camera_weights, equal_nan=True)
+    np.testing.assert_allclose(chunked.reprojection_error, expected.reprojection_error, equal_nan=True)
+
+    if use_memmap:
+        for file_name, expected_array in (
+                (CHUNKED_POINTS_3D_NPY, expected.points_3d),
+                (CHUNKED_PER_CAMERA_WEIGHTS_NPY, expected.per_camera_weights),
+                (CHUNKED_REPROJECTION_ERROR_NPY, expected.reprojection_error),
+        ):
+            np.testing.assert_allclose(np.load(tmp_path / file_name), expected_array, equal_nan=True)
+
+
+def test_chunked_triangulation_requires_chunk_size() -> None:
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=3))
+    with pytest.raises(ValueError, match="chunk_size_frames"):
+        triangulator.triangulate_chunked(load_chunk=lambda start, stop: {}, n_frames=10)
@@ -0,0 +1,55 @@
+"""The vectorized multi-camera projection must match cv2.projectPoints camera by camera."""
+import cv2
+import numpy as np
+
+from freemocap.core.tasks.calibration.shared.camera_extrinsics import CameraExtrinsics
+from freemocap.core.tasks.calibration.shared.camera_intrinsics import CameraIntrinsics
+from freemocap.core.tasks.calibration.shared.camera_model import CameraModel
+from freemocap.core.tasks.triangulation.triangulator import Triangulator
+from freemocap.tests.triangulation.helpers import make_ring_cameras
+
+
+def test_project_matches_cv2_project_points() -> None:
+    cameras = make_ring_cameras(n_cameras=3)
+    # One camera with strong radial + tangential distortion.
+    cameras[1] = CameraModel(
+        id="cam_distorted",
+        index=1,
+        image_size=(1280, 720),
+        intrinsics=CameraIntrinsics(fx=850.0, fy=870.0, cx=630.0, cy=370.0, k1=-0.2, k2=0.05, p1=0.003, p2=-0.002),
+        extrinsics=cameras[1].extrinsics,
+    )
+    triangulator = Triangulator(cameras=cameras)
+
+    rng = np.random.default_rng(3)
+    points_3d = rng.uniform(-800.0, 800.0, size=(50, 3))
+    points_3d[7] = np.nan
+
+    projected = triangulator.project(points_3d=points_3d)
+
+    assert projected.shape == (3, 50, 2)
+    assert np.isnan(projected[:, 7]).all()
+    valid = ~np.isnan(points_3d).any(axis=1)
+    for cam_idx, cam in enumerate(cameras):
+        expected, _ = cv2.projectPoints(
+            points_3d[valid].reshape(-1, 1, 3),
+            cam.extrinsics.rodrigues_vector.reshape(3, 1),
+            cam.extrinsics.translation,
+            cam.intrinsics.to_camera_matrix(),
+            cam.intrinsics.to_dist_coeffs(),
+        )
+        np.testing.assert_allclose(projected[cam_idx, valid], expected.reshape(-1, 2), atol=1e-8)
+
+
+def test_mean_reprojection_error_ignores_unobserved_cameras() -> None:
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=3))
+    points_3d = np.array([[0.0, 0.0, 0.0], [100.0, -50.0, 20.0]])
+    observed = triangulator.project(points_3d=points_3d)
+    observed[0, 0] += [3.0, 4.0]   # 5 px error in camera 0 for point 0
+    observed[2, 0] = np.nan        # point 0 unobserved by camera 2
+    observed[1:, 1] = np.nan       # point 1 seen by one camera only
+
+    error = triangulator.mean_reprojection_error(points_3d=points_3d, points_2d_pixel=observed)
+
+    np.testing.assert_allclose(error[0], 2.5)
+    assert np.isnan(error[1])
@@ -0,0 +1,59 @@
+"""Parity tests for the numba triangulation backend.
+
+The numba kernel must reproduce the numpy dispatch in `Triangulator.triangulate`
+(batch path for fully-visible points, per-point path for partial visibility) for
+both plain DLT and subset-ensemble outlier rejection.
+"""
+import numpy as np
+import pytest
+
+from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
+from freemocap.core.tasks.triangulation.triangulator import Triangulator
+from freemocap.tests.triangulation.helpers import make_observations, make_ring_cameras
+
+
+@pytest.mark.parametrize("use_outlier_rejection", [False, True])
+def test_numba_backend_matches_numpy_backend(use_outlier_rejection: bool) -> None:
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=6))
+    data2d = make_observations(triangulator=triangulator, n_frames=40, n_points=17, seed=7)
+
+    config_kwargs = dict(
+        use_outlier_rejection=use_outlier_rejection,
+        target_reprojection_error=0.002,
+        maximum_cameras_to_drop=2,
+    )
+    result_numpy = triangulator.triangulate(
+        data2d=data2d, config=TriangulationConfig(backend="numpy", **config_kwargs),
+    )
+    result_numba = triangulator.triangulate(
+        data2d=data2d, config=TriangulationConfig(backend="numba", **config_kwargs),
+    )
+
+    # Same NaN pattern (insufficient cameras, unobserved cameras) in every output.
+    np.testing.assert_array_equal(np.isnan(result_numba.points_3d), np.isnan(result_numpy.points_3d))
+    np.testing.assert_array_equal(
+        np.isnan(result_numba.per_camera_weights), np.isnan(result_numpy.per_camera_weights),
+    )
+    np.testing.assert_allclose(result_numba.points_3d, result_numpy.points_3d, atol=1e-6, equal_nan=True)
+    np.testing.assert_allclose(
+        result_numba.per_camera_weights, result_numpy.per_camera_weights, atol=1e-9, equal_nan=True,
+    )
+    np.testing.assert_allclose(
+        result_numba.reprojection_error, result_numpy.reprojection_error, atol=1e-6, equal_nan=True,
+    )
+
+
+def test_numba_backend_respects_minimum_cameras() -> None:
+    """Points seen by fewer than minimum_cameras_for_triangulation cameras stay NaN."""
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=4))
+    obs = triangulator.project(points_3d=np.array([[0.0, 0.0, 0.0], [100.0, 50.0, 0.0]]))
+    obs[2:, 1] = np.nan  # second point only visible in cameras 0 and 1
+
+    result = triangulator.triangulate(
+        data2d=obs,
+        config=TriangulationConfig(backend="numba", minimum_cameras_for_triangulation=3),
+    )
+
+    np.testing.assert_allclose(result.points_3d[0], [0.0, 0.0, 0.0], atol=1e-6)
+    assert np.isnan(result.points_3d[1]).all()
+    assert np.isnan(result.per_camera_weights[1]).all()
@@ -4,7 +4,9 @@ Covers:
   - triangulate_with_outlier_rejection clean-data parity with triangulate_simple
   - triangulate_with_outlier_rejection actually rejects a corrupt camera
   - Triangulator.triangulate dispatches across dict / 3D-array / 4D-array inputs
+  - the masked (visibility-grouped) batch path matches the per-point reference
 """
+import cv2
 import numpy as np
 
 from freemocap.core.tasks.calibration.shared.camera_intrinsics import CameraIntrinsics
@@ -17,6 +19,7 @@ from freemocap.core.tasks.triangulation.helpers.triangulate_simple import triang
 from freemocap.core.tasks.triangulation.helpers.project_point_to_camera import project_point_to_camera
 from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
 from freemocap.core.tasks.triangulation.triangulator import Triangulator
+from freemocap.tests.triangulation.helpers import make_observations, make_ring_cameras
 
 
 # =============================================================================
@@ -178,3 +181,57 @@ def test_triangulator_dispatch_across_input_shapes():
     np.testing.assert_allclose(res_4d.points_3d.ravel(), truth, atol=1e-6)
     np.testing.assert_allclose(res_dict.points_3d.ravel(), truth, atol=1e-6)
     np.testing.assert_allclose(res_or.points_3d.ravel(), res_3d.points_3d.ravel(), atol=1e-9)
+
+
+def test_masked_batch_path_matches_per_point_reference():
+    """Partially-visible points are solved in visibility-mask groups; each one must match
+    triangulate_simple / triangulate_with_outlier_rejection run on its valid cameras alone."""
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=5))
+    data2d = make_observations(
+        triangulator=triangulator, n_frames=20, n_points=10, seed=3, dropout_fraction=0.35,
+    )
+    stacked = data2d.reshape(triangulator.n_cameras, -1, 2)
+    undistorted = np.stack([
+        cv2.undistortPoints(
+            stacked[c].reshape(-1, 1, 2),
+            cam.intrinsics.to_camera_matrix(),
+            cam.intrinsics.to_dist_coeffs(),
+        ).reshape(-1, 2)
+        for c, cam in enumerate(triangulator.cameras)
+    ])
+    extrinsics_mats = np.stack([
+        np.hstack([cam.extrinsics.rotation_matrix, cam.extrinsics.translation[:, None]])
+        for cam in triangulator.cameras
+    ])
+
+    for use_outlier_rejection in (False, True):
+        config = TriangulationConfig(
+            use_outlier_rejection=use_outlier_rejection, target_reprojection_error=0.002,
+        )
+        result = triangulator.triangulate(data2d=data2d, config=config)
+        points_3d = result.points_3d.reshape(-1, 3)
+        weights = result.per_camera_weights.reshape(-1, triangulator.n_cameras)
+
+        n_checked = 0
+        for pt_idx in range(stacked.shape[1]):
+            valid_idx = np.flatnonzero(~np.isnan(stacked[:, pt_idx, 0]))
+            if len(valid_idx) < 2 or len(valid_idx) == triangulator.n_cameras:
+                continue
+            if use_outlier_rejection:
+                expected_p3d, expected_w = triangulate_with_outlier_rejection(
+                    points_2d=undistorted[valid_idx, pt_idx],
+                    extrinsics_mats=extrinsics_mats[valid_idx],
+                    minimum_cameras_for_triangulation=config.minimum_cameras_for_triangulation,
+                    maximum_cameras_to_drop=config.maximum_cameras_to_drop,
+                    target_reprojection_error=config.target_reprojection_error,
+                )
+            else:
+                expected_p3d = triangulate_simple(
+                    points=undistorted[valid_idx, pt_idx], extrinsics_mats=extrinsics_mats[valid_idx],
+                )
+                expected_w = np.full(len(valid_idx), 1.0 / len(valid_idx))
+            np.testing.assert_allclose(points_3d[pt_idx], expected_p3d, atol=1e-6)
+            np.testing.assert_allclose(weights[pt_idx, valid_idx], expected_w, atol=1e-9)
+            assert np.isnan(np.delete(weights[pt_idx], valid_idx)).all()
+            n_checked += 1
+        assert n_checked > 0
@@ -0,0 +1,74 @@
+"""Tests for frame-sharded (process pool, shared memory) triangulation."""
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from freemocap.core.pipeline.posthoc.task_progress_reporter import TaskProgressReporter
+from freemocap.core.tasks.triangulation.helpers.sharded_triangulation import triangulate_sharded
+from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
+from freemocap.core.tasks.triangulation.triangulator import Triangulator
+from freemocap.tests.triangulation.helpers import make_observations, make_ring_cameras
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_sharded_triangulation_matches_whole_recording(num_workers: int) -> None:
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=4))
+    data2d = make_observations(triangulator=triangulator, n_frames=23, n_points=9, seed=5)
+    data2d_by_camera = {cam_id: data2d[i] for i, cam_id in enumerate(triangulator.camera_ids)}
+    config = TriangulationConfig(target_reprojection_error=0.002)
+
+    progress: list[tuple[str, str, float]] = []
+    expected = triangulator.triangulate(data2d=data2d_by_camera, config=config)
+    sharded = triangulate_sharded(
+        triangulator=triangulator,
+        load_chunk=lambda start, stop: {k: v[start:stop] for k, v in data2d_by_camera.items()},
+        n_frames=23,
+        config=config,
+        num_workers=num_workers,
+        shard_size_frames=6,
+        reporter=TaskProgressReporter(callback=lambda *args: progress.append(args)),
+    )
+
+    np.testing.assert_allclose(sharded.points_3d, expected.points_3d, equal_nan=True)
+    np.testing.assert_allclose(sharded.per_camera_weights, expected.per_camera_weights, equal_nan=True)
+    np.testing.assert_allclose(sharded.reprojection_error, expected.reprojection_error, equal_nan=True)
+
+    # One report per shard, fractions increasing to 1.0.
+    fractions = [fraction for _, _, fraction in progress]
+    assert len(fractions) == 4
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == pytest.approx(1.0)
+    assert all(stage == "triangulating" for stage, _, _ in progress)
+
+
+def _triangulate_sharded_in_daemon(results: multiprocessing.Queue) -> None:
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=3))
+    data2d = make_observations(triangulator=triangulator, n_frames=10, n_points=4, seed=2)
+    data2d_by_camera = {cam_id: data2d[i] for i, cam_id in enumerate(triangulator.camera_ids)}
+    sharded = triangulate_sharded(
+        triangulator=triangulator,
+        load_chunk=lambda start, stop: {k: v[start:stop] for k, v in data2d_by_camera.items()},
+        n_frames=10,
+        num_workers=2,
+        shard_size_frames=3,
+    )
+    expected = triangulator.triangulate(data2d=data2d_by_camera)
+    results.put((
+        np.allclose(sharded.points_3d, expected.points_3d, equal_nan=True),
+        multiprocessing.current_process().daemon,
+    ))
+
+
+def test_sharded_triangulation_runs_its_pool_from_a_daemonic_process() -> None:
+    # The posthoc aggregator may itself be a daemonic worker process.
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_triangulate_sharded_in_daemon, args=(results,), daemon=True)
+    process.start()
+    process.join(timeout=120)
+
+    assert process.exitcode == 0
+    matches, still_daemonic = results.get(timeout=5)
+    assert matches
+    assert still_daemonic
@@ -0,0 +1,56 @@
+"""Tests for the precomputed undistortion lookup."""
+import cv2
+import numpy as np
+
+from freemocap.core.tasks.triangulation.helpers.triangulation_config import TriangulationConfig
+from freemocap.core.tasks.triangulation.triangulator import Triangulator
+from freemocap.tests.triangulation.helpers import make_observations, make_ring_cameras
+
+
+def test_lookup_matches_cv2_within_reported_error() -> None:
+    cameras = make_ring_cameras(n_cameras=3)
+    triangulator = Triangulator(cameras=cameras)
+    lookup = triangulator.enable_undistortion_lookup(grid_step_px=8.0)
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform([0.0, 0.0], [1279.0, 719.0], size=(3, 500, 2))
+    points[1, 3] = np.nan
+    points[2, 4] = [-40.0, 900.0]  # outside the image: exact fallback
+
+    undistorted = lookup.undistort(points)
+
+    assert np.isnan(undistorted[1, 3]).all()
+    for cam_idx, cam in enumerate(cameras):
+        valid = ~np.isnan(points[cam_idx]).any(axis=1)
+        exact = cv2.undistortPoints(
+            points[cam_idx, valid].reshape(-1, 1, 2),
+            cam.intrinsics.to_camera_matrix(),
+            cam.intrinsics.to_dist_coeffs(),
+        ).reshape(-1, 2)
+        error = np.linalg.norm(undistorted[cam_idx, valid] - exact, axis=1)
+        assert error.max() <= lookup.max_error_normalized[cam_idx] + 1e-12
+    np.testing.assert_allclose(
+        undistorted[2, 4],
+        cv2.undistortPoints(
+            points[2, 4].reshape(1, 1, 2), cameras[2].intrinsics.to_camera_matrix(),
+            cameras[2].intrinsics.to_dist_coeffs(),
+        ).ravel(),
+    )
+    assert (lookup.max_error_px < 0.01).all()
+
+
+def test_triangulation_with_lookup_matches_cv2_undistortion() -> None:
+    triangulator = Triangulator(cameras=make_ring_cameras(n_cameras=4))
+    data2d = make_observations(triangulator=triangulator, n_frames=10, n_points=12, seed=2)
+    config = TriangulationConfig(use_outlier_rejection=False)
+    expected = triangulator.triangulate(data2d=data2d, config=config)
+
+    triangulator.enable_undistortion_lookup(grid_step_px=4.0)
+    with_lookup = triangulator.triangulate(data2d=data2d, config=config)
+    subset = triangulator.subset(camera_ids=["cam_3", "cam_1", "cam_0"])
+
+    np.testing.assert_allclose(with_lookup.points_3d, expected.points_3d, atol=0.05, equal_nan=True)
+    assert subset.undistortion_lookup is not None
+    np.testing.assert_array_equal(
+        subset.undistortion_lookup.grids, triangulator.undistortion_lookup.grids[[3, 1, 0]],
+    )